@@ -0,0 +1,117 @@
+"""Benchmark the async Box transport against toolkit calls on worker threads.
+
+A local fake Box API answers GET /2.0/files/{id} after a fixed latency.
+Concurrent clients call the file info tool either through the shared
+httpx transport on the event loop or through the synchronous toolkit
+offloaded to the tool executor, and the calls per second are compared.
+
+Usage:
+    uv run python benchmarks/bench_async_transport.py [--clients 200] [--calls 5] [--latency 0.02]
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import socket
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import uvicorn
+from box_sdk_gen import BaseUrls, BoxClient, BoxDeveloperTokenAuth
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from box_api import BoxAsyncTransport
+from config import ExecutionConfig, HttpConfig
+from server_context import BoxContext
+from tool_executor import configure_tool_executor
+from tools.box_tools_file import box_file_info_tool
+
+
+def serve_fake_box_api(sock: socket.socket, latency: float) -> None:
+    async def file_info(request):
+        await asyncio.sleep(latency)
+        return JSONResponse(
+            {"type": "file", "id": request.path_params["file_id"], "name": "report.pdf"}
+        )
+
+    app = Starlette(routes=[Route("/2.0/files/{file_id}", file_info)])
+    uvicorn.Server(uvicorn.Config(app, log_level="warning", backlog=4096)).run(
+        sockets=[sock]
+    )
+
+
+def start_fake_box_api(latency: float) -> tuple[str, multiprocessing.Process]:
+    """Serve the fake Box API from another process so it does not share the GIL."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(4096)
+    port = sock.getsockname()[1]
+    process = multiprocessing.Process(
+        target=serve_fake_box_api, args=(sock, latency), daemon=True
+    )
+    process.start()
+    return f"http://127.0.0.1:{port}", process
+
+
+async def run_clients(box_context: BoxContext, clients: int, calls: int) -> float:
+    ctx = SimpleNamespace(
+        request_context=SimpleNamespace(lifespan_context=box_context, request=None)
+    )
+
+    async def client(n: int):
+        for i in range(calls):
+            result = await box_file_info_tool(ctx, f"{n}-{i}")
+            assert "file_info" in result, result
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(clients)))
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--calls", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, default=32)
+    args = parser.parse_args()
+
+    base_url, process = start_fake_box_api(args.latency)
+    client = BoxClient(BoxDeveloperTokenAuth(token="bench")).with_custom_base_urls(
+        BaseUrls(base_url=base_url)
+    )
+    executor = configure_tool_executor(ExecutionConfig(tool_workers=args.workers))
+    total = args.clients * args.calls
+    print(
+        f"{args.clients} clients x {args.calls} calls, {args.latency * 1000:.0f} ms per call"
+    )
+    print(f"{'transport':>24} {'seconds':>10} {'calls/s':>10}")
+
+    try:
+        elapsed = await run_clients(BoxContext(client=client), args.clients, args.calls)
+        print(
+            f"{f'toolkit, {args.workers} threads':>24} {elapsed:>10.2f} {total / elapsed:>10.0f}"
+        )
+
+        transport = BoxAsyncTransport(HttpConfig(max_connections_per_host=100))
+        try:
+            box_context = BoxContext(client=client, transport=transport)
+            elapsed = await run_clients(box_context, args.clients, args.calls)
+            print(f"{'async httpx':>24} {elapsed:>10.2f} {total / elapsed:>10.0f}")
+        finally:
+            await transport.aclose()
+    finally:
+        executor.shutdown()
+        process.terminate()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
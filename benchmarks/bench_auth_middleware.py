@@ -0,0 +1,96 @@
+"""Benchmark the per-request overhead of AuthMiddleware.
+
+Requests with the headers of a typical MCP streamable HTTP POST are sent in
+process through the middleware around an ASGI app that answers at once, in
+token and in OAuth (mcp_client) mode. The time per request of the bare app
+is subtracted, leaving the cost of the authentication itself.
+
+Usage:
+    uv run python benchmarks/bench_auth_middleware.py [--requests 200000]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from config import (
+    AppConfig,
+    BoxAuthType,
+    McpAuthConfig,
+    McpAuthType,
+    ServerConfig,
+)
+from middleware import AuthMiddleware
+
+TOKEN = "2f1c0e8a9b7d4c3e8f6a5b4c3d2e1f0a"
+
+HEADERS = [
+    (b"host", b"mcp.example.org"),
+    (b"user-agent", b"python-httpx/0.28.1"),
+    (b"accept", b"application/json, text/event-stream"),
+    (b"accept-encoding", b"gzip, deflate"),
+    (b"connection", b"keep-alive"),
+    (b"content-type", b"application/json"),
+    (b"mcp-protocol-version", b"2025-06-18"),
+    (b"mcp-session-id", b"7c9e6679742540de944be07fc1f90ae7"),
+    (b"content-length", b"154"),
+    (b"authorization", b"Bearer " + TOKEN.encode()),
+]
+
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def measure(app, requests: int) -> float:
+    """Seconds per request through an ASGI app."""
+    start = time.perf_counter()
+    for _ in range(requests):
+        scope = {"type": "http", "method": "POST", "path": "/mcp", "headers": HEADERS}
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+def middleware(mcp_auth_type: McpAuthType, box_auth: BoxAuthType) -> AuthMiddleware:
+    app_config = AppConfig(
+        server=ServerConfig(mcp_auth_type=mcp_auth_type, box_auth=box_auth),
+        mcp_auth=McpAuthConfig(auth_token=TOKEN),
+    )
+    return AuthMiddleware(ok_app, app_config)
+
+
+async def main(requests: int) -> None:
+    bare = min([await measure(ok_app, requests) for _ in range(3)])
+    modes = {
+        "token": middleware(McpAuthType.TOKEN, BoxAuthType.CCG),
+        "oauth": middleware(McpAuthType.OAUTH, BoxAuthType.MCP_CLIENT),
+    }
+    print(f"{'bare app':<10} {bare * 1e6:>8.2f} us/request")
+    for name, app in modes.items():
+        elapsed = min([await measure(app, requests) for _ in range(3)])
+        print(
+            f"{name:<10} {elapsed * 1e6:>8.2f} us/request, "
+            f"{(elapsed - bare) * 1e6:.2f} us of authentication"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.requests))
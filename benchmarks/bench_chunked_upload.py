@@ -0,0 +1,181 @@
+"""Benchmark single-request uploads against chunked, parallel upload sessions.
+
+A local fake Box upload API accepts both the single-request upload and the
+upload session calls. Every request body is received at a fixed bandwidth
+per connection, as uploads to Box are usually limited per connection rather
+than by the link. Files are uploaded with box_file_upload_tool, once as a
+single request and once in upload sessions with several numbers of parts
+in flight, and the wall-clock times are compared.
+
+Usage:
+    uv run python benchmarks/bench_chunked_upload.py [--sizes 32 128] [--bandwidth 50] [--workers 1 4 8]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import socket
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+MB = 1024 * 1024
+PART_SIZE = 8 * MB
+
+
+def serve_fake_upload_api(sock: socket.socket, bandwidth: float) -> None:
+    import uvicorn
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse, Response
+    from starlette.routing import Route
+
+    sessions: dict[str, dict] = {}
+
+    async def receive(request) -> bytes:
+        """Read the body at the given bandwidth."""
+        start = time.perf_counter()
+        body = await request.body()
+        delay = len(body) / bandwidth - (time.perf_counter() - start)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return body
+
+    def file_entries(name: str) -> dict:
+        return {"entries": [{"type": "file", "id": "1", "name": name}]}
+
+    async def upload_file(request):
+        await receive(request)
+        return JSONResponse(file_entries("uploaded.bin"), status_code=201)
+
+    async def create_session(request):
+        data = await request.json()
+        session_id = str(len(sessions) + 1)
+        sessions[session_id] = {"name": data["file_name"]}
+        return JSONResponse(
+            {
+                "type": "upload_session",
+                "id": session_id,
+                "part_size": PART_SIZE,
+                "total_parts": -(-data["file_size"] // PART_SIZE),
+                "num_parts_processed": 0,
+            },
+            status_code=201,
+        )
+
+    async def upload_part(request):
+        body = await receive(request)
+        offset = int(request.headers["content-range"].split()[1].split("-")[0])
+        return JSONResponse(
+            {
+                "part": {
+                    "part_id": f"{offset:08x}",
+                    "offset": offset,
+                    "size": len(body),
+                    "sha1": hashlib.sha1(body).hexdigest(),
+                }
+            }
+        )
+
+    async def commit(request):
+        session = sessions[request.path_params["session_id"]]
+        return JSONResponse(file_entries(session["name"]), status_code=201)
+
+    async def not_found(request):
+        return Response(status_code=404)
+
+    app = Starlette(
+        routes=[
+            Route("/api/2.0/files/content", upload_file, methods=["POST"]),
+            Route("/api/2.0/files/upload_sessions", create_session, methods=["POST"]),
+            Route(
+                "/api/2.0/files/upload_sessions/{session_id}",
+                upload_part,
+                methods=["PUT"],
+            ),
+            Route(
+                "/api/2.0/files/upload_sessions/{session_id}/commit",
+                commit,
+                methods=["POST"],
+            ),
+            Route("/{path:path}", not_found),
+        ]
+    )
+    uvicorn.Server(uvicorn.Config(app, log_level="warning")).run(sockets=[sock])
+
+
+def start_fake_upload_api(bandwidth: float) -> tuple[str, multiprocessing.Process]:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(128)
+    port = sock.getsockname()[1]
+    process = multiprocessing.Process(
+        target=serve_fake_upload_api, args=(sock, bandwidth), daemon=True
+    )
+    process.start()
+    return f"http://127.0.0.1:{port}", process
+
+
+async def upload(base_url: str, content: bytes, chunked: bool, workers: int) -> float:
+    from box_sdk_gen import BaseUrls, BoxClient, BoxDeveloperTokenAuth
+
+    from box_api import BoxAsyncTransport, configure_uploads
+    from server_context import BoxContext
+    from tools.box_tools_file_transfer import box_file_upload_tool
+
+    client = BoxClient(BoxDeveloperTokenAuth(token="bench")).with_custom_base_urls(
+        BaseUrls(base_url=base_url, upload_url=f"{base_url}/api")
+    )
+    configure_uploads(0 if chunked else len(content) + 1, workers)
+    transport = BoxAsyncTransport()
+    box_context = BoxContext(client=client, transport=transport)
+    ctx = SimpleNamespace(
+        request_context=SimpleNamespace(lifespan_context=box_context, request=None)
+    )
+    try:
+        start = time.perf_counter()
+        result = await box_file_upload_tool(ctx, content, "bench.bin", "0")
+        elapsed = time.perf_counter() - start
+    finally:
+        await transport.aclose()
+    assert "error" not in result, result
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[32, 128], help="MB")
+    parser.add_argument(
+        "--bandwidth", type=float, default=50, help="MB/s per connection"
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    base_url, server = start_fake_upload_api(args.bandwidth * MB)
+    await asyncio.sleep(1)
+    print(f"{args.bandwidth:.0f} MB/s per connection, {PART_SIZE // MB} MB parts")
+    print(f"{'mode':>10} {'workers':>8} {'size MB':>8} {'seconds':>8} {'MB/s':>8}")
+    try:
+        for size_mb in args.sizes:
+            content = bytes(range(256)) * (size_mb * MB // 256)
+            elapsed = await upload(base_url, content, False, 1)
+            print(
+                f"{'single':>10} {'-':>8} {size_mb:>8} {elapsed:>8.2f} {size_mb / elapsed:>8.1f}"
+            )
+            for workers in args.workers:
+                elapsed = await upload(base_url, content, True, workers)
+                print(
+                    f"{'chunked':>10} {workers:>8} {size_mb:>8} {elapsed:>8.2f} "
+                    f"{size_mb / elapsed:>8.1f}"
+                )
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
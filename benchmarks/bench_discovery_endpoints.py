@@ -0,0 +1,158 @@
+"""Benchmark the OAuth discovery endpoints in requests per second.
+
+The endpoints are called in process through their ASGI app, so the numbers
+measure the handlers and not the network. The protected resource endpoint is
+compared with the previous handler, which parsed the config file and rendered
+the response on every request. The authorization server endpoint is served
+from its metadata cache, with Box's metadata fetched once from a fake
+account.box.com.
+
+Usage:
+    uv run python benchmarks/bench_discovery_endpoints.py [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from config import AppConfig, McpAuthConfig
+from oauth_endpoints import (
+    AuthorizationServerMetadataCache,
+    add_oauth_endpoints,
+    create_oauth_authorization_server_handler,
+    load_protected_resource_metadata,
+)
+
+PROTECTED_RESOURCE = {
+    "resource": "https://mcp.example.org/mcp",
+    "authorization_servers": ["https://mcp.example.org"],
+    "scopes_supported": ["root_readwrite", "ai.readwrite"],
+    "bearer_methods_supported": ["header"],
+    "resource_documentation": "https://developer.box.com",
+}
+
+
+def legacy_protected_resource_app(config_file: str) -> Starlette:
+    """The protected resource endpoint as it was, loading the file per request."""
+
+    async def handler(request):
+        metadata = load_protected_resource_metadata(config_file)
+        return JSONResponse(
+            status_code=200,
+            content=metadata,
+            headers={
+                "Content-Type": "application/json",
+                "Cache-Control": "public, max-age=3600",
+                "Access-Control-Allow-Origin": "*",
+            },
+        )
+
+    return Starlette(routes=[Route("/.well-known/oauth-protected-resource", handler)])
+
+
+async def call(app, path: str) -> int:
+    """Send one GET request through the ASGI app and return its status."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"mcp.example.org"), (b"accept", b"application/json")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8005),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(app, path: str, requests: int) -> float:
+    assert await call(app, path) == 200
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, path)
+    return requests / (time.perf_counter() - start)
+
+
+async def main(requests: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        config_file = str(Path(directory) / ".oauth-protected-resource.json")
+        Path(config_file).write_text(json.dumps(PROTECTED_RESOURCE))
+        app_config = AppConfig(
+            mcp_auth=McpAuthConfig(oauth_protected_resources_config_file=config_file)
+        )
+
+        app = Starlette()
+        add_oauth_endpoints(app, app_config)
+
+        box_account = httpx.MockTransport(
+            lambda request: httpx.Response(
+                200,
+                json={"issuer": "https://account.box.com"},
+                headers={"ETag": '"v1"'},
+            )
+        )
+        authorization_server_app = Starlette(
+            routes=[
+                Route(
+                    "/.well-known/oauth-authorization-server",
+                    create_oauth_authorization_server_handler(
+                        app_config,
+                        AuthorizationServerMetadataCache(app_config, box_account),
+                    ),
+                )
+            ]
+        )
+
+        results = {
+            "protected resource, file loaded per request": await measure(
+                legacy_protected_resource_app(config_file),
+                "/.well-known/oauth-protected-resource",
+                requests,
+            ),
+            "protected resource, cached": await measure(
+                app, "/.well-known/oauth-protected-resource/mcp", requests
+            ),
+            "authorization server, cached": await measure(
+                authorization_server_app,
+                "/.well-known/oauth-authorization-server",
+                requests,
+            ),
+        }
+
+    for name, rate in results.items():
+        print(f"{name:<45} {rate:>10,.0f} req/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(main(args.requests))
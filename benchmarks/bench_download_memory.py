@@ -0,0 +1,173 @@
+"""Benchmark the peak memory of buffered against streamed file downloads.
+
+A local fake Box API serves files of the requested sizes. Every download
+runs in a fresh process that calls box_file_download_tool, either as before
+(the content is read whole and returned base64 encoded) or with
+stream_to_disk, and reports its peak RSS. Streamed downloads should stay at
+the same peak whatever the file size.
+
+Usage:
+    uv run python benchmarks/bench_download_memory.py [--sizes 64 256 1024] [--buffered-max 256]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import resource
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+MB = 1024 * 1024
+BLOCK = bytes(range(256)) * 256
+
+
+def file_content(size: int):
+    """Deterministic content of a fake file, in 64 KiB blocks."""
+    for offset in range(0, size, len(BLOCK)):
+        yield BLOCK[: size - offset]
+
+
+def serve_fake_box_api(sock: socket.socket) -> None:
+    import uvicorn
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse, StreamingResponse
+    from starlette.routing import Route
+
+    hashes: dict[int, str] = {}
+
+    async def file_info(request):
+        size = int(request.path_params["file_id"])
+        if size not in hashes:
+            sha1 = hashlib.sha1()
+            for block in file_content(size):
+                sha1.update(block)
+            hashes[size] = sha1.hexdigest()
+        return JSONResponse(
+            {
+                "type": "file",
+                "id": str(size),
+                "name": f"{size}.bin",
+                "size": size,
+                "sha1": hashes[size],
+                "file_version": {"type": "file_version", "id": "1"},
+            }
+        )
+
+    async def content(request):
+        size = int(request.path_params["file_id"])
+        return StreamingResponse(
+            file_content(size), media_type="application/octet-stream"
+        )
+
+    app = Starlette(
+        routes=[
+            Route("/2.0/files/{file_id}", file_info),
+            Route("/2.0/files/{file_id}/content", content),
+        ]
+    )
+    uvicorn.Server(uvicorn.Config(app, log_level="warning")).run(sockets=[sock])
+
+
+def start_fake_box_api() -> tuple[str, multiprocessing.Process]:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(128)
+    port = sock.getsockname()[1]
+    process = multiprocessing.Process(
+        target=serve_fake_box_api, args=(sock,), daemon=True
+    )
+    process.start()
+    return f"http://127.0.0.1:{port}", process
+
+
+def download(base_url: str, size: int, stream: bool, directory: str, results) -> None:
+    """Download one file in this process and report its peak RSS."""
+    from box_sdk_gen import BaseUrls, BoxClient, BoxDeveloperTokenAuth
+
+    from box_api import BoxAsyncTransport
+    from server_context import BoxContext
+    from tools.box_tools_file_transfer import box_file_download_tool
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    client = BoxClient(BoxDeveloperTokenAuth(token="bench")).with_custom_base_urls(
+        BaseUrls(base_url=base_url)
+    )
+
+    async def run() -> dict:
+        transport = BoxAsyncTransport() if stream else None
+        box_context = BoxContext(client=client, transport=transport)
+        ctx = SimpleNamespace(
+            request_context=SimpleNamespace(lifespan_context=box_context, request=None)
+        )
+        try:
+            return await box_file_download_tool(
+                ctx,
+                str(size),
+                save_file=True,
+                save_path=directory,
+                stream_to_disk=stream,
+            )
+        finally:
+            if transport is not None:
+                await transport.aclose()
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    result = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+    assert "error" not in result, result
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((baseline * 1024, peak * 1024, elapsed))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[64, 256, 1024], help="MB"
+    )
+    parser.add_argument(
+        "--buffered-max",
+        type=int,
+        default=256,
+        help="largest size downloaded buffered, MB",
+    )
+    args = parser.parse_args()
+
+    spawn = multiprocessing.get_context("spawn")
+    base_url, server = start_fake_box_api()
+    results = spawn.Queue()
+    print(
+        f"{'mode':>10} {'size MB':>8} {'seconds':>8} {'baseline MB':>12} {'peak MB':>8}"
+    )
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for stream in (False, True):
+                for size_mb in args.sizes:
+                    if not stream and size_mb > args.buffered_max:
+                        continue
+                    process = spawn.Process(
+                        target=download,
+                        args=(base_url, size_mb * MB, stream, directory, results),
+                    )
+                    process.start()
+                    baseline, peak, elapsed = results.get()
+                    process.join()
+                    mode = "streamed" if stream else "buffered"
+                    print(
+                        f"{mode:>10} {size_mb:>8} {elapsed:>8.2f} "
+                        f"{baseline / MB:>12.0f} {peak / MB:>8.0f}"
+                    )
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Benchmark serial against concurrent recursive folder listings.
+
+A fake Box tree of about 10k folders answers every folder page after a
+fixed latency. The whole tree is listed recursively, page after page with
+the continuation tokens, once with a single worker and once with concurrent
+workers, and the wall-clock times are compared. Both listings must return
+the same items in the same order. With --rps, every page fetch first waits
+on an AdaptiveRateLimiter, as the Box clients of the server do.
+
+Usage:
+    uv run python benchmarks/bench_folder_traversal.py [--fanout 10] [--levels 4] [--latency 0.005]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from box_api import AdaptiveRateLimiter, list_folder_page
+
+
+class FakeBoxTree:
+    """Folder tree served with marker pagination after a fixed latency."""
+
+    def __init__(
+        self, fanout: int, levels: int, files: int, latency: float, rps: float
+    ):
+        self.latency = latency
+        self.children: dict[str, list[dict]] = {}
+        self.requests = 0
+        self.rps = rps
+        self.rate_limiter: Optional[AdaptiveRateLimiter] = None
+        self._build("0", 0, fanout, levels, files)
+
+    def _build(
+        self, folder_id: str, level: int, fanout: int, levels: int, files: int
+    ) -> None:
+        entries = []
+        if level < levels:
+            for i in range(fanout):
+                child = f"{folder_id}.{i}"
+                entries.append({"type": "folder", "id": child, "name": child})
+                self._build(child, level + 1, fanout, levels, files)
+        entries += [
+            {"type": "file", "id": f"{folder_id}.f{i}", "name": f"{i}.txt"}
+            for i in range(files)
+        ]
+        self.children[folder_id] = entries
+
+    def reset(self) -> None:
+        self.requests = 0
+        if self.rps:
+            self.rate_limiter = AdaptiveRateLimiter(rate=self.rps, burst=int(self.rps))
+
+    async def fetch_page(
+        self, folder_id: str, marker: Optional[str], limit: int
+    ) -> dict:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        entries = self.children[folder_id]
+        start = int(marker or 0)
+        end = start + limit
+        return {
+            "entries": entries[start:end],
+            "next_marker": str(end) if end < len(entries) else None,
+        }
+
+
+async def list_tree(
+    tree: FakeBoxTree, workers: int, limit: int
+) -> tuple[float, list[str], int]:
+    tree.reset()
+    ids = []
+    calls = 0
+    token = None
+    start = time.perf_counter()
+    while True:
+        result = await list_folder_page(
+            tree.fetch_page, "0", True, limit, token, workers=workers
+        )
+        calls += 1
+        ids += [item["id"] for item in result["folder_items"]]
+        token = result.get("next_page_token")
+        if token is None:
+            return time.perf_counter() - start, ids, calls
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fanout", type=int, default=10)
+    parser.add_argument("--levels", type=int, default=4)
+    parser.add_argument("--files", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[8, 32])
+    parser.add_argument("--rps", type=float, default=0, help="rate limit, 0 for none")
+    args = parser.parse_args()
+
+    tree = FakeBoxTree(args.fanout, args.levels, args.files, args.latency, args.rps)
+    items = sum(len(entries) for entries in tree.children.values())
+    print(
+        f"{len(tree.children)} folders, {items} items, "
+        f"{args.latency * 1000:.0f} ms per page, {args.limit} items per tool call"
+    )
+    print(
+        f"{'workers':>8} {'seconds':>10} {'requests':>10} {'tool calls':>11} {'speedup':>8}"
+    )
+
+    serial_elapsed, serial_ids, calls = await list_tree(tree, 1, args.limit)
+    print(f"{1:>8} {serial_elapsed:>10.2f} {tree.requests:>10} {calls:>11} {1:>8.1f}")
+    for workers in args.workers:
+        elapsed, ids, calls = await list_tree(tree, workers, args.limit)
+        assert ids == serial_ids, "concurrent listing returned a different order"
+        print(
+            f"{workers:>8} {elapsed:>10.2f} {tree.requests:>10} {calls:>11} "
+            f"{serial_elapsed / elapsed:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
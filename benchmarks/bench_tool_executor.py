@@ -0,0 +1,82 @@
+"""Benchmark tool throughput with concurrent clients for several pool sizes.
+
+Each client calls a tool whose body blocks like a synchronous Box API call.
+Without the executor the calls serialize on the event loop; with it the
+throughput should grow with the number of workers.
+
+Usage:
+    uv run python benchmarks/bench_tool_executor.py [--clients 64] [--calls 4] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mcp.server.fastmcp import Context, FastMCP
+
+from config import ExecutionConfig
+from tool_executor import ToolExecutor
+from tool_registry import register_all_tools
+
+
+def build_server(latency: float, executor: ToolExecutor | None) -> FastMCP:
+    mcp = FastMCP(name="bench")
+
+    async def box_file_info_tool(ctx: Context, file_id: str) -> dict:
+        time.sleep(latency)  # stands in for a blocking Box API round trip
+        return {"file_info": {"id": file_id}}
+
+    def registrar(server):
+        server.tool()(box_file_info_tool)
+
+    wrappers = [executor.wrap_tool] if executor else None
+    register_all_tools(mcp, [registrar], wrappers=wrappers)
+    return mcp
+
+
+async def run_clients(mcp: FastMCP, clients: int, calls: int) -> float:
+    async def client(n: int):
+        for i in range(calls):
+            await mcp.call_tool("box_file_info_tool", {"file_id": f"{n}-{i}"})
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(clients)))
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--calls", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    total = args.clients * args.calls
+    print(
+        f"{args.clients} clients x {args.calls} calls, {args.latency * 1000:.0f} ms per call"
+    )
+    print(f"{'workers':>10} {'seconds':>10} {'calls/s':>10}")
+
+    elapsed = await run_clients(
+        build_server(args.latency, None), args.clients, args.calls
+    )
+    print(f"{'inline':>10} {elapsed:>10.2f} {total / elapsed:>10.1f}")
+
+    for workers in (1, 2, 4, 8, 16, 32, 64):
+        executor = ToolExecutor(
+            ExecutionConfig(tool_workers=workers, tool_queue_size=total)
+        )
+        try:
+            mcp = build_server(args.latency, executor)
+            elapsed = await run_clients(mcp, args.clients, args.calls)
+        finally:
+            executor.shutdown()
+        print(f"{workers:>10} {elapsed:>10.2f} {total / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,53 @@
+from box_api.ai_batches import configure_ai_batches, run_ai_batch
+from box_api.ai_results import cached_ai_call
+from box_api.api import BoxAsyncApi
+from box_api.downloads import download_file_to_path
+from box_api.folder_listing import (
+    configure_folder_traversal,
+    fetch_folder_items_page,
+    list_folder_page,
+)
+from box_api.ranges import (
+    fetch_file_range_bytes,
+    fetch_file_range_info,
+    read_file_range,
+)
+from box_api.rate_limit import AdaptiveRateLimiter, RateLimiterRegistry, box_identity
+from box_api.text_chunks import extract_text_chunk
+from box_api.transport import BoxAsyncTransport, raise_for_box_status
+from box_api.uploads import (
+    SdkUploadSessions,
+    configure_uploads,
+    find_uploaded_file,
+    preflight_upload,
+    upload_in_session,
+    upload_local_file,
+    use_upload_session,
+)
+
+__all__ = [
+    "AdaptiveRateLimiter",
+    "BoxAsyncApi",
+    "BoxAsyncTransport",
+    "RateLimiterRegistry",
+    "SdkUploadSessions",
+    "box_identity",
+    "cached_ai_call",
+    "configure_ai_batches",
+    "configure_folder_traversal",
+    "configure_uploads",
+    "download_file_to_path",
+    "extract_text_chunk",
+    "fetch_file_range_bytes",
+    "fetch_file_range_info",
+    "fetch_folder_items_page",
+    "find_uploaded_file",
+    "list_folder_page",
+    "preflight_upload",
+    "raise_for_box_status",
+    "read_file_range",
+    "run_ai_batch",
+    "upload_in_session",
+    "upload_local_file",
+    "use_upload_session",
+]
@@ -0,0 +1,74 @@
+"""Box AI calls fanned out over many files or prompts in one tool call.
+
+Each item of a batch is a separate Box AI request, so a batch takes about
+the latency of its slowest requests instead of the sum of all of them. The
+requests run on the AI tool pool with at most a configured number of them in
+flight per batch, and go through the rate limiter of the requesting user like
+any other Box request. An item that fails does not fail the batch, its error
+is returned in its place.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from box_sdk_gen import BoxAPIError
+
+from tool_executor import ToolExecutorBusyError
+
+logger = logging.getLogger(__name__)
+
+# Runs the Box AI call of one item: key -> box_ai_agents_toolkit result
+BatchCall = Callable[[str], Awaitable[Dict[str, Any]]]
+
+# Reports a finished item: (items done, items in the batch, key, result)
+BatchProgress = Callable[[int, int, str, Dict[str, Any]], Awaitable[None]]
+
+# Box AI requests in flight per batch, see configure_ai_batches
+_batch_workers = 4
+
+
+def configure_ai_batches(workers: int) -> None:
+    """Set how many Box AI requests a batch may run concurrently."""
+    global _batch_workers
+    _batch_workers = max(1, workers)
+
+
+async def run_ai_batch(
+    keys: Sequence[str],
+    call: BatchCall,
+    progress: Optional[BatchProgress] = None,
+) -> List[Dict[str, Any]]:
+    """Run one Box AI call per distinct key, concurrently.
+
+    Args:
+        keys: File IDs or prompts of the batch. Duplicates are called once.
+        call: Makes the Box AI call of one key.
+        progress: Optional callback awaited as each distinct key finishes.
+
+    Returns:
+        list[dict[str, Any]]: The result of each key, in the order of the keys.
+    """
+    unique_keys = list(dict.fromkeys(keys))
+    semaphore = asyncio.Semaphore(_batch_workers)
+    done = 0
+
+    async def run_one(key: str) -> Dict[str, Any]:
+        nonlocal done
+        async with semaphore:
+            try:
+                result = await call(key)
+            except BoxAPIError as e:
+                logger.error(e.message)
+                result = {"error": e.message}
+            except ToolExecutorBusyError as e:
+                logger.warning(str(e))
+                result = {"error": str(e)}
+        done += 1
+        if progress is not None:
+            await progress(done, len(unique_keys), key, result)
+        return result
+
+    results = await asyncio.gather(*(run_one(key) for key in unique_keys))
+    by_key = dict(zip(unique_keys, results))
+    return [by_key[key] for key in keys]
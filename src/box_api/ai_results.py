@@ -0,0 +1,73 @@
+"""Box AI answers served from the AI result cache while the files are unchanged.
+
+An answer is cached under the content SHA-1 of every file it was computed
+from, so before each lookup the current version of the files is fetched.
+That freshness check costs one file info call per file, much less than the
+Box AI call it saves, and it is made by the requesting user, so a user who
+may not read a file never gets the answer computed for another user.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from box_sdk_gen import BoxAPIError
+
+from box_api.ranges import FileInfoFetcher, content_version
+from cache import AiResultCache, ai_result_key
+
+logger = logging.getLogger(__name__)
+
+# Key of the answer in the results of the box_ai_agents_toolkit AI functions,
+# anything else is an error or a missing answer and is not cached
+AI_RESPONSE_KEY = "AI_response"
+
+
+async def cached_ai_call(
+    fetch_info: FileInfoFetcher,
+    ask: Callable[[], Awaitable[Dict[str, Any]]],
+    tool: str,
+    file_ids: List[str],
+    request: Any,
+    ai_agent_id: Optional[str] = None,
+    cache: Optional[AiResultCache] = None,
+) -> Dict[str, Any]:
+    """Call Box AI, or serve the answer cached for the current file versions.
+
+    Args:
+        fetch_info: Fetches the file info, with its SHA-1 and version.
+        ask: Makes the Box AI call, returning a box_ai_agents_toolkit result.
+        tool: Name of the AI tool.
+        file_ids: IDs of the files the answer is computed from.
+        request: The prompt, fields or template key of the call.
+        ai_agent_id: ID of the AI agent, if any.
+        cache: Optional cache of the Box AI answers.
+
+    Returns:
+        dict[str, Any]: The result of the Box AI call. A cached answer is
+            marked with "cached": True.
+    """
+    if cache is None or not file_ids:
+        return await ask()
+
+    unique_ids = list(dict.fromkeys(file_ids))
+    try:
+        files = await asyncio.gather(*(fetch_info(file_id) for file_id in unique_ids))
+    except BoxAPIError as e:
+        logger.error(e.message)
+        return {"error": e.message}
+    versions = dict(zip(unique_ids, (content_version(file) for file in files)))
+    if None in versions.values():
+        return await ask()
+
+    key = ai_result_key(tool, versions, request, ai_agent_id)
+    answer = cache.get(key)
+    if answer is not None:
+        logger.debug(f"Serving cached Box AI answer of {tool} for files {unique_ids}")
+        answer["cached"] = True
+        return answer
+
+    result = await ask()
+    if AI_RESPONSE_KEY in result:
+        cache.put(key, result)
+    return result
@@ -0,0 +1,508 @@
+"""Hot-path Box API calls served over the shared async transport.
+
+Each method mirrors the box_ai_agents_toolkit function used by the
+corresponding tool and returns exactly the same shape, so the tools can fall
+back to the toolkit when the async transport is disabled.
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+
+import httpx
+from box_sdk_gen import (
+    BoxAPIError,
+    BoxClient,
+    FileFull,
+    FolderFull,
+    Items,
+    SearchForContentContentTypes,
+    SearchResults,
+    SearchResultsWithSharedLinks,
+)
+from box_sdk_gen.internal.utils import to_string
+from box_sdk_gen.serialization.json import deserialize
+
+from box_api.downloads import DOWNLOAD_FIELDS, DownloadWriter, resolve_save_path
+from box_api.rate_limit import box_identity, rate_limiter_for
+from box_api.transport import BoxAsyncTransport, raise_for_box_status
+from box_api.uploads import preflight_conflict
+from cache import ObjectCache
+from tool_executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Representation statuses, as reported by Box
+_REPRESENTATION_IMPOSSIBLE = "impossible"
+_REPRESENTATION_ERROR = "error"
+_REPRESENTATION_UNKNOWN = "unknown"
+
+# Seconds to wait before checking a representation that is being generated
+REPRESENTATION_POLL_INTERVAL = 5.0
+
+
+class _BufferStream(httpx.AsyncByteStream):
+    """Request body sent from a buffer such as a memoryview, and resent on retries."""
+
+    def __init__(self, data: Any):
+        self._data = data
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield self._data
+
+
+class BoxAsyncApi:
+    """Box API calls bound to one request's Box client.
+
+    Args:
+        transport: The shared async transport.
+        client: The Box client resolved for the current request, which
+            provides the authentication, base URLs, extra headers and rate
+            limiter.
+        object_cache: Optional cache of file and folder representations.
+    """
+
+    def __init__(
+        self,
+        transport: BoxAsyncTransport,
+        client: BoxClient,
+        object_cache: Optional[ObjectCache] = None,
+    ):
+        self.transport = transport
+        self.auth = client.auth
+        self.network_session = client.network_session
+        self.base_url = client.network_session.base_urls.base_url
+        self.upload_url = client.network_session.base_urls.upload_url
+        self.rate_limiter = rate_limiter_for(client)
+        self.object_cache = object_cache
+
+    async def request(self, method: str, url: str, **kwargs: Any):
+        """Send a request with this client's authentication."""
+        return await self.transport.request(
+            method,
+            url,
+            auth=self.auth,
+            network_session=self.network_session,
+            rate_limiter=self.rate_limiter,
+            **kwargs,
+        )
+
+    async def get_json(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """GET an API path and return the decoded JSON body.
+
+        Raises:
+            BoxAPIError: If Box returns an unsuccessful status.
+        """
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        response = await self.request(
+            "GET", f"{self.base_url}{path}", params=params, headers=headers
+        )
+        raise_for_box_status(response)
+        return response.json()
+
+    async def _get_object(
+        self, object_type: str, object_id: str, model: type
+    ) -> Dict[str, Any]:
+        """GET a file or folder as a dict, through the object cache when enabled.
+
+        Cached entries are served as is within their max age, and revalidated
+        with If-None-Match after it.
+        """
+        path = f"/2.0/{object_type}s/{object_id}"
+        cache = self.object_cache
+        if cache is None:
+            return deserialize(await self.get_json(path), model).to_dict()
+
+        identity = box_identity(self.auth)
+        key = (object_type, object_id)
+        entry = cache.get(identity, key)
+        if entry is not None and cache.is_fresh(entry):
+            return entry.data
+
+        response = await self.request(
+            "GET", f"{self.base_url}{path}", headers=cache.conditional_headers(entry)
+        )
+        if response.status_code == 304 and entry is not None:
+            cache.mark_not_modified(entry)
+            return entry.data
+        if response.status_code == 404:
+            cache.invalidate([key])
+        raise_for_box_status(response)
+
+        data = response.json()
+        return cache.put(
+            identity, key, data.get("etag"), deserialize(data, model).to_dict()
+        ).data
+
+    async def file_info(self, file_id: str) -> Dict[str, Any]:
+        """Async equivalent of box_ai_agents_toolkit.box_file_info."""
+        try:
+            return {"file_info": await self._get_object("file", file_id, FileFull)}
+        except BoxAPIError as e:
+            logger.error(e.message)
+            return {"error": e.message}
+
+    async def folder_info(self, folder_id: str) -> Dict[str, Any]:
+        """Async equivalent of box_ai_agents_toolkit.box_folder_info."""
+        try:
+            return {"folder": await self._get_object("folder", folder_id, FolderFull)}
+        except BoxAPIError as e:
+            logger.error(e.message)
+            return {"error": e.message}
+
+    async def folder_items_page(
+        self, folder_id: str, marker: Optional[str], limit: int
+    ) -> Dict[str, Any]:
+        """Fetch one page of folder items, see box_api.folder_listing.
+
+        Raises:
+            BoxAPIError: If Box returns an unsuccessful status.
+        """
+        data = await self.get_json(
+            f"/2.0/folders/{folder_id}/items",
+            params={"usemarker": "true", "limit": to_string(limit), "marker": marker},
+        )
+        folder_items = deserialize(data, Items)
+        return {
+            "entries": [item.to_dict() for item in folder_items.entries or []],
+            "next_marker": folder_items.next_marker,
+        }
+
+    async def download_file_to_path(
+        self, file_id: str, save_path: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Stream a file to disk, checking its SHA-1, with constant memory use.
+
+        The version reported with the file's SHA-1 is the one downloaded, so
+        a concurrent upload cannot make the check fail. Chunks are hashed and
+        written on the tool executor, off the event loop.
+
+        Args:
+            file_id: ID of the file to download.
+            save_path: Destination file or directory, see resolve_save_path.
+
+        Returns:
+            dict[str, Any]: The saved path, size and SHA-1 of the file, or an
+                error message.
+        """
+        try:
+            file = await self.get_json(
+                f"/2.0/files/{file_id}", params={"fields": ",".join(DOWNLOAD_FIELDS)}
+            )
+            version = (file.get("file_version") or {}).get("id")
+            async with self.transport.stream(
+                "GET",
+                f"{self.base_url}/2.0/files/{file_id}/content",
+                auth=self.auth,
+                network_session=self.network_session,
+                params={"version": version} if version else None,
+                rate_limiter=self.rate_limiter,
+            ) as response:
+                if response.status_code == 202:
+                    return {
+                        "error": "The file is not ready for download yet, try again later."
+                    }
+                if response.is_error:
+                    await response.aread()
+                    raise_for_box_status(response)
+
+                async with DownloadWriter(
+                    resolve_save_path(save_path, file["name"])
+                ) as writer:
+                    async for chunk in response.aiter_bytes(
+                        self.transport.download_chunk_size
+                    ):
+                        await run_blocking(writer.write, chunk)
+            return await run_blocking(writer.finish, file.get("sha1"))
+        except BoxAPIError as e:
+            logger.error(e.message)
+            return {"error": e.message}
+
+    async def file_range_info(self, file_id: str) -> Dict[str, Any]:
+        """Fetch the file info needed by box_api.ranges, through the object cache.
+
+        Raises:
+            BoxAPIError: If Box returns an unsuccessful status.
+        """
+        return await self._get_object("file", file_id, FileFull)
+
+    async def file_range_bytes(
+        self, file_id: str, version: Optional[str], start: int, end: int
+    ) -> bytes:
+        """Fetch bytes start..end (included) of a file version with a Range request.
+
+        When the Range header is ignored and Box answers with the whole file, the
+        body is streamed and closed once the end of the range is read.
+
+        Raises:
+            BoxAPIError: If Box returns an unsuccessful status.
+        """
+        async with self.transport.stream(
+            "GET",
+            f"{self.base_url}/2.0/files/{file_id}/content",
+            auth=self.auth,
+            network_session=self.network_session,
+            params={"version": version} if version else None,
+            headers={"Range": f"bytes={start}-{end}"},
+            rate_limiter=self.rate_limiter,
+        ) as response:
+            if response.is_error:
+                await response.aread()
+                raise_for_box_status(response)
+            if response.status_code == 206:
+                return await response.aread()
+
+            # The whole file, when the range was ignored: stop reading after the range
+            data = bytearray()
+            position = 0
+            async for chunk in response.aiter_bytes(self.transport.download_chunk_size):
+                if position + len(chunk) > start:
+                    data += chunk[max(0, start - position) : end + 1 - position]
+                position += len(chunk)
+                if position > end:
+                    break
+            return bytes(data)
+
+    async def preflight_upload(
+        self, file_name: str, size: int, parent_folder_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Run Box's preflight check, see box_api.uploads.PreflightCheck."""
+        response = await self.request(
+            "OPTIONS",
+            f"{self.base_url}/2.0/files/content",
+            json={"name": file_name, "size": size, "parent": {"id": parent_folder_id}},
+        )
+        if response.status_code == 409:
+            return preflight_conflict(response.json().get("context_info"))
+        raise_for_box_status(response)
+        return None
+
+    async def _upload_session_request(self, method: str, path: str, **kwargs: Any):
+        response = await self.request(
+            method, f"{self.upload_url}/2.0/files/upload_sessions{path}", **kwargs
+        )
+        raise_for_box_status(response)
+        return response
+
+    async def create_upload_session(
+        self, folder_id: str, file_size: int, file_name: str
+    ) -> Dict[str, Any]:
+        """Create an upload session, see box_api.uploads."""
+        response = await self._upload_session_request(
+            "POST",
+            "",
+            json={
+                "folder_id": folder_id,
+                "file_size": file_size,
+                "file_name": file_name,
+            },
+        )
+        return response.json()
+
+    async def get_upload_session(self, upload_session_id: str) -> Dict[str, Any]:
+        """Get an upload session, see box_api.uploads."""
+        response = await self._upload_session_request("GET", f"/{upload_session_id}")
+        return response.json()
+
+    async def list_upload_parts(self, upload_session_id: str) -> List[Dict[str, Any]]:
+        """List the parts uploaded in a session, see box_api.uploads."""
+        parts: List[Dict[str, Any]] = []
+        while True:
+            response = await self._upload_session_request(
+                "GET",
+                f"/{upload_session_id}/parts",
+                params={"offset": str(len(parts)), "limit": "1000"},
+            )
+            page = response.json()
+            entries = page.get("entries") or []
+            parts += entries
+            if not entries or len(parts) >= (page.get("total_count") or 0):
+                return parts
+
+    async def upload_part(
+        self,
+        upload_session_id: str,
+        data: memoryview,
+        offset: int,
+        file_size: int,
+        digest: str,
+    ) -> Dict[str, Any]:
+        """Upload one part of a session, see box_api.uploads.
+
+        The part is sent from its buffer, without being copied into bytes.
+        """
+        response = await self._upload_session_request(
+            "PUT",
+            f"/{upload_session_id}",
+            content=_BufferStream(data),
+            headers={
+                "Content-Length": str(len(data)),
+                "Content-Type": "application/octet-stream",
+                "Content-Range": f"bytes {offset}-{offset + len(data) - 1}/{file_size}",
+                "Digest": digest,
+            },
+        )
+        return response.json()["part"]
+
+    async def commit_upload_session(
+        self, upload_session_id: str, parts: List[Dict[str, Any]], digest: str
+    ) -> Optional[Dict[str, Any]]:
+        """Commit a session, None while Box is still processing its parts."""
+        response = await self._upload_session_request(
+            "POST",
+            f"/{upload_session_id}/commit",
+            json={"parts": parts},
+            headers={"Digest": digest},
+        )
+        if response.status_code == 202:
+            return None
+        return response.json()
+
+    async def _search(self, params: Dict[str, Any]) -> List[dict]:
+        data = await self.get_json("/2.0/search", params=params)
+        results = deserialize(data, Union[SearchResults, SearchResultsWithSharedLinks])
+        return [entry.to_dict() for entry in results.entries or []]
+
+    async def search(
+        self,
+        query: str,
+        file_extensions: List[str] | None = None,
+        content_types: List[SearchForContentContentTypes] | None = None,
+        ancestor_folder_ids: List[str] | None = None,
+    ) -> List[dict]:
+        """Async equivalent of box_ai_agents_toolkit.box_search, as dicts.
+
+        Raises:
+            BoxAPIError: If the search fails, like the toolkit function.
+        """
+        return await self._search(
+            {
+                "query": query,
+                "file_extensions": to_string(file_extensions),
+                "ancestor_folder_ids": to_string(ancestor_folder_ids),
+                "content_types": to_string(content_types),
+                "type": "file",
+                "fields": "id,name,type,size,description",
+            }
+        )
+
+    async def locate_folder_by_name(
+        self, folder_name: str, parent_folder_id: str = "0"
+    ) -> List[dict]:
+        """Async equivalent of box_ai_agents_toolkit.box_locate_folder_by_name, as dicts."""
+        return await self._search(
+            {
+                "query": folder_name,
+                "ancestor_folder_ids": parent_folder_id,
+                "content_types": SearchForContentContentTypes.NAME.value,
+                "type": "folder",
+                "fields": "id,name,type",
+            }
+        )
+
+    async def _representation_status(
+        self, representation_type: str, file_id: str
+    ) -> tuple[str, Optional[str], Optional[str]]:
+        """Return the status, info URL and content URL template of a representation."""
+        data = await self.get_json(
+            f"/2.0/files/{file_id}",
+            params={"fields": "name,representations"},
+            headers={"x-rep-hints": f"[{representation_type}]"},
+        )
+        entries = (data.get("representations") or {}).get("entries") or []
+        if not entries:
+            logger.error(
+                f"Representation of type {representation_type} is impossible for file {file_id}."
+            )
+            return _REPRESENTATION_IMPOSSIBLE, None, None
+
+        entry = entries[0]
+        status = (entry.get("status") or {}).get("state") or _REPRESENTATION_IMPOSSIBLE
+        info_url = (entry.get("info") or {}).get("url")
+        content_url = (entry.get("content") or {}).get("url_template")
+        return status, info_url, content_url
+
+    async def _download_representation(
+        self, url_template: Optional[str]
+    ) -> Dict[str, Any]:
+        if url_template is None:
+            return {"error": "No URL provided for representation download."}
+
+        response = await self.request("GET", url_template.replace("{+asset_path}", ""))
+        if response.is_error:
+            logger.error(
+                f"Representation download failed with {response.status_code}: {response.text}"
+            )
+            return {"error": response.reason_phrase}
+        return {"content": response.content.decode("utf-8")}
+
+    async def _process_representation(
+        self, representation_type: str, file_id: str, is_recursive: bool = False
+    ) -> Dict[str, Any]:
+        status, info_url, content_url = await self._representation_status(
+            representation_type, file_id
+        )
+
+        if status in ("none", "pending"):
+            if status == "none":
+                # Requesting the info URL starts the representation generation
+                if info_url is not None:
+                    await self.request("GET", info_url)
+            if not is_recursive:
+                await asyncio.sleep(REPRESENTATION_POLL_INTERVAL)
+                return await self._process_representation(
+                    representation_type, file_id, is_recursive=True
+                )
+            if status == "none":
+                return {
+                    "message": f"{representation_type} representation generation requested.",
+                    "status": status,
+                }
+            return {
+                "message": f"{representation_type} representation is still being generated. Please try again later.",
+                "status": status,
+            }
+
+        if status == "success":
+            return await self._download_representation(content_url)
+
+        if status == _REPRESENTATION_ERROR:
+            return {
+                "error": f"Error generating {representation_type} representation.",
+                "status": status,
+            }
+
+        if status == _REPRESENTATION_IMPOSSIBLE:
+            return {
+                "error": f"{representation_type} representation is impossible for this file.",
+                "status": status,
+            }
+
+        return {
+            "error": f"Unknown status for {representation_type} representation.",
+            "status": _REPRESENTATION_UNKNOWN,
+        }
+
+    async def file_text_extract(self, file_id: str) -> Dict[str, Any]:
+        """Async equivalent of box_ai_agents_toolkit.box_file_text_extract.
+
+        The markdown representation is preferred, the extracted text is the fallback.
+        """
+        try:
+            representation = await self._process_representation("markdown", file_id)
+            if representation.get("status") not in (
+                _REPRESENTATION_IMPOSSIBLE,
+                _REPRESENTATION_ERROR,
+                _REPRESENTATION_UNKNOWN,
+            ):
+                return representation
+
+            return await self._process_representation("extracted_text", file_id)
+        except BoxAPIError as e:
+            logger.error(e.message)
+            return {"error": f"Box API Error: {e.message}"}
@@ -0,0 +1,124 @@
+"""Streaming file downloads written to disk with a fixed-size buffer.
+
+The content is never held in memory as a whole: every chunk is hashed and
+written as it arrives, to a ``.part`` file next to the destination. The file
+only gets its final name once its SHA-1 matches the one Box reports for the
+downloaded version, so a truncated or corrupted download never replaces an
+existing file.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from typing import Any, BinaryIO, Dict, Optional
+
+from box_sdk_gen import BoxClient
+
+from tool_executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Bytes per chunk yielded by the Box SDK network client for binary responses
+SDK_CHUNK_SIZE = 1024
+
+# Fields of the file needed to name and verify a download
+DOWNLOAD_FIELDS = ["name", "size", "sha1", "file_version"]
+
+
+def resolve_save_path(save_path: Optional[str], file_name: str) -> str:
+    """Destination of a download, like box_ai_agents_toolkit.box_file_download.
+
+    A directory gets the Box file name appended, and no path means the
+    system temporary directory.
+    """
+    if not save_path:
+        return os.path.join(tempfile.gettempdir(), file_name)
+    if os.path.isdir(save_path):
+        return os.path.join(save_path, file_name)
+    return save_path
+
+
+class DownloadWriter:
+    """Writes a download to disk chunk by chunk, computing its SHA-1.
+
+    Used as a context manager, which opens the partial file and discards it
+    when the download fails. The async form opens and closes it on the tool
+    executor.
+
+    Args:
+        path: Final destination of the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.partial_path = f"{path}.part"
+        self.size = 0
+        self._sha1 = hashlib.sha1()
+        self._file: Optional[BinaryIO] = None
+
+    def __enter__(self) -> "DownloadWriter":
+        self._file = open(self.partial_path, "wb")
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is not None:
+            self.abort()
+        else:
+            self._file.close()
+
+    async def __aenter__(self) -> "DownloadWriter":
+        return await run_blocking(self.__enter__)
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        await run_blocking(self.__exit__, exc_type, exc, traceback)
+
+    def write(self, chunk: bytes) -> None:
+        self._sha1.update(chunk)
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def abort(self) -> None:
+        """Discard the partial file."""
+        self._file.close()
+        if os.path.exists(self.partial_path):
+            os.remove(self.partial_path)
+
+    def finish(self, expected_sha1: Optional[str]) -> Dict[str, Any]:
+        """Verify the download and move it to its destination.
+
+        Returns:
+            dict[str, Any]: The saved path, size and SHA-1 of the file, or an
+                error when the SHA-1 does not match the expected one.
+        """
+        self._file.close()
+        sha1 = self._sha1.hexdigest()
+        if expected_sha1 and sha1 != expected_sha1:
+            os.remove(self.partial_path)
+            logger.error(
+                f"SHA-1 mismatch downloading to {self.path}: {sha1} != {expected_sha1}"
+            )
+            return {"error": f"SHA-1 mismatch: expected {expected_sha1}, got {sha1}"}
+        os.replace(self.partial_path, self.path)
+        return {"path_saved": self.path, "size": self.size, "sha1": sha1}
+
+
+def download_file_to_path(
+    client: BoxClient, file_id: str, save_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """Stream a file to disk with the Box SDK, see BoxAsyncApi.download_file_to_path.
+
+    Raises:
+        BoxAPIError: If Box returns an unsuccessful status.
+    """
+    file = client.files.get_file_by_id(file_id, fields=DOWNLOAD_FIELDS)
+    version = file.file_version.id if file.file_version else None
+    stream = client.downloads.download_file(file_id, version=version)
+    if stream is None:
+        return {"error": "The file is not ready for download yet, try again later."}
+
+    with DownloadWriter(resolve_save_path(save_path, file.name)) as writer:
+        # Reading more than the SDK chunk size at once would copy its buffer repeatedly
+        while chunk := stream.read(SDK_CHUNK_SIZE):
+            writer.write(chunk)
+    return writer.finish(file.sha1)
@@ -0,0 +1,368 @@
+"""Paged folder listings resumable with an opaque continuation token.
+
+A listing call returns at most one page of items. Recursive listings walk
+the tree depth first (a folder is followed by its contents, then by its next
+sibling) and the token only records the path from the listed folder to the
+folder being read: for every level, its Box marker and the position in that
+page. Memory use therefore depends on the page size and the tree depth, never
+on the number of items in the folders.
+
+Recursive listings fetch ahead: as soon as a page arrives, its next page and
+the first pages of all its subfolders become known, and a bounded number of
+concurrent workers fetch the known pages nearest in listing order. Items are still emitted in
+depth first order, so the result does not depend on which request finishes
+first. Every fetch goes through the caller's Box client and thus its rate
+limiter.
+"""
+
+import asyncio
+import base64
+import binascii
+import heapq
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from box_sdk_gen import BoxAPIError, BoxClient
+
+logger = logging.getLogger(__name__)
+
+# Largest page the Box folder items endpoint returns
+MAX_PAGE_SIZE = 1000
+
+# Fetches one Box page of a folder: (folder_id, marker, limit) ->
+# {"entries": [item dicts], "next_marker": str | None}
+FolderPageFetcher = Callable[[str, Optional[str], int], Awaitable[Dict[str, Any]]]
+
+# (folder_id, marker) of a Box page
+PageKey = Tuple[str, Optional[str]]
+
+# Concurrent page fetches of one recursive listing, see configure_folder_traversal
+_traversal_workers = 8
+
+
+def configure_folder_traversal(workers: int) -> None:
+    """Set how many pages a recursive listing may fetch concurrently."""
+    global _traversal_workers
+    _traversal_workers = max(1, workers)
+
+
+@dataclass
+class _Frame:
+    """Position of the traversal in one folder of the current path."""
+
+    folder_id: str
+    marker: Optional[str] = None
+    index: int = 0
+    # Pages of the folder read by this call, not saved in the token
+    page: int = 0
+
+
+# Position of a page in the listing order: for every folder on its path, the
+# page number and entry index, then the page number in its folder. Tuples
+# compare in the order a depth first traversal reads the pages.
+PagePosition = Tuple[int, ...]
+
+
+def _page_position(frames: List[_Frame]) -> PagePosition:
+    """Position of the page the innermost frame is reading."""
+    position: List[int] = []
+    for frame in frames[:-1]:
+        # The parent frame index is already past the subfolder entry
+        position += [frame.page, frame.index - 1]
+    position.append(frames[-1].page)
+    return tuple(position)
+
+
+def _entries_before(position: PagePosition, count: int, other: PagePosition) -> int:
+    """Number of entries of a page read before another page."""
+    if other == position:
+        return 0
+    if other[: len(position)] == position:
+        # The other page is in the subfolder of one of the entries
+        return min(count, other[len(position)] + 1)
+    return count if position < other else 0
+
+
+class _PagePrefetcher:
+    """Fetches the pages a depth first traversal will read, ahead of it.
+
+    Every fetched page makes its next page and the first page of each of its
+    subfolders known. Known pages are fetched by up to ``workers`` concurrent
+    requests, nearest in listing order first, as long as the entries read
+    before them do not fill the page of the listing call and at most
+    ``max_ahead`` fetched pages wait to be read.
+
+    The traversal keeps ``frames`` and ``remaining`` up to date.
+    """
+
+    def __init__(
+        self,
+        fetch_page: FolderPageFetcher,
+        limit: int,
+        workers: int,
+        max_ahead: int,
+        max_depth: Optional[int],
+    ):
+        self._fetch_page = fetch_page
+        self._limit = limit
+        self._workers = workers
+        self._max_ahead = max_ahead
+        self._max_depth = max_depth
+        self._tasks: Dict[PageKey, asyncio.Task] = {}
+        self._known: List[Tuple[PagePosition, PageKey]] = []
+        self._fetched: Dict[PageKey, Tuple[PagePosition, int]] = {}
+        self._started: Set[PageKey] = set()
+        self._in_flight = 0
+        self._semaphore = asyncio.Semaphore(workers)
+        self.frames: List[_Frame] = []
+        self.remaining = 0
+
+    async def get(self, key: PageKey, position: PagePosition) -> Dict[str, Any]:
+        """Get a page, waiting for its fetch if it was already started."""
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._start(key, position)
+        return await task
+
+    def release(self, key: PageKey) -> None:
+        """Forget a page the traversal has read."""
+        self._tasks.pop(key, None)
+        self._fetched.pop(key, None)
+        self._pump()
+
+    def close(self) -> None:
+        """Cancel the fetches the traversal will not need."""
+        self._known.clear()
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    def _start(self, key: PageKey, position: PagePosition) -> asyncio.Task:
+        self._in_flight += 1
+        self._started.add(key)
+        task = asyncio.ensure_future(self._fetch(key, position))
+        # Failed fetches ahead of the traversal may never be awaited
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._tasks[key] = task
+        return task
+
+    async def _fetch(self, key: PageKey, position: PagePosition) -> Dict[str, Any]:
+        try:
+            async with self._semaphore:
+                page = await self._fetch_page(key[0], key[1], self._limit)
+        finally:
+            self._in_flight -= 1
+        self._fetched[key] = (position, len(page["entries"]))
+        if self._workers > 1:
+            if page.get("next_marker"):
+                next_position = position[:-1] + (position[-1] + 1,)
+                heapq.heappush(
+                    self._known, (next_position, (key[0], page["next_marker"]))
+                )
+            depth = len(position) // 2
+            if self._max_depth is None or depth < self._max_depth:
+                for index, entry in enumerate(page["entries"]):
+                    if entry.get("type") == "folder":
+                        heapq.heappush(
+                            self._known, (position + (index, 0), (entry["id"], None))
+                        )
+            self._pump()
+        return page
+
+    def _unread_before(self, position: PagePosition) -> int:
+        """Entries the traversal has still to read before a page."""
+        unread = sum(
+            _entries_before(fetched, count, position)
+            for fetched, count in self._fetched.values()
+        )
+        for frame in self.frames:
+            if (frame.folder_id, frame.marker) in self._fetched:
+                unread -= frame.index
+        return unread
+
+    def _pump(self) -> None:
+        if not self.frames:
+            return
+        # Subfolders before the position of a resumed traversal were listed already
+        current = _page_position(self.frames)
+        while (
+            self._known
+            and self._in_flight < self._workers
+            and len(self._tasks) < self._max_ahead
+        ):
+            position, key = self._known[0]
+            if key in self._started or position < current:
+                heapq.heappop(self._known)
+                continue
+            if self._unread_before(position) >= self.remaining:
+                # Known pages are sorted, none of them fits in this call
+                return
+            heapq.heappop(self._known)
+            self._start(key, position)
+
+
+def encode_page_token(
+    folder_id: str,
+    is_recursive: bool,
+    limit: int,
+    frames: List[_Frame],
+    emitted: int = 0,
+) -> str:
+    """Serialize the traversal state into an opaque continuation token."""
+    state = {
+        "f": folder_id,
+        "r": is_recursive,
+        "l": limit,
+        "n": emitted,
+        "p": [[frame.folder_id, frame.marker, frame.index] for frame in frames],
+    }
+    raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_page_token(
+    page_token: str, folder_id: str, is_recursive: bool
+) -> tuple[int, List[_Frame], int]:
+    """Restore the page size, traversal path and emitted item count of a token.
+
+    Raises:
+        ValueError: If the token is malformed or belongs to another listing.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(page_token + "=" * (-len(page_token) % 4))
+        state = json.loads(raw)
+        frames = [_Frame(str(f), m, int(i)) for f, m, i in state["p"]]
+        limit = int(state["l"])
+        emitted = int(state.get("n", 0))
+        token_folder, token_recursive = state["f"], state["r"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid page token") from e
+    if token_folder != folder_id or token_recursive != is_recursive or not frames:
+        raise ValueError("The page token was issued for a different folder listing")
+    return limit, frames, emitted
+
+
+def fetch_folder_items_page(
+    client: BoxClient, folder_id: str, marker: Optional[str], limit: int
+) -> Dict[str, Any]:
+    """Fetch one page of folder items with the Box SDK."""
+    page = client.folders.get_folder_items(
+        folder_id=folder_id, usemarker=True, marker=marker, limit=limit
+    )
+    return {
+        "entries": [item.to_dict() for item in page.entries or []],
+        "next_marker": page.next_marker,
+    }
+
+
+async def list_folder_page(
+    fetch_page: FolderPageFetcher,
+    folder_id: str,
+    is_recursive: bool = False,
+    limit: Optional[int] = MAX_PAGE_SIZE,
+    page_token: Optional[str] = None,
+    max_depth: Optional[int] = None,
+    max_items: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """List one page of a folder, or of a folder tree when recursive.
+
+    Args:
+        fetch_page: Fetches one Box page of a folder.
+        folder_id: ID of the listed folder.
+        is_recursive: Whether to include the contents of the subfolders.
+        limit: Maximum items per page, at most 1000. A continuation token
+            keeps the page size of the listing that issued it.
+        page_token: Continuation token returned by the previous page.
+        max_depth: Deepest level listed in recursive listings, 0 being the
+            folder's own items. Unlimited by default.
+        max_items: Maximum items over all the pages of the listing.
+        workers: Concurrent page fetches in recursive listings, defaults to
+            the configured traversal workers. 1 lists serially.
+
+    Returns:
+        dict[str, Any]: The page under "folder_items" and, when more items
+            remain, a "next_page_token". In recursive listings every item has
+            its "depth" below the listed folder and its "parent_folder_id".
+            "truncated" is set when max_items stopped the listing.
+    """
+    try:
+        if page_token:
+            limit, frames, emitted = decode_page_token(
+                page_token, folder_id, is_recursive
+            )
+        else:
+            limit = min(max(1, limit or MAX_PAGE_SIZE), MAX_PAGE_SIZE)
+            frames = [_Frame(folder_id)]
+            emitted = 0
+    except ValueError as e:
+        return {"error": str(e)}
+
+    page_size = limit
+    if max_items is not None:
+        page_size = max(0, min(limit, max_items - emitted))
+    if not is_recursive:
+        workers = 1
+    workers = workers or _traversal_workers
+    prefetcher = _PagePrefetcher(
+        fetch_page, limit, workers, max_ahead=4 * workers, max_depth=max_depth
+    )
+    prefetcher.frames = frames
+    prefetcher.remaining = page_size
+
+    items: List[dict] = []
+    try:
+        while frames and len(items) < page_size:
+            frame = frames[-1]
+            depth = len(frames) - 1
+            key = (frame.folder_id, frame.marker)
+            page = await prefetcher.get(key, _page_position(frames))
+            entries = page["entries"]
+
+            descended = False
+            while frame.index < len(entries) and len(items) < page_size:
+                entry = entries[frame.index]
+                frame.index += 1
+                if not is_recursive:
+                    items.append(entry)
+                    continue
+                items.append(
+                    {**entry, "depth": depth, "parent_folder_id": frame.folder_id}
+                )
+                if entry.get("type") == "folder" and (
+                    max_depth is None or depth < max_depth
+                ):
+                    frames.append(_Frame(entry["id"]))
+                    descended = True
+                    break
+            prefetcher.remaining = page_size - len(items)
+            if descended or frame.index < len(entries):
+                continue
+
+            # This page is done, move to the next page of the folder or back up
+            prefetcher.release(key)
+            if page.get("next_marker"):
+                frame.marker = page["next_marker"]
+                frame.index = 0
+                frame.page += 1
+            else:
+                frames.pop()
+    except BoxAPIError as e:
+        logger.error(e.message)
+        return {"error": e.message}
+    finally:
+        prefetcher.close()
+
+    if not items and not frames and not page_token:
+        return {"message": "No items found in folder."}
+    result: Dict[str, Any] = {"folder_items": items}
+    emitted += len(items)
+    if frames and max_items is not None and emitted >= max_items:
+        result["truncated"] = True
+    elif frames:
+        result["next_page_token"] = encode_page_token(
+            folder_id, is_recursive, limit, frames, emitted
+        )
+    return result
@@ -0,0 +1,98 @@
+"""Metrics and trace spans of the requests sent to the Box API."""
+
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from urllib.parse import urlsplit
+
+from box_sdk_gen import BoxClient, BoxNetworkClient
+
+from metrics import box_api_endpoint, get_metrics
+from tracing import SPAN_KIND_CLIENT, get_tracer
+
+
+class BoxRequestObservation:
+    """Outcome of an observed request, filled in by the sender."""
+
+    __slots__ = ("status",)
+
+    def __init__(self):
+        self.status: Optional[int] = None
+
+
+@contextmanager
+def observe_box_request(method: str, url: str) -> Iterator[BoxRequestObservation]:
+    """
+    Record a Box API request in the metrics and as a client span of the current trace.
+
+    The sender sets the response status on the yielded observation, a request
+    without one is recorded as failed.
+
+    Args:
+        method: HTTP method
+        url: Full request URL
+    """
+    observation = BoxRequestObservation()
+    metrics = get_metrics()
+    tracer = get_tracer()
+    if metrics is None and tracer is None:
+        yield observation
+        return
+
+    parts = urlsplit(url)
+    started = metrics.box_api_request_started() if metrics is not None else 0.0
+    try:
+        if tracer is None:
+            yield observation
+            return
+
+        attributes = {
+            "http.request.method": method,
+            "server.address": parts.hostname or "",
+            "url.path": parts.path,
+        }
+        name = f"{method} {box_api_endpoint(parts.path)}"
+        with tracer.start_span(name, SPAN_KIND_CLIENT, attributes) as span:
+            try:
+                yield observation
+            finally:
+                if observation.status is not None:
+                    span.set_attribute("http.response.status_code", observation.status)
+                    if observation.status >= 400:
+                        span.set_error(str(observation.status))
+                else:
+                    span.set_error("No response")
+    finally:
+        if metrics is not None:
+            metrics.box_api_request_finished(
+                started, method, parts.path, observation.status
+            )
+
+
+class ObservedNetworkClient(BoxNetworkClient):
+    """Box SDK network client that records every attempt in the metrics and traces.
+
+    The SDK runs on the tool executor threads, which carry the context of the
+    tool call, so these requests are children of the tool's span.
+    """
+
+    def _make_request(self, request):
+        with observe_box_request(request.method, request.url) as observation:
+            response = super()._make_request(request)
+            if response.network_response is not None:
+                observation.status = response.network_response.status_code
+            return response
+
+
+def observe_client(client: BoxClient) -> BoxClient:
+    """Return a copy of a Box client whose requests are observed.
+
+    The client's HTTP session is kept, so its connection pool is reused.
+    """
+    network_session = client.network_session
+    if isinstance(network_session.network_client, ObservedNetworkClient):
+        return client
+    session = getattr(network_session.network_client, "requests_session", None)
+    network_session = network_session.with_network_client(
+        ObservedNetworkClient(requests_session=session)
+    )
+    return BoxClient(auth=client.auth, network_session=network_session)
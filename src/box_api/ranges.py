@@ -0,0 +1,221 @@
+"""Partial file reads with HTTP Range requests.
+
+A read returns one slice of a file. Ranges are fetched from Box in whole
+blocks of the range cache, and consecutive missing blocks in one request, so
+paging through a file downloads every block once as long as it stays cached.
+"""
+
+import base64
+import logging
+import mimetypes
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from box_sdk_gen import BoxAPIError, BoxClient
+from box_sdk_gen.networking.fetch_options import FetchOptions, ResponseFormat
+
+from cache import RANGE_BLOCK_SIZE, RangeCache
+
+logger = logging.getLogger(__name__)
+
+# Largest slice returned by one read
+MAX_RANGE_LENGTH = 1024 * 1024
+
+# Fields of the file needed to read a range of its current version
+RANGE_FIELDS = ["name", "size", "sha1", "file_version"]
+
+# Bytes per chunk yielded by the Box SDK network client for binary responses
+SDK_CHUNK_SIZE = 1024
+
+# Fetches the file info: file_id -> file dict with at least RANGE_FIELDS
+FileInfoFetcher = Callable[[str], Awaitable[Dict[str, Any]]]
+
+# Fetches bytes of a file version: (file_id, version_id, start, end) -> bytes,
+# both ends included like in the Range header
+RangeFetcher = Callable[[str, Optional[str], int, int], Awaitable[bytes]]
+
+
+def complete_utf8_length(data: bytes) -> int:
+    """Length of the prefix of data that does not end in a truncated UTF-8 character."""
+    for back in range(1, min(4, len(data)) + 1):
+        byte = data[-back]
+        if byte & 0xC0 == 0x80:
+            # Continuation byte, keep looking for the first byte of the character
+            continue
+        if byte >= 0xF0:
+            needed = 4
+        elif byte >= 0xE0:
+            needed = 3
+        elif byte >= 0xC0:
+            needed = 2
+        else:
+            needed = 1
+        return len(data) - back if needed > back else len(data)
+    return len(data)
+
+
+def content_version(file: Dict[str, Any]) -> Optional[str]:
+    """Identify the content of a file, its SHA-1 or else its version."""
+    return file.get("sha1") or (file.get("file_version") or {}).get("id")
+
+
+def fetch_file_range_info(client: BoxClient, file_id: str) -> Dict[str, Any]:
+    """Fetch the fields needed to read a range with the Box SDK."""
+    return client.files.get_file_by_id(file_id, fields=RANGE_FIELDS).to_dict()
+
+
+def fetch_file_range_bytes(
+    client: BoxClient, file_id: str, version: Optional[str], start: int, end: int
+) -> bytes:
+    """Fetch bytes start..end (included) of a file version with the Box SDK.
+
+    When the Range header is ignored and Box answers with the whole file, only
+    the file up to the end of the range is read.
+
+    Raises:
+        BoxAPIError: If Box returns an unsuccessful status.
+    """
+    response = client.make_request(
+        FetchOptions(
+            url=f"{client.network_session.base_urls.base_url}/2.0/files/{file_id}/content",
+            method="GET",
+            params={"version": version} if version else None,
+            headers={"range": f"bytes={start}-{end}"},
+            response_format=ResponseFormat.BINARY,
+        )
+    )
+    stream = response.content
+    if response.status == 202 or stream is None:
+        # The file is not ready for download yet
+        return b""
+    if response.status == 206:
+        return stream.read()
+
+    data = bytearray()
+    position = 0
+    # Reading more than the SDK chunk size at once would copy its buffer repeatedly
+    while position <= end and (chunk := stream.read(SDK_CHUNK_SIZE)):
+        if position + len(chunk) > start:
+            data += chunk[max(0, start - position) : end + 1 - position]
+        position += len(chunk)
+    return bytes(data)
+
+
+async def _read_blocks(
+    fetch_range: RangeFetcher,
+    cache: RangeCache,
+    file_id: str,
+    version: str,
+    size: int,
+    start: int,
+    end: int,
+) -> bytes:
+    """Read bytes start..end (included) through the cache of whole blocks."""
+    block_size = cache.block_size
+    first, last = start // block_size, end // block_size
+    blocks: List[Optional[bytes]] = [
+        cache.get(file_id, version, index) for index in range(first, last + 1)
+    ]
+
+    index = first
+    while index <= last:
+        if blocks[index - first] is not None:
+            index += 1
+            continue
+        # Fetch the run of consecutive missing blocks in one request
+        run_end = index
+        while run_end + 1 <= last and blocks[run_end + 1 - first] is None:
+            run_end += 1
+        data = await fetch_range(
+            file_id,
+            version,
+            index * block_size,
+            min(size, (run_end + 1) * block_size) - 1,
+        )
+        for block_index in range(index, run_end + 1):
+            offset = (block_index - index) * block_size
+            block = data[offset : offset + block_size]
+            blocks[block_index - first] = block
+            cache.put(file_id, version, block_index, block)
+        index = run_end + 1
+
+    data = b"".join(blocks)  # type: ignore[arg-type]
+    return data[start - first * block_size : end - first * block_size + 1]
+
+
+async def read_file_range(
+    fetch_info: FileInfoFetcher,
+    fetch_range: RangeFetcher,
+    file_id: str,
+    offset: int = 0,
+    length: int = RANGE_BLOCK_SIZE,
+    cache: Optional[RangeCache] = None,
+) -> Dict[str, Any]:
+    """Read a slice of a file.
+
+    Text is returned as UTF-8 when the slice decodes as such and has no NUL
+    byte. A character cut by the end of the slice is left for the next read,
+    so "next_offset" always starts on a character boundary. Anything else is
+    returned base64 encoded.
+
+    Args:
+        fetch_info: Fetches the file info.
+        fetch_range: Fetches bytes of a file version.
+        file_id: ID of the file to read.
+        offset: First byte to read.
+        length: Bytes to read, at most 1 MiB.
+        cache: Optional cache of the blocks read.
+
+    Returns:
+        dict[str, Any]: The slice under "content" with its "encoding",
+            "offset", "length", "next_offset", the file "size", "mime_type"
+            and "eof", or an error message.
+    """
+    if offset < 0 or length <= 0:
+        return {"error": "offset must be positive and length greater than 0"}
+    length = min(length, MAX_RANGE_LENGTH)
+
+    try:
+        file = await fetch_info(file_id)
+        size = file.get("size") or 0
+        version = (file.get("file_version") or {}).get("id")
+        mime_type, _ = mimetypes.guess_type(file.get("name") or "")
+
+        end = min(offset + length, size) - 1
+        if offset >= size:
+            data = b""
+        elif cache is not None and version is not None:
+            data = await _read_blocks(
+                fetch_range, cache, file_id, version, size, offset, end
+            )
+        else:
+            data = await fetch_range(file_id, version, offset, end)
+    except BoxAPIError as e:
+        logger.error(e.message)
+        return {"error": e.message}
+
+    eof = offset + len(data) >= size
+    content: Optional[str] = None
+    encoding = "base64"
+    # NUL bytes do not occur in text, but binary slices may well decode as UTF-8
+    if not (mime_type and mime_type.startswith("image/")) and b"\x00" not in data:
+        text = data if eof else data[: complete_utf8_length(data)] or data
+        try:
+            content = text.decode("utf-8")
+            encoding = "utf-8"
+            data = text
+            eof = offset + len(data) >= size
+        except UnicodeDecodeError:
+            pass
+    if content is None:
+        content = base64.b64encode(data).decode()
+
+    return {
+        "content": content,
+        "encoding": encoding,
+        "offset": offset,
+        "length": len(data),
+        "next_offset": offset + len(data),
+        "size": size,
+        "mime_type": mime_type,
+        "eof": eof,
+    }
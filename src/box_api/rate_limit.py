@@ -0,0 +1,305 @@
+"""Adaptive rate limiting of the requests sent to the Box API.
+
+Every Box identity (a CCG/JWT subject, the OAuth app user, or a bearer token
+in mcp_client mode) gets one token bucket shared by the Box SDK, running on
+the tool executor threads, and by the async transport. A 429 response halves
+the rate and blocks the bucket for the Retry-After delay, or for a jittered
+exponential backoff when Box does not send one. Successful responses slowly
+restore the configured rate.
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from box_sdk_gen import (
+    BoxCCGAuth,
+    BoxClient,
+    BoxDeveloperTokenAuth,
+    BoxJWTAuth,
+    BoxOAuth,
+    BoxRetryStrategy,
+)
+from box_sdk_gen.networking.auth import Authentication
+from box_sdk_gen.networking.fetch_options import FetchOptions
+from box_sdk_gen.networking.fetch_response import FetchResponse
+
+from box_api.observability import ObservedNetworkClient
+from cache import LRUCache
+from config import HttpConfig
+
+logger = logging.getLogger(__name__)
+
+# Longest backoff when Box does not send a Retry-After header
+MAX_BACKOFF = 60.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header in seconds, ignoring HTTP dates."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class AdaptiveRateLimiter:
+    """Thread-safe token bucket whose rate adapts to Box 429 responses.
+
+    Args:
+        rate: Requests per second allowed when Box is not throttling.
+        burst: Requests allowed back to back before the rate applies.
+        min_rate: Lowest rate the limiter backs off to.
+        jitter: Relative random spread added to throttle delays so that
+            blocked callers do not all retry at the same instant.
+        clock: Monotonic clock, replaceable in tests.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        min_rate: float = 1.0,
+        jitter: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_rate = rate
+        self.burst = burst
+        self.min_rate = min(min_rate, rate)
+        self.jitter = jitter
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._rate = rate
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._consecutive_throttles = 0
+
+        self._requests = 0
+        self._throttled = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._max_wait = 0.0
+
+    def _refill(self, now: float) -> None:
+        # While blocked by a 429, _updated is in the future and nothing refills
+        if now > self._updated:
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self._rate
+            )
+            self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return the seconds to wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            self._requests += 1
+            wait = max(0.0, self._updated - now)
+            if self._tokens < 0:
+                wait += -self._tokens / self._rate
+            if wait > 0:
+                self._waits += 1
+                self._wait_seconds += wait
+                self._max_wait = max(self._max_wait, wait)
+            return wait
+
+    def acquire(self) -> float:
+        """Block the calling thread until a request may be sent.
+
+        Returns:
+            float: The seconds spent waiting.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Wait on the event loop until a request may be sent.
+
+        Returns:
+            float: The seconds spent waiting.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> float:
+        """Record a 429 response and back off.
+
+        Args:
+            retry_after: The Retry-After delay sent by Box, if any.
+
+        Returns:
+            float: The seconds the limiter is blocked for.
+        """
+        with self._lock:
+            self._throttled += 1
+            self._consecutive_throttles += 1
+            self._rate = max(self.min_rate, self._rate / 2)
+            if retry_after is None:
+                retry_after = min(MAX_BACKOFF, 2 ** (self._consecutive_throttles - 1))
+            delay = retry_after * (1 + random.uniform(0, self.jitter))
+
+            now = self._clock()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, now + delay)
+        logger.warning(
+            f"Box API rate limit hit, backing off {delay:.1f}s at {self._rate:.1f} requests/s"
+        )
+        return delay
+
+    def on_success(self) -> None:
+        """Record a response that was not throttled, restoring the rate gradually."""
+        with self._lock:
+            self._consecutive_throttles = 0
+            if self._rate < self.max_rate:
+                self._rate = min(self.max_rate, self._rate + self.max_rate / 20)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate": round(self._rate, 2),
+                "max_rate": self.max_rate,
+                "requests": self._requests,
+                "throttled": self._throttled,
+                "waits": self._waits,
+                "wait_seconds": round(self._wait_seconds, 3),
+                "max_wait_seconds": round(self._max_wait, 3),
+            }
+
+
+def box_identity(auth: Authentication) -> str:
+    """Identify the Box user or service account behind an authentication.
+
+    Bearer tokens are only kept as SHA-256 digests.
+    """
+    if isinstance(auth, (BoxCCGAuth, BoxJWTAuth)):
+        return f"{type(auth).__name__}:{auth.subject_type}:{auth.subject_id}"
+    if isinstance(auth, BoxOAuth):
+        return f"BoxOAuth:{auth.config.client_id}"
+    if isinstance(auth, BoxDeveloperTokenAuth):
+        return "token:" + hashlib.sha256(auth.token.encode("utf-8")).hexdigest()
+    return f"{type(auth).__name__}:{id(auth)}"
+
+
+class RateLimiterRegistry:
+    """One AdaptiveRateLimiter per Box identity.
+
+    Limiters outlive the Box clients that use them, so a client recreated for
+    the same identity keeps backing off. Identities unused for longer than
+    the idle TTL are forgotten.
+    """
+
+    def __init__(
+        self, config: HttpConfig, max_identities: int = 1024, ttl: float = 3600.0
+    ):
+        self.config = config
+        self._limiters: LRUCache[AdaptiveRateLimiter] = LRUCache(
+            max_entries=max_identities, ttl=ttl
+        )
+        self._lock = threading.Lock()
+
+    def get(self, identity: str) -> AdaptiveRateLimiter:
+        """Get the limiter of an identity, creating it on first use."""
+        with self._lock:
+            limiter = self._limiters.get(identity)
+            if limiter is None:
+                limiter = AdaptiveRateLimiter(
+                    rate=self.config.rate_limit_rps,
+                    burst=self.config.rate_limit_burst,
+                    min_rate=self.config.rate_limit_min_rps,
+                )
+                self._limiters.put(identity, limiter)
+            return limiter
+
+    def wrap_client(self, client: BoxClient) -> BoxClient:
+        """Route every SDK request of a client through its identity's limiter."""
+        return with_rate_limiter(client, self.get(box_identity(client.auth)))
+
+    def stats(self) -> Dict[str, Any]:
+        """Aggregate throttling counters over every identity."""
+        limiters = self._limiters.values()
+        totals: Dict[str, Any] = {
+            "identities": len(limiters),
+            "requests": 0,
+            "throttled": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+        for limiter in limiters:
+            stats = limiter.stats()
+            for key in ("requests", "throttled", "waits", "wait_seconds"):
+                totals[key] += stats[key]
+            totals["max_wait_seconds"] = max(
+                totals["max_wait_seconds"], stats["max_wait_seconds"]
+            )
+        totals["wait_seconds"] = round(totals["wait_seconds"], 3)
+        return totals
+
+
+class RateLimitedNetworkClient(ObservedNetworkClient):
+    """Box SDK network client that sends every attempt through a rate limiter."""
+
+    def __init__(self, rate_limiter: AdaptiveRateLimiter, requests_session=None):
+        super().__init__(requests_session=requests_session)
+        self.rate_limiter = rate_limiter
+
+    def _make_request(self, request):
+        self.rate_limiter.acquire()
+        response = super()._make_request(request)
+        network_response = response.network_response
+        if network_response is not None and network_response.status_code == 429:
+            self.rate_limiter.on_throttled(
+                parse_retry_after(network_response.headers.get("Retry-After"))
+            )
+        elif network_response is not None:
+            self.rate_limiter.on_success()
+        return response
+
+
+class RateLimitedRetryStrategy(BoxRetryStrategy):
+    """Retry strategy that leaves the 429 backoff to the rate limiter.
+
+    The SDK would otherwise sleep for Retry-After on its own, on top of the
+    limiter's wait before the next attempt.
+    """
+
+    def retry_after(
+        self,
+        fetch_options: FetchOptions,
+        fetch_response: FetchResponse,
+        attempt_number: int,
+    ) -> float:
+        if fetch_response.status == 429:
+            return 0.0
+        return super().retry_after(fetch_options, fetch_response, attempt_number)
+
+
+def with_rate_limiter(
+    client: BoxClient, rate_limiter: AdaptiveRateLimiter
+) -> BoxClient:
+    """Return a copy of a Box client whose requests go through a rate limiter.
+
+    The client's HTTP session is kept, so its connection pool is reused.
+    """
+    network_session = client.network_session
+    session = getattr(network_session.network_client, "requests_session", None)
+    network_session = network_session.with_network_client(
+        RateLimitedNetworkClient(rate_limiter, requests_session=session)
+    ).with_retry_strategy(RateLimitedRetryStrategy())
+    return BoxClient(auth=client.auth, network_session=network_session)
+
+
+def rate_limiter_for(client: BoxClient) -> Optional[AdaptiveRateLimiter]:
+    """Get the rate limiter a Box client was wrapped with, if any."""
+    return getattr(client.network_session.network_client, "rate_limiter", None)
@@ -0,0 +1,219 @@
+"""Extracted text served in stable chunks with continuation cursors.
+
+The text of a file representation is split into chunks of at most a given
+number of characters. Texts with page breaks (form feeds, as in the text
+extracted from PDFs) are split between pages, with as many whole pages per
+chunk as fit. Anything else, including a page too long for one chunk, is
+split by character window, at a paragraph, line or word boundary when the
+window has one.
+
+The boundaries only depend on the text and the chunk size, so a cursor
+stays valid for as long as the file content does not change. The whole text
+is kept in the text cache, and later chunks are served from it. With a disk
+text cache, texts also survive restarts and are shared by the server
+processes: a file whose content did not change is never extracted again.
+"""
+
+import base64
+import binascii
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from box_sdk_gen import BoxAPIError
+
+from box_api.ranges import FileInfoFetcher, content_version
+from cache import DiskTextCache, ExtractedText, TextCache
+from tool_executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Default and largest chunk sizes, in characters
+TEXT_CHUNK_SIZE = 50_000
+MAX_TEXT_CHUNK_SIZE = 1_000_000
+
+# Page separator of extracted texts
+PAGE_BREAK = "\f"
+
+# Boundaries a window is preferably cut at, from best to worst
+_WINDOW_BREAKS = ("\n\n", "\n", " ")
+
+# Extracts the text of a file: file_id -> {"content": text} or a status or
+# error dict, like box_ai_agents_toolkit.box_file_text_extract
+TextExtractor = Callable[[str], Awaitable[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    """Bounds of a chunk in the text, and the pages it covers when the text has pages."""
+
+    start: int
+    end: int
+    first_page: Optional[int] = None
+    last_page: Optional[int] = None
+
+
+def _windows(text: str, start: int, end: int, max_chars: int) -> List[Tuple[int, int]]:
+    """Split text[start:end] into windows of at most max_chars."""
+    windows = []
+    while end - start > max_chars:
+        cut = start + max_chars
+        # Only cut at a boundary in the second half of the window
+        for separator in _WINDOW_BREAKS:
+            position = text.rfind(separator, start + max_chars // 2, cut)
+            if position != -1:
+                cut = position + len(separator)
+                break
+        windows.append((start, cut))
+        start = cut
+    windows.append((start, end))
+    return windows
+
+
+def split_text(text: str, max_chars: int) -> List[TextChunk]:
+    """Split a text into chunks of at most max_chars characters."""
+    if PAGE_BREAK not in text:
+        return [
+            TextChunk(start, end)
+            for start, end in _windows(text, 0, len(text), max_chars)
+        ]
+
+    chunks: List[TextChunk] = []
+    # Pages not yet in a chunk, from page number first at offset start
+    start, first = 0, 1
+    page, page_start = 1, 0
+    while page_start <= len(text):
+        page_end = text.find(PAGE_BREAK, page_start)
+        page_end = len(text) if page_end == -1 else page_end + len(PAGE_BREAK)
+        if page_end - start > max_chars and page_start > start:
+            # The page does not fit with the previous ones
+            chunks.append(TextChunk(start, page_start, first, page - 1))
+            start, first = page_start, page
+        if page_end - start > max_chars:
+            # The page alone does not fit in a chunk
+            for window_start, window_end in _windows(text, start, page_end, max_chars):
+                chunks.append(TextChunk(window_start, window_end, page, page))
+            start, first = page_end, page + 1
+        if page_end == len(text):
+            break
+        page, page_start = page + 1, page_end
+    if start < len(text) or not chunks:
+        chunks.append(TextChunk(start, len(text), first, page))
+    return chunks
+
+
+def encode_text_cursor(file_id: str, version: str, index: int, max_chars: int) -> str:
+    """Serialize the position of a chunk into an opaque cursor."""
+    state = {"f": file_id, "v": version, "c": index, "n": max_chars}
+    raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_text_cursor(cursor: str, file_id: str) -> Tuple[str, int, int]:
+    """Restore the file version, chunk index and chunk size of a cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another file.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        state = json.loads(raw)
+        cursor_file, version = state["f"], str(state["v"])
+        index, max_chars = int(state["c"]), int(state["n"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if cursor_file != file_id or index < 0 or max_chars <= 0:
+        raise ValueError("The cursor was issued for a different file")
+    return version, index, max_chars
+
+
+async def extract_text_chunk(
+    fetch_info: FileInfoFetcher,
+    extract: TextExtractor,
+    file_id: str,
+    cursor: Optional[str] = None,
+    max_chars: int = TEXT_CHUNK_SIZE,
+    cache: Optional[TextCache] = None,
+    disk_cache: Optional[DiskTextCache] = None,
+) -> Dict[str, Any]:
+    """Extract one chunk of the text of a file.
+
+    Args:
+        fetch_info: Fetches the file info, with its SHA-1 and version.
+        extract: Extracts the whole text of the file.
+        file_id: ID of the file.
+        cursor: The "next_cursor" of the previous chunk, to get the next one.
+        max_chars: Characters per chunk, ignored with a cursor.
+        cache: Optional cache of the extracted texts.
+        disk_cache: Optional persistent cache of the extracted texts, behind the cache.
+
+    Returns:
+        dict[str, Any]: The chunk under "content" with its "chunk" index,
+            "total_chunks", the "pages" it covers when the text has page
+            breaks and, unless it is the last chunk, a "next_cursor". The
+            status or error of the extraction is returned as is.
+    """
+    index = 0
+    version: Optional[str] = None
+    cursor_version: Optional[str] = None
+    if cursor:
+        try:
+            cursor_version, index, max_chars = decode_text_cursor(cursor, file_id)
+        except ValueError as e:
+            return {"error": str(e)}
+    max_chars = min(max(1, max_chars), MAX_TEXT_CHUNK_SIZE)
+
+    try:
+        entry = None
+        if cursor or cache is not None or disk_cache is not None:
+            version = content_version(await fetch_info(file_id))
+            if cursor and version != cursor_version:
+                return {
+                    "error": "The file changed since the cursor was issued, "
+                    "extract it again without a cursor"
+                }
+            if cache is not None and version is not None:
+                entry = cache.get(file_id, version)
+
+        if entry is None:
+            text = None
+            if disk_cache is not None and version is not None:
+                text = await run_blocking(disk_cache.get, file_id, version)
+            if text is None:
+                result = await extract(file_id)
+                if "content" not in result:
+                    return result
+                text = result["content"]
+                if disk_cache is not None and version is not None:
+                    await run_blocking(disk_cache.put, file_id, version, text)
+            if cache is not None and version is not None:
+                entry = cache.put(file_id, version, text)
+            else:
+                entry = ExtractedText(text)
+
+        chunks = entry.chunks.get(max_chars)
+        if chunks is None:
+            chunks = entry.chunks[max_chars] = split_text(entry.text, max_chars)
+        if index >= len(chunks):
+            return {"error": "The cursor is past the end of the text"}
+
+        chunk = chunks[index]
+        result = {
+            "content": entry.text[chunk.start : chunk.end],
+            "chunk": index,
+            "total_chunks": len(chunks),
+        }
+        if chunk.first_page is not None:
+            result["pages"] = [chunk.first_page, chunk.last_page]
+        if index + 1 < len(chunks):
+            if version is None:
+                version = content_version(await fetch_info(file_id))
+            if version is not None:
+                result["next_cursor"] = encode_text_cursor(
+                    file_id, version, index + 1, max_chars
+                )
+        return result
+    except BoxAPIError as e:
+        logger.error(e.message)
+        return {"error": f"Box API Error: {e.message}"}
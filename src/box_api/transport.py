@@ -0,0 +1,274 @@
+"""Shared async HTTP transport to the Box API."""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+from box_sdk_gen import BoxAPIError
+from box_sdk_gen.box.errors import RequestInfo, ResponseInfo
+from box_sdk_gen.internal.logging import DataSanitizer
+from box_sdk_gen.networking.auth import Authentication
+from box_sdk_gen.networking.network import NetworkSession
+
+from box_api.observability import observe_box_request
+from box_api.rate_limit import AdaptiveRateLimiter, parse_retry_after
+from config import HttpConfig
+from tool_executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def raise_for_box_status(response: httpx.Response) -> None:
+    """Raise a BoxAPIError for unsuccessful responses, like the Box SDK does.
+
+    The error message has the same format as the SDK's, so tools report
+    errors identically whichever network layer served them.
+    """
+    if response.is_success or response.status_code == 304:
+        return
+
+    try:
+        body = response.json()
+    except ValueError:
+        body = {}
+    if not isinstance(body, dict):
+        body = {}
+
+    request = response.request
+    headers = {k: v for k, v in request.headers.items() if k.lower() != "authorization"}
+    raise BoxAPIError(
+        message=f"{response.status_code} {body.get('message', '')}; Request ID: {body.get('request_id', '')}",
+        request_info=RequestInfo(
+            method=request.method,
+            url=str(request.url.copy_with(query=None)),
+            query_params=dict(request.url.params),
+            headers=headers,
+        ),
+        response_info=ResponseInfo(
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            body=body,
+            raw_body=response.text,
+            code=body.get("code"),
+            context_info=body.get("context_info", {}),
+            request_id=body.get("request_id"),
+            help_url=body.get("help_url"),
+        ),
+        data_sanitizer=DataSanitizer(),
+    )
+
+
+class BoxAsyncTransport:
+    """An httpx.AsyncClient shared by every request to the Box API.
+
+    It is created once per server lifespan so that connections (HTTP/2 when
+    available) are kept alive and reused across tool calls and users. The
+    per-request Box authentication is passed to every call.
+
+    Args:
+        config: HttpConfig with the pool limits and timeouts.
+        transport: Optional httpx transport, used to target a fake Box API in tests.
+    """
+
+    def __init__(
+        self,
+        config: Optional[HttpConfig] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        config = config or HttpConfig()
+        http2 = config.http2 and _h2_available()
+        if config.http2 and not http2:
+            logger.warning(
+                "The h2 package is not installed, using HTTP/1.1 for Box API calls"
+            )
+
+        self.http2 = http2
+        self.max_connections_per_host = config.max_connections_per_host
+        self.max_attempts = max(1, config.rate_limit_max_attempts)
+        self.download_chunk_size = config.download_chunk_size
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(config.read_timeout, connect=config.connect_timeout),
+            follow_redirects=True,
+            transport=transport,
+        )
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _host_limit(self, host: str) -> asyncio.Semaphore:
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = asyncio.Semaphore(self.max_connections_per_host)
+            self._host_limits[host] = limit
+        return limit
+
+    @staticmethod
+    async def _authorization(
+        auth: Authentication, network_session: NetworkSession
+    ) -> str:
+        """Build the Authorization header value.
+
+        The cached token is used directly. Only a missing token goes through
+        the SDK, whose token retrieval is blocking, on the tool executor.
+        """
+        token_storage = getattr(auth, "token_storage", None)
+        token = token_storage.get() if token_storage is not None else None
+        if token is None:
+            token = await run_blocking(
+                auth.retrieve_token, network_session=network_session
+            )
+        return f"Bearer {token.access_token}"
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        auth: Authentication,
+        network_session: NetworkSession,
+        headers: Dict[str, str],
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request within the per-host connection cap.
+
+        A streamed response keeps its connection, and thus its slot of the
+        cap, until it is closed.
+        """
+        headers["Authorization"] = await self._authorization(auth, network_session)
+        request = self._client.build_request(method, url, headers=headers, **kwargs)
+        limit = self._host_limit(request.url.host)
+        await limit.acquire()
+        try:
+            with observe_box_request(method, str(request.url)) as observation:
+                response = await self._client.send(request, stream=stream)
+                observation.status = response.status_code
+        except BaseException:
+            limit.release()
+            raise
+        if not stream:
+            limit.release()
+            return response
+
+        aclose = response.aclose
+        released = False
+
+        async def release_on_close() -> None:
+            nonlocal released
+            try:
+                await aclose()
+            finally:
+                if not released:
+                    released = True
+                    limit.release()
+
+        # httpx also closes the response through it once the body is read
+        response.aclose = release_on_close  # type: ignore[method-assign]
+        return response
+
+    async def _send_limited(
+        self,
+        method: str,
+        url: str,
+        auth: Authentication,
+        network_session: NetworkSession,
+        headers: Dict[str, str],
+        rate_limiter: Optional[AdaptiveRateLimiter],
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request through the rate limiter, retrying after 429 responses."""
+        if rate_limiter is None:
+            return await self._send(
+                method, url, auth, network_session, headers, **kwargs
+            )
+
+        for attempt in range(self.max_attempts):
+            await rate_limiter.acquire_async()
+            response = await self._send(
+                method, url, auth, network_session, headers, **kwargs
+            )
+            if response.status_code != 429:
+                rate_limiter.on_success()
+                return response
+            rate_limiter.on_throttled(
+                parse_retry_after(response.headers.get("Retry-After"))
+            )
+            if attempt < self.max_attempts - 1:
+                await response.aclose()
+        return response
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        auth: Authentication,
+        network_session: NetworkSession,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        json: Optional[Any] = None,
+        content: Optional[Any] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """Send a request to the Box API and return the response.
+
+        The network session's additional headers (e.g. the library header or
+        As-User) are sent with every request. A 401 triggers a single token
+        refresh and retry when the authentication supports refreshing. With a
+        rate limiter, every attempt waits for it and 429 responses are retried
+        after its backoff. With ``stream``, the body is not read and the
+        caller must close the response, see ``stream``.
+        """
+        request_headers = dict(network_session.additional_headers)
+        if headers:
+            request_headers.update(headers)
+        kwargs = {"params": params, "json": json, "content": content, "stream": stream}
+
+        response = await self._send_limited(
+            method, url, auth, network_session, request_headers, rate_limiter, **kwargs
+        )
+        if response.status_code != 401:
+            return response
+
+        try:
+            await run_blocking(auth.refresh_token, network_session=network_session)
+        except Exception as e:
+            # e.g. developer tokens (mcp_client mode) cannot be refreshed
+            logger.debug(f"Box token refresh failed after a 401: {e}")
+            return response
+        await response.aclose()
+        return await self._send_limited(
+            method, url, auth, network_session, request_headers, rate_limiter, **kwargs
+        )
+
+    @asynccontextmanager
+    async def stream(
+        self, method: str, url: str, **kwargs: Any
+    ) -> AsyncIterator[httpx.Response]:
+        """Send a request like ``request`` and read its body as it arrives.
+
+        The response is closed when the context exits.
+        """
+        response = await self.request(method, url, stream=True, **kwargs)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    async def aclose(self) -> None:
+        """Close every pooled connection."""
+        await self._client.aclose()
@@ -0,0 +1,494 @@
+"""Chunked, parallel and resumable uploads with Box upload sessions.
+
+Large files are uploaded in the parts chosen by Box, several parts at a
+time. Parts are hashed in order, which also builds the SHA-1 of the whole
+file for the commit, and at most ``workers`` parts are in flight, so
+besides the content itself memory use is bounded by ``workers`` parts.
+
+A failed upload reports its session id. Uploading the same content again
+with that id lists the parts Box already has and only sends the missing
+ones. Upload sessions expire after a day.
+
+The session calls are made through an object with the methods of
+``SdkUploadSessions``, implemented over the async transport by BoxAsyncApi.
+
+Before content is uploaded, its SHA-1 is compared with the file of the same
+name already in the folder, from a local index of the files uploaded to each
+folder or else from Box's preflight check. Identical content is not uploaded
+again.
+
+Files on the server host can be uploaded from their path, within the
+configured allowed directories. They are memory-mapped, so their parts are
+hashed and sent from the page cache without being copied into Python bytes.
+"""
+
+import asyncio
+import base64
+import hashlib
+import io
+import logging
+import mmap
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import httpx
+from box_sdk_gen import (
+    BoxAPIError,
+    BoxClient,
+    BoxSDKError,
+    PreflightFileUploadCheckParent,
+    UploadFileAttributes,
+    UploadFileAttributesParentField,
+)
+from box_sdk_gen.schemas.upload_part import UploadPart
+from box_sdk_gen.serialization.json import deserialize
+
+from cache import UploadIndex
+from tool_executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Smallest file Box accepts in an upload session
+MIN_CHUNKED_UPLOAD_SIZE = 20 * 1024 * 1024
+
+# Seconds between commit attempts while Box is still processing the parts
+COMMIT_RETRY_INTERVAL = 1.0
+COMMIT_MAX_ATTEMPTS = 30
+
+# Checks if a file can be uploaded: (file name, size, folder id) -> the
+# file with the same name already in the folder, or None
+PreflightCheck = Callable[[str, int, str], Awaitable[Optional[Dict[str, Any]]]]
+
+# Upload settings, see configure_uploads
+_chunked_upload_threshold = MIN_CHUNKED_UPLOAD_SIZE
+_upload_workers = 4
+_allowed_dirs: List[str] = []
+
+
+def configure_uploads(
+    threshold: int, workers: int, allowed_dirs: Sequence[str] = ()
+) -> None:
+    """Set the size from which uploads use sessions, their concurrent parts,
+    and the directories local files may be uploaded from."""
+    global _chunked_upload_threshold, _upload_workers, _allowed_dirs
+    _chunked_upload_threshold = max(threshold, MIN_CHUNKED_UPLOAD_SIZE)
+    _upload_workers = max(1, workers)
+    _allowed_dirs = [
+        os.path.realpath(directory) for directory in allowed_dirs if directory
+    ]
+
+
+def use_upload_session(size: int) -> bool:
+    """Check if content of this size is uploaded in a session."""
+    return size >= _chunked_upload_threshold
+
+
+def sha1_digest(sha1: Any) -> str:
+    """Digest header value of a SHA-1."""
+    return "sha=" + base64.b64encode(sha1.digest()).decode()
+
+
+def preflight_conflict(
+    context_info: Optional[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """The existing file reported by a 409 answer to a preflight check."""
+    conflicts = (context_info or {}).get("conflicts")
+    if isinstance(conflicts, list):
+        conflicts = conflicts[0] if conflicts else None
+    if not conflicts or conflicts.get("type") != "file":
+        return None
+    return conflicts
+
+
+def preflight_upload(
+    client: BoxClient, file_name: str, size: int, parent_folder_id: str
+) -> Optional[Dict[str, Any]]:
+    """Run Box's preflight check with the Box SDK, see PreflightCheck.
+
+    Raises:
+        BoxAPIError: If the upload would fail for another reason than a name conflict.
+    """
+    try:
+        client.uploads.preflight_file_upload_check(
+            name=file_name,
+            size=size,
+            parent=PreflightFileUploadCheckParent(id=parent_folder_id),
+        )
+    except BoxAPIError as e:
+        if e.response_info is not None and e.response_info.status_code == 409:
+            return preflight_conflict(e.response_info.context_info)
+        raise
+    return None
+
+
+async def find_uploaded_file(
+    preflight: PreflightCheck,
+    index: Optional[UploadIndex],
+    identity: str,
+    file_name: str,
+    parent_folder_id: str,
+    size: int,
+    sha1: str,
+) -> Optional[Dict[str, Any]]:
+    """Find a file with this name and content in a folder, to skip uploading it again.
+
+    Args:
+        preflight: Runs Box's preflight check.
+        index: Optional index of the files uploaded to each folder.
+        identity: Box identity of the uploading user, see box_identity.
+        file_name: Name of the file to upload.
+        parent_folder_id: ID of the folder the file would be uploaded to.
+        size: Size of the content.
+        sha1: Hex SHA-1 of the content.
+
+    Returns:
+        dict[str, Any]: The id, name and type of the existing file, or None
+            if the content must be uploaded.
+    """
+    if index is not None:
+        file = index.get(identity, parent_folder_id, file_name, sha1)
+        if file is not None:
+            return file
+    conflict = await preflight(file_name, size, parent_folder_id)
+    if conflict is None or conflict.get("sha1") != sha1:
+        return None
+    file = {
+        "id": conflict["id"],
+        "name": conflict.get("name", file_name),
+        "type": "file",
+    }
+    if index is not None:
+        index.put(identity, parent_folder_id, file_name, sha1, file)
+    return file
+
+
+class SdkUploadSessions:
+    """Upload session calls made with the Box SDK on the tool executor."""
+
+    def __init__(self, client: BoxClient):
+        self._uploads = client.chunked_uploads
+
+    async def create_upload_session(
+        self, folder_id: str, file_size: int, file_name: str
+    ) -> Dict[str, Any]:
+        session = await run_blocking(
+            self._uploads.create_file_upload_session,
+            folder_id=folder_id,
+            file_size=file_size,
+            file_name=file_name,
+        )
+        return session.to_dict()
+
+    async def get_upload_session(self, upload_session_id: str) -> Dict[str, Any]:
+        session = await run_blocking(
+            self._uploads.get_file_upload_session_by_id, upload_session_id
+        )
+        return session.to_dict()
+
+    async def list_upload_parts(self, upload_session_id: str) -> List[Dict[str, Any]]:
+        parts: List[Dict[str, Any]] = []
+        while True:
+            page = await run_blocking(
+                self._uploads.get_file_upload_session_parts,
+                upload_session_id,
+                offset=len(parts),
+                limit=1000,
+            )
+            entries = [part.to_dict() for part in page.entries or []]
+            parts += entries
+            if not entries or len(parts) >= (page.total_count or 0):
+                return parts
+
+    async def upload_part(
+        self,
+        upload_session_id: str,
+        data: memoryview,
+        offset: int,
+        file_size: int,
+        digest: str,
+    ) -> Dict[str, Any]:
+        uploaded = await run_blocking(
+            self._uploads.upload_file_part,
+            upload_session_id,
+            io.BytesIO(data),
+            digest,
+            f"bytes {offset}-{offset + len(data) - 1}/{file_size}",
+        )
+        return uploaded.part.to_dict()
+
+    async def commit_upload_session(
+        self, upload_session_id: str, parts: List[Dict[str, Any]], digest: str
+    ) -> Optional[Dict[str, Any]]:
+        files = await run_blocking(
+            self._uploads.create_file_upload_session_commit,
+            upload_session_id,
+            [deserialize(part, UploadPart) for part in parts],
+            digest,
+        )
+        return files.to_dict() if files is not None else None
+
+
+def _hash_part(file_sha1: Any, chunk: memoryview) -> Any:
+    """Add a part to the SHA-1 of the file, if any, and return the part's own SHA-1."""
+    if file_sha1 is not None:
+        file_sha1.update(chunk)
+    return hashlib.sha1(chunk)
+
+
+async def upload_in_session(
+    sessions: Any,
+    content: Any,
+    file_name: str,
+    parent_folder_id: str,
+    upload_session_id: Optional[str] = None,
+    workers: Optional[int] = None,
+    sha1: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Upload content as a file in an upload session, or resume a session.
+
+    The SHA-1 of the file is computed along with those of the parts, in a
+    single pass over the content, unless the caller already knows it.
+
+    Args:
+        sessions: Makes the upload session calls, e.g. SdkUploadSessions.
+        content: The file content, bytes or any buffer such as an mmap.
+        file_name: The name of the new file.
+        parent_folder_id: ID of the folder the file is uploaded to.
+        upload_session_id: Session of a failed upload of the same content, to resume.
+        workers: Parts uploaded concurrently, defaults to the configured upload workers.
+        sha1: Hex SHA-1 of the content, when already computed.
+
+    Returns:
+        dict[str, Any]: The id, name and type of the uploaded file, like
+            box_ai_agents_toolkit.box_file_upload, and its SHA-1, or an error
+            message with the "upload_session_id" to resume the upload with.
+    """
+    view = memoryview(content)
+    file_size = len(view)
+
+    try:
+        if upload_session_id:
+            session = await sessions.get_upload_session(upload_session_id)
+            uploaded = {
+                part["offset"]: part
+                for part in await sessions.list_upload_parts(upload_session_id)
+            }
+        else:
+            session = await sessions.create_upload_session(
+                parent_folder_id, file_size, file_name
+            )
+            uploaded = {}
+    except BoxAPIError as e:
+        logger.error(e.message)
+        return {"error": e.message}
+
+    session_id = session["id"]
+    part_size = session["part_size"]
+    if -(-file_size // part_size) != session["total_parts"]:
+        return {"error": "The content size does not match the upload session"}
+
+    semaphore = asyncio.Semaphore(workers or _upload_workers)
+    failures: List[BaseException] = []
+
+    async def upload(offset: int, chunk: memoryview, digest: str) -> Dict[str, Any]:
+        try:
+            return await sessions.upload_part(
+                session_id, chunk, offset, file_size, digest
+            )
+        except BaseException as e:
+            failures.append(e)
+            raise
+        finally:
+            semaphore.release()
+
+    file_sha1 = hashlib.sha1() if sha1 is None else None
+    parts: List[Dict[str, Any]] = []
+    tasks: List[asyncio.Task] = []
+    try:
+        for offset in range(0, file_size, part_size):
+            chunk = view[offset : offset + part_size]
+            part_sha1 = await run_blocking(_hash_part, file_sha1, chunk)
+            part = uploaded.get(offset)
+            if part is not None:
+                if part.get("sha1") != part_sha1.hexdigest():
+                    return {
+                        "error": f"The content differs from the part at offset {offset} of the upload session",
+                        "upload_session_id": session_id,
+                    }
+                parts.append(part)
+                continue
+            # Bound the parts in flight, and thus the memory they use
+            await semaphore.acquire()
+            if failures:
+                break
+            tasks.append(
+                asyncio.ensure_future(upload(offset, chunk, sha1_digest(part_sha1)))
+            )
+
+        # Let the parts in flight finish, they will not be sent again on resume
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if failures:
+            raise failures[0]
+        parts += [task.result() for task in tasks]
+        if file_sha1 is not None:
+            sha1 = file_sha1.hexdigest()
+
+        for _ in range(COMMIT_MAX_ATTEMPTS):
+            files = await sessions.commit_upload_session(
+                session_id,
+                sorted(parts, key=lambda part: part["offset"]),
+                "sha=" + base64.b64encode(bytes.fromhex(sha1)).decode(),
+            )
+            if files is not None:
+                entry = files["entries"][0]
+                return {
+                    "id": entry["id"],
+                    "name": entry["name"],
+                    "type": entry["type"],
+                    "sha1": sha1,
+                }
+            # Box is still processing the parts
+            await asyncio.sleep(COMMIT_RETRY_INTERVAL)
+        return {
+            "error": "Box did not finish processing the uploaded parts, try again later",
+            "upload_session_id": session_id,
+        }
+    except (BoxSDKError, httpx.HTTPError) as e:
+        message = getattr(e, "message", None) or str(e)
+        logger.error(f"Upload session {session_id} failed: {message}")
+        return {"error": message, "upload_session_id": session_id}
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def resolve_local_path(file_path: str) -> str:
+    """Resolve a local file to upload, which must be within an allowed directory.
+
+    Symbolic links are resolved first, so they cannot point out of the
+    allowed directories.
+
+    Raises:
+        PermissionError: If local uploads are disabled or the file is not allowed.
+        FileNotFoundError: If the file does not exist or is not a regular file.
+    """
+    if not _allowed_dirs:
+        raise PermissionError(
+            "Uploading local files is disabled, set BOX_MCP_UPLOAD_ALLOWED_DIRS to enable it"
+        )
+    path = os.path.realpath(file_path)
+    if not any(
+        os.path.commonpath([path, directory]) == directory
+        for directory in _allowed_dirs
+    ):
+        raise PermissionError(f"{file_path} is not in a directory allowed for uploads")
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"{file_path} is not a file")
+    return path
+
+
+def _file_sha1(mapped: Optional[mmap.mmap]) -> str:
+    """Hex SHA-1 of a mapped file, None when the file is empty."""
+    return hashlib.sha1(mapped or b"").hexdigest()
+
+
+def _upload_small_file(
+    client: BoxClient, file: Any, file_name: str, parent_folder_id: str, sha1: str
+) -> Dict[str, Any]:
+    """Upload a file in one request, Box checks it against its SHA-1."""
+    uploaded = client.uploads.upload_file(
+        UploadFileAttributes(
+            name=file_name, parent=UploadFileAttributesParentField(id=parent_folder_id)
+        ),
+        file,
+        content_md_5=sha1,
+    )
+    entry = uploaded.entries[0]
+    return {"id": entry.id, "name": entry.name, "type": entry.type}
+
+
+async def upload_local_file(
+    client: BoxClient,
+    sessions: Any,
+    file_path: str,
+    parent_folder_id: str,
+    file_name: Optional[str] = None,
+    upload_session_id: Optional[str] = None,
+    preflight: Optional[PreflightCheck] = None,
+    index: Optional[UploadIndex] = None,
+    identity: str = "",
+) -> Dict[str, Any]:
+    """Upload a file of the server host, see upload_in_session.
+
+    Large files are uploaded in an upload session straight from their memory
+    map. Smaller files are uploaded in one request with the SDK, with their
+    SHA-1 for Box to check. With a preflight check, a file identical to the
+    one of the same name already in the folder is not uploaded again, see
+    find_uploaded_file. The file is read once to hash it: its SHA-1 is only
+    computed up front for the preflight check or a small upload, otherwise
+    the upload session computes it with those of the parts.
+
+    Args:
+        client: Box client for uploads in one request.
+        sessions: Makes the upload session calls, e.g. SdkUploadSessions.
+        file_path: Path of the file, within the allowed directories.
+        parent_folder_id: ID of the folder the file is uploaded to.
+        file_name: Name of the new file, defaults to the name of the local file.
+        upload_session_id: Session of a failed upload of the same file, to resume.
+        preflight: Optional preflight check, to skip uploading the file again.
+        index: Optional index of the files uploaded to each folder, searched
+            before the preflight check. Uploaded files are not indexed here,
+            the caller indexes them once their folder is invalidated.
+        identity: Box identity of the uploading user, see box_identity.
+
+    Returns:
+        dict[str, Any]: The id, name, type and SHA-1 of the uploaded file, with
+            "already_uploaded" when the existing file holds the same content,
+            or an error message.
+    """
+    try:
+        path = resolve_local_path(file_path)
+    except OSError as e:
+        return {"error": str(e)}
+    file_name = file_name or os.path.basename(path)
+
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        # Empty files cannot be mapped
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        try:
+            sha1 = None
+            if upload_session_id is None and preflight is not None:
+                sha1 = await run_blocking(_file_sha1, mapped)
+                existing = await find_uploaded_file(
+                    preflight, index, identity, file_name, parent_folder_id, size, sha1
+                )
+                if existing is not None:
+                    return {**existing, "sha1": sha1, "already_uploaded": True}
+
+            if upload_session_id or use_upload_session(size):
+                result = await upload_in_session(
+                    sessions,
+                    mapped or b"",
+                    file_name,
+                    parent_folder_id,
+                    upload_session_id,
+                    sha1=sha1,
+                )
+            else:
+                sha1 = sha1 or await run_blocking(_file_sha1, mapped)
+                result = await run_blocking(
+                    _upload_small_file, client, file, file_name, parent_folder_id, sha1
+                )
+                result = {**result, "sha1": sha1}
+            return result
+        except BoxAPIError as e:
+            logger.error(e.message)
+            return {"error": e.message}
+        finally:
+            if mapped is not None:
+                try:
+                    mapped.close()
+                except BufferError:
+                    # A view of the map is still referenced, it is unmapped once freed
+                    pass
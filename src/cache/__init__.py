@@ -0,0 +1,21 @@
+from cache.ai_results import AiResultCache, ai_result_key
+from cache.disk_text import DiskTextCache
+from cache.lru import LRUCache
+from cache.objects import CachedObject, ObjectCache
+from cache.ranges import RANGE_BLOCK_SIZE, RangeCache
+from cache.text import ExtractedText, TextCache
+from cache.uploads import UploadIndex
+
+__all__ = [
+    "AiResultCache",
+    "CachedObject",
+    "DiskTextCache",
+    "ExtractedText",
+    "LRUCache",
+    "ObjectCache",
+    "RANGE_BLOCK_SIZE",
+    "RangeCache",
+    "TextCache",
+    "UploadIndex",
+    "ai_result_key",
+]
@@ -0,0 +1,90 @@
+"""Cache of Box AI answers, keyed by the file versions and the request."""
+
+import hashlib
+import json
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from cache.lru import LRUCache
+
+
+def ai_result_key(
+    tool: str,
+    versions: Mapping[str, str],
+    request: Any,
+    ai_agent_id: Optional[str] = None,
+) -> str:
+    """Digest of an AI request on given file versions.
+
+    Args:
+        tool: Name of the AI tool, as the tools answer the same request differently.
+        versions: Content SHA-1 (or version ID) of each file, by file ID.
+        request: The prompt, fields or template key, anything JSON serializable.
+        ai_agent_id: ID of the AI agent, if any.
+    """
+    key = {
+        "tool": tool,
+        "files": sorted(versions.items()),
+        "request": request,
+        "agent": ai_agent_id,
+    }
+    raw = json.dumps(key, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AiResultCache:
+    """LRU cache of Box AI answers, bounded by their serialized size.
+
+    Answers are kept as JSON, so every hit returns a fresh copy. They expire
+    ``ttl`` seconds after they were stored, however often they are read. The
+    key includes the content SHA-1 of every file, so an answer is never served
+    for a file that changed since. Serving a cached answer still requires a
+    file info call by the requesting user, which also checks that the user
+    may read the files.
+
+    Args:
+        ttl: Seconds an answer is served after it was stored.
+        max_bytes: Approximate maximum total size of the cached answers.
+        clock: Monotonic time source, overridable for tests.
+    """
+
+    def __init__(
+        self, ttl: float, max_bytes: int, clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl = ttl
+        self._clock = clock
+        # key -> (time stored, answer as JSON)
+        self._answers: LRUCache[tuple] = LRUCache(
+            max_entries=10000,
+            ttl=ttl,
+            max_weight=max_bytes,
+            weigher=lambda entry: len(entry[1]),
+            clock=clock,
+        )
+        # Counted here, as the lookups of expired answers are hits of the LRU cache
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of a cached answer, or None when missing or expired."""
+        entry = self._answers.get(key)
+        if entry is not None and self._clock() - entry[0] > self.ttl:
+            self._answers.pop(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(entry[1])
+
+    def put(self, key: str, answer: Dict[str, Any]) -> None:
+        """Cache an answer."""
+        self._answers.put(key, (self._clock(), json.dumps(answer, default=str)))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        stats = self._answers.stats()
+        stats["hits"] = self.hits
+        stats["misses"] = self.misses
+        stats["hit_ratio"] = round(self.hits / lookups, 3) if lookups else 0.0
+        return stats
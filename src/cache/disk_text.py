@@ -0,0 +1,143 @@
+"""Persistent, compressed cache of extracted texts shared by server processes."""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Suffix of the cache entries, anything else in the directory is ignored
+ENTRY_SUFFIX = ".txt.z"
+
+# Share of the size cap kept after an eviction, so evictions do not run on every write
+EVICTION_TARGET = 0.9
+
+
+class DiskTextCache:
+    """Extracted texts stored as zlib compressed files, keyed by file and content SHA-1.
+
+    Entries are written to a temporary file and renamed into place, so
+    processes sharing the directory only ever read whole entries. Reading an
+    entry updates its modification time, which orders the least recently
+    used entries for eviction. Each process adds the bytes it writes to the
+    directory size it last measured, and once that passes the size cap
+    measures the directory again and deletes the oldest entries, whichever
+    process wrote them. The writes of other processes since the last scan
+    are not counted, so the cap may be exceeded until the next scan.
+
+    Args:
+        directory: Directory of the cache, created if missing.
+        max_bytes: Size cap of the compressed entries.
+        level: zlib compression level.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, level: int = 6):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.level = level
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size = sum(size for _, size, _ in self._entries())
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def _path(self, file_id: str, version: str) -> str:
+        digest = hashlib.sha256(f"{file_id}:{version}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + ENTRY_SUFFIX)
+
+    def get(self, file_id: str, version: str) -> Optional[str]:
+        """Read the text extracted from a file version."""
+        path = self._path(file_id, version)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            text = zlib.decompress(data).decode("utf-8")
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, zlib.error, UnicodeDecodeError) as e:
+            logger.warning(f"Dropping unreadable text cache entry {path}: {e}")
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            # Evicted by another process meanwhile
+            pass
+        self.hits += 1
+        return text
+
+    def put(self, file_id: str, version: str, text: str) -> None:
+        """Store the text extracted from a file version."""
+        data = zlib.compress(text.encode("utf-8"), self.level)
+        if len(data) > self.max_bytes:
+            return
+        fd, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temporary, self._path(file_id, version))
+        except OSError as e:
+            logger.warning(f"Could not write text cache entry: {e}")
+            self._remove(temporary)
+            return
+        self.writes += 1
+        with self._lock:
+            self._size += len(data)
+            if self._size <= self.max_bytes:
+                return
+            self._evict()
+
+    def _entries(self) -> List[Tuple[str, int, float]]:
+        """(path, size, modification time) of every entry."""
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self) -> None:
+        """Delete the least recently used entries down to the target size. Must hold the lock."""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size = sum(entry[1] for entry in entries)
+        target = self.max_bytes * EVICTION_TARGET
+        for path, entry_size, _ in entries:
+            if size <= target:
+                break
+            if self._remove(path):
+                self.evictions += 1
+            size -= entry_size
+        self._size = size
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
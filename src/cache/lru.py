@@ -0,0 +1,183 @@
+"""Thread-safe LRU cache with idle TTL eviction."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """A bounded LRU cache whose entries also expire after an idle period.
+
+    Entries are evicted when the cache holds more than ``max_entries`` items,
+    when the total weight of the entries exceeds ``max_weight``, or when they
+    have not been accessed for ``ttl`` seconds. The cache is safe to use from
+    the tool executor threads.
+
+    Args:
+        max_entries: Maximum number of entries kept in the cache.
+        ttl: Idle time in seconds after which an entry expires. ``None`` disables expiry.
+        on_evict: Called with the key and value of every entry that leaves the cache.
+        clock: Monotonic time source, overridable for tests.
+        max_weight: Maximum total weight of the entries. ``None`` disables the bound.
+        weigher: Returns the weight of a value, e.g. its size in bytes. Required
+            with ``max_weight``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: Optional[float] = None,
+        on_evict: Optional[Callable[[Hashable, V], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        max_weight: Optional[int] = None,
+        weigher: Optional[Callable[[V], int]] = None,
+    ):
+        if max_weight is not None and weigher is None:
+            raise ValueError("max_weight requires a weigher")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_weight = max_weight
+        self._weigher = weigher
+        self._on_evict = on_evict
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (value, last access time)
+        self._entries: "OrderedDict[Hashable, tuple[V, float]]" = OrderedDict()
+        # key -> weight, only tracked with a weigher
+        self._weights: Dict[Hashable, int] = {}
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _expired(self, accessed_at: float, now: float) -> bool:
+        return self.ttl is not None and now - accessed_at > self.ttl
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Get a value and mark it as recently used, or None on a miss."""
+        evicted = None
+        with self._lock:
+            now = self._clock()
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[1], now):
+                evicted = (key, self._remove(key))
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                value = None
+            else:
+                self.hits += 1
+                value = entry[0]
+                self._entries[key] = (value, now)
+                self._entries.move_to_end(key)
+        if evicted is not None:
+            self._notify_evicted([evicted])
+        return value
+
+    def peek(self, key: Hashable) -> Optional[V]:
+        """Get a value without counting a lookup or marking it as used."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def put(self, key: Hashable, value: V) -> None:
+        """Insert or replace a value, evicting the least recently used entries."""
+        evicted = []
+        with self._lock:
+            now = self._clock()
+            previous = self._remove(key) if key in self._entries else None
+            if previous is not None and previous is not value:
+                evicted.append((key, previous))
+            self._entries[key] = (value, now)
+            if self._weigher is not None:
+                self._weights[key] = self._weigher(value)
+                self.weight += self._weights[key]
+            evicted.extend(self._prune(now))
+        self._notify_evicted(evicted)
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        """Remove an entry without counting it as an eviction."""
+        with self._lock:
+            return self._remove(key) if key in self._entries else None
+
+    def _remove(self, key: Hashable) -> V:
+        """Remove a present entry and its weight. Must hold the lock."""
+        value, _ = self._entries.pop(key)
+        self.weight -= self._weights.pop(key, 0)
+        return value
+
+    def _over_bounds(self) -> bool:
+        if len(self._entries) > self.max_entries:
+            return True
+        return self.max_weight is not None and self.weight > self.max_weight
+
+    def _prune(self, now: float) -> list:
+        """Drop expired and overflowing entries. Must hold the lock."""
+        evicted = []
+        if self.ttl is not None:
+            for key, (value, accessed_at) in list(self._entries.items()):
+                # Entries are ordered by access time, so stop at the first live one
+                if not self._expired(accessed_at, now):
+                    break
+                self._remove(key)
+                evicted.append((key, value))
+        while self._entries and self._over_bounds():
+            key = next(iter(self._entries))
+            evicted.append((key, self._remove(key)))
+        self.evictions += len(evicted)
+        return evicted
+
+    def expire(self) -> None:
+        """Evict every entry whose idle TTL has elapsed."""
+        with self._lock:
+            evicted = self._prune(self._clock())
+        self._notify_evicted(evicted)
+
+    def clear(self) -> None:
+        """Remove every entry, calling ``on_evict`` for each of them."""
+        with self._lock:
+            evicted = [(key, value) for key, (value, _) in self._entries.items()]
+            self._entries.clear()
+            self._weights.clear()
+            self.weight = 0
+        self._notify_evicted(evicted)
+
+    def _notify_evicted(self, evicted: list) -> None:
+        if self._on_evict is None:
+            return
+        for key, value in evicted:
+            self._on_evict(key, value)
+
+    def values(self) -> list:
+        """Snapshot of the cached values, without marking them as used."""
+        with self._lock:
+            return [value for value, _ in self._entries.values()]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+            if self.max_weight is not None:
+                stats["weight"] = self.weight
+                stats["max_weight"] = self.max_weight
+            return stats
@@ -0,0 +1,114 @@
+"""ETag aware cache of Box file and folder representations."""
+
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from cache.lru import LRUCache
+
+# (object type, object id), e.g. ("file", "123")
+ObjectKey = Tuple[str, str]
+
+
+@dataclass
+class CachedObject:
+    """The last representation of a Box object seen by one identity."""
+
+    etag: Optional[str]
+    data: Dict[str, Any]
+    validated_at: float
+    size: int = field(default=0)
+
+
+def _weigh(entries: Dict[str, CachedObject]) -> int:
+    return sum(entry.size for entry in entries.values())
+
+
+class ObjectCache:
+    """Per identity cache of Box objects, revalidated with their etag.
+
+    Entries are served without asking Box for ``max_age`` seconds after they
+    were last validated. Older entries are revalidated with a conditional GET.
+    Objects are keyed by type and id, with one entry per Box identity since
+    users may see different representations of the same object. The cache is
+    bounded by the approximate JSON size of the cached representations.
+
+    Args:
+        max_age: Seconds an entry is served without revalidation.
+        max_bytes: Approximate memory bound of the cached representations.
+        max_entries: Maximum number of cached objects.
+        clock: Monotonic time source, overridable for tests.
+    """
+
+    def __init__(
+        self,
+        max_age: float,
+        max_bytes: int,
+        max_entries: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_age = max_age
+        self._clock = clock
+        self._objects: LRUCache[Dict[str, CachedObject]] = LRUCache(
+            max_entries=max_entries, max_weight=max_bytes, weigher=_weigh, clock=clock
+        )
+        self.revalidations = 0
+        self.not_modified = 0
+
+    def get(self, identity: str, key: ObjectKey) -> Optional[CachedObject]:
+        """Get the entry an identity cached for an object."""
+        entries = self._objects.get(key)
+        return entries.get(identity) if entries is not None else None
+
+    def is_fresh(self, entry: CachedObject) -> bool:
+        """Check if an entry may be served without revalidation."""
+        return self._clock() - entry.validated_at < self.max_age
+
+    def put(
+        self, identity: str, key: ObjectKey, etag: Optional[str], data: Dict[str, Any]
+    ) -> CachedObject:
+        """Store the representation an identity fetched for an object."""
+        entry = CachedObject(
+            etag=etag,
+            data=data,
+            validated_at=self._clock(),
+            size=len(json.dumps(data, default=str)),
+        )
+        # Copy on write, the per object dict may be read concurrently
+        entries = dict(self._objects.peek(key) or {})
+        entries[identity] = entry
+        self._objects.put(key, entries)
+        return entry
+
+    def conditional_headers(self, entry: Optional[CachedObject]) -> Dict[str, str]:
+        """Headers revalidating a stale entry, empty when there is nothing to revalidate."""
+        if entry is None or entry.etag is None:
+            return {}
+        self.revalidations += 1
+        return {"If-None-Match": entry.etag}
+
+    def mark_not_modified(self, entry: CachedObject) -> None:
+        """Record that Box answered 304 to a revalidation of an entry."""
+        entry.validated_at = self._clock()
+        self.not_modified += 1
+
+    def invalidate(self, keys: Iterable[ObjectKey]) -> None:
+        """Drop every identity's entry of the given objects."""
+        for key in keys:
+            self._objects.pop(key)
+
+    def parent_of(self, key: ObjectKey) -> Optional[ObjectKey]:
+        """The cached parent folder of an object, from any identity's entry."""
+        entries = self._objects.peek(key)
+        for entry in (entries or {}).values():
+            parent = entry.data.get("parent")
+            if parent and parent.get("id"):
+                return ("folder", parent["id"])
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._objects.stats()
+        stats["revalidations"] = self.revalidations
+        stats["not_modified"] = self.not_modified
+        return stats
@@ -0,0 +1,52 @@
+"""Cache of file content blocks read with HTTP Range requests."""
+
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from cache.lru import LRUCache
+
+# Bytes per cached block, ranges are read from Box in whole blocks
+RANGE_BLOCK_SIZE = 64 * 1024
+
+# (file id, file version id, block index)
+BlockKey = Tuple[str, str, int]
+
+
+class RangeCache:
+    """LRU cache of file content blocks, bounded by their total size.
+
+    Blocks are keyed by file version, so a new upload never serves stale
+    bytes and old versions simply age out. Reading the version of a file
+    requires a file info call by the requesting user, which also checks
+    that the user may read it.
+
+    Args:
+        max_bytes: Maximum total size of the cached blocks.
+        block_size: Bytes per block.
+        clock: Monotonic time source, overridable for tests.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        block_size: int = RANGE_BLOCK_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.block_size = block_size
+        self._blocks: LRUCache[bytes] = LRUCache(
+            max_entries=max(1, max_bytes // block_size) * 4,
+            max_weight=max_bytes,
+            weigher=len,
+            clock=clock,
+        )
+
+    def get(self, file_id: str, version: str, index: int) -> Optional[bytes]:
+        """Get a cached block of a file version."""
+        return self._blocks.get((file_id, version, index))
+
+    def put(self, file_id: str, version: str, index: int, block: bytes) -> None:
+        """Cache a block of a file version."""
+        self._blocks.put((file_id, version, index), block)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._blocks.stats()
@@ -0,0 +1,50 @@
+"""Cache of the text extracted from file representations."""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from cache.lru import LRUCache
+
+
+@dataclass
+class ExtractedText:
+    """The text extracted from one file version."""
+
+    text: str
+    # Chunk boundaries of the text, by chunk size, computed on first use
+    chunks: Dict[int, Any] = field(default_factory=dict)
+
+
+class TextCache:
+    """LRU cache of extracted texts, bounded by their total length.
+
+    Texts are keyed by file and content SHA-1, so a new version of a file
+    is extracted again. Serving a cached text still requires a file info call
+    by the requesting user, which also checks that the user may read it.
+
+    Args:
+        max_bytes: Approximate maximum total size of the cached texts.
+        clock: Monotonic time source, overridable for tests.
+    """
+
+    def __init__(self, max_bytes: int, clock: Callable[[], float] = time.monotonic):
+        self._texts: LRUCache[ExtractedText] = LRUCache(
+            max_entries=10000,
+            max_weight=max_bytes,
+            weigher=lambda entry: len(entry.text),
+            clock=clock,
+        )
+
+    def get(self, file_id: str, version: str) -> Optional[ExtractedText]:
+        """Get the text extracted from a file version."""
+        return self._texts.get((file_id, version))
+
+    def put(self, file_id: str, version: str, text: str) -> ExtractedText:
+        """Cache the text extracted from a file version."""
+        entry = ExtractedText(text)
+        self._texts.put((file_id, version), entry)
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        return self._texts.stats()
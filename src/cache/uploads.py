@@ -0,0 +1,104 @@
+"""Index of the files uploaded to each folder, by name and content SHA-1."""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from cache.lru import LRUCache
+
+# (identity, file name, content SHA-1)
+UploadKey = Tuple[str, str, str]
+
+
+@dataclass
+class IndexedUpload:
+    """A file known to hold some content under some name in a folder."""
+
+    file: Dict[str, Any]
+    indexed_at: float
+
+
+class UploadIndex:
+    """Per folder index of uploaded files, to skip uploading identical content again.
+
+    Entries are kept per Box identity, since users may not see the same
+    files, and expire ``max_age`` seconds after they were indexed, as files
+    can also change outside of the server. Write tools invalidate the folders
+    and files they change.
+
+    Args:
+        max_age: Seconds an entry is trusted without asking Box again.
+        max_folders: Maximum number of indexed folders.
+        clock: Monotonic time source, overridable for tests.
+    """
+
+    def __init__(
+        self,
+        max_age: float,
+        max_folders: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_age = max_age
+        self._clock = clock
+        self._folders: LRUCache[Dict[UploadKey, IndexedUpload]] = LRUCache(
+            max_entries=max_folders, on_evict=self._forget_folder, clock=clock
+        )
+        # file id -> folder id, to invalidate a file without knowing its folder
+        self._file_folders: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, identity: str, folder_id: str, name: str, sha1: str
+    ) -> Optional[Dict[str, Any]]:
+        """Get the file an identity has in a folder with this name and content."""
+        entries = self._folders.peek(folder_id) or {}
+        entry = entries.get((identity, name, sha1))
+        if entry is None or self._clock() - entry.indexed_at >= self.max_age:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.file
+
+    def put(
+        self, identity: str, folder_id: str, name: str, sha1: str, file: Dict[str, Any]
+    ) -> None:
+        """Index a file an identity uploaded or found in a folder."""
+        with self._lock:
+            # Copy on write, the per folder dict may be read concurrently
+            entries = dict(self._folders.peek(folder_id) or {})
+            entries[(identity, name, sha1)] = IndexedUpload(
+                file=file, indexed_at=self._clock()
+            )
+            self._folders.put(folder_id, entries)
+            self._file_folders[file["id"]] = folder_id
+
+    def invalidate_folder(self, folder_id: str) -> None:
+        """Forget every file indexed in a folder."""
+        with self._lock:
+            entries = self._folders.pop(folder_id)
+            if entries is not None:
+                self._forget_files(entries)
+
+    def invalidate_file(self, file_id: str) -> None:
+        """Forget the folder a file is indexed in, as the file may have moved or changed."""
+        with self._lock:
+            folder_id = self._file_folders.get(file_id)
+        if folder_id is not None:
+            self.invalidate_folder(folder_id)
+
+    def _forget_files(self, entries: Dict[UploadKey, IndexedUpload]) -> None:
+        for entry in entries.values():
+            self._file_folders.pop(entry.file["id"], None)
+
+    def _forget_folder(
+        self, folder_id: str, entries: Dict[UploadKey, IndexedUpload]
+    ) -> None:
+        # Called under our lock by put, also for the entries of a folder it replaces
+        if folder_id not in self._folders:
+            self._forget_files(entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"folders": len(self._folders), "hits": self.hits, "misses": self.misses}
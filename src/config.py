@@ -81,6 +81,164 @@ class McpAuthConfig:
     # OAuth protected resource config file
     oauth_protected_resources_config_file: str = ".oauth-protected-resource.json"
 
+    # Seconds Box's authorization server metadata is served before it is
+    # revalidated, unless Box sends a Cache-Control max-age
+    oauth_metadata_ttl: float = 3600.0
+
+    # Seconds expired metadata is still served while it is revalidated in the
+    # background, before requests wait for the revalidation
+    oauth_metadata_max_stale: float = 86400.0
+
+    # Check each new Box bearer token against users/me before it reaches the
+    # tools, in OAuth and mcp_client modes
+    validate_box_tokens: bool = False
+
+    # Seconds the verdict on a Box bearer token is cached
+    token_validation_ttl: float = 300.0
+
+    # Verdicts kept in the token validation cache
+    token_validation_max_entries: int = 10000
+
+
+@dataclass
+class ExecutionConfig:
+    """Configuration for the thread pools that run blocking Box tool calls."""
+
+    # Worker threads for regular Box API tools
+    tool_workers: int = 32
+
+    # Worker threads for Box AI tools, which are much slower per call
+    ai_tool_workers: int = 8
+
+    # Maximum calls waiting for a worker per pool before new calls are rejected
+    tool_queue_size: int = 256
+
+    # Share one execution between identical concurrent read-only tool calls
+    coalesce_read_tools: bool = True
+
+    # Box AI requests in flight per batch AI tool call
+    ai_batch_workers: int = 4
+
+    # Concurrent page fetches of one recursive folder listing
+    folder_traversal_workers: int = 8
+
+    # Uploads of at least this many bytes use chunked upload sessions (20 MiB at least)
+    chunked_upload_threshold: int = 20 * 1024 * 1024
+
+    # Parts of one upload session uploaded concurrently
+    upload_workers: int = 4
+
+    # Directories of the server host files may be uploaded from, none disables local uploads
+    upload_allowed_dirs: list[str] = field(default_factory=list)
+
+
+@dataclass
+class HttpConfig:
+    """Configuration for the HTTP requests sent to the Box API."""
+
+    # Serve the hot-path tools through the async transport instead of the SDK
+    async_transport: bool = True
+
+    # Negotiate HTTP/2 when the h2 package is installed
+    http2: bool = True
+
+    # Total connections across all Box hosts
+    max_connections: int = 100
+
+    # Idle connections kept alive for reuse
+    max_keepalive_connections: int = 20
+
+    # Seconds an idle connection is kept alive
+    keepalive_expiry: float = 30.0
+
+    # Concurrent requests allowed to a single Box host
+    max_connections_per_host: int = 32
+
+    # Connect and read timeouts in seconds, matching the Box SDK defaults
+    connect_timeout: float = 5.0
+    read_timeout: float = 60.0
+
+    # Rate limit the requests of each Box identity, backing off on 429 responses
+    rate_limit_enabled: bool = True
+
+    # Requests per second and burst allowed per identity while Box is not throttling
+    rate_limit_rps: float = 16.0
+    rate_limit_burst: int = 32
+
+    # Lowest rate the limiter backs off to after repeated 429 responses
+    rate_limit_min_rps: float = 1.0
+
+    # Attempts per request, including retries after a 429, on the async transport
+    rate_limit_max_attempts: int = 5
+
+    # Bytes read and written at a time when streaming a download to disk
+    download_chunk_size: int = 1024 * 1024
+
+
+@dataclass
+class CacheConfig:
+    """Configuration for the in-memory caches."""
+
+    # Box clients kept per bearer token in mcp_client mode
+    client_cache_max_entries: int = 256
+
+    # Seconds a cached Box client may stay unused before it is closed
+    client_cache_ttl: float = 900.0
+
+    # Seconds a cached file or folder is served before it is revalidated by etag
+    object_cache_max_age: float = 30.0
+
+    # Approximate memory bound of the file and folder cache, 0 disables it
+    object_cache_max_bytes: int = 32 * 1024 * 1024
+
+    # Memory bound of the file content blocks read by ranged reads, 0 disables it
+    range_cache_max_bytes: int = 64 * 1024 * 1024
+
+    # Memory bound of the texts extracted from file representations, 0 disables it
+    text_cache_max_bytes: int = 128 * 1024 * 1024
+
+    # Directory of the compressed extracted texts kept across restarts and
+    # shared by server processes, None disables it
+    text_disk_cache_dir: Optional[str] = None
+
+    # Size cap of the compressed extracted texts on disk
+    text_disk_cache_max_bytes: int = 1024 * 1024 * 1024
+
+    # Seconds an uploaded file is trusted to still hold its content, 0 disables the index
+    upload_index_max_age: float = 300.0
+
+    # Serve repeated Box AI asks and extracts on unchanged files from a cache
+    ai_cache_enabled: bool = False
+
+    # Seconds a Box AI answer is served after it was stored
+    ai_cache_ttl: float = 3600.0
+
+    # Memory bound of the cached Box AI answers
+    ai_cache_max_bytes: int = 16 * 1024 * 1024
+
+
+@dataclass
+class ObservabilityConfig:
+    """Configuration for the metrics and traces of the server."""
+
+    # Record the metrics and serve them on /metrics (SSE and streamable-http transports)
+    metrics_enabled: bool = True
+
+    # Serve /metrics without authentication, for scrapers that cannot send a bearer token
+    metrics_public: bool = False
+
+    # Where trace spans are exported: "otlp", "file", or None to disable tracing
+    tracing_exporter: Optional[str] = None
+
+    # Base URL of the OTLP/HTTP collector
+    tracing_otlp_endpoint: str = "http://localhost:4318"
+
+    # File the "file" exporter appends the spans to
+    tracing_file: str = "box-mcp-traces.jsonl"
+
+    # service.name of the exported spans
+    tracing_service_name: str = "mcp-server-box"
+
 
 @dataclass
 class LoggingConfig:
@@ -96,6 +254,10 @@ class AppConfig:
     server: ServerConfig = field(default_factory=ServerConfig)
     box_api: BoxApiConfig = field(default_factory=BoxApiConfig)
     mcp_auth: McpAuthConfig = field(default_factory=McpAuthConfig)
+    execution: ExecutionConfig = field(default_factory=ExecutionConfig)
+    http: HttpConfig = field(default_factory=HttpConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    observability: ObservabilityConfig = field(default_factory=ObservabilityConfig)
     logging: LoggingConfig = field(default_factory=LoggingConfig)
 
     @classmethod
@@ -129,6 +291,90 @@ class AppConfig:
                 "OAUTH_PROTECTED_RESOURCES_CONFIG_FILE",
                 ".oauth-protected-resource.json"
             ),
+            oauth_metadata_ttl=float(os.getenv("BOX_MCP_OAUTH_METADATA_TTL", "3600")),
+            oauth_metadata_max_stale=float(
+                os.getenv("BOX_MCP_OAUTH_METADATA_MAX_STALE", "86400")
+            ),
+            validate_box_tokens=os.getenv("BOX_MCP_VALIDATE_TOKENS", "false").lower() == "true",
+            token_validation_ttl=float(os.getenv("BOX_MCP_TOKEN_VALIDATION_TTL", "300")),
+            token_validation_max_entries=int(
+                os.getenv("BOX_MCP_TOKEN_VALIDATION_MAX_ENTRIES", "10000")
+            ),
+        )
+
+        # Tool execution configuration
+        execution_config = ExecutionConfig(
+            tool_workers=int(os.getenv("BOX_MCP_TOOL_WORKERS", "32")),
+            ai_tool_workers=int(os.getenv("BOX_MCP_AI_TOOL_WORKERS", "8")),
+            tool_queue_size=int(os.getenv("BOX_MCP_TOOL_QUEUE_SIZE", "256")),
+            coalesce_read_tools=os.getenv("BOX_MCP_COALESCE_READS", "true").lower() == "true",
+            ai_batch_workers=int(os.getenv("BOX_MCP_AI_BATCH_WORKERS", "4")),
+            folder_traversal_workers=int(os.getenv("BOX_MCP_FOLDER_TRAVERSAL_WORKERS", "8")),
+            chunked_upload_threshold=int(
+                os.getenv("BOX_MCP_CHUNKED_UPLOAD_THRESHOLD", str(20 * 1024 * 1024))
+            ),
+            upload_workers=int(os.getenv("BOX_MCP_UPLOAD_WORKERS", "4")),
+            upload_allowed_dirs=[
+                directory
+                for directory in os.getenv("BOX_MCP_UPLOAD_ALLOWED_DIRS", "").split(os.pathsep)
+                if directory
+            ],
+        )
+
+        # Async HTTP transport configuration
+        http_config = HttpConfig(
+            async_transport=os.getenv("BOX_MCP_ASYNC_TRANSPORT", "true").lower() == "true",
+            http2=os.getenv("BOX_MCP_HTTP2", "true").lower() == "true",
+            max_connections=int(os.getenv("BOX_MCP_HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("BOX_MCP_HTTP_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("BOX_MCP_HTTP_KEEPALIVE_EXPIRY", "30")),
+            max_connections_per_host=int(os.getenv("BOX_MCP_HTTP_MAX_PER_HOST", "32")),
+            rate_limit_enabled=os.getenv("BOX_MCP_RATE_LIMIT", "true").lower() == "true",
+            rate_limit_rps=float(os.getenv("BOX_MCP_RATE_LIMIT_RPS", "16")),
+            rate_limit_burst=int(os.getenv("BOX_MCP_RATE_LIMIT_BURST", "32")),
+            rate_limit_min_rps=float(os.getenv("BOX_MCP_RATE_LIMIT_MIN_RPS", "1")),
+            rate_limit_max_attempts=int(os.getenv("BOX_MCP_RATE_LIMIT_MAX_ATTEMPTS", "5")),
+            download_chunk_size=int(
+                os.getenv("BOX_MCP_DOWNLOAD_CHUNK_SIZE", str(1024 * 1024))
+            ),
+        )
+
+        # Cache configuration
+        cache_config = CacheConfig(
+            client_cache_max_entries=int(os.getenv("BOX_MCP_CLIENT_CACHE_SIZE", "256")),
+            client_cache_ttl=float(os.getenv("BOX_MCP_CLIENT_CACHE_TTL", "900")),
+            object_cache_max_age=float(os.getenv("BOX_MCP_OBJECT_CACHE_MAX_AGE", "30")),
+            object_cache_max_bytes=int(
+                os.getenv("BOX_MCP_OBJECT_CACHE_MAX_BYTES", str(32 * 1024 * 1024))
+            ),
+            range_cache_max_bytes=int(
+                os.getenv("BOX_MCP_RANGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+            ),
+            text_cache_max_bytes=int(
+                os.getenv("BOX_MCP_TEXT_CACHE_MAX_BYTES", str(128 * 1024 * 1024))
+            ),
+            text_disk_cache_dir=os.getenv("BOX_MCP_TEXT_DISK_CACHE_DIR") or None,
+            text_disk_cache_max_bytes=int(
+                os.getenv("BOX_MCP_TEXT_DISK_CACHE_MAX_BYTES", str(1024 * 1024 * 1024))
+            ),
+            upload_index_max_age=float(os.getenv("BOX_MCP_UPLOAD_INDEX_MAX_AGE", "300")),
+            ai_cache_enabled=os.getenv("BOX_MCP_AI_CACHE", "false").lower() == "true",
+            ai_cache_ttl=float(os.getenv("BOX_MCP_AI_CACHE_TTL", "3600")),
+            ai_cache_max_bytes=int(
+                os.getenv("BOX_MCP_AI_CACHE_MAX_BYTES", str(16 * 1024 * 1024))
+            ),
+        )
+
+        # Metrics and tracing configuration
+        observability_config = ObservabilityConfig(
+            metrics_enabled=os.getenv("BOX_MCP_METRICS", "true").lower() == "true",
+            metrics_public=os.getenv("BOX_MCP_METRICS_PUBLIC", "false").lower() == "true",
+            tracing_exporter=os.getenv("BOX_MCP_TRACING_EXPORTER") or None,
+            tracing_otlp_endpoint=os.getenv(
+                "BOX_MCP_TRACING_OTLP_ENDPOINT", "http://localhost:4318"
+            ),
+            tracing_file=os.getenv("BOX_MCP_TRACING_FILE", "box-mcp-traces.jsonl"),
+            tracing_service_name=os.getenv("BOX_MCP_TRACING_SERVICE_NAME", "mcp-server-box"),
         )
 
         # Logging configuration
@@ -140,6 +386,10 @@ class AppConfig:
             server=server_config,
             box_api=box_api_config,
             mcp_auth=mcp_auth_config,
+            execution=execution_config,
+            http=http_config,
+            cache=cache_config,
+            observability=observability_config,
             logging=logging_config,
         )
 
@@ -0,0 +1,53 @@
+import logging
+from typing import Optional, Tuple
+
+from fastapi import status
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+AUTHORIZATION_HEADER = b"authorization"
+BEARER_PREFIX = b"Bearer "
+
+
+def unauthorized(
+    error: str, description: str, status_code: int = status.HTTP_401_UNAUTHORIZED
+) -> JSONResponse:
+    """Error response of a request that failed authentication."""
+    return JSONResponse(
+        content={"error": error, "error_description": description},
+        status_code=status_code,
+    )
+
+
+def get_bearer_token(scope) -> Tuple[Optional[bytes], Optional[JSONResponse]]:
+    """
+    Extract the bearer token of a request.
+
+    The raw ASGI header list is scanned once, without copying or decoding it.
+    ASGI servers send the header names lowercased.
+
+    Args:
+        scope: ASGI scope containing request information
+
+    Returns:
+        Tuple[Optional[bytes], Optional[JSONResponse]]: The token, or the error
+            response if the request has no bearer token
+    """
+    auth_header = None
+    for name, value in scope.get("headers", ()):
+        if name == AUTHORIZATION_HEADER:
+            auth_header = value
+            break
+
+    if not auth_header:
+        logger.warning(
+            f"[Token] Missing authorization header for {scope['method']} {scope['path']}"
+        )
+        return None, unauthorized("invalid_request", "Missing Authorization header")
+    if not auth_header.startswith(BEARER_PREFIX):
+        logger.warning("[Token] Invalid authorization header format")
+        return None, unauthorized(
+            "invalid_request", "Authorization header must use Bearer scheme"
+        )
+    return auth_header[len(BEARER_PREFIX) :], None
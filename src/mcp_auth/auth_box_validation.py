@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+from starlette.responses import JSONResponse
+
+from cache import LRUCache
+from config import McpAuthConfig
+from mcp_auth.auth_bearer import unauthorized
+
+logger = logging.getLogger(__name__)
+
+BOX_USERS_ME_URL = "https://api.box.com/2.0/users/me"
+
+
+@dataclass(frozen=True)
+class TokenVerdict:
+    """What Box said about a bearer token, and until when it is trusted."""
+
+    valid: bool
+    user_id: Optional[str]
+    expires_at: float
+
+
+class BoxTokenValidator:
+    """
+    Check Box bearer tokens against users/me, once per token and TTL.
+
+    Verdicts are cached by the SHA-256 digest of the token, so tokens are never
+    kept in memory. Concurrent requests with a new token share one check. Only
+    a 401 from Box rejects a token: when Box cannot be reached or fails, the
+    request is let through without caching anything, and the tools report the
+    error as before.
+
+    Args:
+        config: McpAuthConfig with the TTL and size of the cache
+        transport: Optional httpx transport to reach Box, overridable for tests
+        clock: Monotonic time source, overridable for tests
+    """
+
+    def __init__(
+        self,
+        config: "McpAuthConfig",
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = config.token_validation_ttl
+        self._transport = transport
+        self._clock = clock
+        self._client: Optional[httpx.AsyncClient] = None
+        self._verdicts: LRUCache[TokenVerdict] = LRUCache(
+            max_entries=config.token_validation_max_entries, ttl=self.ttl, clock=clock
+        )
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.checks = 0
+        self.rejected = 0
+        self.unavailable = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    async def verify(self, token: str) -> Optional[TokenVerdict]:
+        """
+        Get the verdict of Box on a token, from the cache or from users/me.
+
+        Returns:
+            Optional[TokenVerdict]: The verdict with the Box user ID of a valid
+                token, None if Box could not be asked
+        """
+        key = self._key(token)
+        verdict = self._verdicts.get(key)
+        if verdict is None or verdict.expires_at <= self._clock():
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = asyncio.ensure_future(self._check(key, token))
+                self._pending[key] = pending
+                pending.add_done_callback(lambda _: self._pending.pop(key, None))
+            verdict = await asyncio.shield(pending)
+        return verdict
+
+    async def validate(self, scope) -> Optional[JSONResponse]:
+        """
+        Validate the OAuth token of a request, already extracted into its scope.
+
+        The Box user ID of a valid token is stored in the scope as "box_user_id",
+        for the tools to read through BoxRequestContext.
+
+        Returns:
+            Optional[JSONResponse]: Error response if Box rejected the token, None otherwise
+        """
+        verdict = await self.verify(scope["oauth_token"])
+        if verdict is None:
+            return None
+        if not verdict.valid:
+            logger.warning(
+                f"[Token] Box rejected the token for {scope['method']} {scope['path']}"
+            )
+            return unauthorized(
+                "invalid_token", "The access token is invalid or expired"
+            )
+        scope["box_user_id"] = verdict.user_id
+        return None
+
+    async def _check(self, key: str, token: str) -> Optional[TokenVerdict]:
+        """Ask Box who the token belongs to, None if Box did not answer."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(transport=self._transport)
+        self.checks += 1
+        try:
+            response = await self._client.get(
+                BOX_USERS_ME_URL,
+                params={"fields": "id"},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+        except httpx.HTTPError as e:
+            self.unavailable += 1
+            logger.warning(f"Could not validate the token with Box: {e}")
+            return None
+
+        if response.status_code == 401:
+            self.rejected += 1
+            verdict = TokenVerdict(False, None, self._clock() + self.ttl)
+        elif response.status_code == 200:
+            try:
+                user_id = response.json().get("id")
+            except ValueError:
+                user_id = None
+            verdict = TokenVerdict(True, user_id, self._clock() + self.ttl)
+        else:
+            self.unavailable += 1
+            logger.warning(
+                f"Could not validate the token with Box: status {response.status_code}"
+            )
+            return None
+        self._verdicts.put(key, verdict)
+        return verdict
+
+    async def aclose(self) -> None:
+        """Close the connections to Box, they are reopened by the next check."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Cached verdicts and the outcome of the checks with Box."""
+        stats = self._verdicts.stats()
+        stats.update(
+            checks=self.checks, rejected=self.rejected, unavailable=self.unavailable
+        )
+        return stats
+
+
+_token_validator: Optional[BoxTokenValidator] = None
+
+
+def configure_token_validator(config: McpAuthConfig) -> Optional[BoxTokenValidator]:
+    """Create the process wide validator of the Box tokens, None when disabled."""
+    global _token_validator
+    _token_validator = BoxTokenValidator(config) if config.validate_box_tokens else None
+    return _token_validator
+
+
+def get_token_validator() -> Optional[BoxTokenValidator]:
+    """Get the process wide validator of the Box tokens, None when disabled."""
+    return _token_validator
@@ -92,7 +92,11 @@ def main() -> int:
     )
 
     # Register all tools
-    register_tools(mcp)
+    register_tools(
+        mcp,
+        execution_config=app_config.execution,
+        observability_config=app_config.observability,
+    )
 
     # Register server info tool
     create_server_info_tool(mcp, config=app_config.server)
@@ -0,0 +1,483 @@
+"""Prometheus metrics of the tool calls, the Box API requests and the caches.
+
+Tools are instrumented once, by the wrapper ``register_all_tools`` applies to
+every tool, and the Box API requests by the network layers. The thread pools,
+caches and rate limiters are read when ``/metrics`` is scraped. The metrics are rendered in
+the Prometheus text exposition format, so no client library is needed.
+"""
+
+import functools
+import itertools
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+
+from tool_executor import get_tool_executor
+
+logger = logging.getLogger(__name__)
+
+METRICS_PATH = "/metrics"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Tool calls range from a cached read to a Box AI answer over many files
+TOOL_BUCKETS = (
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+BOX_API_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Metrics of the tool pools, by the key of the pool stats they read
+POOL_METRICS = (
+    (
+        "box_mcp_tool_pool_workers",
+        "gauge",
+        "Worker threads of the tool pool",
+        "max_workers",
+    ),
+    ("box_mcp_tool_pool_active", "gauge", "Tool calls running on the pool", "active"),
+    ("box_mcp_tool_pool_queued", "gauge", "Tool calls waiting for a worker", "queued"),
+    (
+        "box_mcp_tool_pool_saturation",
+        "gauge",
+        "Share of the pool workers busy",
+        "saturation",
+    ),
+    (
+        "box_mcp_tool_pool_rejected_total",
+        "counter",
+        "Tool calls rejected by the queue",
+        "rejected",
+    ),
+)
+
+# Metrics of the Box API rate limiters, by the key of the rate limiter stats they read
+RATE_LIMIT_METRICS = (
+    (
+        "box_mcp_rate_limit_throttled_total",
+        "Box API responses throttled with a 429",
+        "throttled",
+    ),
+    (
+        "box_mcp_rate_limit_waits_total",
+        "Box API requests delayed by a rate limiter",
+        "waits",
+    ),
+    (
+        "box_mcp_rate_limit_wait_seconds_total",
+        "Time Box API requests waited for a rate limiter",
+        "wait_seconds",
+    ),
+)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _sample(name: str, label_names: Labels, labels: Labels, value: float) -> str:
+    if not label_names:
+        return f"{name} {_format_value(value)}"
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(label_names, labels))
+    return f"{name}{{{pairs}}} {_format_value(value)}"
+
+
+def _family(
+    name: str,
+    kind: str,
+    documentation: str,
+    label_names: Labels,
+    samples: List[Tuple[Labels, float]],
+) -> List[str]:
+    """Render a metric family whose samples are computed at scrape time."""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    lines.extend(_sample(name, label_names, labels, value) for labels, value in samples)
+    return lines
+
+
+class _Metric:
+    """A metric family whose samples are keyed by their label values."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Labels = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        self._values: Dict[Labels, Any] = {}
+
+    def _header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = self._header()
+        lines.extend(
+            _sample(self.name, self.label_names, labels, v) for labels, v in values
+        )
+        return lines
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Labels = (),
+        buckets: Tuple[float, ...] = TOOL_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # Per bucket counts, then the sum and count of the observations
+                state = [[0] * len(self.buckets), 0.0, 0]
+                self._values[labels] = state
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            state = self._values.get(labels)
+            return state[2] if state is not None else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(
+                (labels, (list(state[0]), state[1], state[2]))
+                for labels, state in self._values.items()
+            )
+        lines = self._header()
+        names = self.label_names + ("le",)
+        for labels, (counts, total, count) in values:
+            for bound, cumulative in zip(self.buckets, itertools.accumulate(counts)):
+                bucket = labels + (_format_value(bound),)
+                lines.append(_sample(f"{self.name}_bucket", names, bucket, cumulative))
+            lines.append(
+                _sample(f"{self.name}_bucket", names, labels + ("+Inf",), count)
+            )
+            lines.append(_sample(f"{self.name}_sum", self.label_names, labels, total))
+            lines.append(_sample(f"{self.name}_count", self.label_names, labels, count))
+        return lines
+
+
+def box_api_endpoint(path: str) -> str:
+    """Box API path with the object IDs replaced, to bound the label values.
+
+    e.g. ``/2.0/files/12345/content`` becomes ``/2.0/files/{id}/content``.
+    Upload session IDs, which are long hexadecimal strings, are replaced too.
+    """
+    segments = []
+    for segment in path.split("/"):
+        if segment.isdigit() or (
+            len(segment) >= 16
+            and segment.isalnum()
+            and any(c.isdigit() for c in segment)
+        ):
+            segment = "{id}"
+        segments.append(segment)
+    return "/".join(segments)
+
+
+class ServerMetrics:
+    """The metrics of the server process."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self.tool_calls = Counter(
+            "box_mcp_tool_calls_total", "Tool calls completed", ("tool",)
+        )
+        self.tool_errors = Counter(
+            "box_mcp_tool_errors_total",
+            "Tool calls that raised or returned an error",
+            ("tool",),
+        )
+        self.tool_duration = Histogram(
+            "box_mcp_tool_duration_seconds",
+            "Tool call latency, including the wait for a worker",
+            ("tool",),
+            TOOL_BUCKETS,
+        )
+        self.tool_in_flight = Gauge(
+            "box_mcp_tool_calls_in_flight", "Tool calls in progress", ("tool",)
+        )
+        self.box_api_duration = Histogram(
+            "box_mcp_box_api_request_duration_seconds",
+            "Box API request latency, until the response headers",
+            ("method", "endpoint", "status"),
+            BOX_API_BUCKETS,
+        )
+        self.box_api_in_flight = Gauge(
+            "box_mcp_box_api_requests_in_flight", "Box API requests in progress"
+        )
+        self._lock = threading.Lock()
+        self._cache_sources: Dict[int, Callable[[], Dict[str, Dict[str, Any]]]] = {}
+        self._retired_caches: Dict[str, Dict[str, float]] = {}
+        self._rate_limit_sources: Dict[int, Callable[[], Dict[str, Any]]] = {}
+        self._retired_rate_limits: Dict[str, float] = {
+            key: 0 for *_, key in RATE_LIMIT_METRICS
+        }
+        self._handles = itertools.count()
+
+    def wrap_tool(self, fn: Callable) -> Callable:
+        """Wrap a tool so its calls, errors and latency are recorded.
+
+        The wrapped tool must be a coroutine function, which every tool is
+        once wrapped by the tool executor. Tools report Box errors by
+        returning a dictionary with an "error" key, which counts as an error.
+        """
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        async def instrumented(*args: Any, **kwargs: Any) -> Any:
+            self.tool_in_flight.inc(name)
+            start = self._clock()
+            failed = True
+            try:
+                result = await fn(*args, **kwargs)
+                failed = isinstance(result, dict) and "error" in result
+                return result
+            finally:
+                self.tool_in_flight.dec(name)
+                self.tool_duration.observe(self._clock() - start, name)
+                self.tool_calls.inc(name)
+                if failed:
+                    self.tool_errors.inc(name)
+
+        return instrumented
+
+    def box_api_request_started(self) -> float:
+        """Record the start of a Box API request, returning its start time."""
+        self.box_api_in_flight.inc()
+        return self._clock()
+
+    def box_api_request_finished(
+        self, started: float, method: str, path: str, status: Optional[int]
+    ) -> None:
+        """Record a Box API request, with no status when no response was received."""
+        self.box_api_in_flight.dec()
+        self.box_api_duration.observe(
+            self._clock() - started,
+            method.upper(),
+            box_api_endpoint(path),
+            str(status) if status is not None else "error",
+        )
+
+    def track_caches(self, source: Callable[[], Dict[str, Dict[str, Any]]]) -> int:
+        """Export the counters of the caches a source reports, until released.
+
+        Returns:
+            int: Handle to pass to ``release_caches``
+        """
+        with self._lock:
+            handle = next(self._handles)
+            self._cache_sources[handle] = source
+            return handle
+
+    def release_caches(self, handle: int) -> None:
+        """Stop reading a cache source, keeping its final counts in the totals."""
+        with self._lock:
+            source = self._cache_sources.pop(handle, None)
+        if source is None:
+            return
+        final = source()
+        with self._lock:
+            for cache, stats in final.items():
+                retired = self._retired_caches.setdefault(
+                    cache, {"hits": 0, "misses": 0}
+                )
+                retired["hits"] += stats.get("hits", 0)
+                retired["misses"] += stats.get("misses", 0)
+
+    def track_rate_limits(self, source: Callable[[], Dict[str, Any]]) -> int:
+        """Export the counters of the rate limiters a source reports, until released.
+
+        Returns:
+            int: Handle to pass to ``release_rate_limits``
+        """
+        with self._lock:
+            handle = next(self._handles)
+            self._rate_limit_sources[handle] = source
+            return handle
+
+    def release_rate_limits(self, handle: int) -> None:
+        """Stop reading a rate limiter source, keeping its final counts in the totals."""
+        with self._lock:
+            source = self._rate_limit_sources.pop(handle, None)
+        if source is None:
+            return
+        final = source()
+        with self._lock:
+            for key in self._retired_rate_limits:
+                self._retired_rate_limits[key] += final.get(key, 0)
+
+    def _cache_totals(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            totals = {
+                cache: dict(counts) for cache, counts in self._retired_caches.items()
+            }
+            sources = list(self._cache_sources.values())
+        for source in sources:
+            for cache, stats in source().items():
+                if "hits" not in stats:
+                    continue
+                counts = totals.setdefault(cache, {"hits": 0, "misses": 0})
+                counts["hits"] += stats.get("hits", 0)
+                counts["misses"] += stats.get("misses", 0)
+        return totals
+
+    def _render_caches(self) -> List[str]:
+        totals = sorted(self._cache_totals().items())
+        ratios = [
+            (
+                cache,
+                c["hits"] / (c["hits"] + c["misses"])
+                if c["hits"] + c["misses"]
+                else 0.0,
+            )
+            for cache, c in totals
+        ]
+        return (
+            _family(
+                "box_mcp_cache_hits_total",
+                "counter",
+                "Cache lookups that found an entry",
+                ("cache",),
+                [((cache,), c["hits"]) for cache, c in totals],
+            )
+            + _family(
+                "box_mcp_cache_misses_total",
+                "counter",
+                "Cache lookups that found no entry",
+                ("cache",),
+                [((cache,), c["misses"]) for cache, c in totals],
+            )
+            + _family(
+                "box_mcp_cache_hit_ratio",
+                "gauge",
+                "Share of the cache lookups that found an entry",
+                ("cache",),
+                [((cache,), ratio) for cache, ratio in ratios],
+            )
+        )
+
+    def _render_rate_limits(self) -> List[str]:
+        with self._lock:
+            totals = dict(self._retired_rate_limits)
+            sources = list(self._rate_limit_sources.values())
+        for source in sources:
+            stats = source()
+            for key in totals:
+                totals[key] += stats.get(key, 0)
+        lines: List[str] = []
+        for name, documentation, key in RATE_LIMIT_METRICS:
+            lines += _family(name, "counter", documentation, (), [((), totals[key])])
+        return lines
+
+    @staticmethod
+    def _render_pools() -> List[str]:
+        pools = sorted(get_tool_executor().stats().items())
+        lines: List[str] = []
+        for name, kind, documentation, key in POOL_METRICS:
+            samples = [((pool,), stats[key]) for pool, stats in pools]
+            lines += _family(name, kind, documentation, ("pool",), samples)
+        return lines
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in (
+            self.tool_calls,
+            self.tool_errors,
+            self.tool_duration,
+            self.tool_in_flight,
+            self.box_api_duration,
+            self.box_api_in_flight,
+        ):
+            lines += metric.render()
+        lines += self._render_pools()
+        lines += self._render_caches()
+        lines += self._render_rate_limits()
+        return "\n".join(lines) + "\n"
+
+
+_metrics: Optional[ServerMetrics] = None
+
+
+def configure_metrics(enabled: bool) -> Optional[ServerMetrics]:
+    """Create the process wide metrics, or disable them."""
+    global _metrics
+    _metrics = ServerMetrics() if enabled else None
+    logger.info(f"Metrics {'enabled' if enabled else 'disabled'}")
+    return _metrics
+
+
+def get_metrics() -> Optional[ServerMetrics]:
+    """Get the process wide metrics, None when they are disabled."""
+    return _metrics
+
+
+async def metrics_handler(request: Request) -> Response:
+    """Serve the metrics to a Prometheus scraper."""
+    metrics = get_metrics()
+    if metrics is None:
+        return PlainTextResponse("Metrics are disabled", status_code=404)
+    return Response(metrics.render(), headers={"Content-Type": CONTENT_TYPE})
@@ -1,13 +1,20 @@
 """Authentication middleware for MCP server."""
 
 import logging
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Callable, Optional
 
 from mcp.server.fastmcp import FastMCP
+from starlette.applications import Starlette
 from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse
 
 from config import AppConfig, BoxAuthType, McpAuthType, TransportType
 from mcp_auth.auth_box import box_auth_validate_token
+from mcp_auth.auth_box_validation import configure_token_validator, get_token_validator
 from mcp_auth.auth_token import auth_validate_token
+from metrics import METRICS_PATH
 from oauth_endpoints import add_oauth_endpoints
 
 logger = logging.getLogger(__name__)
@@ -20,7 +27,7 @@ class AuthMiddleware:
     """
 
     # OAuth discovery endpoints that must be publicly accessible (no auth required)
-    PUBLIC_PATHS = {
+    PUBLIC_PATHS = frozenset({
         "/.well-known/oauth-protected-resource",
         "/.well-known/oauth-protected-resource/mcp",
         "/.well-known/oauth-protected-resource/sse",
@@ -29,17 +36,52 @@ class AuthMiddleware:
         "/.well-known/oauth-authorization-server/sse",
         "/oauth/register",
         # "/.well-known/openid-configuration",
-    }
+    })
 
     def __init__(self, app, app_config: AppConfig):
         self.app = app
         self.app_config = app_config
         self.mcp_auth_type = McpAuthType(app_config.server.mcp_auth_type)
+        self.box_auth = BoxAuthType(app_config.server.box_auth)
         self.www_header = {
             # "WWW-Authenticate": f'Bearer realm="OAuth", resource_metadata="http://{self.app_config.server.host}:{self.app_config.server.port}/.well-known/oauth-protected-resource"'
             # "WWW-Authenticate": f'Bearer realm="OAuth", resource_metadata="https://{self.app_config.server.host}/.well-known/oauth-protected-resource"'
             "WWW-Authenticate": 'Bearer realm="OAuth", resource_metadata="/.well-known/oauth-protected-resource"'
         }
+        self.public_paths = self.PUBLIC_PATHS
+        if app_config.observability.metrics_public:
+            self.public_paths = self.PUBLIC_PATHS | {METRICS_PATH}
+        # The validation of every request only depends on the configuration, so choose it once
+        self.validate = self._select_validation()
+        # Optional check of the Box tokens with Box itself
+        self.token_validator = None
+        if self.validate is box_auth_validate_token:
+            self.token_validator = configure_token_validator(app_config.mcp_auth)
+            if self.token_validator is not None:
+                logger.info("Box bearer tokens are validated with Box before reaching the tools")
+
+    def _select_validation(self) -> Optional[Callable[[dict], Optional[JSONResponse]]]:
+        """The token validation of the configured auth types, None if there is none."""
+        if self.mcp_auth_type == McpAuthType.TOKEN:
+            logger.debug("MCP auth type is TOKEN, performing token authentication")
+            auth_token = self.app_config.mcp_auth.auth_token
+            return partial(
+                auth_validate_token,
+                config=self.app_config.mcp_auth,
+                expected_token=auth_token.encode("utf-8") if auth_token else None,
+            )
+
+        if self.mcp_auth_type == McpAuthType.OAUTH:
+            logger.debug("MCP auth type is OAUTH, performing OAuth authentication")
+            return box_auth_validate_token
+
+        if self.box_auth == BoxAuthType.MCP_CLIENT:
+            logger.debug("MCP auth type is NONE, box auth type is MCP_CLIENT, skipping expecting an authorization header")
+            return box_auth_validate_token
+
+        # If no authentication required, pass through
+        logger.debug("MCP auth type is NONE, skipping authentication")
+        return None
 
     async def __call__(self, scope, receive, send):
         """Pure ASGI middleware - handles streaming properly."""
@@ -48,33 +90,24 @@ class AuthMiddleware:
             return
 
         path = scope["path"]
-        logger.debug(f"AuthMiddleware processing: {scope['method']} {path}")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(f"AuthMiddleware processing: {scope['method']} {path}")
 
         # Allow public OAuth discovery endpoints without authentication
-        if path in self.PUBLIC_PATHS:
-            logger.debug(f"Public OAuth discovery endpoint accessed: {path}")
+        if path in self.public_paths:
+            if debug:
+                logger.debug(f"Public OAuth discovery endpoint accessed: {path}")
             await self.app(scope, receive, send)
             return
 
-        # If no authentication required, pass through
-        if self.mcp_auth_type == McpAuthType.NONE and self.app_config.server.box_auth != BoxAuthType.MCP_CLIENT:
-            logger.debug("MCP auth type is NONE, skipping authentication")
+        if self.validate is None:
             await self.app(scope, receive, send)
             return
 
-        error_response = None
-
-        if self.mcp_auth_type == McpAuthType.NONE and self.app_config.server.box_auth == BoxAuthType.MCP_CLIENT:
-            logger.debug("MCP auth type is NONE, box auth type is MCP_CLIENT, skipping expecting an authorization header")
-            error_response = box_auth_validate_token(scope=scope)
-
-        if self.mcp_auth_type == McpAuthType.TOKEN:
-            logger.debug("MCP auth type is TOKEN, performing token authentication")
-            error_response = auth_validate_token(scope=scope, config=self.app_config.mcp_auth)
-
-        if self.mcp_auth_type == McpAuthType.OAUTH:
-            logger.debug("MCP auth type is OAUTH, performing OAuth authentication")
-            error_response = box_auth_validate_token(scope=scope)
+        error_response = self.validate(scope)
+        if error_response is None and self.token_validator is not None:
+            error_response = await self.token_validator.validate(scope)
 
         # If there's an error, send error response
         if error_response is not None:
@@ -84,12 +117,30 @@ class AuthMiddleware:
             return
 
         # Authentication successful, pass to next layer
-        logger.debug(
-            f"[Middleware]Authentication successful for {scope['method']} {path}"
-        )
+        if debug:
+            logger.debug(
+                f"[Middleware]Authentication successful for {scope['method']} {path}"
+            )
         await self.app(scope, receive, send)
 
 
+def close_token_validator_on_shutdown(app: Starlette) -> None:
+    """Close the connections of the Box token validator when the app shuts down."""
+    lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan_closing_validator(app):
+        async with lifespan(app) as state:
+            try:
+                yield state
+            finally:
+                token_validator = get_token_validator()
+                if token_validator is not None:
+                    await token_validator.aclose()
+
+    app.router.lifespan_context = lifespan_closing_validator
+
+
 def add_auth_middleware(
     mcp: FastMCP,
     app_config: AppConfig,
@@ -130,10 +181,16 @@ def add_auth_middleware(
                 allow_origins=["*"],
                 allow_credentials=False,
                 allow_methods=["GET", "POST", "OPTIONS"],
-                allow_headers=["Mcp-Protocol-Version", "Content-Type", "Authorization"],
+                allow_headers=[
+                    "Mcp-Protocol-Version",
+                    "Content-Type",
+                    "Authorization",
+                    "traceparent",
+                ],
                 expose_headers=["WWW-Authenticate"],
                 max_age=86400,
             )
+            close_token_validator_on_shutdown(app)
             return app
 
         # Replace the method with our wrapper
@@ -165,10 +222,16 @@ def add_auth_middleware(
                 allow_origins=["*"],
                 allow_credentials=False,
                 allow_methods=["GET", "POST", "OPTIONS"],
-                allow_headers=["Mcp-Protocol-Version", "Content-Type", "Authorization"],
+                allow_headers=[
+                    "Mcp-Protocol-Version",
+                    "Content-Type",
+                    "Authorization",
+                    "traceparent",
+                ],
                 expose_headers=["WWW-Authenticate"],
                 max_age=86400,
             )
+            close_token_validator_on_shutdown(app)
             return app
 
         mcp.streamable_http_app = wrapped_streamable_http_app
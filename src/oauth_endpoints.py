@@ -1,18 +1,52 @@
 """OAuth 2.1 discovery endpoints for MCP server."""
 
+import asyncio
 import json
 import logging
+import os
+import time
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable, Optional
 
+import httpx
 from fastapi import Request
 from httpx import AsyncClient
 from starlette.responses import JSONResponse
 
 from config import AppConfig
+from metrics import METRICS_PATH, metrics_handler
 
 logger = logging.getLogger(__name__)
 
+BOX_AUTHORIZATION_SERVER_METADATA_URL = (
+    "https://account.box.com/.well-known/oauth-authorization-server"
+)
+
+# Seconds before a failed fetch of Box's metadata is retried
+METADATA_RETRY_DELAY = 30.0
+
+
+def cache_control_max_age(cache_control: Optional[str]) -> Optional[float]:
+    """Seconds a response may be cached according to its Cache-Control header.
+
+    Returns:
+        Optional[float]: The max-age, 0 for no-store or no-cache, or None
+            when the header does not say.
+    """
+    if not cache_control:
+        return None
+    for directive in cache_control.lower().split(","):
+        name, _, value = directive.strip().partition("=")
+        if name in ("no-store", "no-cache"):
+            return 0.0
+        if name == "max-age":
+            try:
+                return max(0.0, float(value.strip('"')))
+            except ValueError:
+                return None
+    return None
+
 
 def load_protected_resource_metadata(config_file: str) -> dict:
     """
@@ -45,8 +79,91 @@ def load_protected_resource_metadata(config_file: str) -> dict:
         return {}
 
 
-def create_oauth_protected_resource_handler(app_config: AppConfig):
+# Answer to the CORS preflight requests of the discovery endpoints
+CORS_PREFLIGHT_RESPONSE = JSONResponse(
+    status_code=200,
+    content={},
+    headers={
+        "Access-Control-Allow-Origin": "*",
+        "Access-Control-Allow-Methods": "GET, OPTIONS",
+        "Access-Control-Allow-Headers": "*",
+    },
+)
+
+PROTECTED_RESOURCE_NOT_CONFIGURED_RESPONSE = JSONResponse(
+    status_code=500,
+    content={
+        "error": "server_error",
+        "error_description": "OAuth Protected Resource metadata not configured",
+    },
+    headers={
+        "Access-Control-Allow-Origin": "*",
+    },
+)
+
+
+class ProtectedResourceMetadata:
+    """The OAuth Protected Resource metadata file, reloaded when it changes.
+
+    The file is only parsed again when its modification time or size
+    changed, and its response is rendered once per load, so every request
+    in between gets the same response object.
+
+    Args:
+        config_file: Path to the OAuth protected resource config file.
+    """
+
+    def __init__(self, config_file: str):
+        self.config_file = config_file
+        # (modification time, size) of the loaded file, None if it was missing
+        self.version: Optional[tuple] = None
+        self.metadata: dict = {}
+        self.response: Optional[JSONResponse] = None
+        self._loaded = False
+        self.loads = 0
+
+    def _file_version(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.config_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def refresh(self) -> None:
+        """Reload the file if it changed since it was loaded."""
+        version = self._file_version()
+        if self._loaded and version == self.version:
+            return
+        self.metadata = load_protected_resource_metadata(self.config_file)
+        self.version = version
+        self._loaded = True
+        self.loads += 1
+        self.response = None
+        if self.metadata:
+            self.response = JSONResponse(
+                status_code=200,
+                content=self.metadata,
+                headers={
+                    "Content-Type": "application/json",
+                    "Cache-Control": "public, max-age=3600",  # Cache for 1 hour
+                    "Access-Control-Allow-Origin": "*",
+                },
+            )
+
+    def get_response(self) -> Optional[JSONResponse]:
+        """Get the rendered metadata, or None if it is not configured."""
+        self.refresh()
+        return self.response
+
+
+def create_oauth_protected_resource_handler(
+    app_config: AppConfig, resource_metadata: Optional[ProtectedResourceMetadata] = None
+):
     """Create handler with app_config closure."""
+    resource_metadata = resource_metadata or ProtectedResourceMetadata(
+        app_config.mcp_auth.oauth_protected_resources_config_file
+    )
+
     async def oauth_protected_resource_handler(request: Request) -> JSONResponse:
         """
         RFC 9728: OAuth 2.0 Protected Resource Metadata endpoint.
@@ -58,41 +175,12 @@ def create_oauth_protected_resource_handler(app_config: AppConfig):
         """
         # Handle OPTIONS preflight request
         if request.method == "OPTIONS":
-            return JSONResponse(
-                status_code=200,
-                content={},
-                headers={
-                    "Access-Control-Allow-Origin": "*",
-                    "Access-Control-Allow-Methods": "GET, OPTIONS",
-                    "Access-Control-Allow-Headers": "*",
-                },
-            )
+            return CORS_PREFLIGHT_RESPONSE
 
-        metadata = load_protected_resource_metadata(
-            app_config.mcp_auth.oauth_protected_resources_config_file
-        )
-
-        if not metadata:
-            return JSONResponse(
-                status_code=500,
-                content={
-                    "error": "server_error",
-                    "error_description": "OAuth Protected Resource metadata not configured",
-                },
-                headers={
-                    "Access-Control-Allow-Origin": "*",
-                },
-            )
-
-        return JSONResponse(
-            status_code=200,
-            content=metadata,
-            headers={
-                "Content-Type": "application/json",
-                "Cache-Control": "public, max-age=3600",  # Cache for 1 hour
-                "Access-Control-Allow-Origin": "*",
-            },
-        )
+        response = resource_metadata.get_response()
+        if response is None:
+            return PROTECTED_RESOURCE_NOT_CONFIGURED_RESPONSE
+        return response
 
     return oauth_protected_resource_handler
 
@@ -106,15 +194,7 @@ async def openid_configuration_handler(request: Request) -> JSONResponse:
     """
     # Handle OPTIONS preflight request
     if request.method == "OPTIONS":
-        return JSONResponse(
-            status_code=200,
-            content={},
-            headers={
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, OPTIONS",
-                "Access-Control-Allow-Headers": "*",
-            },
-        )
+        return CORS_PREFLIGHT_RESPONSE
 
     return JSONResponse(
         status_code=404,
@@ -132,28 +212,109 @@ async def openid_configuration_handler(request: Request) -> JSONResponse:
     )
 
 
-def create_oauth_authorization_server_handler(app_config: AppConfig):
-    """Create handler with app_config closure."""
-    async def oauth_authorization_server_handler(request: Request) -> JSONResponse:
-        """
-        This end point provides works around the Box API not having dynamic client registration
-        It first gets the Box's metadata from https://account.box.com/.well-known/oauth-authorization-server
-        and if the returned json it does not contain the "registration_endpoint" field, it adds it to the response.
-        This "registration_endpoint" field is required for dynamic client registration, and will point to another endpoint
-        in this server that will handle client registration.
-        """
-        # Get Box's OAuth Authorization Server metadata
+class AuthorizationServerMetadataCache:
+    """Box's OAuth authorization server metadata, completed for this server.
 
-        async with AsyncClient() as client:
-            box_response = await client.get(
-                "https://account.box.com/.well-known/oauth-authorization-server"
-            )
-        box_metadata = box_response.json()
-        metadata = load_protected_resource_metadata(
+    Box's metadata is fetched once and served from memory until it expires,
+    after the max-age of its Cache-Control header or else the configured
+    TTL. Expired metadata is revalidated with its ETag in the background while
+    it is still served, unless it expired more than ``max_stale`` seconds ago,
+    in which case requests wait for the revalidation. Concurrent requests
+    share one fetch. The completed response is rendered once per change of
+    Box's metadata or of the protected resource metadata, and the same
+    response object is returned to every request.
+
+    Args:
+        app_config: Application configuration, with the protected resource
+            config file and the TTLs.
+        transport: Optional httpx transport to reach Box, overridable for tests.
+        clock: Monotonic time source, overridable for tests.
+        resource_metadata: The protected resource metadata, shared with its endpoint.
+    """
+
+    def __init__(
+        self,
+        app_config: AppConfig,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        clock: Callable[[], float] = time.monotonic,
+        resource_metadata: Optional[ProtectedResourceMetadata] = None,
+    ):
+        self.resource_metadata = resource_metadata or ProtectedResourceMetadata(
             app_config.mcp_auth.oauth_protected_resources_config_file
         )
-
-        # logger.debug(f"Box OAuth Authorization Server metadata: {request}")
+        self.ttl = app_config.mcp_auth.oauth_metadata_ttl
+        self.max_stale = app_config.mcp_auth.oauth_metadata_max_stale
+        self._transport = transport
+        self._clock = clock
+        self._box_metadata: Optional[dict] = None
+        self._response: Optional[JSONResponse] = None
+        # Loads of the protected resource metadata the response was rendered with
+        self._rendered_loads = 0
+        self._etag: Optional[str] = None
+        self._expires_at = 0.0
+        self._refresh: Optional[asyncio.Future] = None
+        self.fetches = 0
+        self.not_modified = 0
+        self.errors = 0
+
+    async def get_response(self) -> Optional[JSONResponse]:
+        """Get the completed metadata response, or None if Box could never be reached."""
+        now = self._clock()
+        if self._response is None:
+            await self._revalidate()
+        elif now >= self._expires_at:
+            if now - self._expires_at > self.max_stale:
+                await self._revalidate()
+            else:
+                self._start_revalidation()
+        if self._box_metadata is not None:
+            self.resource_metadata.refresh()
+            if self.resource_metadata.loads != self._rendered_loads:
+                self._response = self._render(self._box_metadata)
+        return self._response
+
+    def _start_revalidation(self) -> asyncio.Future:
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.ensure_future(self._fetch())
+        return self._refresh
+
+    async def _revalidate(self) -> None:
+        # Shielded, so a cancelled request does not cancel the fetch of the others
+        await asyncio.shield(self._start_revalidation())
+
+    async def _fetch(self) -> None:
+        """Fetch Box's metadata, conditionally when it was fetched before."""
+        headers = {}
+        if self._response is not None and self._etag:
+            headers["If-None-Match"] = self._etag
+        self.fetches += 1
+        try:
+            async with AsyncClient(transport=self._transport) as client:
+                box_response = await client.get(
+                    BOX_AUTHORIZATION_SERVER_METADATA_URL, headers=headers
+                )
+            if box_response.status_code == 304 and self._response is not None:
+                self.not_modified += 1
+            else:
+                box_response.raise_for_status()
+                self._box_metadata = box_response.json()
+                self.resource_metadata.refresh()
+                self._response = self._render(self._box_metadata)
+                self._etag = box_response.headers.get("etag")
+                logger.info("Fetched Box OAuth Authorization Server metadata")
+        except (httpx.HTTPError, ValueError) as e:
+            self.errors += 1
+            logger.error(f"Could not fetch Box OAuth Authorization Server metadata: {e}")
+            self._expires_at = self._clock() + min(self.ttl, METADATA_RETRY_DELAY)
+            return
+        max_age = cache_control_max_age(box_response.headers.get("cache-control"))
+        self._expires_at = self._clock() + (self.ttl if max_age is None else max_age)
+
+    def _render(self, box_metadata: dict) -> JSONResponse:
+        """Complete Box's metadata for this server and render the response."""
+        box_metadata = dict(box_metadata)
+        metadata = self.resource_metadata.metadata
+        self._rendered_loads = self.resource_metadata.loads
 
         # Add registration_endpoint if missing
         if "registration_endpoint" not in box_metadata:
@@ -175,6 +336,44 @@ def create_oauth_authorization_server_handler(app_config: AppConfig):
             },
         )
 
+
+def create_oauth_authorization_server_handler(
+    app_config: AppConfig,
+    metadata_cache: Optional[AuthorizationServerMetadataCache] = None,
+    resource_metadata: Optional[ProtectedResourceMetadata] = None,
+):
+    """Create handler with app_config closure."""
+    metadata_cache = metadata_cache or AuthorizationServerMetadataCache(
+        app_config, resource_metadata=resource_metadata
+    )
+
+    async def oauth_authorization_server_handler(request: Request) -> JSONResponse:
+        """
+        This end point provides works around the Box API not having dynamic client registration
+        It first gets the Box's metadata from https://account.box.com/.well-known/oauth-authorization-server
+        and if the returned json it does not contain the "registration_endpoint" field, it adds it to the response.
+        This "registration_endpoint" field is required for dynamic client registration, and will point to another endpoint
+        in this server that will handle client registration.
+        Box's metadata is cached, see AuthorizationServerMetadataCache.
+        """
+        # Handle OPTIONS preflight request
+        if request.method == "OPTIONS":
+            return CORS_PREFLIGHT_RESPONSE
+
+        response = await metadata_cache.get_response()
+        if response is None:
+            return JSONResponse(
+                status_code=502,
+                content={
+                    "error": "temporarily_unavailable",
+                    "error_description": "Box OAuth Authorization Server metadata unavailable",
+                },
+                headers={
+                    "Access-Control-Allow-Origin": "*",
+                },
+            )
+        return response
+
     return oauth_authorization_server_handler
 
 
@@ -234,9 +433,16 @@ def add_oauth_endpoints(app, app_config: AppConfig) -> None:
     """
     from starlette.routing import Route
 
-    # Create handlers with config closure
-    protected_resource_handler = create_oauth_protected_resource_handler(app_config)
-    authorization_server_handler = create_oauth_authorization_server_handler(app_config)
+    # Create handlers with config closure, sharing the protected resource metadata
+    resource_metadata = ProtectedResourceMetadata(
+        app_config.mcp_auth.oauth_protected_resources_config_file
+    )
+    protected_resource_handler = create_oauth_protected_resource_handler(
+        app_config, resource_metadata
+    )
+    authorization_server_handler = create_oauth_authorization_server_handler(
+        app_config, resource_metadata=resource_metadata
+    )
 
     async def oauth_register_handler_with_config(request: Request) -> JSONResponse:
         return await oauth_register_handler(request, app_config)
@@ -280,6 +486,9 @@ def add_oauth_endpoints(app, app_config: AppConfig) -> None:
         ),
     ]
 
+    if app_config.observability.metrics_enabled:
+        oauth_routes.append(Route(METRICS_PATH, metrics_handler, methods=["GET"]))
+
     # Add routes to the app's router (insert at beginning for priority matching)
     for route in oauth_routes:
         app.router.routes.insert(0, route)
@@ -1,18 +1,31 @@
 """MCP server configuration and initialization."""
 
 from pathlib import Path
+from typing import cast
 
 import tomli
-from mcp.server.fastmcp import FastMCP
-
-from config import AppConfig, ServerConfig, TransportType
+from mcp.server.fastmcp import Context, FastMCP
+
+from box_api import configure_ai_batches, configure_folder_traversal, configure_uploads
+from config import (
+    AppConfig,
+    ExecutionConfig,
+    ObservabilityConfig,
+    ServerConfig,
+    TransportType,
+)
+from mcp_auth.auth_box_validation import get_token_validator
+from metrics import configure_metrics
 from middleware import add_auth_middleware
 from server_context import (
+    BoxContext,
     box_lifespan_ccg,
     box_lifespan_jwt,
     box_lifespan_mcp_oauth,
     box_lifespan_oauth,
 )
+from tool_coalescing import get_tool_coalescer
+from tool_executor import configure_tool_executor, get_tool_executor
 from tool_registry import register_all_tools
 from tool_registry.ai_tools import register_ai_tools
 from tool_registry.collaboration_tools import register_collaboration_tools
@@ -29,6 +42,7 @@ from tool_registry.shared_link_tools import register_shared_link_tools
 from tool_registry.tasks_tools import register_tasks_tools
 from tool_registry.user_tools import register_user_tools
 from tool_registry.web_link_tools import register_web_link_tools
+from tracing import configure_tracing
 
 
 def get_version() -> str:
@@ -59,17 +73,27 @@ def create_mcp_server(
     if app_config.server.box_auth == "oauth":
 
         def lifespan(server):
-            return box_lifespan_oauth(server, app_config.box_api)
+            return box_lifespan_oauth(
+                server, app_config.box_api, app_config.http, app_config.cache
+            )
     elif app_config.server.box_auth == "ccg":
 
         def lifespan(server):
-            return box_lifespan_ccg(server, app_config.box_api)
+            return box_lifespan_ccg(
+                server, app_config.box_api, app_config.http, app_config.cache
+            )
     elif app_config.server.box_auth == "jwt":
 
         def lifespan(server):
-            return box_lifespan_jwt(server, app_config.box_api)
+            return box_lifespan_jwt(
+                server, app_config.box_api, app_config.http, app_config.cache
+            )
     elif app_config.server.box_auth == "mcp_client":
-        lifespan = box_lifespan_mcp_oauth
+
+        def lifespan(server):
+            return box_lifespan_mcp_oauth(
+                server, app_config.box_api, app_config.http, app_config.cache
+            )
     else:
         raise ValueError(f"Unsupported Box auth type: {app_config.server.box_auth}")
 
@@ -90,8 +114,43 @@ def create_mcp_server(
     return mcp
 
 
-def register_tools(mcp: FastMCP) -> None:
-    """Register all tools with the MCP server."""
+def register_tools(
+    mcp: FastMCP,
+    execution_config: ExecutionConfig | None = None,
+    observability_config: ObservabilityConfig | None = None,
+) -> None:
+    """
+    Register all tools with the MCP server.
+
+    Every tool is wrapped so its blocking Box calls run on the tool executor
+    thread pools instead of the event loop. Identical concurrent calls of the
+    read-only tools are coalesced before they reach the pools. With metrics
+    or tracing enabled, the outermost wrappers record every call.
+
+    Args:
+        mcp: FastMCP server instance
+        execution_config: Thread pool and concurrency configuration of the tools
+        observability_config: Metrics and tracing configuration
+    """
+    execution_config = execution_config or ExecutionConfig()
+    observability_config = observability_config or ObservabilityConfig()
+    executor = configure_tool_executor(execution_config)
+    configure_ai_batches(execution_config.ai_batch_workers)
+    configure_folder_traversal(execution_config.folder_traversal_workers)
+    configure_uploads(
+        execution_config.chunked_upload_threshold,
+        execution_config.upload_workers,
+        execution_config.upload_allowed_dirs,
+    )
+    wrappers = [executor.wrap_tool]
+    if execution_config.coalesce_read_tools:
+        wrappers.append(get_tool_coalescer().wrap_tool)
+    metrics = configure_metrics(observability_config.metrics_enabled)
+    if metrics is not None:
+        wrappers.append(metrics.wrap_tool)
+    tracer = configure_tracing(observability_config)
+    if tracer is not None:
+        wrappers.append(tracer.wrap_tool)
     register_all_tools(
         mcp,
         [
@@ -111,6 +170,7 @@ def register_tools(mcp: FastMCP) -> None:
             register_shared_link_tools,
             register_tasks_tools,
         ],
+        wrappers=wrappers,
     )
 
 
@@ -121,7 +181,7 @@ def create_server_info_tool(
     """Create and register the server info tool."""
 
     @mcp.tool()
-    def mcp_server_info():
+    def mcp_server_info(ctx: Context):
         """Returns information about the MCP server."""
         info = {
             "server_name": mcp.name,
@@ -129,8 +189,18 @@ def create_server_info_tool(
             "transport": config.transport,
             "mcp auth": config.mcp_auth_type,
             "box auth": config.box_auth,
+            "tool pools": get_tool_executor().stats(),
+            "coalesced calls": get_tool_coalescer().stats(),
         }
 
+        box_context = cast(BoxContext, ctx.request_context.lifespan_context)
+        info.update(box_context.cache_stats())
+        if box_context.rate_limiters is not None:
+            info["rate limits"] = box_context.rate_limiters.stats()
+        token_validator = get_token_validator()
+        if token_validator is not None:
+            info["token validation"] = token_validator.stats()
+
         if config.transport != TransportType.STDIO.value:
             info["host"] = config.host
             info["port"] = str(config.port)
@@ -1,133 +1,456 @@
+import hashlib
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import AsyncIterator
+from typing import Any, AsyncIterator, Dict, Iterator
 
 from box_sdk_gen import BoxClient, BoxDeveloperTokenAuth
 from mcp.server.fastmcp import FastMCP
 from starlette.requests import Request
 
-from config import BoxApiConfig
+from box_api import BoxAsyncTransport, RateLimiterRegistry
+from box_api.observability import observe_client
+from cache import (
+    AiResultCache,
+    DiskTextCache,
+    LRUCache,
+    ObjectCache,
+    RangeCache,
+    TextCache,
+    UploadIndex,
+)
+from config import BoxApiConfig, CacheConfig, HttpConfig
 
 # from box_ai_agents_toolkit import BoxClient, get_ccg_client,get_oauth_client, get_jwt_client
-from mcp_auth.auth_box_api import get_ccg_client, get_jwt_client, get_oauth_client
+from mcp_auth.auth_box_api import (
+    add_extra_header_to_box_client,
+    get_ccg_client,
+    get_jwt_client,
+    get_oauth_client,
+)
+from metrics import get_metrics
 
 logger = logging.getLogger(__name__)
 
 
+def _close_box_client(_key: str, client: BoxClient) -> None:
+    """Close the HTTP session behind an evicted Box client."""
+    session = getattr(client.network_session.network_client, "requests_session", None)
+    if session is not None:
+        session.close()
+
+
+def _create_token_client(
+    token: str, rate_limiters: RateLimiterRegistry | None = None
+) -> BoxClient:
+    """Create a Box client for a bearer token, rate limited per token."""
+    logger.info("Creating Box client with OAuth token")
+    auth = BoxDeveloperTokenAuth(token=token)
+    client = add_extra_header_to_box_client(BoxClient(auth=auth))
+    return _rate_limited(client, rate_limiters)
+
+
+class BoxClientCache:
+    """Box clients per bearer token, so each token keeps its connection pool.
+
+    Tokens are only kept as SHA-256 digests. Clients unused for longer than
+    the idle TTL, or beyond the maximum number of entries, are closed.
+    """
+
+    def __init__(self, config: CacheConfig, rate_limiters: RateLimiterRegistry | None = None):
+        self.rate_limiters = rate_limiters
+        self._cache: LRUCache[BoxClient] = LRUCache(
+            max_entries=config.client_cache_max_entries,
+            ttl=config.client_cache_ttl,
+            on_evict=_close_box_client,
+        )
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get_or_create(self, token: str) -> BoxClient:
+        """Get the cached client for a token, creating it on a miss."""
+        key = self._key(token)
+        client = self._cache.get(key)
+        if client is None:
+            client = _create_token_client(token, self.rate_limiters)
+            self._cache.put(key, client)
+        return client
+
+    def expire(self) -> None:
+        self._cache.expire()
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+@dataclass
+class BoxRequestContext:
+    """Box state scoped to a single MCP request.
+
+    Holds the incoming request, the token resolved from it (mcp_client mode
+    only) and the Box client used to serve it. When the middleware validates
+    the token with Box, the Box user it belongs to is known too.
+    """
+
+    request: Request | None = None
+    token: str | None = None
+    client: BoxClient | None = None
+    user_id: str | None = None
+
+
+# Each tool call runs in its own task (and its own copied context on the tool
+# executor threads), so concurrent requests never see each other's state.
+_box_request_context: ContextVar[BoxRequestContext | None] = ContextVar(
+    "box_request_context", default=None
+)
+
+
 @dataclass
 class BoxContext:
+    """Lifespan context shared by every request.
+
+    It must not hold any per-request state, see ``BoxRequestContext``.
+    """
+
     client: BoxClient | None = None
-    request: Request | None = None
+    client_cache: BoxClientCache | None = None
+    transport: BoxAsyncTransport | None = None
+    rate_limiters: RateLimiterRegistry | None = None
+    object_cache: ObjectCache | None = None
+    range_cache: RangeCache | None = None
+    text_cache: TextCache | None = None
+    text_disk_cache: DiskTextCache | None = None
+    upload_index: UploadIndex | None = None
+    ai_cache: AiResultCache | None = None
 
     def get_client_from_token(self, token: str) -> BoxClient:
-        """Create a Box client using the provided OAuth token."""
-        logger.info("Creating Box client with OAuth token")
-        auth = BoxDeveloperTokenAuth(token=token)
-        return BoxClient(auth=auth)
+        """Get a Box client for the provided OAuth token.
+
+        Clients are reused from the client cache when one is configured.
+        """
+        if self.client_cache is not None:
+            return self.client_cache.get_or_create(token)
+        return _create_token_client(token, self.rate_limiters)
 
-    def get_active_client(self) -> BoxClient:
-        """Get the active Box client.
+    def get_request_context(self, request: Request | None = None) -> BoxRequestContext:
+        """Get the Box context for the current request.
+
+        The context is resolved once per request and reused by later calls in
+        the same request.
 
         For OAuth mode: extracts the token from the request and creates a client.
-        For CCG mode: returns the pre-created client.
+        For CCG mode: uses the pre-created client.
 
         Raises:
             ValueError: If no client is available or no OAuth token found.
         """
+        current = _box_request_context.get()
+        if current is not None and current.request is request:
+            return current
+
         # If we have a pre-created client, use it
         if self.client is not None:
             logger.debug("Using pre-created Box client")
-            return self.client
+            request_context = BoxRequestContext(request=request, client=self.client)
+        else:
+            # OAuth mode: extract token from request scope
+            if request is None:
+                raise ValueError("No request context available")
+
+            # Get the OAuth token from the request scope (set by middleware)
+            token = request.scope.get("oauth_token")
+            if not token:
+                raise ValueError("No OAuth token found in request scope")
+
+            logger.debug("Creating Box client from request OAuth token")
+            request_context = BoxRequestContext(
+                request=request,
+                token=token,
+                client=self.get_client_from_token(token),
+                user_id=request.scope.get("box_user_id"),
+            )
+
+        _box_request_context.set(request_context)
+        return request_context
+
+    def get_active_client(self, request: Request | None = None) -> BoxClient:
+        """Get the active Box client for the given request.
+
+        Raises:
+            ValueError: If no client is available or no OAuth token found.
+        """
+        return self.get_request_context(request).client
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Stats of the configured caches, by cache name."""
+        caches = {
+            "client cache": self.client_cache,
+            "object cache": self.object_cache,
+            "range cache": self.range_cache,
+            "text cache": self.text_cache,
+            "text disk cache": self.text_disk_cache,
+            "upload index": self.upload_index,
+            "ai cache": self.ai_cache,
+        }
+        return {name: cache.stats() for name, cache in caches.items() if cache is not None}
+
+
+@contextmanager
+def _report_metrics(context: BoxContext) -> Iterator[None]:
+    """Export the cache and rate limiter counters of a lifespan context while it lives."""
+    metrics = get_metrics()
+    if metrics is None:
+        yield
+        return
+    handle = metrics.track_caches(context.cache_stats)
+    rate_limits = None
+    if context.rate_limiters is not None:
+        rate_limits = metrics.track_rate_limits(context.rate_limiters.stats)
+    try:
+        yield
+    finally:
+        metrics.release_caches(handle)
+        if rate_limits is not None:
+            metrics.release_rate_limits(rate_limits)
+
+
+def _create_transport(http_config: HttpConfig | None) -> BoxAsyncTransport | None:
+    """Create the shared async transport, unless it is disabled."""
+    http_config = http_config or HttpConfig()
+    if not http_config.async_transport:
+        logger.info("Async Box transport disabled, all tools use the Box SDK")
+        return None
+    return BoxAsyncTransport(http_config)
+
+
+def _create_rate_limiters(http_config: HttpConfig | None) -> RateLimiterRegistry | None:
+    """Create the per identity rate limiters, unless rate limiting is disabled."""
+    http_config = http_config or HttpConfig()
+    if not http_config.rate_limit_enabled:
+        logger.info("Box API rate limiting disabled")
+        return None
+    return RateLimiterRegistry(http_config)
+
+
+def _rate_limited(client: BoxClient, rate_limiters: RateLimiterRegistry | None) -> BoxClient:
+    """Send the client's requests through its rate limiter, or only observe them."""
+    if rate_limiters is None:
+        return observe_client(client)
+    return rate_limiters.wrap_client(client)
+
+
+def _create_object_cache(cache_config: CacheConfig | None) -> ObjectCache | None:
+    """Create the file and folder cache, unless it is disabled."""
+    cache_config = cache_config or CacheConfig()
+    if cache_config.object_cache_max_bytes <= 0:
+        return None
+    return ObjectCache(
+        max_age=cache_config.object_cache_max_age,
+        max_bytes=cache_config.object_cache_max_bytes,
+    )
+
+
+def _create_range_cache(cache_config: CacheConfig | None) -> RangeCache | None:
+    """Create the cache of ranged file reads, unless it is disabled."""
+    cache_config = cache_config or CacheConfig()
+    if cache_config.range_cache_max_bytes <= 0:
+        return None
+    return RangeCache(max_bytes=cache_config.range_cache_max_bytes)
 
-        # OAuth mode: extract token from request scope
-        if self.request is None:
-            raise ValueError("No request context available")
 
-        # Get the OAuth token from the request scope (set by middleware)
-        token = self.request.scope.get("oauth_token")
-        if not token:
-            raise ValueError("No OAuth token found in request scope")
+def _create_text_cache(cache_config: CacheConfig | None) -> TextCache | None:
+    """Create the cache of extracted texts, unless it is disabled."""
+    cache_config = cache_config or CacheConfig()
+    if cache_config.text_cache_max_bytes <= 0:
+        return None
+    return TextCache(max_bytes=cache_config.text_cache_max_bytes)
 
-        logger.debug("Creating Box client from request OAuth token")
-        return self.get_client_from_token(token)
+
+def _create_text_disk_cache(cache_config: CacheConfig | None) -> DiskTextCache | None:
+    """Create the on-disk cache of extracted texts, if a directory is configured."""
+    cache_config = cache_config or CacheConfig()
+    if not cache_config.text_disk_cache_dir or cache_config.text_disk_cache_max_bytes <= 0:
+        return None
+    return DiskTextCache(
+        cache_config.text_disk_cache_dir, max_bytes=cache_config.text_disk_cache_max_bytes
+    )
+
+
+def _create_upload_index(cache_config: CacheConfig | None) -> UploadIndex | None:
+    """Create the index of uploaded files, unless it is disabled."""
+    cache_config = cache_config or CacheConfig()
+    if cache_config.upload_index_max_age <= 0:
+        return None
+    return UploadIndex(max_age=cache_config.upload_index_max_age)
+
+
+def _create_ai_cache(cache_config: CacheConfig | None) -> AiResultCache | None:
+    """Create the cache of Box AI answers, if it is enabled."""
+    cache_config = cache_config or CacheConfig()
+    if not cache_config.ai_cache_enabled or cache_config.ai_cache_max_bytes <= 0:
+        return None
+    return AiResultCache(ttl=cache_config.ai_cache_ttl, max_bytes=cache_config.ai_cache_max_bytes)
+
+
+def _create_box_context(
+    client: BoxClient | None,
+    http_config: HttpConfig | None,
+    cache_config: CacheConfig | None,
+    client_cache: BoxClientCache | None = None,
+) -> BoxContext:
+    """Create the context of a lifespan, with its transport, rate limiters and caches.
+
+    Args:
+        client: Box client of the lifespan, None when clients are created per request
+        http_config: HttpConfig for the shared async transport and rate limits
+        cache_config: CacheConfig with the cache bounds
+        client_cache: Cache of the per request clients, which share the rate limiters
+    """
+    rate_limiters = _create_rate_limiters(http_config)
+    if client is not None:
+        client = _rate_limited(client, rate_limiters)
+    if client_cache is not None:
+        client_cache.rate_limiters = rate_limiters
+    return BoxContext(
+        client=client,
+        client_cache=client_cache,
+        transport=_create_transport(http_config),
+        rate_limiters=rate_limiters,
+        object_cache=_create_object_cache(cache_config),
+        range_cache=_create_range_cache(cache_config),
+        text_cache=_create_text_cache(cache_config),
+        text_disk_cache=_create_text_disk_cache(cache_config),
+        upload_index=_create_upload_index(cache_config),
+        ai_cache=_create_ai_cache(cache_config),
+    )
+
+
+async def _close_transport(transport: BoxAsyncTransport | None) -> None:
+    if transport is not None:
+        await transport.aclose()
 
 
 @asynccontextmanager
-async def box_lifespan_mcp_oauth(server: FastMCP) -> AsyncIterator[BoxContext]:
+async def box_lifespan_mcp_oauth(
+    server: FastMCP,
+    config: BoxApiConfig | None = None,
+    http_config: HttpConfig | None = None,
+    cache_config: CacheConfig | None = None,
+) -> AsyncIterator[BoxContext]:
     """Manage Box client lifecycle with OAuth handling.
 
     In OAuth mode, the client is created per-request using the Bearer token
     from the Authorization header. The middleware stores the token in the
-    request scope, and tools should use context.get_client_with_token() to
-    create the client dynamically.
+    request scope, and tools resolve a request-scoped client through
+    BoxContext.get_request_context(). Clients are cached per token so their
+    connection pools survive across tool calls.
+
+    Args:
+        server: FastMCP server instance
+        config: BoxApiConfig, unused as clients are created from the Bearer token
+        http_config: HttpConfig for the shared async transport and rate limits
+        cache_config: CacheConfig with the client and object cache bounds
+
+    Yields:
+        BoxContext with a client cache and no pre-created client
     """
+    # Don't create a client at startup - it will be created per-request
+    logger.info(
+        "OAuth mode: Box client will be created per-request from Bearer token"
+    )
+    client_cache = BoxClientCache(cache_config or CacheConfig())
+    context = _create_box_context(None, http_config, cache_config, client_cache)
     try:
-        # Don't create a client at startup - it will be created per-request
-        logger.info(
-            "OAuth mode: Box client will be created per-request from Bearer token"
-        )
-        yield BoxContext(client=None)
+        with _report_metrics(context):
+            yield context
     finally:
-        # Cleanup (if needed)
-        pass
+        # Close the connection pools of every cached client
+        client_cache.clear()
+        await _close_transport(context.transport)
 
 
 @asynccontextmanager
-async def box_lifespan_oauth(server: FastMCP, config: "BoxApiConfig") -> AsyncIterator[BoxContext]:
+async def box_lifespan_oauth(
+    server: FastMCP,
+    config: "BoxApiConfig",
+    http_config: HttpConfig | None = None,
+    cache_config: CacheConfig | None = None,
+) -> AsyncIterator[BoxContext]:
     """
     Manage Box client lifecycle with OAuth handling.
 
     Args:
         server: FastMCP server instance
         config: BoxApiConfig containing OAuth credentials
+        http_config: HttpConfig for the shared async transport and rate limits
+        cache_config: CacheConfig with the object cache bounds
 
     Yields:
         BoxContext with initialized OAuth client
     """
+    context = _create_box_context(get_oauth_client(config), http_config, cache_config)
     try:
-        client = get_oauth_client(config)
-        yield BoxContext(client=client)
+        with _report_metrics(context):
+            yield context
     finally:
-        # Cleanup (if needed)
-        pass
+        await _close_transport(context.transport)
 
 
 @asynccontextmanager
-async def box_lifespan_ccg(server: FastMCP, config: "BoxApiConfig") -> AsyncIterator[BoxContext]:
+async def box_lifespan_ccg(
+    server: FastMCP,
+    config: "BoxApiConfig",
+    http_config: HttpConfig | None = None,
+    cache_config: CacheConfig | None = None,
+) -> AsyncIterator[BoxContext]:
     """
     Manage Box client lifecycle with CCG handling.
 
     Args:
         server: FastMCP server instance
         config: BoxApiConfig containing CCG credentials
+        http_config: HttpConfig for the shared async transport and rate limits
+        cache_config: CacheConfig with the object cache bounds
 
     Yields:
         BoxContext with initialized CCG client
     """
+    context = _create_box_context(get_ccg_client(config), http_config, cache_config)
     try:
-        client = get_ccg_client(config)
-        yield BoxContext(client=client)
+        with _report_metrics(context):
+            yield context
     finally:
-        # Cleanup (if needed)
-        pass
+        await _close_transport(context.transport)
 
 
 @asynccontextmanager
-async def box_lifespan_jwt(server: FastMCP, config: "BoxApiConfig") -> AsyncIterator[BoxContext]:
+async def box_lifespan_jwt(
+    server: FastMCP,
+    config: "BoxApiConfig",
+    http_config: HttpConfig | None = None,
+    cache_config: CacheConfig | None = None,
+) -> AsyncIterator[BoxContext]:
     """
     Manage Box client lifecycle with JWT handling.
 
     Args:
         server: FastMCP server instance
         config: BoxApiConfig containing JWT credentials
+        http_config: HttpConfig for the shared async transport and rate limits
+        cache_config: CacheConfig with the object cache bounds
 
     Yields:
         BoxContext with initialized JWT client
     """
+    context = _create_box_context(get_jwt_client(config), http_config, cache_config)
     try:
-        client = get_jwt_client(config)
-        yield BoxContext(client=client)
+        with _report_metrics(context):
+            yield context
     finally:
-        # Cleanup (if needed)
-        pass
+        await _close_transport(context.transport)
@@ -0,0 +1,148 @@
+"""Single-flight coalescing of identical concurrent read-only tool calls.
+
+Agents often issue the same read several times in parallel, e.g. sub-agents
+exploring the same folder. Tools marked with ``coalesced`` share one
+in-flight call per (Box identity, tool, normalized arguments): the first
+caller runs the tool and every concurrent duplicate awaits its result.
+Nothing is cached once the call completes.
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, get_type_hints
+
+from mcp.server.fastmcp import Context
+
+from box_api import box_identity
+from server_context import BoxContext
+
+logger = logging.getLogger(__name__)
+
+
+def coalesced(fn: Callable) -> Callable:
+    """Mark a read-only tool so identical concurrent calls share one execution.
+
+    Only use this for tools without side effects whose result depends on
+    nothing but the caller's Box identity and the tool arguments.
+    """
+    fn._box_coalesced = True
+    return fn
+
+
+def is_coalesced(fn: Callable) -> bool:
+    """Check if a tool was marked with ``coalesced``."""
+    return getattr(fn, "_box_coalesced", False)
+
+
+def _context_parameter(fn: Callable) -> Optional[str]:
+    """Name of the tool parameter that receives the MCP Context."""
+    hints = get_type_hints(fn)
+    for name in inspect.signature(fn).parameters:
+        if hints.get(name) is Context:
+            return name
+    return None
+
+
+def _request_identity(ctx: Any) -> Optional[str]:
+    """Box identity of the request behind a tool call, if it can be resolved."""
+    request_context = getattr(ctx, "request_context", None)
+    box_context = getattr(request_context, "lifespan_context", None)
+    if not isinstance(box_context, BoxContext):
+        return None
+    try:
+        client = box_context.get_active_client(request_context.request)
+    except ValueError:
+        # Let the tool itself report the missing client or token
+        return None
+    return box_identity(client.auth)
+
+
+class ToolCoalescer:
+    """Shares in-flight executions of identical read-only tool calls."""
+
+    def __init__(self):
+        self._in_flight: Dict[tuple, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._executions = 0
+        self._saved = 0
+
+    def _join_or_start(self, key: tuple, start: Callable[[], Any]) -> asyncio.Task:
+        with self._lock:
+            self._calls += 1
+            task = self._in_flight.get(key)
+            if task is not None and not task.done():
+                self._saved += 1
+                return task
+            self._executions += 1
+            task = asyncio.ensure_future(start())
+            self._in_flight[key] = task
+
+        def forget(done: asyncio.Task) -> None:
+            with self._lock:
+                if self._in_flight.get(key) is done:
+                    del self._in_flight[key]
+
+        task.add_done_callback(forget)
+        return task
+
+    def wrap_tool(self, fn: Callable) -> Callable:
+        """Wrap a tool so identical concurrent calls share one execution.
+
+        Tools not marked with ``coalesced`` are returned unchanged.
+        """
+        if not is_coalesced(fn):
+            return fn
+
+        signature = inspect.signature(fn)
+        ctx_name = _context_parameter(fn)
+        if ctx_name is None:
+            logger.warning(
+                f"Tool {fn.__name__} has no Context parameter, not coalescing it"
+            )
+            return fn
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            identity = _request_identity(arguments.pop(ctx_name))
+            if identity is None:
+                return await fn(*args, **kwargs)
+
+            key = (
+                identity,
+                fn.__name__,
+                json.dumps(arguments, sort_keys=True, default=str),
+            )
+            task = self._join_or_start(key, lambda: fn(*args, **kwargs))
+            # A cancelled caller must not cancel the execution others are awaiting
+            return await asyncio.shield(task)
+
+        return wrapper
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the coalescing counters."""
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "executions": self._executions,
+                "saved_calls": self._saved,
+                "in_flight": len(self._in_flight),
+            }
+
+
+_tool_coalescer: Optional[ToolCoalescer] = None
+
+
+def get_tool_coalescer() -> ToolCoalescer:
+    """Get the process wide tool coalescer, creating it if needed."""
+    global _tool_coalescer
+    if _tool_coalescer is None:
+        _tool_coalescer = ToolCoalescer()
+    return _tool_coalescer
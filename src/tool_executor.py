@@ -0,0 +1,245 @@
+"""Execution layer that keeps blocking Box tool calls off the event loop.
+
+The Box tools are declared ``async def`` but call the synchronous
+box_ai_agents_toolkit functions, so running them directly on the event loop
+would stall every other client of the SSE/streamable-http server. Tools
+registered through ``tool_registry.register_all_tools`` are wrapped so their
+body runs on a bounded worker pool instead.
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from config import ExecutionConfig
+from tracing import get_tracer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL = "default"
+AI_POOL = "ai"
+
+
+class ToolExecutorBusyError(RuntimeError):
+    """Raised when a pool queue is full and a new call cannot be accepted."""
+
+
+def native_async(fn: Callable) -> Callable:
+    """Mark a tool coroutine as non-blocking so it runs on the event loop.
+
+    Use this for tools that only await real async I/O (or that offload their
+    blocking parts explicitly with ``run_blocking``).
+    """
+    fn._box_native_async = True
+    return fn
+
+
+def is_native_async(fn: Callable) -> bool:
+    """Check if a tool was marked with ``native_async``."""
+    return getattr(fn, "_box_native_async", False)
+
+
+class ToolThreadPool:
+    """A bounded thread pool that tracks queue depth and saturation."""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"box-tools-{name}"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+        self._peak_queued = 0
+        self._thread_state = threading.local()
+        self._loops: list[asyncio.AbstractEventLoop] = []
+
+    def run_coroutine(self, coro_fn: Callable, args: tuple, kwargs: dict) -> Any:
+        """Drive a coroutine to completion on the worker thread's own loop.
+
+        Must be called from one of the pool threads.
+        """
+        loop = getattr(self._thread_state, "loop", None)
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            self._thread_state.loop = loop
+            with self._lock:
+                self._loops.append(loop)
+        return loop.run_until_complete(coro_fn(*args, **kwargs))
+
+    def _call(self, fn: Callable, args: tuple, kwargs: dict, submitted_ns: int) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        tracer = get_tracer()
+        if tracer is not None:
+            tracer.record_span(
+                "tool pool queue",
+                submitted_ns,
+                time.time_ns(),
+                {"box_mcp.pool": self.name},
+            )
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+
+    def _on_done(self, future: Future) -> None:
+        # A call cancelled while still queued never reaches _call
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    async def run(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking callable on the pool and await its result.
+
+        The caller's contextvars are propagated to the worker thread.
+
+        Raises:
+            ToolExecutorBusyError: If the pool queue is full.
+        """
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise ToolExecutorBusyError(
+                    f"Tool pool '{self.name}' is saturated "
+                    f"({self._active} running, {self._queued} queued), try again later"
+                )
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+
+        context = contextvars.copy_context()
+        future = self._executor.submit(
+            context.run, self._call, fn, args, kwargs, time.time_ns()
+        )
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of the pool counters."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": self._queued,
+                "peak_queued": self._peak_queued,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "saturation": round(self._active / self.max_workers, 3),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            loops, self._loops = self._loops, []
+        for loop in loops:
+            loop.close()
+
+
+class ToolExecutor:
+    """Routes tool calls to the worker pools.
+
+    Box AI tools get their own pool so that long running AI calls cannot starve
+    the quick metadata calls.
+    """
+
+    def __init__(self, config: Optional[ExecutionConfig] = None):
+        config = config or ExecutionConfig()
+        self.pools: Dict[str, ToolThreadPool] = {
+            DEFAULT_POOL: ToolThreadPool(
+                DEFAULT_POOL, config.tool_workers, config.tool_queue_size
+            ),
+            AI_POOL: ToolThreadPool(
+                AI_POOL, config.ai_tool_workers, config.tool_queue_size
+            ),
+        }
+
+    @staticmethod
+    def pool_for_tool(fn: Callable) -> str:
+        """Pick the pool a tool should run on."""
+        return AI_POOL if fn.__name__.startswith("box_ai_") else DEFAULT_POOL
+
+    async def run(
+        self, fn: Callable, *args: Any, pool: str = DEFAULT_POOL, **kwargs: Any
+    ) -> Any:
+        """Run a blocking callable on the given pool."""
+        return await self.pools[pool].run(fn, *args, **kwargs)
+
+    def wrap_tool(self, fn: Callable) -> Callable:
+        """Wrap a tool so its body runs on a worker pool.
+
+        Tools marked with ``native_async`` are returned unchanged.
+        """
+        if is_native_async(fn):
+            return fn
+
+        pool = self.pools[self.pool_for_tool(fn)]
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                return await pool.run(pool.run_coroutine, fn, args, kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        async def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+            return await pool.run(fn, *args, **kwargs)
+
+        return sync_wrapper
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-pool counters."""
+        return {name: pool.stats() for name, pool in self.pools.items()}
+
+    def shutdown(self) -> None:
+        for pool in self.pools.values():
+            pool.shutdown()
+
+
+_tool_executor: Optional[ToolExecutor] = None
+
+
+def configure_tool_executor(config: ExecutionConfig) -> ToolExecutor:
+    """Create the process wide tool executor from configuration."""
+    global _tool_executor
+    if _tool_executor is not None:
+        _tool_executor.shutdown()
+    _tool_executor = ToolExecutor(config)
+    logger.info(
+        f"Tool executor configured: {config.tool_workers} workers, "
+        f"{config.ai_tool_workers} AI workers, queue size {config.tool_queue_size}"
+    )
+    return _tool_executor
+
+
+def get_tool_executor() -> ToolExecutor:
+    """Get the process wide tool executor, creating a default one if needed."""
+    global _tool_executor
+    if _tool_executor is None:
+        _tool_executor = ToolExecutor()
+    return _tool_executor
+
+
+async def run_blocking(
+    fn: Callable, *args: Any, pool: str = DEFAULT_POOL, **kwargs: Any
+) -> Any:
+    """Run a blocking callable on the shared tool executor.
+
+    For use inside ``native_async`` tools that still need a synchronous call.
+    """
+    return await get_tool_executor().run(fn, *args, pool=pool, **kwargs)
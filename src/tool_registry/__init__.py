@@ -1,12 +1,45 @@
-# src/tool_registry/__init__.py
-from typing import Callable, List
+from typing import Any, Callable, List, Optional
 
 from mcp.server.fastmcp import FastMCP
 
 ToolRegistrar = Callable[[FastMCP], None]
+ToolWrapper = Callable[[Callable], Callable]
 
 
-def register_all_tools(mcp: FastMCP, registrars: List[ToolRegistrar]):
-    """Register all tools from provided registrars"""
+class _WrappingToolServer:
+    """Proxy handed to the registrars so every registered tool gets wrapped.
+
+    Only ``tool()`` is intercepted, everything else is forwarded to the
+    underlying FastMCP instance.
+    """
+
+    def __init__(self, mcp: FastMCP, wrappers: List[ToolWrapper]):
+        self._mcp = mcp
+        self._wrappers = wrappers
+
+    def tool(self, *args: Any, **kwargs: Any) -> Callable[[Callable], Callable]:
+        decorator = self._mcp.tool(*args, **kwargs)
+
+        def register(fn: Callable) -> Callable:
+            wrapped = fn
+            # The first wrapper ends up innermost
+            for wrapper in self._wrappers:
+                wrapped = wrapper(wrapped)
+            decorator(wrapped)
+            return fn
+
+        return register
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._mcp, name)
+
+
+def register_all_tools(
+    mcp: FastMCP,
+    registrars: List[ToolRegistrar],
+    wrappers: Optional[List[ToolWrapper]] = None,
+):
+    """Register all tools from provided registrars, applying the wrappers to each tool"""
+    target = _WrappingToolServer(mcp, wrappers) if wrappers else mcp
     for registrar in registrars:
-        registrar(mcp)
+        registrar(target)
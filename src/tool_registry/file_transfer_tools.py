@@ -2,10 +2,14 @@ from mcp.server.fastmcp import FastMCP
 
 from tools.box_tools_file_transfer import (
     box_file_download_tool,
+    box_file_read_range_tool,
+    box_file_upload_from_path_tool,
     box_file_upload_tool,
 )
 
 
 def register_file_transfer_tools(mcp: FastMCP):
     mcp.tool()(box_file_download_tool)
+    mcp.tool()(box_file_read_range_tool)
     mcp.tool()(box_file_upload_tool)
+    mcp.tool()(box_file_upload_from_path_tool)
@@ -1,4 +1,7 @@
-from typing import Any, List, Optional
+import asyncio
+import json
+from functools import partial
+from typing import Any, Callable, List, Optional
 
 from box_ai_agents_toolkit import (
     box_ai_agent_info_by_id,
@@ -13,9 +16,38 @@ from box_ai_agents_toolkit import (
     box_ai_extract_structured_using_fields,
     box_ai_extract_structured_using_template,
 )
+from box_sdk_gen import BoxClient
 from mcp.server.fastmcp import Context
 
-from tools.box_tools_generic import get_box_client
+from box_api import cached_ai_call, fetch_file_range_info, run_ai_batch
+from tool_executor import AI_POOL, native_async, run_blocking
+from tools.box_tools_generic import get_ai_cache, get_box_client
+
+
+async def _ask_cached(
+    ctx: Context,
+    box_client: BoxClient,
+    tool: str,
+    ask: Callable[[], dict],
+    file_ids: List[str],
+    request: Any,
+    ai_agent_id: Optional[str] = None,
+) -> dict:
+    """Make a Box AI call through the AI result cache, when it is enabled."""
+
+    async def ask_here() -> dict:
+        # The AI tools already run on the AI tool pool
+        return ask()
+
+    return await cached_ai_call(
+        partial(run_blocking, fetch_file_range_info, box_client),
+        ask_here,
+        tool,
+        file_ids,
+        request,
+        ai_agent_id,
+        get_ai_cache(ctx),
+    )
 
 
 async def box_ai_ask_file_single_tool(
@@ -23,6 +55,7 @@ async def box_ai_ask_file_single_tool(
 ) -> dict:
     """
     Ask a question about a file using AI.
+    To ask several questions about the same file, use box_ai_ask_file_prompts_tool.
     Args:
         ctx (Context): The context object containing the request and lifespan context.
         file_id (str): The ID of the file to ask about, example: "1234567890".
@@ -30,13 +63,16 @@ async def box_ai_ask_file_single_tool(
         ai_agent_id (Optional[str]): The ID of the AI agent to use for the question. If None, the default AI agent will be used.
     Returns:
         dict: The AI response containing the answer to the question.
+            Answers served from the AI result cache are marked with "cached": True.
     """
 
     box_client = get_box_client(ctx)
-    response = box_ai_ask_file_single(
-        box_client, file_id, prompt=prompt, ai_agent_id=ai_agent_id
+    ask = partial(
+        box_ai_ask_file_single, box_client, file_id, prompt=prompt, ai_agent_id=ai_agent_id
+    )
+    return await _ask_cached(
+        ctx, box_client, "box_ai_ask_file_single", ask, [file_id], prompt, ai_agent_id
     )
-    return response
 
 
 async def box_ai_ask_file_multi_tool(
@@ -51,12 +87,76 @@ async def box_ai_ask_file_multi_tool(
         ai_agent_id (Optional[str]): The ID of the AI agent to use for the question. If None, the default AI agent will be used.
     Returns:
         dict: The AI response containing the answers to the questions for each file.
+            Answers served from the AI result cache are marked with "cached": True.
     """
     box_client = get_box_client(ctx)
-    response = box_ai_ask_file_multi(
-        box_client, file_ids, prompt=prompt, ai_agent_id=ai_agent_id
+    ask = partial(
+        box_ai_ask_file_multi, box_client, file_ids, prompt=prompt, ai_agent_id=ai_agent_id
+    )
+    return await _ask_cached(
+        ctx, box_client, "box_ai_ask_file_multi", ask, file_ids, prompt, ai_agent_id
     )
-    return response
+
+
+@native_async
+async def box_ai_ask_file_prompts_tool(
+    ctx: Context, file_id: str, prompts: List[str], ai_agent_id: Optional[str] = None
+) -> dict:
+    """
+    Ask several separate questions about one file using AI, in a single call.
+
+    Each prompt is answered separately, as with box_ai_ask_file_single_tool, but all the
+    questions are sent to Box AI concurrently, so the call takes about as long as one
+    question. Identical prompts are asked once. Each answered prompt is reported as a
+    progress notification whose message is its answer as JSON.
+
+    Use cases:
+    - Review a contract with a checklist of questions
+    - Fill a questionnaire from one document
+
+    Args:
+        ctx (Context): The context object containing the request and lifespan context.
+        file_id (str): The ID of the file to ask about, example: "1234567890".
+        prompts (List[str]): The questions to ask, example: ["Who are the parties?", "When does it expire?"].
+        ai_agent_id (Optional[str]): The ID of the AI agent to use for the questions. If None, the default AI agent will be used.
+    Returns:
+        dict: The "results" of each prompt in order, each with its "prompt" and either the
+            AI response or an "error", and the number of prompts that "succeeded" and "failed".
+    """
+    box_client = get_box_client(ctx)
+    ai_cache = get_ai_cache(ctx)
+    file_info: Optional[asyncio.Future] = None
+
+    async def fetch_info_once(file_id: str) -> dict:
+        # The freshness check of the AI cache only fetches the file once per call
+        nonlocal file_info
+        if file_info is None:
+            file_info = asyncio.ensure_future(
+                run_blocking(fetch_file_range_info, box_client, file_id)
+            )
+        return await asyncio.shield(file_info)
+
+    async def ask_prompt(prompt: str) -> dict:
+        ask = partial(
+            run_blocking,
+            box_ai_ask_file_single,
+            box_client,
+            file_id,
+            prompt=prompt,
+            ai_agent_id=ai_agent_id,
+            pool=AI_POOL,
+        )
+        return await cached_ai_call(
+            fetch_info_once,
+            ask,
+            "box_ai_ask_file_single",
+            [file_id],
+            prompt,
+            ai_agent_id,
+            ai_cache,
+        )
+
+    return await _run_batch(ctx, "prompt", prompts, ask_prompt)
 
 
 async def box_ai_ask_hub_tool(
@@ -112,13 +212,16 @@ async def box_ai_extract_freeform_tool(
         ai_agent_id (Optional[str]): The ID of the AI agent to use for the extraction. If None, the default AI agent will be used.
     Returns:
         dict: The AI response containing the extracted information.
+            Answers served from the AI result cache are marked with "cached": True.
     """
     box_client = get_box_client(ctx)
 
-    response = box_ai_extract_freeform(
-        box_client, file_ids, prompt=prompt, ai_agent_id=ai_agent_id
+    ask = partial(
+        box_ai_extract_freeform, box_client, file_ids, prompt=prompt, ai_agent_id=ai_agent_id
+    )
+    return await _ask_cached(
+        ctx, box_client, "box_ai_extract_freeform", ask, file_ids, prompt, ai_agent_id
     )
-    return response
 
 
 async def box_ai_extract_structured_using_fields_tool(
@@ -145,7 +248,7 @@ async def box_ai_extract_structured_using_fields_tool(
       (e.g., extract "total_project_cost" from both a proposal and budget document)
 
     NOT for batch processing: If you need to extract data from multiple files as
-    separate instances, call this tool once per file in a loop.
+    separate instances, use box_ai_extract_structured_batch_using_fields_tool.
 
     Args:
         ctx (Context): The context object containing the request and lifespan context.
@@ -203,13 +306,26 @@ async def box_ai_extract_structured_using_fields_tool(
         ai_agent_id (Optional[str]): The ID of the AI agent to use for processing.
     Returns:
         dict: The extracted structured data in a json string format.
+            Answers served from the AI result cache are marked with "cached": True.
     """
     box_client = get_box_client(ctx)
 
-    response = box_ai_extract_structured_using_fields(
-        box_client, file_ids, fields, ai_agent_id=ai_agent_id
+    ask = partial(
+        box_ai_extract_structured_using_fields,
+        box_client,
+        file_ids,
+        fields,
+        ai_agent_id=ai_agent_id,
+    )
+    return await _ask_cached(
+        ctx,
+        box_client,
+        "box_ai_extract_structured_using_fields",
+        ask,
+        file_ids,
+        fields,
+        ai_agent_id,
     )
-    return response
 
 
 async def box_ai_extract_structured_using_template_tool(
@@ -231,7 +347,7 @@ async def box_ai_extract_structured_using_template_tool(
       (e.g., extract customer info from both a contract PDF and a supporting letter)
 
     NOT for batch processing: If you need to extract metadata from multiple files as
-    separate instances, call this tool once per file in a loop.
+    separate instances, use box_ai_extract_structured_batch_using_template_tool.
 
     Args:
         ctx (Context): The context object containing the request and lifespan context.
@@ -240,13 +356,26 @@ async def box_ai_extract_structured_using_template_tool(
         ai_agent_id (Optional[str]): The ID of the AI agent to use for processing.
     Returns:
         dict: The extracted structured data in a json string format.
+            Answers served from the AI result cache are marked with "cached": True.
     """
     box_client = get_box_client(ctx)
 
-    response = box_ai_extract_structured_using_template(
-        box_client, file_ids, template_key, ai_agent_id=ai_agent_id
+    ask = partial(
+        box_ai_extract_structured_using_template,
+        box_client,
+        file_ids,
+        template_key,
+        ai_agent_id=ai_agent_id,
+    )
+    return await _ask_cached(
+        ctx,
+        box_client,
+        "box_ai_extract_structured_using_template",
+        ask,
+        file_ids,
+        template_key,
+        ai_agent_id,
     )
-    return response
 
 
 async def box_ai_extract_structured_enhanced_using_fields_tool(
@@ -277,7 +406,7 @@ async def box_ai_extract_structured_enhanced_using_fields_tool(
       (e.g., extract patient info from medical records, lab results, and prescription images)
 
     NOT for batch processing: If you need to extract data from multiple files as
-    separate instances, call this tool once per file in a loop.
+    separate instances, use box_ai_extract_structured_batch_using_fields_tool.
 
     Args:
         ctx (Context): The context object containing the request and lifespan context.
@@ -285,15 +414,24 @@ async def box_ai_extract_structured_enhanced_using_fields_tool(
         fields (List[dict[str, Any]]): The fields to extract from the files.
     Returns:
         dict: The AI response containing the extracted information.
+            Answers served from the AI result cache are marked with "cached": True.
     """
     box_client = get_box_client(ctx)
 
-    response = box_ai_extract_structured_enhanced_using_fields(
+    ask = partial(
+        box_ai_extract_structured_enhanced_using_fields,
         box_client,
         file_ids,
         fields,
     )
-    return response
+    return await _ask_cached(
+        ctx,
+        box_client,
+        "box_ai_extract_structured_enhanced_using_fields",
+        ask,
+        file_ids,
+        fields,
+    )
 
 
 async def box_ai_extract_structured_enhanced_using_template_tool(
@@ -319,7 +457,7 @@ async def box_ai_extract_structured_enhanced_using_template_tool(
       (e.g., extract project info from a proposal PDF, budget spreadsheet, and timeline image)
 
     NOT for batch processing: If you need to extract metadata from multiple files as
-    separate instances, call this tool once per file in a loop.
+    separate instances, use box_ai_extract_structured_batch_using_template_tool.
 
     Args:
         ctx (Context): The context object containing the request and lifespan context.
@@ -328,13 +466,172 @@ async def box_ai_extract_structured_enhanced_using_template_tool(
                             Example: "insurance_policy_template".
     Returns:
         dict: The extracted structured data in a json string format.
+            Answers served from the AI result cache are marked with "cached": True.
     """
     box_client = get_box_client(ctx)
 
-    response = box_ai_extract_structured_enhanced_using_template(
-        box_client, file_ids, template_key
+    ask = partial(
+        box_ai_extract_structured_enhanced_using_template, box_client, file_ids, template_key
+    )
+    return await _ask_cached(
+        ctx,
+        box_client,
+        "box_ai_extract_structured_enhanced_using_template",
+        ask,
+        file_ids,
+        template_key,
+    )
+
+
+async def _run_batch(
+    ctx: Context, key_name: str, keys: List[str], call: Callable[[str], Any]
+) -> dict:
+    """Run one Box AI call per key, reporting each finished key as MCP progress."""
+
+    async def report(done: int, total: int, key: str, result: dict) -> None:
+        message = json.dumps({key_name: key, **result}, default=str)
+        await ctx.report_progress(done, total, message)
+
+    results = await run_ai_batch(keys, call, report)
+    entries = [{key_name: key, **result} for key, result in zip(keys, results)]
+    failed = sum(1 for entry in entries if "error" in entry)
+    return {
+        "results": entries,
+        "succeeded": len(entries) - failed,
+        "failed": failed,
+    }
+
+
+async def _extract_batch(
+    ctx: Context,
+    box_client: BoxClient,
+    tool: str,
+    extract: Callable[[List[str]], dict],
+    file_ids: List[str],
+    request: Any,
+    ai_agent_id: Optional[str] = None,
+) -> dict:
+    """Run one extraction per file."""
+    fetch_info = partial(run_blocking, fetch_file_range_info, box_client)
+    ai_cache = get_ai_cache(ctx)
+
+    async def extract_file(file_id: str) -> dict:
+        ask = partial(run_blocking, extract, [file_id], pool=AI_POOL)
+        return await cached_ai_call(
+            fetch_info, ask, tool, [file_id], request, ai_agent_id, ai_cache
+        )
+
+    return await _run_batch(ctx, "file_id", file_ids, extract_file)
+
+
+@native_async
+async def box_ai_extract_structured_batch_using_fields_tool(
+    ctx: Context,
+    file_ids: List[str],
+    fields: List[dict[str, Any]],
+    ai_agent_id: Optional[str] = None,
+    enhanced: bool = False,
+) -> dict:
+    """
+    Extract structured data from each of many files separately, using custom fields.
+
+    Unlike box_ai_extract_structured_using_fields_tool, which combines ALL files into
+    ONE data instance, this tool runs one extraction per file and returns one data
+    instance per file. The extractions run concurrently, and each finished file is
+    reported as a progress notification whose message is its result as JSON.
+
+    Use cases:
+    - Extract the same custom fields from hundreds of invoices, receipts or contracts
+    - Build a table with one row per document
+
+    Args:
+        ctx (Context): The context object containing the request and lifespan context.
+        file_ids (List[str]): The IDs of the files to extract from, one result per file.
+        fields (List[dict[str, Any]]): The fields to extract from each file, in the format
+            of box_ai_extract_structured_using_fields_tool.
+        ai_agent_id (Optional[str]): The ID of the AI agent to use, ignored when enhanced.
+        enhanced (bool): Use the enhanced extraction agent, like
+            box_ai_extract_structured_enhanced_using_fields_tool. Defaults to False.
+    Returns:
+        dict: The "results" of each file in order, each with its "file_id" and either
+            the AI response or an "error", and the number of files that "succeeded"
+            and "failed".
+    """
+    box_client = get_box_client(ctx)
+
+    if enhanced:
+        tool = "box_ai_extract_structured_enhanced_using_fields"
+        extract = partial(
+            box_ai_extract_structured_enhanced_using_fields, box_client, fields=fields
+        )
+        ai_agent_id = None
+    else:
+        tool = "box_ai_extract_structured_using_fields"
+        extract = partial(
+            box_ai_extract_structured_using_fields,
+            box_client,
+            fields=fields,
+            ai_agent_id=ai_agent_id,
+        )
+    return await _extract_batch(
+        ctx, box_client, tool, extract, file_ids, fields, ai_agent_id
+    )
+
+
+@native_async
+async def box_ai_extract_structured_batch_using_template_tool(
+    ctx: Context,
+    file_ids: List[str],
+    template_key: str,
+    ai_agent_id: Optional[str] = None,
+    enhanced: bool = False,
+) -> dict:
+    """
+    Extract structured data from each of many files separately, using a metadata template.
+
+    Unlike box_ai_extract_structured_using_template_tool, which combines ALL files into
+    ONE metadata instance, this tool runs one extraction per file and returns one
+    metadata instance per file. The extractions run concurrently, and each finished
+    file is reported as a progress notification whose message is its result as JSON.
+
+    Use cases:
+    - Extract invoice metadata from every invoice of a folder
+    - Populate a metadata template for hundreds of documents
+
+    Args:
+        ctx (Context): The context object containing the request and lifespan context.
+        file_ids (List[str]): The IDs of the files to extract from, one result per file.
+        template_key (str): The key of the metadata template to use for the extraction.
+                            Example: "insurance_policy_template".
+        ai_agent_id (Optional[str]): The ID of the AI agent to use, ignored when enhanced.
+        enhanced (bool): Use the enhanced extraction agent, like
+            box_ai_extract_structured_enhanced_using_template_tool. Defaults to False.
+    Returns:
+        dict: The "results" of each file in order, each with its "file_id" and either
+            the AI response or an "error", and the number of files that "succeeded"
+            and "failed".
+    """
+    box_client = get_box_client(ctx)
+
+    if enhanced:
+        tool = "box_ai_extract_structured_enhanced_using_template"
+        extract = partial(
+            box_ai_extract_structured_enhanced_using_template,
+            box_client,
+            template_key=template_key,
+        )
+        ai_agent_id = None
+    else:
+        tool = "box_ai_extract_structured_using_template"
+        extract = partial(
+            box_ai_extract_structured_using_template,
+            box_client,
+            template_key=template_key,
+            ai_agent_id=ai_agent_id,
+        )
+    return await _extract_batch(
+        ctx, box_client, tool, extract, file_ids, template_key, ai_agent_id
     )
-    return response
 
 
 async def box_ai_agent_info_by_id_tool(
@@ -24,9 +24,17 @@ from box_ai_agents_toolkit import (
 )
 from mcp.server.fastmcp import Context
 
-from tools.box_tools_generic import get_box_client
+from tool_coalescing import coalesced
+from tool_executor import native_async, run_blocking
+from tools.box_tools_generic import (
+    get_box_api,
+    get_box_client,
+    invalidate_cached_objects,
+)
 
 
+@coalesced
+@native_async
 async def box_file_info_tool(
     ctx: Context,
     file_id: str,
@@ -38,8 +46,12 @@ async def box_file_info_tool(
     return:
         dict[str, Any]: Information about the file.
     """
+    box_api = get_box_api(ctx)
+    if box_api is not None:
+        return await box_api.file_info(file_id)
+
     box_client = get_box_client(ctx)
-    return box_file_info(box_client, file_id)
+    return await run_blocking(box_file_info, box_client, file_id)
 
 
 async def box_file_copy_tool(
@@ -60,9 +72,11 @@ async def box_file_copy_tool(
         dict[str, Any]: Dictionary containing the copied file information or error message.
     """
     box_client = get_box_client(ctx)
-    return box_file_copy(
+    result = box_file_copy(
         box_client, file_id, destination_folder_id, new_name, version_number
     )
+    invalidate_cached_objects(ctx, ("folder", destination_folder_id))
+    return result
 
 
 async def box_file_delete_tool(
@@ -77,7 +91,9 @@ async def box_file_delete_tool(
         dict[str, Any]: Dictionary containing success message or error.
     """
     box_client = get_box_client(ctx)
-    return box_file_delete(box_client, file_id)
+    result = box_file_delete(box_client, file_id)
+    invalidate_cached_objects(ctx, ("file", file_id))
+    return result
 
 
 async def box_file_move_tool(
@@ -94,7 +110,9 @@ async def box_file_move_tool(
         dict[str, Any]: Dictionary containing the moved file information.
     """
     box_client = get_box_client(ctx)
-    return box_file_move(box_client, file_id, destination_folder_id)
+    result = box_file_move(box_client, file_id, destination_folder_id)
+    invalidate_cached_objects(ctx, ("file", file_id), ("folder", destination_folder_id))
+    return result
 
 
 async def box_file_rename_tool(
@@ -111,7 +129,9 @@ async def box_file_rename_tool(
         dict[str, Any]: Dictionary containing the renamed file information.
     """
     box_client = get_box_client(ctx)
-    return box_file_rename(box_client, file_id, new_name)
+    result = box_file_rename(box_client, file_id, new_name)
+    invalidate_cached_objects(ctx, ("file", file_id))
+    return result
 
 
 async def box_file_set_description_tool(
@@ -128,7 +148,9 @@ async def box_file_set_description_tool(
         dict[str, Any]: Dictionary containing the updated file information.
     """
     box_client = get_box_client(ctx)
-    return box_file_set_description(box_client, file_id, description)
+    result = box_file_set_description(box_client, file_id, description)
+    invalidate_cached_objects(ctx, ("file", file_id))
+    return result
 
 
 async def box_file_retention_date_set_tool(
@@ -147,7 +169,9 @@ async def box_file_retention_date_set_tool(
     box_client = get_box_client(ctx)
     # Parse the retention date string to datetime
     retention_dt = datetime.fromisoformat(retention_date.replace("Z", "+00:00"))
-    return box_file_retention_date_set(box_client, file_id, retention_dt)
+    result = box_file_retention_date_set(box_client, file_id, retention_dt)
+    invalidate_cached_objects(ctx, ("file", file_id))
+    return result
 
 
 async def box_file_retention_date_clear_tool(
@@ -162,7 +186,9 @@ async def box_file_retention_date_clear_tool(
         dict[str, Any]: Dictionary containing the updated file information.
     """
     box_client = get_box_client(ctx)
-    return box_file_retention_date_clear(box_client, file_id)
+    result = box_file_retention_date_clear(box_client, file_id)
+    invalidate_cached_objects(ctx, ("file", file_id))
+    return result
 
 
 async def box_file_lock_tool(
@@ -186,9 +212,11 @@ async def box_file_lock_tool(
     if lock_expires_at:
         lock_expires_dt = datetime.fromisoformat(lock_expires_at.replace("Z", "+00:00"))
 
-    return box_file_lock(
+    result = box_file_lock(
         box_client, file_id, lock_expires_dt, is_download_prevented
     )
+    invalidate_cached_objects(ctx, ("file", file_id))
+    return result
 
 
 async def box_file_unlock_tool(
@@ -203,7 +231,9 @@ async def box_file_unlock_tool(
         dict[str, Any]: Dictionary containing the unlocked file information.
     """
     box_client = get_box_client(ctx)
-    return box_file_unlock(box_client, file_id)
+    result = box_file_unlock(box_client, file_id)
+    invalidate_cached_objects(ctx, ("file", file_id))
+    return result
 
 
 async def box_file_set_download_open_tool(
@@ -218,7 +248,9 @@ async def box_file_set_download_open_tool(
         dict[str, Any]: Dictionary containing the updated file information.
     """
     box_client = get_box_client(ctx)
-    return box_file_set_download_open(box_client, file_id)
+    result = box_file_set_download_open(box_client, file_id)
+    invalidate_cached_objects(ctx, ("file", file_id))
+    return result
 
 
 async def box_file_set_download_company_tool(
@@ -233,7 +265,9 @@ async def box_file_set_download_company_tool(
         dict[str, Any]: Dictionary containing the updated file information.
     """
     box_client = get_box_client(ctx)
-    return box_file_set_download_company(box_client, file_id)
+    result = box_file_set_download_company(box_client, file_id)
+    invalidate_cached_objects(ctx, ("file", file_id))
+    return result
 
 
 async def box_file_set_download_reset_tool(
@@ -248,7 +282,9 @@ async def box_file_set_download_reset_tool(
         dict[str, Any]: Dictionary containing the updated file information.
     """
     box_client = get_box_client(ctx)
-    return box_file_set_download_reset(box_client, file_id)
+    result = box_file_set_download_reset(box_client, file_id)
+    invalidate_cached_objects(ctx, ("file", file_id))
+    return result
 
 
 async def box_file_tag_list_tool(
@@ -280,7 +316,9 @@ async def box_file_tag_add_tool(
         dict[str, Any]: Dictionary containing the updated file information including tags.
     """
     box_client = get_box_client(ctx)
-    return box_file_tag_add(box_client, file_id, tag)
+    result = box_file_tag_add(box_client, file_id, tag)
+    invalidate_cached_objects(ctx, ("file", file_id))
+    return result
 
 
 async def box_file_tag_remove_tool(
@@ -297,7 +335,9 @@ async def box_file_tag_remove_tool(
         dict[str, Any]: Dictionary containing the updated file information including tags.
     """
     box_client = get_box_client(ctx)
-    return box_file_tag_remove(box_client, file_id, tag)
+    result = box_file_tag_remove(box_client, file_id, tag)
+    invalidate_cached_objects(ctx, ("file", file_id))
+    return result
 
 
 async def box_file_thumbnail_url_tool(
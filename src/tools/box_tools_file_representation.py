@@ -1,26 +1,61 @@
-from typing import Any
+from functools import partial
+from typing import Any, Optional
 
 from box_ai_agents_toolkit import box_file_text_extract
 from mcp.server.fastmcp import Context
 
-from tools.box_tools_generic import get_box_client
+from box_api import extract_text_chunk, fetch_file_range_info
+from box_api.text_chunks import TEXT_CHUNK_SIZE
+from tool_executor import native_async, run_blocking
+from tools.box_tools_generic import (
+    get_box_api,
+    get_box_client,
+    get_text_cache,
+    get_text_disk_cache,
+)
 
 
+@native_async
 async def box_file_text_extract_tool(
     ctx: Context,
     file_id: str,
+    cursor: Optional[str] = None,
+    max_chars: int = TEXT_CHUNK_SIZE,
 ) -> dict[str, Any]:
     """
     Extract text from a file in Box.
 
     The result can be markdown or plain text. If a markdown representation
-    is available, it will be preferred.
+    is available, it will be preferred. Long texts are returned one chunk at a
+    time, split between pages when the text has page breaks.
 
     Args:
         file_id (str): The ID of the file to extract text from.
+        cursor (str, optional): The "next_cursor" of the previous chunk, to get the next one.
+            Defaults to None, the first chunk.
+        max_chars (int, optional): Maximum characters per chunk, at most 1,000,000. Ignored
+            with a cursor. Defaults to 50,000.
 
     Returns:
-        dict[str, Any]: The extracted text (markdown or plain text).
+        dict[str, Any]: The extracted text (markdown or plain text) of the chunk, its "chunk"
+            index, "total_chunks", the "pages" it covers if known, and a "next_cursor" unless
+            it is the last chunk.
     """
-    box_client = get_box_client(ctx)
-    return box_file_text_extract(box_client, file_id)
+    box_api = get_box_api(ctx)
+    if box_api is not None:
+        fetch_info = box_api.file_range_info
+        extract = box_api.file_text_extract
+    else:
+        box_client = get_box_client(ctx)
+        fetch_info = partial(run_blocking, fetch_file_range_info, box_client)
+        extract = partial(run_blocking, box_file_text_extract, box_client)
+
+    return await extract_text_chunk(
+        fetch_info,
+        extract,
+        file_id,
+        cursor,
+        max_chars,
+        get_text_cache(ctx),
+        get_text_disk_cache(ctx),
+    )
@@ -1,20 +1,46 @@
 import base64
+import hashlib
+from functools import partial
 from typing import Any, Optional
 
 from box_ai_agents_toolkit import (
     box_file_download,
     box_file_upload,
 )
+from box_sdk_gen import BoxAPIError
 from mcp.server.fastmcp import Context
 
-from tools.box_tools_generic import get_box_client
+from box_api import (
+    SdkUploadSessions,
+    box_identity,
+    download_file_to_path,
+    fetch_file_range_bytes,
+    fetch_file_range_info,
+    find_uploaded_file,
+    preflight_upload,
+    read_file_range,
+    upload_in_session,
+    upload_local_file,
+    use_upload_session,
+)
+from tool_coalescing import coalesced
+from tool_executor import native_async, run_blocking
+from tools.box_tools_generic import (
+    get_box_api,
+    get_box_client,
+    get_range_cache,
+    get_upload_index,
+    invalidate_cached_objects,
+)
 
 
+@native_async
 async def box_file_download_tool(
     ctx: Context,
     file_id: str,
     save_file: bool = False,
     save_path: Optional[str] = None,
+    stream_to_disk: bool = False,
 ) -> dict[str, Any]:
     """
     Download a file from Box and optionally save it locally.
@@ -24,16 +50,31 @@ async def box_file_download_tool(
         save_file (bool, optional): Whether to save the file locally. Defaults to False.
         save_path (str, optional): Path where to save the file. If not provided but save_file is True,
                                   uses a temporary directory. Defaults to None.
+        stream_to_disk (bool, optional): Stream the file to save_path in fixed-size chunks instead of
+                                  returning its content, for large files. The SHA-1 of the saved file
+                                  is checked against Box. Defaults to False.
 
     Returns:
         dict[str, Any]: For text files: content as string.
                        For images: base64-encoded string with metadata.
                        For unsupported files: error message.
                        If save_file is True, includes the path where the file was saved.
+                       If stream_to_disk is True, only the path where the file was saved, its size and SHA-1.
     """
+    if stream_to_disk:
+        box_api = get_box_api(ctx)
+        if box_api is not None:
+            return await box_api.download_file_to_path(file_id, save_path)
+        try:
+            return await run_blocking(
+                download_file_to_path, get_box_client(ctx), file_id, save_path
+            )
+        except BoxAPIError as e:
+            return {"error": e.message}
+
     box_client = get_box_client(ctx)
-    path_saved, file_content, mime_type = box_file_download(
-        box_client, file_id, save_file, save_path
+    path_saved, file_content, mime_type = await run_blocking(
+        box_file_download, box_client, file_id, save_file, save_path
     )
 
     result: dict[str, Any] = {}
@@ -61,22 +102,176 @@ async def box_file_download_tool(
     return result
 
 
+@coalesced
+@native_async
+async def box_file_read_range_tool(
+    ctx: Context,
+    file_id: str,
+    offset: int = 0,
+    length: int = 65536,
+) -> dict[str, Any]:
+    """
+    Read part of a file from Box, e.g. the header of a CSV or the first lines of a log,
+    without downloading the whole file.
+
+    Args:
+        file_id (str): The ID of the file to read.
+        offset (int, optional): Position of the first byte to read. Defaults to 0.
+        length (int, optional): Number of bytes to read, up to 1048576. Defaults to 65536.
+
+    Returns:
+        dict[str, Any]: The slice under "content", as text when "encoding" is "utf-8" or base64-encoded
+                       when it is "base64", its "offset" and "length", the "next_offset" to continue
+                       reading from, the file "size" and "mime_type", and "eof" when the end of the file
+                       was reached. Text slices never end in a partial character, so "length" may be
+                       slightly lower than requested.
+    """
+    box_api = get_box_api(ctx)
+    if box_api is not None:
+        fetch_info = box_api.file_range_info
+        fetch_range = box_api.file_range_bytes
+    else:
+        client = get_box_client(ctx)
+
+        async def fetch_info(file_id: str) -> dict:
+            return await run_blocking(fetch_file_range_info, client, file_id)
+
+        async def fetch_range(
+            file_id: str, version: Optional[str], start: int, end: int
+        ) -> bytes:
+            return await run_blocking(
+                fetch_file_range_bytes, client, file_id, version, start, end
+            )
+
+    return await read_file_range(
+        fetch_info, fetch_range, file_id, offset, length, get_range_cache(ctx)
+    )
+
+
+@native_async
 async def box_file_upload_tool(
     ctx: Context,
     content: str | bytes,
     file_name: str,
     parent_folder_id: str,
+    upload_session_id: Optional[str] = None,
 ) -> dict[str, Any]:
     """
     Upload content as a file to Box.
 
+    Content identical to the file of the same name already in the folder is not uploaded
+    again, the existing file is returned instead. Large content is uploaded in parts,
+    several at a time, with a Box upload session.
+
     Args:
         content (str | bytes): The content to upload. Can be text or binary data.
         file_name (str): The name to give the file in Box.
         parent_folder_id (str): The ID of the destination folder. Defaults to root ("0").
+        upload_session_id (str, optional): The upload session of a failed upload of the same
+                                  content. Only the parts missing from the session are uploaded.
+                                  Defaults to None.
+
+    Returns:
+        dict[str, Any]: Information about the uploaded file including id and name, with
+                       "already_uploaded" when the existing file holds the same content.
+                       If an upload session fails, its "upload_session_id" to resume it with.
+    """
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    box_client = get_box_client(ctx)
+    box_api = get_box_api(ctx)
+    upload_index = get_upload_index(ctx)
+    identity = box_identity(box_client.auth) if upload_index is not None else ""
+    folder_id = str(parent_folder_id)
+    sha1 = await run_blocking(lambda: hashlib.sha1(data).hexdigest())
+
+    if upload_session_id is None:
+        if box_api is not None:
+            preflight = box_api.preflight_upload
+        else:
+            preflight = partial(run_blocking, preflight_upload, box_client)
+        try:
+            existing = await find_uploaded_file(
+                preflight, upload_index, identity, file_name, folder_id, len(data), sha1
+            )
+        except BoxAPIError as e:
+            return {"error": e.message}
+        if existing is not None:
+            return {**existing, "already_uploaded": True}
+
+    if upload_session_id or use_upload_session(len(data)):
+        result = await upload_in_session(
+            box_api or SdkUploadSessions(box_client),
+            data,
+            file_name,
+            parent_folder_id,
+            upload_session_id,
+            sha1=sha1,
+        )
+    else:
+        result = await run_blocking(
+            box_file_upload, box_client, content, file_name, parent_folder_id
+        )
+
+    if "error" not in result:
+        invalidate_cached_objects(ctx, ("folder", folder_id))
+        if upload_index is not None:
+            upload_index.put(identity, folder_id, file_name, sha1, result)
+    return result
+
+
+@native_async
+async def box_file_upload_from_path_tool(
+    ctx: Context,
+    file_path: str,
+    parent_folder_id: str,
+    file_name: Optional[str] = None,
+    upload_session_id: Optional[str] = None,
+) -> dict[str, Any]:
+    """
+    Upload a file of the MCP server host to Box, without passing its content.
+
+    Only files within the directories allowed by the server configuration can be uploaded.
+    A file identical to the file of the same name already in the folder is not uploaded
+    again, the existing file is returned instead.
+
+    Args:
+        file_path (str): Path of the file on the MCP server host.
+        parent_folder_id (str): The ID of the destination folder.
+        file_name (str, optional): The name to give the file in Box. Defaults to the name of the local file.
+        upload_session_id (str, optional): The upload session of a failed upload of the same
+                                  file. Only the parts missing from the session are uploaded.
+                                  Defaults to None.
 
     Returns:
-        dict[str, Any]: Information about the uploaded file including id and name.
+        dict[str, Any]: Information about the uploaded file including id, name and SHA-1,
+                       with "already_uploaded" when the existing file holds the same content.
+                       If an upload session fails, its "upload_session_id" to resume it with.
     """
     box_client = get_box_client(ctx)
-    return box_file_upload(box_client, content, file_name, parent_folder_id)
+    box_api = get_box_api(ctx)
+    upload_index = get_upload_index(ctx)
+    identity = box_identity(box_client.auth) if upload_index is not None else ""
+    folder_id = str(parent_folder_id)
+    if box_api is not None:
+        preflight = box_api.preflight_upload
+    else:
+        preflight = partial(run_blocking, preflight_upload, box_client)
+
+    result = await upload_local_file(
+        box_client,
+        box_api or SdkUploadSessions(box_client),
+        file_path,
+        folder_id,
+        file_name,
+        upload_session_id,
+        preflight,
+        upload_index,
+        identity,
+    )
+    if "error" not in result and not result.get("already_uploaded"):
+        invalidate_cached_objects(ctx, ("folder", folder_id))
+        if upload_index is not None:
+            upload_index.put(
+                identity, folder_id, result["name"], result["sha1"], result
+            )
+    return result
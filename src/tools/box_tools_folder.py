@@ -7,7 +7,6 @@ from box_ai_agents_toolkit import (
     box_folder_favorites_add,
     box_folder_favorites_remove,
     box_folder_info,
-    box_folder_items_list,
     box_folder_move,
     box_folder_rename,
     box_folder_set_collaboration,
@@ -20,7 +19,14 @@ from box_ai_agents_toolkit import (
 )
 from mcp.server.fastmcp import Context
 
-from tools.box_tools_generic import get_box_client
+from box_api import fetch_folder_items_page, list_folder_page
+from tool_coalescing import coalesced
+from tool_executor import native_async, run_blocking
+from tools.box_tools_generic import (
+    get_box_api,
+    get_box_client,
+    invalidate_cached_objects,
+)
 
 
 async def box_folder_copy_tool(
@@ -41,12 +47,14 @@ async def box_folder_copy_tool(
         dict[str, Any]: Dictionary containing the copied folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_copy(
+    result = box_folder_copy(
         client=client,
         folder_id=folder_id,
         destination_parent_folder_id=destination_parent_folder_id,
         name=name,
     )
+    invalidate_cached_objects(ctx, ("folder", destination_parent_folder_id))
+    return result
 
 
 async def box_folder_create_tool(
@@ -64,11 +72,13 @@ async def box_folder_create_tool(
         dict[str, Any]: Dictionary containing the created folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_create(
+    result = box_folder_create(
         client=client,
         name=name,
         parent_folder_id=parent_folder_id,
     )
+    invalidate_cached_objects(ctx, ("folder", parent_folder_id))
+    return result
 
 
 async def box_folder_delete_tool(
@@ -87,11 +97,13 @@ async def box_folder_delete_tool(
         dict[str, Any]: Dictionary containing success message or error message
     """
     client = get_box_client(ctx)
-    return box_folder_delete(
+    result = box_folder_delete(
         client=client,
         folder_id=folder_id,
         recursive=recursive,
     )
+    invalidate_cached_objects(ctx, ("folder", folder_id))
+    return result
 
 
 async def box_folder_favorites_add_tool(
@@ -109,10 +121,12 @@ async def box_folder_favorites_add_tool(
         dict[str, Any]: Dictionary containing the updated folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_favorites_add(
+    result = box_folder_favorites_add(
         client=client,
         folder_id=folder_id,
     )
+    invalidate_cached_objects(ctx, ("folder", folder_id))
+    return result
 
 
 async def box_folder_favorites_remove_tool(
@@ -129,12 +143,16 @@ async def box_folder_favorites_remove_tool(
         dict[str, Any]: Dictionary containing the updated folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_favorites_remove(
+    result = box_folder_favorites_remove(
         client=client,
         folder_id=folder_id,
     )
+    invalidate_cached_objects(ctx, ("folder", folder_id))
+    return result
 
 
+@coalesced
+@native_async
 async def box_folder_info_tool(
     ctx: Context,
     folder_id: str,
@@ -148,37 +166,68 @@ async def box_folder_info_tool(
     Returns:
         dict[str, Any]: Dictionary containing folder information or error message.
     """
+    box_api = get_box_api(ctx)
+    if box_api is not None:
+        return await box_api.folder_info(folder_id)
+
     client = get_box_client(ctx)
-    return box_folder_info(
+    return await run_blocking(
+        box_folder_info,
         client=client,
         folder_id=folder_id,
     )
 
 
+@coalesced
+@native_async
 async def box_folder_items_list_tool(
     ctx: Context,
     folder_id: str,
     is_recursive: bool = False,
     limit: Optional[int] = 1000,
+    page_token: Optional[str] = None,
+    max_depth: Optional[int] = None,
+    max_items: Optional[int] = None,
 ) -> dict:
     """
-    List items in a Box folder with optional recursive traversal.
+    List items in a Box folder, one page at a time, with optional recursive traversal.
 
     Args:
         ctx: Context: The context containing Box client information.
         folder_id (str): ID of the folder to list items from.
         is_recursive (bool, optional): Whether to recursively list subfolder contents. Defaults to False.
-        limit (Optional[int], optional): Maximum items per API call. Defaults to 1000.
+            Each subfolder is followed by its contents, and every item has its "depth" and "parent_folder_id".
+        limit (Optional[int], optional): Maximum items per page, up to 1000. Defaults to 1000.
+        page_token (Optional[str], optional): The "next_page_token" of the previous page, to get the next one.
+            Pass the same folder_id and is_recursive as the first call.
+        max_depth (Optional[int], optional): Deepest subfolder level listed when recursive, 0 listing only
+            the folder's own items. Defaults to no limit.
+        max_items (Optional[int], optional): Maximum items returned over all pages. When reached, the last
+            page has "truncated" set instead of a "next_page_token". Defaults to no limit.
 
     Returns:
-        dict[str, Any]: Dictionary containing folder items list or error message.
-    """
-    client = get_box_client(ctx)
-    return box_folder_items_list(
-        client=client,
-        folder_id=folder_id,
-        is_recursive=is_recursive,
-        limit=limit,
+        dict[str, Any]: Dictionary containing the page of folder items and, when more items remain,
+            a "next_page_token", or an error message.
+    """
+    box_api = get_box_api(ctx)
+    if box_api is not None:
+        fetch_page = box_api.folder_items_page
+    else:
+        client = get_box_client(ctx)
+
+        async def fetch_page(folder_id: str, marker: Optional[str], limit: int) -> dict:
+            return await run_blocking(
+                fetch_folder_items_page, client, folder_id, marker, limit
+            )
+
+    return await list_folder_page(
+        fetch_page,
+        folder_id,
+        is_recursive,
+        limit,
+        page_token,
+        max_depth=max_depth,
+        max_items=max_items,
     )
 
 
@@ -219,11 +268,15 @@ async def box_folder_move_tool(
         dict[str, Any]: Dictionary containing the moved folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_move(
+    result = box_folder_move(
         client=client,
         folder_id=folder_id,
         destination_parent_folder_id=destination_parent_folder_id,
     )
+    invalidate_cached_objects(
+        ctx, ("folder", folder_id), ("folder", destination_parent_folder_id)
+    )
+    return result
 
 
 async def box_folder_rename_tool(
@@ -242,11 +295,13 @@ async def box_folder_rename_tool(
         dict[str, Any]: Dictionary containing the renamed folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_rename(
+    result = box_folder_rename(
         client=client,
         folder_id=folder_id,
         new_name=new_name,
     )
+    invalidate_cached_objects(ctx, ("folder", folder_id))
+    return result
 
 
 async def box_folder_set_collaboration_tool(
@@ -268,13 +323,15 @@ async def box_folder_set_collaboration_tool(
         dict[str, Any]: Dictionary containing the updated folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_set_collaboration(
+    result = box_folder_set_collaboration(
         client=client,
         folder_id=folder_id,
         can_non_owners_invite=can_non_owners_invite,
         can_non_owners_view_collaborators=can_non_owners_view_collaborators,
         is_collaboration_restricted_to_enterprise=is_collaboration_restricted_to_enterprise,
     )
+    invalidate_cached_objects(ctx, ("folder", folder_id))
+    return result
 
 
 async def box_folder_set_description_tool(
@@ -293,11 +350,13 @@ async def box_folder_set_description_tool(
         dict[str, Any]: Dictionary containing the updated folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_set_description(
+    result = box_folder_set_description(
         client=client,
         folder_id=folder_id,
         description=description,
     )
+    invalidate_cached_objects(ctx, ("folder", folder_id))
+    return result
 
 
 async def box_folder_set_sync_tool(
@@ -317,11 +376,13 @@ async def box_folder_set_sync_tool(
         dict[str, Any]: Dictionary containing the updated folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_set_sync(
+    result = box_folder_set_sync(
         client=client,
         folder_id=folder_id,
         sync_state=sync_state,
     )
+    invalidate_cached_objects(ctx, ("folder", folder_id))
+    return result
 
 
 async def box_folder_set_upload_email_tool(
@@ -343,11 +404,13 @@ async def box_folder_set_upload_email_tool(
         dict[str, Any]: Dictionary containing the updated folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_set_upload_email(
+    result = box_folder_set_upload_email(
         client=client,
         folder_id=folder_id,
         folder_upload_email_access=folder_upload_email_access,
     )
+    invalidate_cached_objects(ctx, ("folder", folder_id))
+    return result
 
 
 async def box_folder_tag_add_tool(
@@ -367,11 +430,13 @@ async def box_folder_tag_add_tool(
         dict[str, Any]: Dictionary containing the updated folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_tag_add(
+    result = box_folder_tag_add(
         client=client,
         folder_id=folder_id,
         tag=tag,
     )
+    invalidate_cached_objects(ctx, ("folder", folder_id))
+    return result
 
 
 async def box_folder_tag_remove_tool(
@@ -389,8 +454,10 @@ async def box_folder_tag_remove_tool(
         dict[str, Any]: Dictionary containing the updated folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_tag_remove(
+    result = box_folder_tag_remove(
         client=client,
         folder_id=folder_id,
         tag=tag,
     )
+    invalidate_cached_objects(ctx, ("folder", folder_id))
+    return result
@@ -1,8 +1,11 @@
-from typing import cast
+from typing import Optional, cast
 
 from box_ai_agents_toolkit import BoxClient, authorize_app
 from mcp.server.fastmcp import Context
 
+from box_api import BoxAsyncApi
+from cache import AiResultCache, DiskTextCache, RangeCache, TextCache, UploadIndex
+from cache.objects import ObjectKey
 from server_context import BoxContext
 
 
@@ -12,17 +15,95 @@ def get_box_client(ctx: Context) -> BoxClient:
     This works for both OAuth and CCG modes:
     - OAuth mode: Creates a client from the Bearer token in the request
     - CCG mode: Returns the pre-initialized client
+
+    The client is resolved per request, the shared lifespan context is never
+    modified.
     """
     box_context = cast(BoxContext, ctx.request_context.lifespan_context)
+    return box_context.get_active_client(ctx.request_context.request)
+
+
+def invalidate_cached_objects(ctx: Context, *keys: ObjectKey) -> None:
+    """Drop changed files or folders from the object cache and the upload index.
+
+    The cached parent folder of each object is dropped too, since its item
+    collection lists the object's name and etag.
+
+    Args:
+        keys: (type, id) of each changed object, e.g. ("file", file_id).
+    """
+    box_context = ctx.request_context.lifespan_context
+    if not isinstance(box_context, BoxContext):
+        return
+    upload_index = box_context.upload_index
+    if upload_index is not None:
+        for object_type, object_id in keys:
+            if object_type == "folder":
+                upload_index.invalidate_folder(object_id)
+            else:
+                upload_index.invalidate_file(object_id)
+    object_cache = box_context.object_cache
+    if object_cache is None:
+        return
+    parents = [object_cache.parent_of(key) for key in keys]
+    object_cache.invalidate([*keys, *(parent for parent in parents if parent)])
+
+
+def get_range_cache(ctx: Context) -> Optional[RangeCache]:
+    """Helper function to get the cache of ranged file reads, if enabled."""
+    box_context = ctx.request_context.lifespan_context
+    if not isinstance(box_context, BoxContext):
+        return None
+    return box_context.range_cache
+
+
+def get_text_cache(ctx: Context) -> Optional[TextCache]:
+    """Helper function to get the cache of extracted texts, if enabled."""
+    box_context = ctx.request_context.lifespan_context
+    if not isinstance(box_context, BoxContext):
+        return None
+    return box_context.text_cache
 
-    # For OAuth mode, we need the request to extract the token
-    if box_context.client is None:
-        # Store the request in the context if not already there
-        if box_context.request is None and ctx.request_context.request is not None:
-            box_context.request = ctx.request_context.request
 
-    # Use the new get_active_client() method which handles both modes
-    return box_context.get_active_client()
+def get_text_disk_cache(ctx: Context) -> Optional[DiskTextCache]:
+    """Helper function to get the on-disk cache of extracted texts, if enabled."""
+    box_context = ctx.request_context.lifespan_context
+    if not isinstance(box_context, BoxContext):
+        return None
+    return box_context.text_disk_cache
+
+
+def get_upload_index(ctx: Context) -> Optional[UploadIndex]:
+    """Helper function to get the index of uploaded files, if enabled."""
+    box_context = ctx.request_context.lifespan_context
+    if not isinstance(box_context, BoxContext):
+        return None
+    return box_context.upload_index
+
+
+def get_ai_cache(ctx: Context) -> Optional[AiResultCache]:
+    """Helper function to get the cache of Box AI answers, if enabled."""
+    box_context = ctx.request_context.lifespan_context
+    if not isinstance(box_context, BoxContext):
+        return None
+    return box_context.ai_cache
+
+
+def get_box_api(ctx: Context) -> Optional[BoxAsyncApi]:
+    """Helper function to get the async Box API for the current request.
+
+    The hot-path tools use it to call Box over the shared async transport
+    without a worker thread.
+
+    Returns:
+        BoxAsyncApi bound to the request's client, or None if the async
+        transport is disabled, in which case tools use the toolkit instead.
+    """
+    box_context = ctx.request_context.lifespan_context
+    if not isinstance(box_context, BoxContext) or box_context.transport is None:
+        return None
+    client = box_context.get_active_client(ctx.request_context.request)
+    return BoxAsyncApi(box_context.transport, client, box_context.object_cache)
 
 
 async def box_who_am_i(ctx: Context) -> dict:
@@ -7,9 +7,11 @@ from box_ai_agents_toolkit import (
 )
 from mcp.server.fastmcp import Context
 
-from tools.box_tools_generic import get_box_client
+from tool_executor import native_async, run_blocking
+from tools.box_tools_generic import get_box_api, get_box_client
 
 
+@native_async
 async def box_search_tool(
     ctx: Context,
     query: str,
@@ -33,22 +35,33 @@ async def box_search_tool(
     return:
         List[dict]: The search results.
     """
-    box_client = get_box_client(ctx)
-
     # Convert the where to look for query to content types
     content_types: List[SearchForContentContentTypes] = []
     if where_to_look_for_query:
         for content_type in where_to_look_for_query:
             content_types.append(SearchForContentContentTypes[content_type])
 
+    box_api = get_box_api(ctx)
+    if box_api is not None:
+        return await box_api.search(
+            query, file_extensions, content_types, ancestor_folder_ids
+        )
+
     # Search for files with the query
-    search_results = box_search(
-        box_client, query, file_extensions, content_types, ancestor_folder_ids
+    box_client = get_box_client(ctx)
+    search_results = await run_blocking(
+        box_search,
+        box_client,
+        query,
+        file_extensions,
+        content_types,
+        ancestor_folder_ids,
     )
 
     return [search_result.to_dict() for search_result in search_results]
 
 
+@native_async
 async def box_search_folder_by_name_tool(ctx: Context, folder_name: str) -> List[dict]:
     """
     Locate a folder in Box by its name.
@@ -58,6 +71,12 @@ async def box_search_folder_by_name_tool(ctx: Context, folder_name: str) -> List
     return:
         List[dict]: The folder ID.
     """
+    box_api = get_box_api(ctx)
+    if box_api is not None:
+        return await box_api.locate_folder_by_name(folder_name)
+
     box_client = get_box_client(ctx)
-    search_results = box_locate_folder_by_name(box_client, folder_name)
+    search_results = await run_blocking(
+        box_locate_folder_by_name, box_client, folder_name
+    )
     return [search_result.to_dict() for search_result in search_results]
@@ -0,0 +1,505 @@
+"""Trace spans of the tool calls and of the Box API requests they make.
+
+Every tool call opens a span, child of the W3C ``traceparent`` of the HTTP
+request that carried it when there is one. The Box API requests, sent by the
+async transport or by the Box SDK on the tool executor threads, are recorded
+as child spans of the current span, which follows the tool call through
+contextvars. So does the time a call waited for a pool worker.
+
+Spans are encoded in the OTLP/JSON format and exported in batches from a
+background thread, either to an OTLP/HTTP collector or to a file holding one
+export request per line, which collectors can also read.
+"""
+
+import atexit
+import functools
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+import httpx
+from mcp.server.fastmcp import Context
+
+from config import ObservabilityConfig
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+
+class SpanContext(NamedTuple):
+    """The identity of a span, as propagated in a traceparent header."""
+
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+
+
+def _is_hex(value: str, length: int) -> bool:
+    return len(value) == length and set(value) <= _HEX_DIGITS
+
+
+def _is_hex_id(value: str, length: int) -> bool:
+    # All zero IDs are invalid
+    return _is_hex(value, length) and value != "0" * length
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[SpanContext]:
+    """
+    Parse a W3C traceparent header.
+
+    Args:
+        header: Header value, e.g. ``00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01``
+
+    Returns:
+        Optional[SpanContext]: The remote parent span, None if the header is missing or invalid
+    """
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) < 4:
+        return None
+    version, trace_id, span_id, flags = parts[:4]
+    if not (_is_hex(version, 2) and _is_hex(flags, 2)) or version == "ff":
+        return None
+    # Future versions may append fields, version 00 must not
+    if version == "00" and len(parts) != 4:
+        return None
+    if not (_is_hex_id(trace_id, 32) and _is_hex_id(span_id, 16)):
+        return None
+    return SpanContext(trace_id, span_id, bool(int(flags, 16) & 0x01))
+
+
+def format_traceparent(context: SpanContext) -> str:
+    """Format a span context as a W3C traceparent header."""
+    return (
+        f"00-{context.trace_id}-{context.span_id}-{'01' if context.sampled else '00'}"
+    )
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"key": key, "value": _otlp_value(value)} for key, value in attributes.items()
+    ]
+
+
+class Span:
+    """A timed operation of a trace."""
+
+    __slots__ = (
+        "name",
+        "context",
+        "parent_span_id",
+        "kind",
+        "attributes",
+        "start_ns",
+        "end_ns",
+        "status_code",
+        "status_message",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        context: SpanContext,
+        parent_span_id: Optional[str],
+        kind: int,
+        attributes: Dict[str, Any],
+        start_ns: int,
+    ):
+        self.name = name
+        self.context = context
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.attributes = attributes
+        self.start_ns = start_ns
+        self.end_ns: Optional[int] = None
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.status_code = STATUS_ERROR
+        self.status_message = message
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """The span in the OTLP/JSON encoding."""
+        span = {
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(
+                self.end_ns if self.end_ns is not None else self.start_ns
+            ),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status_code},
+        }
+        if self.parent_span_id is not None:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar(
+    "box_mcp_current_span", default=None
+)
+
+
+def current_span() -> Optional[Span]:
+    """The span of the current tool call or Box request, if any."""
+    return _current_span.get()
+
+
+class BatchSpanExporter(ABC):
+    """Export finished spans in batches from a background thread.
+
+    Spans are dropped, oldest first, when more than ``max_queue`` wait for
+    the exporter, so a slow or missing collector cannot grow the memory.
+
+    Args:
+        service_name: Value of the service.name resource attribute
+        batch_size: Spans per export request
+        interval: Seconds between two exports of an incomplete batch
+        max_queue: Maximum number of spans waiting to be exported
+    """
+
+    def __init__(
+        self,
+        service_name: str,
+        batch_size: int = 256,
+        interval: float = 5.0,
+        max_queue: int = 8192,
+    ):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._resource = {
+            "attributes": _otlp_attributes({"service.name": service_name})
+        }
+        self._queue: deque = deque(maxlen=max_queue)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self.exported = 0
+        self.failed = 0
+
+    def export(self, span: Span) -> None:
+        """Queue a finished span."""
+        self._queue.append(span)
+        if self._thread is None:
+            self._start()
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(
+                    target=self._run, name="box-mcp-span-exporter", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def document(self, spans: List[Span]) -> Dict[str, Any]:
+        """An OTLP/JSON export request holding the spans."""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": self._resource,
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "mcp-server-box"},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def flush(self) -> None:
+        """Export every queued span."""
+        with self._lock:
+            while self._queue:
+                batch = []
+                while self._queue and len(batch) < self.batch_size:
+                    batch.append(self._queue.popleft())
+                try:
+                    self._send(self.document(batch))
+                    self.exported += len(batch)
+                except Exception as e:
+                    self.failed += len(batch)
+                    logger.warning(f"Could not export {len(batch)} trace spans: {e}")
+
+    @abstractmethod
+    def _send(self, document: Dict[str, Any]) -> None:
+        """Send an export request, raising when the spans were not accepted."""
+
+    def shutdown(self) -> None:
+        """Export the remaining spans and stop the background thread."""
+        self._stopped = True
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.interval)
+        self.flush()
+
+
+class OtlpHttpSpanExporter(BatchSpanExporter):
+    """Export spans to an OTLP/HTTP collector, in the JSON encoding.
+
+    Args:
+        endpoint: Base URL of the collector, ``/v1/traces`` is appended
+        transport: Optional httpx transport, used to target a fake collector in tests
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str,
+        transport: Optional[httpx.BaseTransport] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(service_name, **kwargs)
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self._client = httpx.Client(transport=transport, timeout=10.0)
+
+    def _send(self, document: Dict[str, Any]) -> None:
+        response = self._client.post(
+            self.url,
+            content=json.dumps(document, separators=(",", ":")),
+            headers={"Content-Type": "application/json"},
+        )
+        response.raise_for_status()
+
+    def shutdown(self) -> None:
+        super().shutdown()
+        self._client.close()
+
+
+class JsonFileSpanExporter(BatchSpanExporter):
+    """Append spans to a file, one OTLP/JSON export request per line.
+
+    This is the format of the OpenTelemetry collector's file exporter, so the
+    file can be inspected offline or replayed into a collector.
+    """
+
+    def __init__(self, path: str, service_name: str, **kwargs: Any):
+        super().__init__(service_name, **kwargs)
+        self.path = path
+
+    def _send(self, document: Dict[str, Any]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(document, separators=(",", ":")) + "\n")
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits) or 1:0{bits // 4}x}"
+
+
+def _remote_parent(args: tuple, kwargs: dict) -> Optional[SpanContext]:
+    """The traceparent of the HTTP request behind a tool call, if any."""
+    ctx = next(
+        (a for a in itertools.chain(args, kwargs.values()) if isinstance(a, Context)),
+        None,
+    )
+    if ctx is None:
+        return None
+    try:
+        request = ctx.request_context.request
+    except ValueError:
+        # Outside of a request, e.g. a tool called directly
+        return None
+    headers = getattr(request, "headers", None)
+    if headers is None:
+        return None
+    return parse_traceparent(headers.get(TRACEPARENT_HEADER))
+
+
+class Tracer:
+    """Create the spans of the server and hand the finished ones to an exporter.
+
+    Args:
+        exporter: Exporter of the finished spans
+        clock_ns: Wall clock in nanoseconds, overridable for tests
+    """
+
+    def __init__(
+        self, exporter: BatchSpanExporter, clock_ns: Callable[[], int] = time.time_ns
+    ):
+        self.exporter = exporter
+        self._clock_ns = clock_ns
+
+    def _new_span(
+        self,
+        name: str,
+        kind: int,
+        attributes: Optional[Dict[str, Any]],
+        parent: Optional[SpanContext],
+        start_ns: Optional[int] = None,
+    ) -> Span:
+        parent_span_id = None
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current is not None else None
+        if parent is not None:
+            context = SpanContext(parent.trace_id, _new_id(64), parent.sampled)
+            parent_span_id = parent.span_id
+        else:
+            context = SpanContext(_new_id(128), _new_id(64))
+        start_ns = start_ns if start_ns is not None else self._clock_ns()
+        return Span(
+            name, context, parent_span_id, kind, dict(attributes or {}), start_ns
+        )
+
+    def _end(self, span: Span, end_ns: Optional[int] = None) -> None:
+        span.end_ns = end_ns if end_ns is not None else self._clock_ns()
+        if span.context.sampled:
+            self.exporter.export(span)
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[SpanContext] = None,
+    ) -> Iterator[Span]:
+        """
+        Open a span, current until the block exits.
+
+        Args:
+            name: Span name
+            kind: OTLP span kind
+            attributes: Initial span attributes
+            parent: Remote parent, the current span is the parent by default
+
+        Yields:
+            Span: The open span, ended and exported when the block exits
+        """
+        span = self._new_span(name, kind, attributes, parent)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(token)
+            self._end(span)
+
+    def record_span(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Record an operation that already happened as a child of the current span."""
+        if _current_span.get() is None:
+            return
+        self._end(
+            self._new_span(name, SPAN_KIND_INTERNAL, attributes, None, start_ns), end_ns
+        )
+
+    def wrap_tool(self, fn: Callable) -> Callable:
+        """Wrap a tool so every call opens a span.
+
+        The span continues the trace of the HTTP request's traceparent header.
+        Tools report Box errors by returning a dictionary with an "error" key,
+        which sets the span status to error.
+        """
+        name = fn.__name__
+        span_name = f"tools/call {name}"
+        attributes = {"mcp.method.name": "tools/call", "gen_ai.tool.name": name}
+
+        @functools.wraps(fn)
+        async def traced(*args: Any, **kwargs: Any) -> Any:
+            parent = _remote_parent(args, kwargs)
+            with self.start_span(
+                span_name, SPAN_KIND_SERVER, attributes, parent
+            ) as span:
+                result = await fn(*args, **kwargs)
+                if isinstance(result, dict) and "error" in result:
+                    span.set_error(str(result["error"]))
+                return result
+
+        return traced
+
+    def shutdown(self) -> None:
+        self.exporter.shutdown()
+
+
+_tracer: Optional[Tracer] = None
+
+
+def configure_tracing(config: ObservabilityConfig) -> Optional[Tracer]:
+    """Create the process wide tracer from configuration, None when tracing is disabled."""
+    global _tracer
+    if _tracer is not None:
+        atexit.unregister(_tracer.shutdown)
+        _tracer.shutdown()
+        _tracer = None
+
+    exporter_name = (config.tracing_exporter or "").lower()
+    if exporter_name == "otlp":
+        exporter = OtlpHttpSpanExporter(
+            config.tracing_otlp_endpoint, config.tracing_service_name
+        )
+        logger.info(f"Tracing enabled, exporting to {exporter.url}")
+    elif exporter_name == "file":
+        exporter = JsonFileSpanExporter(
+            config.tracing_file, config.tracing_service_name
+        )
+        logger.info(f"Tracing enabled, exporting to {config.tracing_file}")
+    else:
+        if exporter_name and exporter_name != "none":
+            logger.warning(
+                f"Unknown tracing exporter '{config.tracing_exporter}', tracing disabled"
+            )
+        return None
+
+    _tracer = Tracer(exporter)
+    atexit.register(_tracer.shutdown)
+    return _tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Get the process wide tracer, None when tracing is disabled."""
+    return _tracer
@@ -26,6 +26,7 @@ class FakeRequestContext:
                 client = get_oauth_client(config=app_config.box_api)
 
         self.lifespan_context = BoxContext(client=client)
+        self.request = None
 
 
 class FakeContext:
@@ -0,0 +1,240 @@
+import asyncio
+import json
+from contextlib import AsyncExitStack
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from box_sdk_gen import BoxClient, BoxDeveloperTokenAuth, SearchForContentContentTypes
+
+from box_api import BoxAsyncApi, BoxAsyncTransport
+from config import HttpConfig
+from server_context import BoxContext
+from tools.box_tools_file import box_file_info_tool
+from tools.box_tools_folder import box_folder_items_list_tool
+from tools.box_tools_generic import get_box_api
+
+FILE = {"type": "file", "id": "123", "name": "report.pdf", "etag": "1"}
+FOLDER = {"type": "folder", "id": "0", "name": "All Files", "etag": "0"}
+
+
+def make_client(token: str = "token-a") -> BoxClient:
+    return BoxClient(BoxDeveloperTokenAuth(token=token)).with_extra_headers(
+        extra_headers={"x-box-ai-library": "mcp-server-box"}
+    )
+
+
+def make_api(
+    handler, config: HttpConfig | None = None, client: BoxClient | None = None
+):
+    transport = BoxAsyncTransport(config, transport=httpx.MockTransport(handler))
+    return BoxAsyncApi(transport, client or make_client())
+
+
+def items_page(entries, next_marker=None):
+    return {"entries": entries, "limit": 1000, "next_marker": next_marker}
+
+
+@pytest.mark.asyncio
+async def test_file_info_shape_and_headers():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json=FILE)
+
+    api = make_api(handler)
+    result = await api.file_info("123")
+
+    assert result["file_info"]["id"] == "123"
+    assert result["file_info"]["name"] == "report.pdf"
+    request = seen[0]
+    assert request.url.path == "/2.0/files/123"
+    assert request.headers["authorization"] == "Bearer token-a"
+    assert request.headers["x-box-ai-library"] == "mcp-server-box"
+
+
+@pytest.mark.asyncio
+async def test_errors_are_reported_like_the_sdk():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            404,
+            json={
+                "type": "error",
+                "status": 404,
+                "message": "Not Found",
+                "request_id": "abc",
+            },
+        )
+
+    api = make_api(handler)
+    assert await api.folder_info("999") == {"error": "404 Not Found; Request ID: abc"}
+
+
+@pytest.mark.asyncio
+async def test_folder_items_page():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["usemarker"] == "true"
+        assert request.url.params["marker"] == "m1"
+        assert request.url.params["limit"] == "2"
+        return httpx.Response(200, json=items_page([FILE, FOLDER], next_marker="m2"))
+
+    api = make_api(handler)
+    page = await api.folder_items_page("0", "m1", 2)
+
+    assert [item["id"] for item in page["entries"]] == ["123", "0"]
+    assert page["next_marker"] == "m2"
+
+
+@pytest.mark.asyncio
+async def test_search_parameters():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.params)
+        return httpx.Response(200, json={"entries": [FILE], "total_count": 1})
+
+    api = make_api(handler)
+    results = await api.search(
+        "report", ["pdf", "docx"], [SearchForContentContentTypes.NAME], ["0"]
+    )
+
+    assert results[0]["name"] == "report.pdf"
+    assert seen[0]["file_extensions"] == "pdf,docx"
+    assert seen[0]["content_types"] == "name"
+    assert seen[0]["type"] == "file"
+
+
+@pytest.mark.asyncio
+async def test_file_text_extract_downloads_markdown():
+    representation = {
+        "type": "file",
+        "id": "123",
+        "representations": {
+            "entries": [
+                {
+                    "representation": "markdown",
+                    "status": {"state": "success"},
+                    "content": {
+                        "url_template": "https://dl.boxcloud.com/rep/{+asset_path}"
+                    },
+                    "info": {"url": "https://api.box.com/2.0/internal_files/123/rep"},
+                }
+            ]
+        },
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "dl.boxcloud.com":
+            return httpx.Response(200, content=b"# Report")
+        assert request.headers["x-rep-hints"] == "[markdown]"
+        return httpx.Response(200, json=representation)
+
+    api = make_api(handler)
+    assert await api.file_text_extract("123") == {"content": "# Report"}
+
+
+@pytest.mark.asyncio
+async def test_401_refreshes_token_once():
+    tokens = iter(["expired", "fresh"])
+    auth = MagicMock()
+    auth.token_storage.get.side_effect = lambda: SimpleNamespace(
+        access_token=next(tokens)
+    )
+    client = SimpleNamespace(auth=auth, network_session=make_client().network_session)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers["authorization"] == "Bearer expired":
+            return httpx.Response(401)
+        return httpx.Response(200, json=FILE)
+
+    api = make_api(handler, client=client)
+    result = await api.file_info("123")
+
+    assert result["file_info"]["id"] == "123"
+    auth.refresh_token.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_per_host_concurrency_is_capped():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json=FILE)
+
+    api = make_api(handler, HttpConfig(max_connections_per_host=3))
+    await asyncio.gather(*(api.file_info("123") for _ in range(12)))
+
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_streams_hold_their_host_slot_until_closed():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b"body")
+
+    api = make_api(handler, HttpConfig(max_connections_per_host=2))
+    kwargs = {"auth": api.auth, "network_session": api.network_session}
+    url = "https://api.box.com/2.0/files/123/content"
+
+    async def read_stream() -> bytes:
+        async with api.transport.stream("GET", url, **kwargs) as response:
+            return await response.aread()
+
+    async with AsyncExitStack() as streams:
+        for _ in range(2):
+            await streams.enter_async_context(
+                api.transport.stream("GET", url, **kwargs)
+            )
+
+        # The third stream waits for a slot while the others are open
+        third = asyncio.ensure_future(read_stream())
+        await asyncio.sleep(0.05)
+        assert not third.done()
+
+    assert await asyncio.wait_for(third, 1) == b"body"
+
+    # Reading a streamed body to the end closes it, which releases its slot
+    for _ in range(3):
+        response = await api.transport.request("GET", url, stream=True, **kwargs)
+        assert await response.aread() == b"body"
+    assert await asyncio.wait_for(read_stream(), 1) == b"body"
+
+
+@pytest.mark.asyncio
+async def test_tools_use_the_async_transport():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/items"):
+            return httpx.Response(200, json=items_page([FILE]))
+        return httpx.Response(200, json=FILE)
+
+    transport = BoxAsyncTransport(transport=httpx.MockTransport(handler))
+    box_context = BoxContext(client=make_client(), transport=transport)
+    ctx = SimpleNamespace(
+        request_context=SimpleNamespace(lifespan_context=box_context, request=None)
+    )
+
+    assert isinstance(get_box_api(ctx), BoxAsyncApi)
+    with patch("tools.box_tools_file.box_file_info") as mock_file_info:
+        result = await box_file_info_tool(ctx, "123")
+        mock_file_info.assert_not_called()
+    assert result["file_info"]["id"] == "123"
+
+    result = await box_folder_items_list_tool(ctx, "0")
+    assert json.loads(json.dumps(result))["folder_items"][0]["id"] == "123"
+    await transport.aclose()
+
+
+def test_get_box_api_without_transport():
+    box_context = BoxContext(client=make_client())
+    ctx = SimpleNamespace(
+        request_context=SimpleNamespace(lifespan_context=box_context, request=None)
+    )
+    assert get_box_api(ctx) is None
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from box_sdk_gen import BoxAPIError
+
+from box_api import configure_ai_batches, run_ai_batch
+from tool_executor import ToolExecutorBusyError
+
+
+class FakeBoxAi:
+    """Fake Box AI that tracks the requests in flight."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = []
+
+    async def call(self, key):
+        self.calls.append(key)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            # Later keys finish first
+            await asyncio.sleep(0.01 / (len(self.calls)))
+        finally:
+            self.in_flight -= 1
+        if key == "missing":
+            raise BoxAPIError(
+                message="Not Found", request_info=None, response_info=None
+            )
+        if key == "busy":
+            raise ToolExecutorBusyError("Tool pool 'ai' is saturated")
+        return {"AI_response": {"answer": f"answer of {key}"}}
+
+
+@pytest.fixture(autouse=True)
+def batch_workers():
+    configure_ai_batches(3)
+    yield
+    configure_ai_batches(4)
+
+
+@pytest.mark.asyncio
+async def test_results_are_in_order_under_the_concurrency_limit():
+    box = FakeBoxAi()
+    keys = [str(i) for i in range(10)]
+
+    results = await run_ai_batch(keys, box.call)
+
+    assert results == [{"AI_response": {"answer": f"answer of {key}"}} for key in keys]
+    assert box.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_duplicate_keys_are_called_once():
+    box = FakeBoxAi()
+
+    results = await run_ai_batch(["a", "b", "a"], box.call)
+
+    assert sorted(box.calls) == ["a", "b"]
+    assert results[0] == results[2]
+
+
+@pytest.mark.asyncio
+async def test_failures_are_returned_per_item():
+    box = FakeBoxAi()
+
+    results = await run_ai_batch(["1", "missing", "busy"], box.call)
+
+    assert results[0] == {"AI_response": {"answer": "answer of 1"}}
+    assert results[1] == {"error": "Not Found"}
+    assert results[2] == {"error": "Tool pool 'ai' is saturated"}
+
+
+@pytest.mark.asyncio
+async def test_progress_is_reported_per_distinct_item():
+    box = FakeBoxAi()
+    reports = []
+
+    async def progress(done, total, key, result):
+        reports.append((done, total, key, result))
+
+    await run_ai_batch(["1", "2", "1", "missing"], box.call, progress)
+
+    assert [(done, total) for done, total, _, _ in reports] == [(1, 3), (2, 3), (3, 3)]
+    assert {key for _, _, key, _ in reports} == {"1", "2", "missing"}
@@ -0,0 +1,115 @@
+import hashlib
+import io
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from box_sdk_gen import BoxClient, BoxDeveloperTokenAuth
+
+from box_api import BoxAsyncApi, BoxAsyncTransport, download_file_to_path
+from config import HttpConfig
+
+CONTENT = b"0123456789" * 1000
+SHA1 = hashlib.sha1(CONTENT).hexdigest()
+
+
+def make_api(content: bytes = CONTENT, sha1: str = SHA1, requests=None):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if requests is not None:
+            requests.append(request)
+        if request.url.path == "/2.0/files/123":
+            return httpx.Response(
+                200,
+                json={
+                    "type": "file",
+                    "id": "123",
+                    "name": "report.bin",
+                    "size": len(content),
+                    "sha1": sha1,
+                    "file_version": {"type": "file_version", "id": "v2"},
+                },
+            )
+        if request.url.path == "/2.0/files/123/content":
+            return httpx.Response(
+                302, headers={"Location": "https://dl.boxcloud.com/d/123"}
+            )
+        return httpx.Response(200, content=content)
+
+    transport = BoxAsyncTransport(
+        HttpConfig(download_chunk_size=256), transport=httpx.MockTransport(handler)
+    )
+    return BoxAsyncApi(transport, BoxClient(BoxDeveloperTokenAuth(token="token-a")))
+
+
+@pytest.mark.asyncio
+async def test_download_is_streamed_and_verified(tmp_path):
+    requests = []
+    api = make_api(requests=requests)
+    path = tmp_path / "out.bin"
+
+    result = await api.download_file_to_path("123", str(path))
+
+    assert result == {"path_saved": str(path), "size": len(CONTENT), "sha1": SHA1}
+    assert path.read_bytes() == CONTENT
+    assert not (tmp_path / "out.bin.part").exists()
+    content_request = requests[1]
+    assert content_request.url.params["version"] == "v2"
+    # The pre-signed download host does not get the Box token
+    assert "authorization" not in requests[2].headers
+
+
+@pytest.mark.asyncio
+async def test_download_into_a_directory_uses_the_file_name(tmp_path):
+    result = await make_api().download_file_to_path("123", str(tmp_path))
+
+    assert result["path_saved"] == str(tmp_path / "report.bin")
+    assert (tmp_path / "report.bin").read_bytes() == CONTENT
+
+
+@pytest.mark.asyncio
+async def test_sha1_mismatch_keeps_the_existing_file(tmp_path):
+    path = tmp_path / "out.bin"
+    path.write_bytes(b"previous")
+
+    result = await make_api(sha1="0" * 40).download_file_to_path("123", str(path))
+
+    assert result == {"error": f"SHA-1 mismatch: expected {'0' * 40}, got {SHA1}"}
+    assert path.read_bytes() == b"previous"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_sdk_download_is_streamed(tmp_path):
+    client = MagicMock()
+    client.files.get_file_by_id.return_value = SimpleNamespace(
+        name="report.bin", sha1=SHA1, file_version=SimpleNamespace(id="v2")
+    )
+    client.downloads.download_file.return_value = io.BytesIO(CONTENT)
+
+    result = download_file_to_path(client, "123", str(tmp_path))
+
+    assert result == {
+        "path_saved": str(tmp_path / "report.bin"),
+        "size": len(CONTENT),
+        "sha1": SHA1,
+    }
+    client.downloads.download_file.assert_called_once_with("123", version="v2")
+
+
+def test_interrupted_download_discards_the_partial_file(tmp_path):
+    class BrokenStream(io.BytesIO):
+        def read(self, size=-1):
+            if self.tell() >= 2048:
+                raise ConnectionError("reset")
+            return super().read(size)
+
+    client = MagicMock()
+    client.files.get_file_by_id.return_value = SimpleNamespace(
+        name="report.bin", sha1=SHA1, file_version=None
+    )
+    client.downloads.download_file.return_value = BrokenStream(CONTENT)
+
+    with pytest.raises(ConnectionError):
+        download_file_to_path(client, "123", str(tmp_path))
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,257 @@
+import asyncio
+import random
+
+import pytest
+from box_sdk_gen import BoxAPIError
+
+from box_api import list_folder_page
+
+
+class FakeTree:
+    """Fake Box folder tree served with marker pagination."""
+
+    def __init__(self, children: dict[str, list[dict]]):
+        self.children = children
+        self.calls = []
+
+    async def fetch_page(self, folder_id, marker, limit):
+        self.calls.append((folder_id, marker, limit))
+        entries = self.children[folder_id]
+        start = int(marker or 0)
+        end = start + limit
+        return {
+            "entries": entries[start:end],
+            "next_marker": str(end) if end < len(entries) else None,
+        }
+
+
+def make_tree() -> FakeTree:
+    def files(prefix, count):
+        return [{"type": "file", "id": f"{prefix}-{i}"} for i in range(count)]
+
+    return FakeTree(
+        {
+            "0": [
+                {"type": "folder", "id": "a"},
+                *files("root", 3),
+                {"type": "folder", "id": "b"},
+            ],
+            "a": [{"type": "folder", "id": "a1"}, *files("a", 4)],
+            "a1": files("a1", 2),
+            "b": [],
+        }
+    )
+
+
+def walk(tree: FakeTree, folder_id: str, depth: int = 0):
+    """Reference depth first order of a tree."""
+    for entry in tree.children[folder_id]:
+        yield entry["id"], depth
+        if entry["type"] == "folder":
+            yield from walk(tree, entry["id"], depth + 1)
+
+
+async def list_all(tree, folder_id, is_recursive, limit):
+    pages = []
+    token = None
+    while True:
+        result = await list_folder_page(
+            tree.fetch_page, folder_id, is_recursive, limit, token
+        )
+        pages.append(result["folder_items"])
+        token = result.get("next_page_token")
+        if token is None:
+            return pages
+
+
+@pytest.mark.asyncio
+async def test_large_folder_is_paged_with_markers():
+    tree = FakeTree({"0": [{"type": "file", "id": str(i)} for i in range(2500)]})
+
+    pages = await list_all(tree, "0", False, 1000)
+
+    assert [len(page) for page in pages] == [1000, 1000, 500]
+    assert [item["id"] for page in pages for item in page] == [
+        str(i) for i in range(2500)
+    ]
+    assert [marker for _, marker, _ in tree.calls] == [None, "1000", "2000"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [1, 2, 3, 5, 1000])
+async def test_recursive_pages_resume_the_traversal(limit):
+    tree = make_tree()
+
+    pages = await list_all(tree, "0", True, limit)
+
+    items = [item for page in pages for item in page]
+    assert [(item["id"], item["depth"]) for item in items] == list(walk(tree, "0"))
+    assert all(len(page) <= limit for page in pages)
+    # The last token may only point at folders with nothing left to list
+    assert all(pages[:-1])
+    assert (
+        next(item for item in items if item["id"] == "a1-0")["parent_folder_id"] == "a1"
+    )
+
+
+@pytest.mark.asyncio
+async def test_token_size_does_not_grow_with_the_folder():
+    small = FakeTree({"0": [{"type": "file", "id": str(i)} for i in range(20)]})
+    large = FakeTree({"0": [{"type": "file", "id": str(i)} for i in range(200_000)]})
+
+    small_page = await list_folder_page(small.fetch_page, "0", True, 10)
+    large_page = await list_folder_page(large.fetch_page, "0", True, 10)
+
+    assert (
+        abs(len(large_page["next_page_token"]) - len(small_page["next_page_token"]))
+        <= 4
+    )
+    assert len(large.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_token_is_bound_to_its_listing():
+    tree = make_tree()
+    page = await list_folder_page(tree.fetch_page, "0", True, 2)
+
+    other = await list_folder_page(
+        tree.fetch_page, "a", True, 2, page["next_page_token"]
+    )
+    assert other == {
+        "error": "The page token was issued for a different folder listing"
+    }
+    assert await list_folder_page(tree.fetch_page, "0", True, 2, "garbage!") == {
+        "error": "Invalid page token"
+    }
+
+
+@pytest.mark.asyncio
+async def test_empty_folder_and_errors():
+    tree = make_tree()
+    assert await list_folder_page(tree.fetch_page, "b") == {
+        "message": "No items found in folder."
+    }
+
+    async def failing(folder_id, marker, limit):
+        raise BoxAPIError(
+            message="404 Not Found; Request ID: x",
+            request_info=None,
+            response_info=None,
+        )
+
+    assert await list_folder_page(failing, "0") == {
+        "error": "404 Not Found; Request ID: x"
+    }
+
+
+class SlowTree(FakeTree):
+    """Fake tree answering after a random delay, recording the concurrency."""
+
+    def __init__(self, children, seed=0):
+        super().__init__(children)
+        self.random = random.Random(seed)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch_page(self, folder_id, marker, limit):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.random.uniform(0, 0.005))
+            return await super().fetch_page(folder_id, marker, limit)
+        finally:
+            self.in_flight -= 1
+
+
+def make_wide_tree(fanout=4, levels=3) -> dict:
+    children = {}
+
+    def build(folder_id, level):
+        entries = [{"type": "file", "id": f"{folder_id}.f"}]
+        if level < levels:
+            for i in range(fanout):
+                child = f"{folder_id}.{i}"
+                entries.insert(i, {"type": "folder", "id": child})
+                build(child, level + 1)
+        children[folder_id] = entries
+
+    build("0", 0)
+    return children
+
+
+async def list_all_items(tree, limit, **kwargs):
+    items = []
+    token = None
+    while True:
+        result = await list_folder_page(
+            tree.fetch_page, "0", True, limit, token, **kwargs
+        )
+        items += result["folder_items"]
+        token = result.get("next_page_token")
+        if token is None:
+            return items
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [2, 7, 1000])
+async def test_concurrent_traversal_matches_serial_order(limit):
+    children = make_wide_tree()
+    serial = SlowTree(children)
+    concurrent = SlowTree(children, seed=1)
+
+    serial_items = await list_all_items(serial, limit, workers=1)
+    concurrent_items = await list_all_items(concurrent, limit, workers=8)
+
+    assert concurrent_items == serial_items
+    assert [(i["id"], i["depth"]) for i in serial_items] == list(walk(serial, "0"))
+    assert serial.max_in_flight == 1
+    assert 1 < concurrent.max_in_flight <= 8
+
+
+@pytest.mark.asyncio
+async def test_prefetch_is_bounded_by_the_page():
+    tree = SlowTree(make_wide_tree(fanout=10, levels=2))
+
+    result = await list_folder_page(tree.fetch_page, "0", True, 5, workers=4)
+
+    assert [item["id"] for item in result["folder_items"]] == [
+        "0.0",
+        "0.0.0",
+        "0.0.0.f",
+        "0.0.1",
+        "0.0.1.f",
+    ]
+    # Speculative fetches stay far below the 111 folders of the tree
+    assert len(tree.calls) <= 12
+
+
+@pytest.mark.asyncio
+async def test_max_depth():
+    tree = make_tree()
+
+    result = await list_folder_page(tree.fetch_page, "0", True, max_depth=0)
+    assert [item["id"] for item in result["folder_items"]] == [
+        e["id"] for e in tree.children["0"]
+    ]
+    assert {call[0] for call in tree.calls} == {"0"}
+
+    result = await list_folder_page(tree.fetch_page, "0", True, max_depth=1)
+    assert max(item["depth"] for item in result["folder_items"]) == 1
+    assert "a1-0" not in [item["id"] for item in result["folder_items"]]
+
+
+@pytest.mark.asyncio
+async def test_max_items_spans_pages():
+    tree = make_tree()
+
+    first = await list_folder_page(tree.fetch_page, "0", True, 4, max_items=6)
+    second = await list_folder_page(
+        tree.fetch_page, "0", True, 4, first["next_page_token"], max_items=6
+    )
+
+    expected = [item_id for item_id, _ in walk(tree, "0")][:6]
+    assert [
+        item["id"] for item in first["folder_items"] + second["folder_items"]
+    ] == expected
+    assert second["truncated"] is True
+    assert "next_page_token" not in second
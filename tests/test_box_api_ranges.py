@@ -0,0 +1,203 @@
+import base64
+import io
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+import requests
+from box_sdk_gen import BoxClient, BoxDeveloperTokenAuth
+
+from box_api import BoxAsyncApi, BoxAsyncTransport, read_file_range
+from box_api.ranges import fetch_file_range_bytes
+from cache import RangeCache
+from config import HttpConfig
+
+TEXT = (
+    "id,name,city\n" + "".join(f"{i},Zoë {i},Zürich ✓\n" for i in range(2000))
+).encode()
+
+
+class FakeFile:
+    """Fake Box file answering Range requests on its versions."""
+
+    def __init__(self, name="data.csv", versions=None):
+        self.name = name
+        self.versions = versions or {"v1": TEXT}
+        self.current = next(iter(self.versions))
+        self.ranges = []
+
+    async def fetch_info(self, file_id):
+        return {
+            "id": file_id,
+            "name": self.name,
+            "size": len(self.versions[self.current]),
+            "file_version": {"id": self.current},
+        }
+
+    async def fetch_range(self, file_id, version, start, end):
+        self.ranges.append((version, start, end))
+        return self.versions[version][start : end + 1]
+
+
+async def read_all(file, length, cache=None):
+    chunks = []
+    offset = 0
+    while True:
+        result = await read_file_range(
+            file.fetch_info, file.fetch_range, "1", offset, length, cache
+        )
+        chunks.append(result)
+        offset = result["next_offset"]
+        if result["eof"]:
+            return chunks
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("length", [1000, 4097, 65536])
+async def test_text_slices_end_on_character_boundaries(length):
+    chunks = await read_all(FakeFile(), length)
+
+    assert all(chunk["encoding"] == "utf-8" for chunk in chunks)
+    assert "".join(chunk["content"] for chunk in chunks) == TEXT.decode()
+    assert all(chunk["length"] <= length for chunk in chunks)
+    assert chunks[0]["mime_type"] == "text/csv"
+    assert chunks[-1]["next_offset"] == len(TEXT)
+
+
+@pytest.mark.asyncio
+async def test_paging_downloads_each_block_once():
+    file = FakeFile()
+    cache = RangeCache(max_bytes=1024 * 1024, block_size=4096)
+
+    await read_all(file, 1000, cache)
+    await read_all(file, 3000, cache)
+
+    blocks = -(-len(TEXT) // 4096)
+    assert len(file.ranges) == blocks
+    assert [start for _, start, _ in file.ranges] == [i * 4096 for i in range(blocks)]
+
+
+@pytest.mark.asyncio
+async def test_missing_blocks_are_fetched_in_one_request():
+    file = FakeFile()
+    cache = RangeCache(max_bytes=1024 * 1024, block_size=1024)
+
+    await read_file_range(file.fetch_info, file.fetch_range, "1", 2048, 100, cache)
+    result = await read_file_range(
+        file.fetch_info, file.fetch_range, "1", 0, 5000, cache
+    )
+
+    assert (
+        result["content"]
+        == TEXT[:5000].decode("utf-8", errors="ignore")[: len(result["content"])]
+    )
+    assert file.ranges == [("v1", 2048, 3071), ("v1", 0, 2047), ("v1", 3072, 5119)]
+
+
+@pytest.mark.asyncio
+async def test_new_version_is_not_served_from_cache():
+    file = FakeFile(versions={"v1": b"old content", "v2": b"new content"})
+    cache = RangeCache(max_bytes=1024 * 1024)
+
+    first = await read_file_range(file.fetch_info, file.fetch_range, "1", 0, 100, cache)
+    file.current = "v2"
+    second = await read_file_range(
+        file.fetch_info, file.fetch_range, "1", 0, 100, cache
+    )
+
+    assert (first["content"], second["content"]) == ("old content", "new content")
+
+
+@pytest.mark.asyncio
+async def test_binary_and_images_are_base64():
+    binary = bytes(range(256)) * 4
+    for name in ("data.bin", "photo.png"):
+        file = FakeFile(name=name, versions={"v1": binary})
+        result = await read_file_range(file.fetch_info, file.fetch_range, "1", 0, 20)
+        assert result["encoding"] == "base64"
+        assert base64.b64decode(result["content"]) == binary[:20]
+
+    png = FakeFile(name="photo.png", versions={"v1": b"plain"})
+    result = await read_file_range(png.fetch_info, png.fetch_range, "1", 0, 5)
+    assert result["encoding"] == "base64"
+
+
+@pytest.mark.asyncio
+async def test_out_of_bounds():
+    file = FakeFile(versions={"v1": b"abc"})
+
+    result = await read_file_range(file.fetch_info, file.fetch_range, "1", 10, 5)
+    assert (result["content"], result["length"], result["eof"]) == ("", 0, True)
+    assert file.ranges == []
+    assert "error" in await read_file_range(
+        file.fetch_info, file.fetch_range, "1", -1, 5
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_api_sends_range_requests():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.headers.get("range") and request.url.params.get("version") == "v2":
+            return httpx.Response(206, content=TEXT[10:20])
+        return httpx.Response(200, content=TEXT)
+
+    transport = BoxAsyncTransport(transport=httpx.MockTransport(handler))
+    api = BoxAsyncApi(transport, BoxClient(BoxDeveloperTokenAuth(token="token-a")))
+
+    assert await api.file_range_bytes("1", "v2", 10, 19) == TEXT[10:20]
+    assert seen[0].headers["range"] == "bytes=10-19"
+    # A server ignoring the Range header still yields the requested slice
+    assert await api.file_range_bytes("1", None, 10, 19) == TEXT[10:20]
+
+
+def sdk_client(status: int, body: bytes):
+    """Box client whose HTTP session answers with a streamed body."""
+    response = requests.Response()
+    response.status_code = status
+    response.raw = io.BytesIO(body)
+    response.url = "https://dl.boxcloud.com/d/1"
+    client = BoxClient(BoxDeveloperTokenAuth(token="token-a"))
+    session = client.network_session.network_client.requests_session = MagicMock()
+    session.request.return_value = response
+    return client, session, response.raw
+
+
+def test_sdk_range_fetch_returns_the_partial_content():
+    client, session, _ = sdk_client(206, TEXT[10:20])
+
+    assert fetch_file_range_bytes(client, "1", "v2", 10, 19) == TEXT[10:20]
+    kwargs = session.request.call_args.kwargs
+    assert kwargs["headers"]["range"] == "bytes=10-19"
+    assert kwargs["params"] == {"version": "v2"}
+
+
+def test_sdk_range_fetch_stops_reading_a_whole_file_answer():
+    client, _, body = sdk_client(200, TEXT)
+
+    assert fetch_file_range_bytes(client, "1", None, 1500, 2599) == TEXT[1500:2600]
+    assert body.tell() < 4096 < len(TEXT)
+
+
+@pytest.mark.asyncio
+async def test_async_range_fetch_stops_reading_a_whole_file_answer():
+    chunks_sent = []
+
+    async def whole_file():
+        for offset in range(0, len(TEXT), 256):
+            chunks_sent.append(offset)
+            yield TEXT[offset : offset + 256]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        # A server ignoring the Range header
+        return httpx.Response(200, content=whole_file())
+
+    transport = BoxAsyncTransport(
+        HttpConfig(download_chunk_size=256), transport=httpx.MockTransport(handler)
+    )
+    api = BoxAsyncApi(transport, BoxClient(BoxDeveloperTokenAuth(token="token-a")))
+
+    assert await api.file_range_bytes("1", None, 300, 699) == TEXT[300:700]
+    assert len(chunks_sent) == 3
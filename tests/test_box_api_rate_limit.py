@@ -0,0 +1,153 @@
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+import requests
+from box_sdk_gen import BoxClient, BoxDeveloperTokenAuth
+from requests.structures import CaseInsensitiveDict
+
+from box_api import (
+    AdaptiveRateLimiter,
+    BoxAsyncApi,
+    BoxAsyncTransport,
+    RateLimiterRegistry,
+)
+from box_api.rate_limit import box_identity, rate_limiter_for
+from config import CacheConfig, HttpConfig
+from server_context import BoxClientCache
+
+FILE = {"type": "file", "id": "123", "name": "report.pdf"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_response(
+    status: int, body: dict, headers: dict | None = None
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers or {})
+    response._content = json.dumps(body).encode("utf-8")
+    response.url = "https://api.box.com/2.0/files/123"
+    return response
+
+
+def test_bucket_allows_burst_then_paces_requests():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(rate=10, burst=2, clock=clock)
+
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(0.1)
+    assert limiter.reserve() == pytest.approx(0.2)
+
+    clock.now = 1.0
+    assert limiter.reserve() == 0
+    assert limiter.stats()["waits"] == 2
+
+
+def test_throttle_honors_retry_after_and_recovers():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(rate=10, burst=5, jitter=0.5, clock=clock)
+
+    delay = limiter.on_throttled(2.0)
+    assert 2.0 <= delay <= 3.0
+    assert limiter.reserve() >= 2.0
+    assert limiter.stats()["rate"] == 5
+
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.stats()["rate"] == 10
+    assert limiter.stats()["throttled"] == 1
+
+
+def test_backoff_grows_without_retry_after():
+    limiter = AdaptiveRateLimiter(
+        rate=10, burst=5, min_rate=2, jitter=0, clock=FakeClock()
+    )
+
+    assert [limiter.on_throttled() for _ in range(4)] == [1, 2, 4, 8]
+    assert limiter.stats()["rate"] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_transport_retries_after_429():
+    responses = iter([429, 429, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = next(responses)
+        if status == 429:
+            return httpx.Response(429, headers={"Retry-After": "0.05"})
+        return httpx.Response(200, json=FILE)
+
+    registry = RateLimiterRegistry(HttpConfig())
+    client = registry.wrap_client(BoxClient(BoxDeveloperTokenAuth(token="token-a")))
+    transport = BoxAsyncTransport(transport=httpx.MockTransport(handler))
+    result = await BoxAsyncApi(transport, client).file_info("123")
+
+    assert result["file_info"]["id"] == "123"
+    stats = registry.stats()
+    assert stats["throttled"] == 2
+    assert stats["wait_seconds"] >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_the_backoff():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(asyncio.get_running_loop().time())
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0.2"})
+        return httpx.Response(200, json=FILE)
+
+    registry = RateLimiterRegistry(HttpConfig(rate_limit_burst=1, rate_limit_rps=1000))
+    client = registry.wrap_client(BoxClient(BoxDeveloperTokenAuth(token="token-a")))
+    api = BoxAsyncApi(BoxAsyncTransport(transport=httpx.MockTransport(handler)), client)
+
+    first = asyncio.create_task(api.file_info("123"))
+    await asyncio.sleep(0.01)
+    await asyncio.gather(first, *(api.file_info("123") for _ in range(5)))
+
+    # Nothing was sent while the identity was blocked by the 429
+    assert all(t - calls[0] >= 0.2 for t in calls[1:])
+
+
+def test_sdk_requests_go_through_the_limiter():
+    registry = RateLimiterRegistry(HttpConfig())
+    client = registry.wrap_client(BoxClient(BoxDeveloperTokenAuth(token="token-a")))
+    session = client.network_session.network_client.requests_session = MagicMock()
+    session.request.side_effect = [
+        make_response(429, {}, {"Retry-After": "0.05"}),
+        make_response(200, FILE),
+    ]
+
+    file = client.files.get_file_by_id("123")
+
+    assert file.id == "123"
+    assert session.request.call_count == 2
+    assert registry.stats()["throttled"] == 1
+    assert registry.stats()["wait_seconds"] >= 0.05
+
+
+def test_limiters_are_shared_per_identity():
+    registry = RateLimiterRegistry(HttpConfig())
+    client_cache = BoxClientCache(CacheConfig(client_cache_max_entries=1), registry)
+
+    first = client_cache.get_or_create("token-a")
+    client_cache.get_or_create("token-b")
+    # token-a's client was evicted, its recreated client keeps the same limiter
+    again = client_cache.get_or_create("token-a")
+
+    assert again is not first
+    assert rate_limiter_for(again) is rate_limiter_for(first)
+    assert registry.stats()["identities"] == 2
+    assert "token-a" not in box_identity(first.auth)
@@ -0,0 +1,167 @@
+import pytest
+
+from box_api import extract_text_chunk
+from box_api.text_chunks import encode_text_cursor, split_text
+from cache import TextCache
+
+PAGES = [f"Page {page}\n" + "word " * (20 * page) + "\f" for page in range(1, 8)]
+PDF_TEXT = "".join(PAGES)
+MARKDOWN = "\n\n".join(
+    f"## Section {i}\n\n" + "Lorem ipsum dolor sit amet. " * 30 for i in range(40)
+)
+
+
+class FakeFile:
+    """Fake Box file whose text representation can be extracted."""
+
+    def __init__(self, text, sha1="sha-1"):
+        self.text = text
+        self.sha1 = sha1
+        self.extractions = 0
+        self.info_calls = 0
+
+    async def fetch_info(self, file_id):
+        self.info_calls += 1
+        return {"id": file_id, "sha1": self.sha1, "file_version": {"id": "v1"}}
+
+    async def extract(self, file_id):
+        self.extractions += 1
+        return {"content": self.text}
+
+
+async def read_all(file, max_chars, cache=None):
+    cursor = None
+    results = []
+    while True:
+        # The chunk size of the cursor wins over max_chars
+        results.append(
+            await extract_text_chunk(
+                file.fetch_info, file.extract, "1", cursor, max_chars, cache
+            )
+        )
+        cursor = results[-1].get("next_cursor")
+        if cursor is None:
+            return results
+        max_chars = 10
+
+
+def test_text_without_pages_is_split_at_paragraphs():
+    chunks = split_text(MARKDOWN, 2000)
+
+    assert "".join(MARKDOWN[c.start : c.end] for c in chunks) == MARKDOWN
+    assert all(c.end - c.start <= 2000 for c in chunks)
+    assert all(MARKDOWN[c.start : c.end].endswith("\n\n") for c in chunks[:-1])
+    assert all(c.first_page is None for c in chunks)
+
+
+def test_text_is_split_between_pages():
+    chunks = split_text(PDF_TEXT, 400)
+
+    assert "".join(PDF_TEXT[c.start : c.end] for c in chunks) == PDF_TEXT
+    assert all(c.end - c.start <= 400 for c in chunks)
+    # Whole pages are kept together while they fit
+    assert (chunks[0].first_page, chunks[0].last_page) == (1, 2)
+    assert PDF_TEXT[chunks[0].start : chunks[0].end] == "".join(PAGES[:2])
+    # Pages longer than a chunk are split by window
+    long_page = [c for c in chunks if c.first_page == c.last_page == 7]
+    assert len(long_page) == 2
+    assert "".join(PDF_TEXT[c.start : c.end] for c in long_page) == PAGES[6]
+
+
+def test_empty_text_is_one_chunk():
+    assert len(split_text("", 100)) == 1
+    assert len(split_text("\f", 100)) == 1
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_served_from_the_cache():
+    file = FakeFile(PDF_TEXT)
+    cache = TextCache(max_bytes=1_000_000)
+
+    results = await read_all(file, 400, cache)
+
+    assert "".join(result["content"] for result in results) == PDF_TEXT
+    assert [result["chunk"] for result in results] == list(range(len(results)))
+    assert all(result["total_chunks"] == len(results) for result in results)
+    assert results[0]["pages"] == [1, 2]
+    assert "next_cursor" not in results[-1]
+    assert file.extractions == 1
+    assert file.info_calls == len(results)
+
+    # Another reader of the same version starts from the cached text
+    await extract_text_chunk(file.fetch_info, file.extract, "1", None, 400, cache)
+    assert file.extractions == 1
+
+
+@pytest.mark.asyncio
+async def test_without_cache_each_chunk_extracts_again():
+    file = FakeFile(MARKDOWN)
+
+    results = await read_all(file, 5000)
+
+    assert "".join(result["content"] for result in results) == MARKDOWN
+    assert file.extractions == len(results)
+
+
+@pytest.mark.asyncio
+async def test_short_text_is_one_chunk_without_cursor():
+    file = FakeFile("Hello")
+
+    result = await extract_text_chunk(file.fetch_info, file.extract, "1")
+
+    assert result == {"content": "Hello", "chunk": 0, "total_chunks": 1}
+    assert file.info_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_cursor_of_a_changed_file_is_refused():
+    file = FakeFile(MARKDOWN)
+    cache = TextCache(max_bytes=1_000_000)
+    first = await extract_text_chunk(
+        file.fetch_info, file.extract, "1", None, 5000, cache
+    )
+
+    file.sha1 = "sha-2"
+    result = await extract_text_chunk(
+        file.fetch_info, file.extract, "1", first["next_cursor"], cache=cache
+    )
+
+    assert result == {
+        "error": "The file changed since the cursor was issued, extract it again without a cursor"
+    }
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursors_are_refused():
+    file = FakeFile(MARKDOWN)
+
+    other_file = encode_text_cursor("2", "sha-1", 1, 5000)
+    past_end = encode_text_cursor("1", "sha-1", 1000, 5000)
+
+    assert await extract_text_chunk(file.fetch_info, file.extract, "1", "!!") == {
+        "error": "Invalid cursor"
+    }
+    assert await extract_text_chunk(file.fetch_info, file.extract, "1", other_file) == {
+        "error": "The cursor was issued for a different file"
+    }
+    assert await extract_text_chunk(file.fetch_info, file.extract, "1", past_end) == {
+        "error": "The cursor is past the end of the text"
+    }
+
+
+@pytest.mark.asyncio
+async def test_pending_representation_is_returned_as_is():
+    file = FakeFile(MARKDOWN)
+    status = {
+        "message": "markdown representation generation requested.",
+        "status": "none",
+    }
+
+    async def extract(file_id):
+        return status
+
+    cache = TextCache(max_bytes=1_000_000)
+    result = await extract_text_chunk(file.fetch_info, extract, "1", cache=cache)
+
+    assert result == status
+    assert cache.stats()["entries"] == 0
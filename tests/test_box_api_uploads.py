@@ -0,0 +1,408 @@
+import asyncio
+import base64
+import hashlib
+import json
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from box_sdk_gen import BoxAPIError, BoxClient, BoxDeveloperTokenAuth
+
+from box_api import (
+    BoxAsyncApi,
+    BoxAsyncTransport,
+    preflight_upload,
+    upload_in_session,
+    upload_local_file,
+    uploads,
+    use_upload_session,
+)
+
+PART_SIZE = 1000
+CONTENT = bytes(range(256)) * 20  # 5120 bytes, 6 parts
+CONTENT_SHA1 = hashlib.sha1(CONTENT).hexdigest()
+
+
+def digest(data: bytes) -> str:
+    return "sha=" + base64.b64encode(hashlib.sha1(data).digest()).decode()
+
+
+class FakeSessions:
+    """Fake Box upload sessions, with parts of PART_SIZE bytes."""
+
+    def __init__(self, fail_offsets=(), processing=0, delay=0.01):
+        self.sessions = {}
+        self.fail_offsets = set(fail_offsets)
+        self.processing = processing
+        self.delay = delay
+        self.uploads = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.commits = []
+
+    async def create_upload_session(self, folder_id, file_size, file_name):
+        session_id = f"s{len(self.sessions) + 1}"
+        self.sessions[session_id] = {"size": file_size, "name": file_name, "parts": {}}
+        return await self.get_upload_session(session_id)
+
+    async def get_upload_session(self, upload_session_id):
+        session = self.sessions[upload_session_id]
+        return {
+            "id": upload_session_id,
+            "part_size": PART_SIZE,
+            "total_parts": -(-session["size"] // PART_SIZE),
+        }
+
+    async def list_upload_parts(self, upload_session_id):
+        return list(self.sessions[upload_session_id]["parts"].values())
+
+    async def upload_part(
+        self, upload_session_id, data, offset, file_size, digest_header
+    ):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            self.uploads.append(offset)
+            if offset in self.fail_offsets:
+                self.fail_offsets.discard(offset)
+                raise BoxAPIError(
+                    message="part failed", request_info=None, response_info=None
+                )
+            assert digest_header == digest(data)
+            part = {
+                "part_id": f"p{offset}",
+                "offset": offset,
+                "size": len(data),
+                "sha1": hashlib.sha1(data).hexdigest(),
+            }
+            self.sessions[upload_session_id]["parts"][offset] = part
+            return part
+        finally:
+            self.in_flight -= 1
+
+    async def commit_upload_session(self, upload_session_id, parts, digest_header):
+        self.commits.append((parts, digest_header))
+        if self.processing:
+            self.processing -= 1
+            return None
+        name = self.sessions[upload_session_id]["name"]
+        return {"entries": [{"type": "file", "id": "42", "name": name}]}
+
+
+@pytest.fixture(autouse=True)
+def no_commit_wait(monkeypatch):
+    monkeypatch.setattr(uploads, "COMMIT_RETRY_INTERVAL", 0)
+
+
+@pytest.fixture
+def allowed_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "allowed"
+    directory.mkdir()
+    monkeypatch.setattr(uploads, "_allowed_dirs", [os.path.realpath(directory)])
+    return directory
+
+
+@pytest.mark.asyncio
+async def test_parts_are_uploaded_concurrently_and_committed_in_order():
+    sessions = FakeSessions()
+
+    result = await upload_in_session(sessions, CONTENT, "big.bin", "0", workers=3)
+
+    assert result == {
+        "id": "42",
+        "name": "big.bin",
+        "type": "file",
+        "sha1": CONTENT_SHA1,
+    }
+    assert sorted(sessions.uploads) == list(range(0, len(CONTENT), PART_SIZE))
+    assert sessions.max_in_flight == 3
+    parts, file_digest = sessions.commits[0]
+    assert [part["offset"] for part in parts] == list(range(0, len(CONTENT), PART_SIZE))
+    assert parts[-1]["size"] == len(CONTENT) % PART_SIZE
+    assert file_digest == digest(CONTENT)
+
+
+@pytest.mark.asyncio
+async def test_commit_is_retried_while_box_processes_the_parts():
+    sessions = FakeSessions(processing=2)
+
+    result = await upload_in_session(sessions, CONTENT, "big.bin", "0")
+
+    assert result["id"] == "42"
+    assert len(sessions.commits) == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_upload_is_resumed_with_the_missing_parts():
+    sessions = FakeSessions(fail_offsets={3000})
+
+    failed = await upload_in_session(sessions, CONTENT, "big.bin", "0", workers=2)
+
+    assert failed == {"error": "part failed", "upload_session_id": "s1"}
+    assert sessions.commits == []
+    done = set(sessions.sessions["s1"]["parts"])
+    assert 3000 not in done
+
+    sessions.uploads.clear()
+    result = await upload_in_session(
+        sessions, CONTENT, "big.bin", "0", upload_session_id="s1", workers=2
+    )
+
+    assert result["id"] == "42"
+    assert set(sessions.uploads) == set(range(0, len(CONTENT), PART_SIZE)) - done
+    parts, file_digest = sessions.commits[0]
+    assert len(parts) == 6
+    assert file_digest == digest(CONTENT)
+
+
+@pytest.mark.asyncio
+async def test_resume_with_different_content_is_refused():
+    sessions = FakeSessions(fail_offsets={5000})
+    await upload_in_session(sessions, CONTENT, "big.bin", "0", workers=1)
+
+    changed = b"x" + CONTENT[1:]
+    result = await upload_in_session(
+        sessions, changed, "big.bin", "0", upload_session_id="s1"
+    )
+
+    assert result == {
+        "error": "The content differs from the part at offset 0 of the upload session",
+        "upload_session_id": "s1",
+    }
+    assert sessions.commits == []
+
+
+@pytest.mark.asyncio
+async def test_resume_with_a_different_size_is_refused():
+    sessions = FakeSessions(fail_offsets={0})
+    await upload_in_session(sessions, CONTENT, "big.bin", "0")
+
+    result = await upload_in_session(
+        sessions, CONTENT + b"more" * 500, "big.bin", "0", upload_session_id="s1"
+    )
+
+    assert result == {"error": "The content size does not match the upload session"}
+
+
+def test_threshold_is_at_least_the_box_minimum():
+    try:
+        uploads.configure_uploads(1024, 4)
+        assert not use_upload_session(1024 * 1024)
+        assert use_upload_session(uploads.MIN_CHUNKED_UPLOAD_SIZE)
+    finally:
+        uploads.configure_uploads(uploads.MIN_CHUNKED_UPLOAD_SIZE, 4)
+
+
+@pytest.mark.asyncio
+async def test_box_async_api_upload_session_requests():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        path = request.url.path
+        if request.method == "POST" and path == "/api/2.0/files/upload_sessions":
+            return httpx.Response(
+                201, json={"id": "s1", "part_size": PART_SIZE, "total_parts": 6}
+            )
+        if request.method == "PUT":
+            body = request.content
+            return httpx.Response(
+                200,
+                json={
+                    "part": {
+                        "part_id": "p",
+                        "offset": int(
+                            request.headers["content-range"].split()[1].split("-")[0]
+                        ),
+                        "size": len(body),
+                        "sha1": hashlib.sha1(body).hexdigest(),
+                    }
+                },
+            )
+        if path.endswith("/commit"):
+            if len([r for r in requests if r.url.path.endswith("/commit")]) == 1:
+                return httpx.Response(202, headers={"Retry-After": "1"})
+            return httpx.Response(
+                201, json={"entries": [{"type": "file", "id": "42", "name": "big.bin"}]}
+            )
+        return httpx.Response(404, json={"message": "unexpected"})
+
+    api = BoxAsyncApi(
+        BoxAsyncTransport(transport=httpx.MockTransport(handler)),
+        BoxClient(BoxDeveloperTokenAuth(token="token-a")),
+    )
+
+    result = await upload_in_session(api, CONTENT, "big.bin", "7", workers=4)
+
+    assert result == {
+        "id": "42",
+        "name": "big.bin",
+        "type": "file",
+        "sha1": CONTENT_SHA1,
+    }
+    assert all(r.url.host == "upload.box.com" for r in requests)
+    assert json.loads(requests[0].content) == {
+        "folder_id": "7",
+        "file_size": len(CONTENT),
+        "file_name": "big.bin",
+    }
+    part_requests = [r for r in requests if r.method == "PUT"]
+    assert len(part_requests) == 6
+    last = next(
+        r for r in part_requests if r.headers["content-range"].startswith("bytes 5000")
+    )
+    assert last.headers["content-range"] == f"bytes 5000-5119/{len(CONTENT)}"
+    assert last.headers["digest"] == digest(CONTENT[5000:])
+    commit = requests[-1]
+    assert commit.headers["digest"] == digest(CONTENT)
+    assert [part["offset"] for part in json.loads(commit.content)["parts"]] == list(
+        range(0, len(CONTENT), PART_SIZE)
+    )
+
+
+@pytest.mark.asyncio
+async def test_local_upload_is_disabled_without_allowed_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "_allowed_dirs", [])
+    path = tmp_path / "a.bin"
+    path.write_bytes(CONTENT)
+
+    result = await upload_local_file(MagicMock(), FakeSessions(), str(path), "0")
+
+    assert "BOX_MCP_UPLOAD_ALLOWED_DIRS" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_local_upload_outside_the_allowed_dirs_is_refused(tmp_path, allowed_dir):
+    outside = tmp_path / "secret.bin"
+    outside.write_bytes(CONTENT)
+    link = allowed_dir / "link.bin"
+    link.symlink_to(outside)
+    client = MagicMock()
+
+    for path in (outside, link, allowed_dir / ".." / "secret.bin"):
+        result = await upload_local_file(client, FakeSessions(), str(path), "0")
+        assert result == {"error": f"{path} is not in a directory allowed for uploads"}
+    client.uploads.upload_file.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_small_local_file_is_uploaded_with_its_sha1(allowed_dir):
+    path = allowed_dir / "small.bin"
+    path.write_bytes(CONTENT)
+    client = MagicMock()
+    client.uploads.upload_file.return_value = SimpleNamespace(
+        entries=[SimpleNamespace(id="42", name="renamed.bin", type="file")]
+    )
+
+    result = await upload_local_file(
+        client, FakeSessions(), str(path), "7", "renamed.bin"
+    )
+
+    assert result == {
+        "id": "42",
+        "name": "renamed.bin",
+        "type": "file",
+        "sha1": CONTENT_SHA1,
+    }
+    attributes, file = client.uploads.upload_file.call_args.args
+    assert attributes.name == "renamed.bin"
+    assert attributes.parent.id == "7"
+    assert file.name == str(path)
+    assert client.uploads.upload_file.call_args.kwargs == {"content_md_5": CONTENT_SHA1}
+
+
+@pytest.mark.asyncio
+async def test_large_local_file_is_uploaded_from_its_memory_map(
+    allowed_dir, monkeypatch
+):
+    monkeypatch.setattr(uploads, "_chunked_upload_threshold", 1)
+    path = allowed_dir / "big.bin"
+    path.write_bytes(CONTENT)
+    sessions = FakeSessions()
+
+    result = await upload_local_file(MagicMock(), sessions, str(path), "0")
+
+    assert result == {
+        "id": "42",
+        "name": "big.bin",
+        "type": "file",
+        "sha1": CONTENT_SHA1,
+    }
+    assert sessions.sessions["s1"]["size"] == len(CONTENT)
+    parts, file_digest = sessions.commits[0]
+    assert len(parts) == 6
+    assert file_digest == digest(CONTENT)
+
+
+@pytest.mark.asyncio
+async def test_large_local_file_is_hashed_in_a_single_pass(allowed_dir, monkeypatch):
+    monkeypatch.setattr(uploads, "_chunked_upload_threshold", 1)
+    path = allowed_dir / "big.bin"
+    path.write_bytes(CONTENT)
+    hashed = []
+    hash_part = uploads._hash_part
+    monkeypatch.setattr(
+        uploads,
+        "_hash_part",
+        lambda file_sha1, chunk: (
+            hashed.append(file_sha1) or hash_part(file_sha1, chunk)
+        ),
+    )
+    file_hashes = []
+    file_sha1 = uploads._file_sha1
+    monkeypatch.setattr(
+        uploads, "_file_sha1", lambda mapped: file_hashes.append(1) or file_sha1(mapped)
+    )
+
+    # Without a preflight check, the file is hashed along with its parts
+    result = await upload_local_file(MagicMock(), FakeSessions(), str(path), "0")
+
+    assert result["sha1"] == CONTENT_SHA1
+    assert file_hashes == []
+    assert len(hashed) == 6 and all(sha1 is not None for sha1 in hashed)
+
+    # The digest of the preflight check is reused by the upload
+    hashed.clear()
+    sessions = FakeSessions()
+
+    async def preflight(file_name, size, parent_folder_id):
+        return None
+
+    result = await upload_local_file(
+        MagicMock(), sessions, str(path), "0", preflight=preflight
+    )
+
+    assert result["sha1"] == CONTENT_SHA1
+    assert file_hashes == [1]
+    assert hashed == [None] * 6
+    assert sessions.commits[0][1] == digest(CONTENT)
+
+
+def test_sdk_preflight_returns_the_conflicting_file():
+    conflict = {"type": "file", "id": "123", "name": "a.txt", "sha1": "abc"}
+    client = MagicMock()
+    client.uploads.preflight_file_upload_check.side_effect = BoxAPIError(
+        message="Item with the same name already exists",
+        request_info=None,
+        response_info=SimpleNamespace(
+            status_code=409, context_info={"conflicts": [conflict]}
+        ),
+    )
+
+    assert preflight_upload(client, "a.txt", 10, "7") == conflict
+    kwargs = client.uploads.preflight_file_upload_check.call_args.kwargs
+    assert (kwargs["name"], kwargs["size"], kwargs["parent"].id) == ("a.txt", 10, "7")
+
+    client.uploads.preflight_file_upload_check.side_effect = None
+    assert preflight_upload(client, "a.txt", 10, "7") is None
+
+    client.uploads.preflight_file_upload_check.side_effect = BoxAPIError(
+        message="Forbidden",
+        request_info=None,
+        response_info=SimpleNamespace(status_code=403, context_info=None),
+    )
+    with pytest.raises(BoxAPIError):
+        preflight_upload(client, "a.txt", 10, "7")
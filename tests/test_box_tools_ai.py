@@ -1,15 +1,19 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from cache import AiResultCache
 from tools.box_tools_ai import (
     box_ai_agent_info_by_id_tool,
     box_ai_agents_list_tool,
     box_ai_agents_search_by_name_tool,
     box_ai_ask_file_multi_tool,
+    box_ai_ask_file_prompts_tool,
     box_ai_ask_file_single_tool,
     box_ai_ask_hub_tool,
     box_ai_extract_freeform_tool,
+    box_ai_extract_structured_batch_using_fields_tool,
+    box_ai_extract_structured_batch_using_template_tool,
     box_ai_extract_structured_enhanced_using_fields_tool,
     box_ai_extract_structured_enhanced_using_template_tool,
     box_ai_extract_structured_using_fields_tool,
@@ -481,3 +485,135 @@ async def test_box_ai_agents_search_by_name_tool_default_limit(
         mock_box_client, "Agent", limit=1000
     )
     assert result == search_response
+
+
+@pytest.mark.asyncio
+@patch("tools.box_tools_ai.get_box_client")
+@patch("tools.box_tools_ai.get_ai_cache")
+@patch("tools.box_tools_ai.fetch_file_range_info")
+@patch("tools.box_tools_ai.box_ai_extract_structured_using_template")
+async def test_box_ai_extract_structured_using_template_tool_cached(
+    mock_extract, mock_file_info, mock_get_cache, mock_get_client, mock_ctx, mock_box_client
+):
+    """Test repeated extractions of unchanged files are served from the AI cache"""
+    mock_get_client.return_value = mock_box_client
+    mock_get_cache.return_value = AiResultCache(ttl=60, max_bytes=100_000)
+    mock_file_info.side_effect = lambda client, file_id: {"id": file_id, "sha1": "sha-" + file_id}
+    mock_extract.return_value = {"AI_response": {"answer": {"total": "42"}}}
+
+    results = [
+        await box_ai_extract_structured_using_template_tool(
+            ctx=mock_ctx, file_ids=file_ids, template_key="invoice"
+        )
+        for file_ids in (["1", "2"], ["2", "1"])
+    ]
+
+    mock_extract.assert_called_once_with(
+        mock_box_client, ["1", "2"], "invoice", ai_agent_id=None
+    )
+    assert results[0] == {"AI_response": {"answer": {"total": "42"}}}
+    assert results[1] == {"AI_response": {"answer": {"total": "42"}}, "cached": True}
+
+
+@pytest.mark.asyncio
+@patch("tools.box_tools_ai.get_box_client")
+@patch("tools.box_tools_ai.box_ai_extract_structured_using_template")
+async def test_box_ai_extract_structured_batch_using_template_tool(
+    mock_extract, mock_get_client, mock_ctx, mock_box_client
+):
+    """Test box_ai_extract_structured_batch_using_template_tool extracts each file"""
+    mock_get_client.return_value = mock_box_client
+    mock_ctx.report_progress = AsyncMock()
+
+    def extract(client, file_ids, template_key, ai_agent_id=None):
+        if file_ids == ["2"]:
+            return {"error": "Not Found"}
+        return {"AI_response": {"answer": {"total": file_ids[0]}}}
+
+    mock_extract.side_effect = extract
+
+    result = await box_ai_extract_structured_batch_using_template_tool(
+        ctx=mock_ctx, file_ids=["1", "2", "3"], template_key="invoice"
+    )
+
+    assert result == {
+        "results": [
+            {"file_id": "1", "AI_response": {"answer": {"total": "1"}}},
+            {"file_id": "2", "error": "Not Found"},
+            {"file_id": "3", "AI_response": {"answer": {"total": "3"}}},
+        ],
+        "succeeded": 2,
+        "failed": 1,
+    }
+    assert mock_extract.call_count == 3
+    mock_extract.assert_any_call(
+        mock_box_client, ["1"], template_key="invoice", ai_agent_id=None
+    )
+    assert mock_ctx.report_progress.await_count == 3
+    assert mock_ctx.report_progress.await_args.args[1] == 3
+
+
+@pytest.mark.asyncio
+@patch("tools.box_tools_ai.get_box_client")
+@patch("tools.box_tools_ai.box_ai_extract_structured_enhanced_using_fields")
+async def test_box_ai_extract_structured_batch_using_fields_tool_enhanced(
+    mock_extract, mock_get_client, mock_ctx, mock_box_client, sample_fields
+):
+    """Test box_ai_extract_structured_batch_using_fields_tool with the enhanced agent"""
+    mock_get_client.return_value = mock_box_client
+    mock_ctx.report_progress = AsyncMock()
+    mock_extract.return_value = {"AI_response": {"answer": {"name": "Jane"}}}
+
+    result = await box_ai_extract_structured_batch_using_fields_tool(
+        ctx=mock_ctx, file_ids=["1", "2"], fields=sample_fields, enhanced=True
+    )
+
+    assert [entry["file_id"] for entry in result["results"]] == ["1", "2"]
+    assert result["succeeded"] == 2
+    mock_extract.assert_any_call(mock_box_client, ["2"], fields=sample_fields)
+
+
+@pytest.mark.asyncio
+@patch("tools.box_tools_ai.get_box_client")
+@patch("tools.box_tools_ai.get_ai_cache")
+@patch("tools.box_tools_ai.fetch_file_range_info")
+@patch("tools.box_tools_ai.box_ai_ask_file_single")
+async def test_box_ai_ask_file_prompts_tool(
+    mock_ask_single, mock_file_info, mock_get_cache, mock_get_client, mock_ctx, mock_box_client
+):
+    """Test box_ai_ask_file_prompts_tool asks each distinct prompt once, in order"""
+    mock_get_client.return_value = mock_box_client
+    mock_get_cache.return_value = AiResultCache(ttl=60, max_bytes=100_000)
+    mock_file_info.return_value = {"id": "123", "sha1": "sha-a"}
+    mock_ctx.report_progress = AsyncMock()
+    mock_ask_single.side_effect = lambda client, file_id, prompt, ai_agent_id: {
+        "AI_response": {"answer": f"answer to {prompt}"}
+    }
+    prompts = ["Who signed?", "When does it expire?", "Who signed?"]
+
+    result = await box_ai_ask_file_prompts_tool(
+        ctx=mock_ctx, file_id="123", prompts=prompts, ai_agent_id="agent_123"
+    )
+
+    assert [entry["prompt"] for entry in result["results"]] == prompts
+    assert result["results"][1] == {
+        "prompt": "When does it expire?",
+        "AI_response": {"answer": "answer to When does it expire?"},
+    }
+    assert result["results"][0] == result["results"][2]
+    assert result["succeeded"] == 3
+    assert mock_ask_single.call_count == 2
+    mock_ask_single.assert_any_call(
+        mock_box_client, "123", prompt="Who signed?", ai_agent_id="agent_123"
+    )
+    # The file version is fetched once for all the prompts
+    mock_file_info.assert_called_once_with(mock_box_client, "123")
+    assert mock_ctx.report_progress.await_count == 2
+
+    # A single question already answered is served from the cache
+    mock_ask_single.reset_mock()
+    cached = await box_ai_ask_file_single_tool(
+        ctx=mock_ctx, file_id="123", prompt="Who signed?", ai_agent_id="agent_123"
+    )
+    assert cached["cached"] is True
+    mock_ask_single.assert_not_called()
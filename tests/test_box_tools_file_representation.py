@@ -219,3 +219,28 @@ async def test_box_file_text_extract_tool_error_response():
         assert isinstance(result, dict)
         assert "error" in result
         mock_extract.assert_called_once_with("client", file_id)
+
+
+@pytest.mark.asyncio
+async def test_box_file_text_extract_tool_pages_long_text():
+    ctx = MagicMock(spec=Context)
+    file_id = "12345"
+    text = "Page one\f" + "Page two " * 10 + "\f" + "Page three"
+    with (
+        patch("tools.box_tools_file_representation.box_file_text_extract") as mock_extract,
+        patch("tools.box_tools_file_representation.fetch_file_range_info") as mock_info,
+        patch("tools.box_tools_file_representation.get_box_client") as mock_get_client,
+    ):
+        mock_get_client.return_value = "client"
+        mock_extract.return_value = {"content": text}
+        mock_info.return_value = {"id": file_id, "sha1": "abc"}
+        first = await box_file_text_extract_tool(ctx, file_id, max_chars=100)
+        assert first["content"] == "Page one\f" + "Page two " * 10 + "\f"
+        assert first["pages"] == [1, 2]
+        assert first["total_chunks"] == 2
+
+        second = await box_file_text_extract_tool(ctx, file_id, cursor=first["next_cursor"])
+        assert second["content"] == "Page three"
+        assert second["pages"] == [3, 3]
+        assert "next_cursor" not in second
+        mock_info.assert_called_with("client", file_id)
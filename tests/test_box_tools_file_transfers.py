@@ -1,4 +1,5 @@
 import base64
+import hashlib
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -6,6 +7,8 @@ from mcp.server.fastmcp import Context
 
 from tools.box_tools_file_transfer import (
     box_file_download_tool,
+    box_file_read_range_tool,
+    box_file_upload_from_path_tool,
     box_file_upload_tool,
 )
 
@@ -149,6 +152,7 @@ async def test_box_file_upload_tool_text():
     parent_folder_id = 67890
     with (
         patch("tools.box_tools_file_transfer.box_file_upload") as mock_upload,
+        patch("tools.box_tools_file_transfer.find_uploaded_file", return_value=None),
         patch("tools.box_tools_file_transfer.get_box_client") as mock_get_client,
     ):
         mock_get_client.return_value = "client"
@@ -168,6 +172,7 @@ async def test_box_file_upload_tool_bytes():
     parent_folder_id = 67890
     with (
         patch("tools.box_tools_file_transfer.box_file_upload") as mock_upload,
+        patch("tools.box_tools_file_transfer.find_uploaded_file", return_value=None),
         patch("tools.box_tools_file_transfer.get_box_client") as mock_get_client,
     ):
         mock_get_client.return_value = "client"
@@ -187,6 +192,7 @@ async def test_box_file_upload_tool_with_special_characters():
     parent_folder_id = 67890
     with (
         patch("tools.box_tools_file_transfer.box_file_upload") as mock_upload,
+        patch("tools.box_tools_file_transfer.find_uploaded_file", return_value=None),
         patch("tools.box_tools_file_transfer.get_box_client") as mock_get_client,
     ):
         mock_get_client.return_value = "client"
@@ -196,3 +202,99 @@ async def test_box_file_upload_tool_with_special_characters():
         assert result["id"] == "99999"
         assert result["name"] == file_name
         mock_upload.assert_called_once_with("client", content, file_name, parent_folder_id)
+
+
+@pytest.mark.asyncio
+async def test_box_file_upload_tool_large_content_uses_upload_session():
+    ctx = MagicMock(spec=Context)
+    content = "x" * (20 * 1024 * 1024)
+    api = MagicMock()
+    with (
+        patch("tools.box_tools_file_transfer.box_file_upload") as mock_upload,
+        patch("tools.box_tools_file_transfer.find_uploaded_file", return_value=None),
+        patch("tools.box_tools_file_transfer.upload_in_session") as mock_session,
+        patch("tools.box_tools_file_transfer.get_box_api", return_value=api),
+    ):
+        mock_session.return_value = {"id": "99999", "name": "big.txt", "type": "file"}
+        result = await box_file_upload_tool(ctx, content, "big.txt", "0")
+        assert result["id"] == "99999"
+        mock_upload.assert_not_called()
+        mock_session.assert_called_once_with(
+            api,
+            content.encode(),
+            "big.txt",
+            "0",
+            None,
+            sha1=hashlib.sha1(content.encode()).hexdigest(),
+        )
+
+
+@pytest.mark.asyncio
+async def test_box_file_upload_tool_resumes_upload_session():
+    ctx = MagicMock(spec=Context)
+    with (
+        patch("tools.box_tools_file_transfer.upload_in_session") as mock_session,
+        patch("tools.box_tools_file_transfer.get_box_api", return_value="api"),
+    ):
+        mock_session.return_value = {"id": "99999", "name": "small.bin", "type": "file"}
+        await box_file_upload_tool(ctx, b"data", "small.bin", "0", upload_session_id="s1")
+        mock_session.assert_called_once_with(
+            "api", b"data", "small.bin", "0", "s1", sha1=hashlib.sha1(b"data").hexdigest()
+        )
+
+
+@pytest.mark.asyncio
+async def test_box_file_upload_from_path_tool():
+    ctx = MagicMock(spec=Context)
+    with (
+        patch("tools.box_tools_file_transfer.upload_local_file") as mock_upload,
+        patch("tools.box_tools_file_transfer.get_box_client", return_value="client"),
+        patch("tools.box_tools_file_transfer.get_box_api") as mock_get_api,
+        patch("tools.box_tools_file_transfer.invalidate_cached_objects") as mock_invalidate,
+    ):
+        api = mock_get_api.return_value
+        mock_upload.return_value = {"id": "99999", "name": "report.pdf", "type": "file"}
+        result = await box_file_upload_from_path_tool(ctx, "/data/report.pdf", "0")
+        assert result["id"] == "99999"
+        mock_upload.assert_called_once_with(
+            "client", api, "/data/report.pdf", "0", None, None, api.preflight_upload, None, ""
+        )
+        mock_invalidate.assert_called_once_with(ctx, ("folder", "0"))
+
+
+@pytest.mark.asyncio
+async def test_box_file_download_tool_stream_to_disk():
+    ctx = MagicMock(spec=Context)
+    file_id = "12345"
+    save_path = "/tmp/large.bin"
+    saved = {"path_saved": save_path, "size": 3, "sha1": "abc"}
+    with (
+        patch("tools.box_tools_file_transfer.download_file_to_path") as mock_download,
+        patch("tools.box_tools_file_transfer.get_box_client") as mock_get_client,
+    ):
+        mock_get_client.return_value = "client"
+        mock_download.return_value = saved
+        result = await box_file_download_tool(
+            ctx, file_id, save_path=save_path, stream_to_disk=True
+        )
+        assert result == saved
+        mock_download.assert_called_once_with("client", file_id, save_path)
+
+
+@pytest.mark.asyncio
+async def test_box_file_read_range_tool():
+    ctx = MagicMock(spec=Context)
+    file_id = "12345"
+    with (
+        patch("tools.box_tools_file_transfer.fetch_file_range_info") as mock_info,
+        patch("tools.box_tools_file_transfer.fetch_file_range_bytes") as mock_bytes,
+        patch("tools.box_tools_file_transfer.get_box_client") as mock_get_client,
+    ):
+        mock_get_client.return_value = "client"
+        mock_info.return_value = {"name": "log.txt", "size": 11, "file_version": {"id": "v1"}}
+        mock_bytes.return_value = b"hello"
+        result = await box_file_read_range_tool(ctx, file_id, offset=0, length=5)
+        assert result["content"] == "hello"
+        assert result["next_offset"] == 5
+        assert result["eof"] is False
+        mock_bytes.assert_called_once_with("client", file_id, "v1", 0, 4)
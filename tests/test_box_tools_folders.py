@@ -195,41 +195,49 @@ async def test_box_folder_items_list_tool():
     ctx = MagicMock(spec=Context)
     folder_id = "12345"
     with (
-        patch("tools.box_tools_folder.box_folder_items_list") as mock_list,
+        patch("tools.box_tools_folder.fetch_folder_items_page") as mock_page,
         patch("tools.box_tools_folder.get_box_client") as mock_get_client,
     ):
         mock_get_client.return_value = "client"
-        mock_list.return_value = {"entries": []}
+        mock_page.return_value = {
+            "entries": [{"type": "file", "id": "1"}],
+            "next_marker": None,
+        }
         result = await box_folder_items_list_tool(ctx, folder_id)
-        assert isinstance(result, dict)
-        mock_list.assert_called_once_with(
-            client="client",
-            folder_id=folder_id,
-            is_recursive=False,
-            limit=1000,
-        )
+        assert result == {"folder_items": [{"type": "file", "id": "1"}]}
+        mock_page.assert_called_once_with("client", folder_id, None, 1000)
 
 
 @pytest.mark.asyncio
 async def test_box_folder_items_list_tool_recursive():
     ctx = MagicMock(spec=Context)
     folder_id = "12345"
+    pages = {
+        (folder_id, None): {
+            "entries": [{"type": "folder", "id": "2"}, {"type": "file", "id": "3"}],
+            "next_marker": None,
+        },
+        ("2", None): {"entries": [{"type": "file", "id": "4"}], "next_marker": None},
+    }
     with (
-        patch("tools.box_tools_folder.box_folder_items_list") as mock_list,
+        patch("tools.box_tools_folder.fetch_folder_items_page") as mock_page,
         patch("tools.box_tools_folder.get_box_client") as mock_get_client,
     ):
         mock_get_client.return_value = "client"
-        mock_list.return_value = {"entries": []}
+        mock_page.side_effect = lambda client, folder, marker, limit: pages[
+            (folder, marker)
+        ]
         result = await box_folder_items_list_tool(
             ctx, folder_id, is_recursive=True, limit=500
         )
-        assert isinstance(result, dict)
-        mock_list.assert_called_once_with(
-            client="client",
-            folder_id=folder_id,
-            is_recursive=True,
-            limit=500,
-        )
+        assert [(i["id"], i["depth"]) for i in result["folder_items"]] == [
+            ("2", 0),
+            ("4", 1),
+            ("3", 0),
+        ]
+        assert result["folder_items"][1]["parent_folder_id"] == "2"
+        assert "next_page_token" not in result
+        mock_page.assert_any_call("client", folder_id, None, 500)
 
 
 @pytest.mark.asyncio
@@ -18,15 +18,14 @@ def mock_ctx():
     mock_lifespan_context = MagicMock(spec=BoxContext)
 
     # Set up get_active_client to return the client attribute by default
-    def get_active_client_side_effect():
+    def get_active_client_side_effect(request=None):
         if mock_lifespan_context.client is not None:
             return mock_lifespan_context.client
-        if mock_lifespan_context.request is None:
+        if request is None:
             raise ValueError("No request context available")
         raise ValueError("No OAuth token found in request scope")
 
     mock_lifespan_context.get_active_client.side_effect = get_active_client_side_effect
-    mock_lifespan_context.request = None
     mock_request_context.lifespan_context = mock_lifespan_context
     mock_request_context.request = None
     ctx.request_context = mock_request_context
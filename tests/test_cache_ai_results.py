@@ -0,0 +1,147 @@
+import pytest
+from box_sdk_gen import BoxAPIError
+
+from box_api import cached_ai_call
+from cache import AiResultCache, ai_result_key
+
+ANSWER = {"AI_response": {"answer": "It is a contract", "completion_reason": "done"}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeBoxAi:
+    """Fake Box AI over files whose content can change."""
+
+    def __init__(self, result=ANSWER):
+        self.versions = {"1": "sha-a", "2": "sha-b"}
+        self.result = result
+        self.asks = 0
+        self.info_calls = []
+
+    async def fetch_info(self, file_id):
+        self.info_calls.append(file_id)
+        return {"id": file_id, "sha1": self.versions[file_id]}
+
+    async def ask(self):
+        self.asks += 1
+        return self.result
+
+    async def call(self, file_ids, prompt="Summarize", cache=None, ai_agent_id=None):
+        return await cached_ai_call(
+            self.fetch_info, self.ask, "ask", file_ids, prompt, ai_agent_id, cache
+        )
+
+
+def test_key_ignores_the_order_of_the_files():
+    fields = [{"key": "name", "type": "string"}]
+
+    assert ai_result_key("t", {"1": "a", "2": "b"}, fields) == ai_result_key(
+        "t", {"2": "b", "1": "a"}, [{"type": "string", "key": "name"}]
+    )
+    assert ai_result_key("t", {"1": "a"}, "p") != ai_result_key("t", {"1": "b"}, "p")
+    assert ai_result_key("t", {"1": "a"}, "p") != ai_result_key(
+        "t", {"1": "a"}, "p", "agent"
+    )
+    assert ai_result_key("t", {"1": "a"}, "p") != ai_result_key("u", {"1": "a"}, "p")
+
+
+def test_answers_expire_after_the_ttl_however_often_read():
+    clock = FakeClock()
+    cache = AiResultCache(ttl=60, max_bytes=100_000, clock=clock)
+    cache.put("k", ANSWER)
+
+    clock.now = 25
+    assert cache.get("k") == ANSWER
+    clock.now = 50
+    assert cache.get("k") == ANSWER
+    clock.now = 75
+    assert cache.get("k") is None
+    assert cache.get("k") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["hit_ratio"] == 0.5
+
+
+def test_answers_are_bounded_by_size_and_copied():
+    cache = AiResultCache(ttl=60, max_bytes=300)
+    for i in range(4):
+        cache.put(str(i), {"AI_response": {"answer": "x" * 100}})
+
+    assert cache.get("0") is None
+    assert cache.stats()["weight"] <= 300
+
+    cache.get("3")["AI_response"]["answer"] = "changed"
+    assert cache.get("3")["AI_response"]["answer"] == "x" * 100
+
+
+@pytest.mark.asyncio
+async def test_repeated_calls_are_served_from_the_cache():
+    box = FakeBoxAi()
+    cache = AiResultCache(ttl=60, max_bytes=100_000)
+
+    first = await box.call(["1", "2"], cache=cache)
+    second = await box.call(["2", "1", "2"], cache=cache)
+
+    assert first == ANSWER
+    assert second == {**ANSWER, "cached": True}
+    assert box.asks == 1
+    # Every call checks the current version of each file
+    assert box.info_calls == ["1", "2", "2", "1"]
+
+    await box.call(["1", "2"], prompt="Translate", cache=cache)
+    await box.call(["1", "2"], cache=cache, ai_agent_id="agent")
+    assert box.asks == 3
+
+
+@pytest.mark.asyncio
+async def test_changed_files_are_asked_again():
+    box = FakeBoxAi()
+    cache = AiResultCache(ttl=60, max_bytes=100_000)
+    await box.call(["1"], cache=cache)
+
+    box.versions["1"] = "sha-c"
+    result = await box.call(["1"], cache=cache)
+
+    assert "cached" not in result
+    assert box.asks == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached():
+    box = FakeBoxAi(result={"error": "Box AI is unavailable"})
+    cache = AiResultCache(ttl=60, max_bytes=100_000)
+
+    for _ in range(2):
+        assert await box.call(["1"], cache=cache) == {"error": "Box AI is unavailable"}
+
+    assert box.asks == 2
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_unreadable_files_are_not_asked():
+    box = FakeBoxAi()
+    cache = AiResultCache(ttl=60, max_bytes=100_000)
+
+    async def fetch_info(file_id):
+        raise BoxAPIError(message="Not Found", request_info=None, response_info=None)
+
+    result = await cached_ai_call(
+        fetch_info, box.ask, "ask", ["1"], "Summarize", cache=cache
+    )
+
+    assert result == {"error": "Not Found"}
+    assert box.asks == 0
+
+
+@pytest.mark.asyncio
+async def test_without_cache_files_are_not_fetched():
+    box = FakeBoxAi()
+
+    assert await box.call(["1"]) == ANSWER
+    assert box.info_calls == []
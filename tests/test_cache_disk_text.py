@@ -0,0 +1,122 @@
+import multiprocessing
+import os
+
+import pytest
+
+from box_api import extract_text_chunk
+from cache import DiskTextCache, TextCache
+
+TEXT = "Zoë's quarterly report ✓\n" * 2000
+
+
+def entry_files(directory):
+    return sorted(name for name in os.listdir(directory) if not name.startswith("."))
+
+
+def test_texts_are_stored_compressed_and_survive_restarts(tmp_path):
+    cache = DiskTextCache(str(tmp_path), max_bytes=1_000_000)
+    cache.put("1", "sha-a", TEXT)
+
+    (name,) = entry_files(tmp_path)
+    assert name.endswith(".txt.z")
+    assert os.path.getsize(tmp_path / name) < len(TEXT) / 10
+
+    restarted = DiskTextCache(str(tmp_path), max_bytes=1_000_000)
+    assert restarted.get("1", "sha-a") == TEXT
+    assert restarted.get("1", "sha-b") is None
+    assert restarted.get("2", "sha-a") is None
+    assert restarted.stats()["bytes"] == os.path.getsize(tmp_path / name)
+    assert restarted.stats()["hit_ratio"] == round(1 / 3, 3)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    texts = {str(i): os.urandom(1500).hex() for i in range(4)}
+    cache = DiskTextCache(str(tmp_path), max_bytes=10_000, level=0)
+    for i, file_id in enumerate(["0", "1", "2"]):
+        cache.put(file_id, "v", texts[file_id])
+        path = cache._path(file_id, "v")
+        os.utime(path, (1000 + i, 1000 + i))
+
+    # Reading the oldest entry makes it the most recently used
+    assert cache.get("0", "v") == texts["0"]
+    cache.put("3", "v", texts["3"])
+
+    assert cache.get("1", "v") is None
+    assert cache.get("0", "v") == texts["0"]
+    assert cache.get("3", "v") == texts["3"]
+    assert cache.stats()["evictions"] >= 1
+    assert cache.stats()["bytes"] <= 10_000
+
+
+def test_unreadable_entries_are_dropped(tmp_path):
+    cache = DiskTextCache(str(tmp_path), max_bytes=1_000_000)
+    cache.put("1", "v", TEXT)
+    path = cache._path("1", "v")
+    with open(path, "wb") as f:
+        f.write(b"not zlib")
+
+    assert cache.get("1", "v") is None
+    assert not os.path.exists(path)
+
+
+def use_shared_cache(directory: str, worker: int, errors) -> None:
+    """Write and read overlapping entries from another process."""
+    cache = DiskTextCache(directory, max_bytes=200_000, level=1)
+    try:
+        for i in range(100):
+            file_id = str((worker * 7 + i) % 40)
+            text = f"text of {file_id} " * 500
+            cached = cache.get(file_id, "v")
+            if cached is None:
+                cache.put(file_id, "v", text)
+            elif cached != text:
+                errors.put(f"corrupted entry {file_id}")
+    except Exception as e:
+        errors.put(repr(e))
+
+
+def test_processes_can_share_the_directory(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    errors = context.Queue()
+    processes = [
+        context.Process(target=use_shared_cache, args=(str(tmp_path), worker, errors))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    assert errors.empty()
+    # No temporary file is left behind
+    assert all(name.endswith(".txt.z") for name in entry_files(tmp_path))
+    cache = DiskTextCache(str(tmp_path), max_bytes=200_000)
+    assert cache.get("3", "v") in (None, "text of 3 " * 500)
+
+
+@pytest.mark.asyncio
+async def test_extraction_is_skipped_by_another_process(tmp_path):
+    extractions = []
+
+    async def fetch_info(file_id):
+        return {"id": file_id, "sha1": "sha-a"}
+
+    async def extract(file_id):
+        extractions.append(file_id)
+        return {"content": TEXT}
+
+    for _ in range(2):
+        # Each server process has its own memory cache over the shared directory
+        result = await extract_text_chunk(
+            fetch_info,
+            extract,
+            "1",
+            max_chars=10_000,
+            cache=TextCache(max_bytes=1_000_000),
+            disk_cache=DiskTextCache(str(tmp_path), max_bytes=1_000_000),
+        )
+        assert result["content"] == TEXT[: len(result["content"])]
+        assert "next_cursor" in result
+
+    assert extractions == ["1"]
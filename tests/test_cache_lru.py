@@ -0,0 +1,97 @@
+from cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_put_and_counters():
+    cache = LRUCache(max_entries=2)
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_least_recently_used_entry_is_evicted():
+    evicted = []
+    cache = LRUCache(max_entries=2, on_evict=lambda k, v: evicted.append(k))
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert evicted == ["b"]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_idle_entries_expire():
+    clock = FakeClock()
+    evicted = []
+    cache = LRUCache(
+        max_entries=10, ttl=10, on_evict=lambda k, v: evicted.append(k), clock=clock
+    )
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    clock.now = 8
+    assert cache.get("a") == 1  # refreshes the idle timer of "a"
+
+    clock.now = 15
+    cache.expire()
+    assert "a" in cache
+    assert "b" not in cache
+
+    clock.now = 30
+    assert cache.get("a") is None
+    assert evicted == ["b", "a"]
+
+
+def test_clear_calls_on_evict_for_every_entry():
+    evicted = []
+    cache = LRUCache(max_entries=10, on_evict=lambda k, v: evicted.append(v))
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.clear()
+
+    assert len(cache) == 0
+    assert sorted(evicted) == [1, 2]
+
+
+def test_pop_does_not_notify():
+    evicted = []
+    cache = LRUCache(max_entries=10, on_evict=lambda k, v: evicted.append(k))
+    cache.put("a", 1)
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+    assert evicted == []
+
+
+def test_weight_bound_evicts_least_recently_used():
+    evicted = []
+    cache = LRUCache(
+        max_entries=10,
+        max_weight=10,
+        weigher=len,
+        on_evict=lambda k, v: evicted.append(k),
+    )
+    cache.put("a", "xxxx")
+    cache.put("b", "xxxx")
+    cache.get("a")
+    cache.put("c", "xxxx")
+
+    assert evicted == ["b"]
+    assert cache.weight == 8
+    cache.put("a", "x")
+    assert cache.stats()["weight"] == 5
+    assert cache.peek("c") == "xxxx"
@@ -0,0 +1,150 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+import pytest
+from box_sdk_gen import BoxClient, BoxDeveloperTokenAuth
+
+from box_api import BoxAsyncApi, BoxAsyncTransport
+from cache import ObjectCache
+from server_context import BoxContext
+from tools.box_tools_file import box_file_info_tool, box_file_rename_tool
+from tools.box_tools_folder import box_folder_info_tool
+
+FILE = {
+    "type": "file",
+    "id": "123",
+    "etag": "1",
+    "name": "report.pdf",
+    "parent": {"type": "folder", "id": "0", "etag": "0", "name": "All Files"},
+}
+FOLDER = {"type": "folder", "id": "0", "etag": "0", "name": "All Files"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeBox:
+    """Fake Box API that honors If-None-Match with the current etags."""
+
+    def __init__(self):
+        self.objects = {"/2.0/files/123": dict(FILE), "/2.0/folders/0": dict(FOLDER)}
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        data = self.objects.get(request.url.path)
+        if data is None:
+            return httpx.Response(404, json={"message": "Not Found", "request_id": "x"})
+        if request.headers.get("if-none-match") == data["etag"]:
+            return httpx.Response(304)
+        return httpx.Response(200, json=data)
+
+
+def make_ctx(fake_box: FakeBox, object_cache: ObjectCache):
+    client = BoxClient(BoxDeveloperTokenAuth(token="token-a"))
+    transport = BoxAsyncTransport(transport=httpx.MockTransport(fake_box))
+    box_context = BoxContext(
+        client=client, transport=transport, object_cache=object_cache
+    )
+    return SimpleNamespace(
+        request_context=SimpleNamespace(lifespan_context=box_context, request=None)
+    )
+
+
+@pytest.mark.asyncio
+async def test_fresh_entries_are_served_without_requests():
+    fake_box = FakeBox()
+    ctx = make_ctx(fake_box, ObjectCache(max_age=30, max_bytes=1_000_000))
+
+    first = await box_file_info_tool(ctx, "123")
+    second = await box_file_info_tool(ctx, "123")
+
+    assert first == second
+    assert second["file_info"]["name"] == "report.pdf"
+    assert len(fake_box.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_revalidated_with_etag():
+    clock = FakeClock()
+    fake_box = FakeBox()
+    object_cache = ObjectCache(max_age=30, max_bytes=1_000_000, clock=clock)
+    ctx = make_ctx(fake_box, object_cache)
+
+    await box_file_info_tool(ctx, "123")
+    clock.now = 31
+    result = await box_file_info_tool(ctx, "123")
+
+    assert result["file_info"]["etag"] == "1"
+    assert fake_box.requests[1].headers["if-none-match"] == "1"
+    assert object_cache.stats()["not_modified"] == 1
+
+    # Changed upstream: the 200 replaces the entry
+    fake_box.objects["/2.0/files/123"].update(etag="2", name="final.pdf")
+    clock.now = 62
+    result = await box_file_info_tool(ctx, "123")
+    assert result["file_info"]["name"] == "final.pdf"
+
+
+@pytest.mark.asyncio
+async def test_mutating_tools_invalidate_object_and_parent():
+    fake_box = FakeBox()
+    ctx = make_ctx(fake_box, ObjectCache(max_age=30, max_bytes=1_000_000))
+    await box_file_info_tool(ctx, "123")
+    await box_folder_info_tool(ctx, "0")
+
+    fake_box.objects["/2.0/files/123"].update(etag="2", name="renamed.pdf")
+    with patch("tools.box_tools_file.box_file_rename", return_value={}) as mock_rename:
+        await box_file_rename_tool(ctx, "123", "renamed.pdf")
+        mock_rename.assert_called_once()
+
+    result = await box_file_info_tool(ctx, "123")
+    await box_folder_info_tool(ctx, "0")
+    assert result["file_info"]["name"] == "renamed.pdf"
+    assert len(fake_box.requests) == 4
+
+
+@pytest.mark.asyncio
+async def test_deleted_objects_are_dropped():
+    fake_box = FakeBox()
+    object_cache = ObjectCache(max_age=0, max_bytes=1_000_000)
+    ctx = make_ctx(fake_box, object_cache)
+    await box_file_info_tool(ctx, "123")
+
+    del fake_box.objects["/2.0/files/123"]
+    result = await box_file_info_tool(ctx, "123")
+
+    assert result == {"error": "404 Not Found; Request ID: x"}
+    assert object_cache.stats()["entries"] == 0
+
+
+def test_entries_are_per_identity_and_memory_bounded():
+    object_cache = ObjectCache(max_age=30, max_bytes=300)
+    object_cache.put("user-a", ("file", "1"), "1", {"name": "a" * 100})
+    object_cache.put("user-b", ("file", "1"), "1", {"name": "b" * 100})
+
+    assert object_cache.get("user-a", ("file", "1")).data["name"] == "a" * 100
+    assert object_cache.get("user-c", ("file", "1")) is None
+
+    object_cache.put("user-a", ("file", "2"), "1", {"name": "c" * 100})
+    assert object_cache.get("user-a", ("file", "1")) is None
+    assert object_cache.stats()["weight"] <= 300
+
+
+@pytest.mark.asyncio
+async def test_without_cache_every_call_reaches_box():
+    fake_box = FakeBox()
+    api = BoxAsyncApi(
+        BoxAsyncTransport(transport=httpx.MockTransport(fake_box)),
+        BoxClient(BoxDeveloperTokenAuth(token="token-a")),
+    )
+    await api.file_info("123")
+    await api.file_info("123")
+    assert len(fake_box.requests) == 2
+    assert "if-none-match" not in fake_box.requests[1].headers
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+import pytest
+from box_sdk_gen import BoxClient, BoxDeveloperTokenAuth
+
+from box_api import BoxAsyncTransport, uploads
+from cache import UploadIndex
+from server_context import BoxContext
+from tools.box_tools_file import box_file_rename_tool
+from tools.box_tools_file_transfer import (
+    box_file_upload_from_path_tool,
+    box_file_upload_tool,
+)
+
+REPORT = b"quarterly report"
+REPORT_SHA1 = hashlib.sha1(REPORT).hexdigest()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeBox:
+    """Fake Box preflight check, with the files already in folder 7 by name."""
+
+    def __init__(self):
+        self.files = {"report.txt": {"type": "file", "id": "123", "sha1": REPORT_SHA1}}
+        self.preflights = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert request.method == "OPTIONS" and request.url.path == "/2.0/files/content"
+        body = json.loads(request.content)
+        self.preflights.append(body)
+        existing = self.files.get(body["name"])
+        if existing is None:
+            return httpx.Response(200, json={"upload_url": "https://upload.box.com"})
+        return httpx.Response(
+            409,
+            json={
+                "type": "error",
+                "status": 409,
+                "code": "item_name_in_use",
+                "message": "Item with the same name already exists",
+                "context_info": {"conflicts": {**existing, "name": body["name"]}},
+            },
+        )
+
+
+def make_ctx(fake_box: FakeBox, upload_index: UploadIndex):
+    client = BoxClient(BoxDeveloperTokenAuth(token="token-a"))
+    transport = BoxAsyncTransport(transport=httpx.MockTransport(fake_box))
+    box_context = BoxContext(
+        client=client, transport=transport, upload_index=upload_index
+    )
+    return SimpleNamespace(
+        request_context=SimpleNamespace(lifespan_context=box_context, request=None)
+    )
+
+
+@pytest.mark.asyncio
+async def test_identical_content_is_not_uploaded_again():
+    fake_box = FakeBox()
+    ctx = make_ctx(fake_box, UploadIndex(max_age=300))
+
+    with patch("tools.box_tools_file_transfer.box_file_upload") as mock_upload:
+        first = await box_file_upload_tool(ctx, REPORT.decode(), "report.txt", "7")
+        second = await box_file_upload_tool(ctx, REPORT, "report.txt", "7")
+
+    expected = {
+        "id": "123",
+        "name": "report.txt",
+        "type": "file",
+        "already_uploaded": True,
+    }
+    assert first == second == expected
+    mock_upload.assert_not_called()
+    # The second call is answered by the index
+    assert fake_box.preflights == [
+        {"name": "report.txt", "size": len(REPORT), "parent": {"id": "7"}}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_new_content_is_uploaded_and_indexed():
+    fake_box = FakeBox()
+    ctx = make_ctx(fake_box, UploadIndex(max_age=300))
+
+    with patch("tools.box_tools_file_transfer.box_file_upload") as mock_upload:
+        mock_upload.return_value = {"id": "456", "name": "notes.txt", "type": "file"}
+        first = await box_file_upload_tool(ctx, "notes", "notes.txt", "7")
+        second = await box_file_upload_tool(ctx, "notes", "notes.txt", "7")
+        changed = await box_file_upload_tool(ctx, REPORT, "report.txt", "7")
+
+    assert first == {"id": "456", "name": "notes.txt", "type": "file"}
+    assert second == {**first, "already_uploaded": True}
+    assert changed["already_uploaded"]
+    mock_upload.assert_called_once()
+    assert len(fake_box.preflights) == 2
+
+
+@pytest.mark.asyncio
+async def test_local_files_are_checked_and_indexed(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "_allowed_dirs", [os.path.realpath(tmp_path)])
+    (tmp_path / "report.txt").write_bytes(REPORT)
+    (tmp_path / "notes.txt").write_bytes(b"notes")
+    fake_box = FakeBox()
+    ctx = make_ctx(fake_box, UploadIndex(max_age=300))
+
+    with patch("box_api.uploads._upload_small_file") as mock_upload:
+        mock_upload.return_value = {"id": "456", "name": "notes.txt", "type": "file"}
+        existing = await box_file_upload_from_path_tool(
+            ctx, str(tmp_path / "report.txt"), "7"
+        )
+        first = await box_file_upload_from_path_tool(
+            ctx, str(tmp_path / "notes.txt"), "7"
+        )
+        second = await box_file_upload_from_path_tool(
+            ctx, str(tmp_path / "notes.txt"), "7"
+        )
+
+    assert existing == {
+        "id": "123",
+        "name": "report.txt",
+        "type": "file",
+        "sha1": REPORT_SHA1,
+        "already_uploaded": True,
+    }
+    notes_sha1 = hashlib.sha1(b"notes").hexdigest()
+    assert first == {
+        "id": "456",
+        "name": "notes.txt",
+        "type": "file",
+        "sha1": notes_sha1,
+    }
+    assert second == {**first, "already_uploaded": True}
+    mock_upload.assert_called_once()
+    assert len(fake_box.preflights) == 2
+
+
+@pytest.mark.asyncio
+async def test_different_content_with_the_same_name_is_uploaded():
+    fake_box = FakeBox()
+    ctx = make_ctx(fake_box, UploadIndex(max_age=300))
+
+    with patch("tools.box_tools_file_transfer.box_file_upload") as mock_upload:
+        mock_upload.return_value = {"error": "Item with the same name already exists"}
+        result = await box_file_upload_tool(ctx, "other content", "report.txt", "7")
+
+    assert result == {"error": "Item with the same name already exists"}
+    mock_upload.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_write_tools_invalidate_the_index():
+    fake_box = FakeBox()
+    ctx = make_ctx(fake_box, UploadIndex(max_age=300))
+    with patch("tools.box_tools_file_transfer.box_file_upload"):
+        await box_file_upload_tool(ctx, REPORT, "report.txt", "7")
+
+    with patch("tools.box_tools_file.box_file_rename", return_value={}):
+        await box_file_rename_tool(ctx, "123", "renamed.txt")
+    del fake_box.files["report.txt"]
+
+    with patch("tools.box_tools_file_transfer.box_file_upload") as mock_upload:
+        mock_upload.return_value = {"id": "789", "name": "report.txt", "type": "file"}
+        result = await box_file_upload_tool(ctx, REPORT, "report.txt", "7")
+
+    assert result == {"id": "789", "name": "report.txt", "type": "file"}
+    assert len(fake_box.preflights) == 2
+
+
+def test_entries_are_per_identity_and_expire():
+    clock = FakeClock()
+    index = UploadIndex(max_age=300, clock=clock)
+    file = {"id": "1", "name": "a.txt", "type": "file"}
+    index.put("user-a", "7", "a.txt", "sha", file)
+
+    assert index.get("user-a", "7", "a.txt", "sha") == file
+    assert index.get("user-b", "7", "a.txt", "sha") is None
+    assert index.get("user-a", "7", "a.txt", "other") is None
+    assert index.get("user-a", "8", "a.txt", "sha") is None
+
+    clock.now = 300
+    assert index.get("user-a", "7", "a.txt", "sha") is None
+    assert index.stats() == {"folders": 1, "hits": 1, "misses": 4}
+
+
+def test_files_are_invalidated_with_their_folder():
+    index = UploadIndex(max_age=300, max_folders=2)
+    index.put(
+        "user-a", "7", "a.txt", "sha-a", {"id": "1", "name": "a.txt", "type": "file"}
+    )
+    index.put(
+        "user-a", "7", "b.txt", "sha-b", {"id": "2", "name": "b.txt", "type": "file"}
+    )
+
+    index.invalidate_file("2")
+    assert index.get("user-a", "7", "a.txt", "sha-a") is None
+
+    # Evicted folders no longer map their files
+    index.put(
+        "user-a", "7", "a.txt", "sha-a", {"id": "1", "name": "a.txt", "type": "file"}
+    )
+    index.put(
+        "user-a", "8", "c.txt", "sha-c", {"id": "3", "name": "c.txt", "type": "file"}
+    )
+    index.put(
+        "user-a", "9", "d.txt", "sha-d", {"id": "4", "name": "d.txt", "type": "file"}
+    )
+    index.invalidate_file("1")
+    assert index.get("user-a", "8", "c.txt", "sha-c") is not None
+    assert index.stats()["folders"] == 2
@@ -0,0 +1,115 @@
+import asyncio
+
+import httpx
+import pytest
+
+from config import McpAuthConfig
+from mcp_auth.auth_box_validation import BoxTokenValidator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeBox:
+    """users/me of Box, answering per token."""
+
+    def __init__(self, users=None, status_code=None):
+        self.users = users or {}
+        self.status_code = status_code
+        self.calls = 0
+
+    async def __call__(self, request):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.status_code is not None:
+            return httpx.Response(self.status_code)
+        token = request.headers["authorization"].removeprefix("Bearer ")
+        if token not in self.users:
+            return httpx.Response(401)
+        return httpx.Response(200, json={"type": "user", "id": self.users[token]})
+
+
+def make_validator(box, ttl=300.0):
+    clock = FakeClock()
+    config = McpAuthConfig(token_validation_ttl=ttl)
+    return BoxTokenValidator(
+        config, transport=httpx.MockTransport(box), clock=clock
+    ), clock
+
+
+def scope_for(token):
+    return {"type": "http", "method": "POST", "path": "/mcp", "oauth_token": token}
+
+
+@pytest.mark.asyncio
+async def test_valid_token_is_checked_once_per_ttl():
+    box = FakeBox(users={"good": "42"})
+    validator, clock = make_validator(box)
+
+    scope = scope_for("good")
+    assert await validator.validate(scope) is None
+    assert scope["box_user_id"] == "42"
+    verdict = await validator.verify("good")
+    assert verdict.valid and verdict.user_id == "42"
+    assert box.calls == 1
+
+    clock.now += 301
+    assert await validator.validate(scope_for("good")) is None
+    assert box.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_invalid_token_is_rejected_and_remembered():
+    box = FakeBox()
+    validator, _ = make_validator(box)
+
+    for _ in range(3):
+        response = await validator.validate(scope_for("bad"))
+        assert response.status_code == 401
+    assert box.calls == 1
+    assert validator.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status_code", [500, 503, 429])
+async def test_box_failures_let_the_request_through_without_caching(status_code):
+    box = FakeBox(status_code=status_code)
+    validator, _ = make_validator(box)
+
+    assert await validator.validate(scope_for("any")) is None
+    assert await validator.validate(scope_for("any")) is None
+    assert box.calls == 2
+    assert validator.stats()["unavailable"] == 2
+
+
+@pytest.mark.asyncio
+async def test_unreachable_box_lets_the_request_through():
+    def fail(request):
+        raise httpx.ConnectError("unreachable", request=request)
+
+    validator = BoxTokenValidator(McpAuthConfig(), transport=httpx.MockTransport(fail))
+
+    assert await validator.validate(scope_for("any")) is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_check():
+    box = FakeBox(users={"good": "42"})
+    validator, _ = make_validator(box)
+
+    results = await asyncio.gather(
+        *(validator.validate(scope_for("good")) for _ in range(10))
+    )
+
+    assert results == [None] * 10
+    assert box.calls == 1
+
+
+def test_tokens_are_not_kept_in_memory():
+    assert "good" not in BoxTokenValidator._key("good")
+    assert len(BoxTokenValidator._key("good")) == 64
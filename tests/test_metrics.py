@@ -0,0 +1,202 @@
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+import requests
+from box_sdk_gen import BoxClient, BoxDeveloperTokenAuth
+from mcp.server.fastmcp import Context, FastMCP
+from requests.structures import CaseInsensitiveDict
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+from box_api import BoxAsyncApi, BoxAsyncTransport, RateLimiterRegistry
+from config import HttpConfig
+from metrics import box_api_endpoint, configure_metrics, metrics_handler
+from tool_executor import ToolExecutor
+from tool_registry import register_all_tools
+
+FILE = {"type": "file", "id": "123", "name": "report.pdf"}
+
+
+@pytest.fixture
+def metrics():
+    metrics = configure_metrics(True)
+    yield metrics
+    configure_metrics(False)
+
+
+def samples(text: str) -> dict:
+    """The samples of a rendered exposition, by name and labels."""
+    return dict(
+        line.rsplit(" ", 1)
+        for line in text.splitlines()
+        if line and not line.startswith("#")
+    )
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_errors_and_latency_are_recorded(metrics):
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def box_slow_tool(fail: str = "") -> dict:
+        started.set()
+        await release.wait()
+        if fail == "raise":
+            raise RuntimeError("boom")
+        if fail == "return":
+            return {"error": "404 Not Found"}
+        return {"ok": True}
+
+    tool = metrics.wrap_tool(box_slow_tool)
+    call = asyncio.create_task(tool())
+    await started.wait()
+    assert metrics.tool_in_flight.value("box_slow_tool") == 1
+    release.set()
+    assert await call == {"ok": True}
+
+    await tool("return")
+    with pytest.raises(RuntimeError):
+        await tool("raise")
+
+    assert metrics.tool_in_flight.value("box_slow_tool") == 0
+    assert metrics.tool_calls.value("box_slow_tool") == 3
+    assert metrics.tool_errors.value("box_slow_tool") == 2
+    assert metrics.tool_duration.count("box_slow_tool") == 3
+
+
+@pytest.mark.asyncio
+async def test_register_all_tools_instruments_every_tool(metrics):
+    mcp = FastMCP(name="test")
+    executor = ToolExecutor()
+
+    async def box_echo_tool(ctx: Context, value: str) -> str:
+        """Echo a value."""
+        return value
+
+    register_all_tools(
+        mcp,
+        [lambda server: server.tool()(box_echo_tool)],
+        [executor.wrap_tool, metrics.wrap_tool],
+    )
+    tools = await mcp.list_tools()
+    assert list(tools[0].inputSchema["properties"]) == ["value"]
+
+    await mcp.call_tool("box_echo_tool", {"value": "x"})
+    executor.shutdown()
+
+    assert metrics.tool_calls.value("box_echo_tool") == 1
+
+
+def test_box_api_endpoints_do_not_contain_ids():
+    assert box_api_endpoint("/2.0/files/12345/content") == "/2.0/files/{id}/content"
+    assert box_api_endpoint("/2.0/folders/0/items") == "/2.0/folders/{id}/items"
+    assert (
+        box_api_endpoint(
+            "/api/2.0/files/upload_sessions/F971964745A5CD0C001BBE4E58196BFD"
+        )
+        == "/api/2.0/files/upload_sessions/{id}"
+    )
+    assert box_api_endpoint("/2.0/users/me") == "/2.0/users/me"
+
+
+@pytest.mark.asyncio
+async def test_async_transport_requests_are_recorded(metrics):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/456"):
+            return httpx.Response(404, json={"message": "Not Found"})
+        return httpx.Response(200, json=FILE)
+
+    client = BoxClient(BoxDeveloperTokenAuth(token="token-a"))
+    api = BoxAsyncApi(BoxAsyncTransport(transport=httpx.MockTransport(handler)), client)
+    await api.file_info("123")
+    await api.file_info("456")
+
+    assert metrics.box_api_duration.count("GET", "/2.0/files/{id}", "200") == 1
+    assert metrics.box_api_duration.count("GET", "/2.0/files/{id}", "404") == 1
+    assert metrics.box_api_in_flight.value() == 0
+
+
+def test_sdk_requests_are_recorded(metrics):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers = CaseInsensitiveDict({})
+    response._content = json.dumps(FILE).encode("utf-8")
+    response.url = "https://api.box.com/2.0/files/123"
+
+    registry = RateLimiterRegistry(HttpConfig())
+    client = registry.wrap_client(BoxClient(BoxDeveloperTokenAuth(token="token-a")))
+    session = client.network_session.network_client.requests_session = MagicMock()
+    session.request.return_value = response
+
+    client.files.get_file_by_id("123")
+
+    assert metrics.box_api_duration.count("GET", "/2.0/files/{id}", "200") == 1
+
+
+def test_cache_counters_survive_the_lifespan_that_owned_them(metrics):
+    stats = {"object cache": {"hits": 3, "misses": 1}, "upload index": {"folders": 0}}
+    handle = metrics.track_caches(lambda: stats)
+    assert (
+        samples(metrics.render())['box_mcp_cache_hit_ratio{cache="object cache"}']
+        == "0.75"
+    )
+
+    metrics.release_caches(handle)
+    metrics.track_caches(lambda: {"object cache": {"hits": 1, "misses": 3}})
+
+    rendered = samples(metrics.render())
+    assert rendered['box_mcp_cache_hits_total{cache="object cache"}'] == "4"
+    assert rendered['box_mcp_cache_misses_total{cache="object cache"}'] == "4"
+    assert rendered['box_mcp_cache_hit_ratio{cache="object cache"}'] == "0.5"
+
+
+def test_rate_limiter_counters_survive_the_lifespan_that_owned_them(metrics):
+    stats = {"throttled": 2, "waits": 3, "wait_seconds": 1.5}
+    handle = metrics.track_rate_limits(lambda: stats)
+    assert samples(metrics.render())["box_mcp_rate_limit_throttled_total"] == "2"
+
+    metrics.release_rate_limits(handle)
+    metrics.track_rate_limits(
+        lambda: {"throttled": 1, "waits": 1, "wait_seconds": 0.25}
+    )
+
+    rendered = samples(metrics.render())
+    assert rendered["box_mcp_rate_limit_throttled_total"] == "3"
+    assert rendered["box_mcp_rate_limit_waits_total"] == "4"
+    assert rendered["box_mcp_rate_limit_wait_seconds_total"] == "1.75"
+
+
+def test_histograms_render_cumulative_buckets(metrics):
+    for seconds in (0.02, 0.3, 200):
+        metrics.tool_duration.observe(seconds, "box_search_tool")
+
+    rendered = samples(metrics.render())
+    bucket = 'box_mcp_tool_duration_seconds_bucket{{tool="box_search_tool",le="{}"}}'
+
+    assert rendered[bucket.format("0.01")] == "0"
+    assert rendered[bucket.format("0.025")] == "1"
+    assert rendered[bucket.format("120")] == "2"
+    assert rendered[bucket.format("+Inf")] == "3"
+    assert (
+        rendered['box_mcp_tool_duration_seconds_count{tool="box_search_tool"}'] == "3"
+    )
+    assert 'box_mcp_tool_pool_saturation{pool="ai"}' in rendered
+
+
+@pytest.mark.asyncio
+async def test_metrics_route_serves_the_exposition_format(metrics):
+    app = Starlette(routes=[Route("/metrics", metrics_handler)])
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE box_mcp_tool_calls_total counter" in response.text
+
+    configure_metrics(False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.get("/metrics")).status_code == 404
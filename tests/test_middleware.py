@@ -0,0 +1,210 @@
+import json
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+
+from config import (
+    AppConfig,
+    BoxAuthType,
+    McpAuthConfig,
+    McpAuthType,
+    ObservabilityConfig,
+    ServerConfig,
+)
+from mcp_auth.auth_box_validation import BoxTokenValidator
+from middleware import AuthMiddleware, close_token_validator_on_shutdown
+
+TOKEN = "secret-token"
+
+
+class Recorder:
+    """ASGI app recording the scopes that reach it."""
+
+    def __init__(self):
+        self.scopes = []
+
+    async def __call__(self, scope, receive, send):
+        self.scopes.append(scope)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+
+def make_middleware(
+    mcp_auth_type, box_auth=BoxAuthType.CCG, auth_token=TOKEN, validate_box_tokens=False
+):
+    app = Recorder()
+    app_config = AppConfig(
+        server=ServerConfig(mcp_auth_type=mcp_auth_type, box_auth=box_auth),
+        mcp_auth=McpAuthConfig(
+            auth_token=auth_token, validate_box_tokens=validate_box_tokens
+        ),
+    )
+    return app, AuthMiddleware(app, app_config)
+
+
+async def call(middleware, authorization=None, path="/mcp"):
+    headers = [(b"host", b"mcp.example.org"), (b"content-type", b"application/json")]
+    if authorization is not None:
+        headers.append((b"authorization", authorization))
+    scope = {"type": "http", "method": "POST", "path": path, "headers": headers}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    start, body = messages[0], messages[-1]
+    response_headers = dict(start["headers"])
+    return (
+        start["status"],
+        json.loads(body["body"]) if body["body"] else None,
+        response_headers,
+        scope,
+    )
+
+
+@pytest.mark.asyncio
+async def test_token_mode_accepts_the_configured_token():
+    app, middleware = make_middleware(McpAuthType.TOKEN)
+
+    status, _, _, _ = await call(middleware, b"Bearer " + TOKEN.encode())
+
+    assert status == 200
+    assert len(app.scopes) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "authorization, error",
+    [
+        (None, "Missing Authorization header"),
+        (b"Basic c2VjcmV0", "Authorization header must use Bearer scheme"),
+        (b"Bearer secret-tokeN", "The access token is invalid or expired"),
+        (b"Bearer secret-token-and-more", "The access token is invalid or expired"),
+    ],
+)
+async def test_token_mode_rejects_other_requests(authorization, error):
+    app, middleware = make_middleware(McpAuthType.TOKEN)
+
+    status, body, headers, _ = await call(middleware, authorization)
+
+    assert status == 401
+    assert body["error_description"] == error
+    assert b"www-authenticate" in headers
+    assert app.scopes == []
+
+
+@pytest.mark.asyncio
+async def test_token_mode_without_configured_token_fails():
+    _, middleware = make_middleware(McpAuthType.TOKEN, auth_token=None)
+
+    status, body, _, _ = await call(middleware, b"Bearer anything")
+
+    assert status == 500
+    assert body["error_description"] == "Server authentication not properly configured"
+
+
+@pytest.mark.asyncio
+async def test_oauth_mode_passes_the_token_to_the_tools():
+    app, middleware = make_middleware(McpAuthType.OAUTH, BoxAuthType.MCP_CLIENT)
+
+    status, _, _, _ = await call(middleware, b"Bearer box-access-token")
+
+    assert status == 200
+    assert app.scopes[0]["oauth_token"] == "box-access-token"
+
+
+@pytest.mark.asyncio
+async def test_mcp_client_mode_requires_a_bearer_token():
+    _, middleware = make_middleware(McpAuthType.NONE, BoxAuthType.MCP_CLIENT)
+
+    status, body, _, _ = await call(middleware)
+
+    assert status == 401
+    assert body["error_description"] == "Missing Authorization header"
+
+
+@pytest.mark.asyncio
+async def test_public_paths_and_no_auth_pass_through():
+    app, middleware = make_middleware(McpAuthType.TOKEN)
+    status, _, _, _ = await call(
+        middleware, path="/.well-known/oauth-protected-resource"
+    )
+    assert status == 200
+
+    app, middleware = make_middleware(McpAuthType.NONE)
+    status, _, _, _ = await call(middleware)
+    assert status == 200
+    assert len(app.scopes) == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_are_public_only_when_configured():
+    _, middleware = make_middleware(McpAuthType.TOKEN)
+    status, _, _, _ = await call(middleware, path="/metrics")
+    assert status == 401
+
+    app_config = AppConfig(
+        server=ServerConfig(mcp_auth_type=McpAuthType.TOKEN),
+        mcp_auth=McpAuthConfig(auth_token=TOKEN),
+        observability=ObservabilityConfig(metrics_public=True),
+    )
+    middleware = AuthMiddleware(Recorder(), app_config)
+    status, _, _, _ = await call(middleware, path="/metrics")
+    assert status == 200
+
+
+def users_me(request):
+    if request.headers["authorization"] != "Bearer good":
+        return httpx.Response(401)
+    return httpx.Response(200, json={"type": "user", "id": "42"})
+
+
+@pytest.mark.asyncio
+async def test_middleware_rejects_tokens_box_rejects():
+    app, middleware = make_middleware(
+        McpAuthType.OAUTH, BoxAuthType.MCP_CLIENT, validate_box_tokens=True
+    )
+    middleware.token_validator = BoxTokenValidator(
+        McpAuthConfig(), transport=httpx.MockTransport(users_me)
+    )
+
+    status, body, headers, _ = await call(middleware, b"Bearer bad")
+    assert status == 401
+    assert body["error"] == "invalid_token"
+    assert b"www-authenticate" in headers
+
+    status, _, _, scope = await call(middleware, b"Bearer good")
+    assert status == 200
+    assert app.scopes == [scope]
+    assert scope["box_user_id"] == "42"
+
+
+def test_middleware_validates_only_when_enabled():
+    _, middleware = make_middleware(McpAuthType.OAUTH, BoxAuthType.MCP_CLIENT)
+    assert middleware.token_validator is None
+
+    _, middleware = make_middleware(
+        McpAuthType.OAUTH, BoxAuthType.MCP_CLIENT, validate_box_tokens=True
+    )
+    assert middleware.token_validator is not None
+
+
+@pytest.mark.asyncio
+async def test_token_validator_is_closed_with_the_app():
+    _, middleware = make_middleware(
+        McpAuthType.OAUTH, BoxAuthType.MCP_CLIENT, validate_box_tokens=True
+    )
+    token_validator = middleware.token_validator
+    token_validator._transport = httpx.MockTransport(users_me)
+    app = Starlette()
+    close_token_validator_on_shutdown(app)
+
+    async with app.router.lifespan_context(app):
+        await call(middleware, b"Bearer good")
+        assert token_validator._client is not None
+    assert token_validator._client is None
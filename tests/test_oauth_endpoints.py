@@ -0,0 +1,283 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+import oauth_endpoints
+from config import AppConfig, McpAuthConfig
+from oauth_endpoints import (
+    AuthorizationServerMetadataCache,
+    ProtectedResourceMetadata,
+    add_oauth_endpoints,
+    cache_control_max_age,
+    create_oauth_authorization_server_handler,
+)
+
+BOX_METADATA = {
+    "issuer": "https://account.box.com",
+    "authorization_endpoint": "https://account.box.com/api/oauth2/authorize",
+    "token_endpoint": "https://api.box.com/oauth2/token",
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeBoxAccount:
+    """Fake account.box.com serving its authorization server metadata."""
+
+    def __init__(self, cache_control=None):
+        self.metadata = dict(BOX_METADATA)
+        self.etag = '"v1"'
+        self.cache_control = cache_control
+        self.requests = []
+        self.down = False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.down:
+            raise httpx.ConnectError("unreachable", request=request)
+        headers = {"ETag": self.etag}
+        if self.cache_control:
+            headers["Cache-Control"] = self.cache_control
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, json=self.metadata, headers=headers)
+
+
+@pytest.fixture
+def app_config(tmp_path):
+    config_file = tmp_path / "protected-resource.json"
+    config_file.write_text(
+        json.dumps(
+            {
+                "resource": "https://mcp.example.org/mcp",
+                "scopes_supported": ["root_readwrite"],
+            }
+        )
+    )
+    return AppConfig(
+        mcp_auth=McpAuthConfig(
+            oauth_protected_resources_config_file=str(config_file),
+            oauth_metadata_ttl=60,
+            oauth_metadata_max_stale=600,
+        )
+    )
+
+
+def make_client(app_config, box, clock):
+    cache = AuthorizationServerMetadataCache(
+        app_config, httpx.MockTransport(box), clock
+    )
+    handler = create_oauth_authorization_server_handler(app_config, cache)
+    app = Starlette(
+        routes=[
+            Route(
+                "/.well-known/oauth-authorization-server",
+                handler,
+                methods=["GET", "OPTIONS"],
+            )
+        ]
+    )
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app), base_url="http://mcp"
+    )
+    return cache, client
+
+
+async def get_metadata(client):
+    response = await client.get("/.well-known/oauth-authorization-server")
+    return response.status_code, response.json()
+
+
+async def settle():
+    """Let the background revalidation finish."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_cache_control_max_age():
+    assert cache_control_max_age("public, max-age=300") == 300
+    assert cache_control_max_age("no-cache") == 0
+    assert cache_control_max_age("public") is None
+    assert cache_control_max_age(None) is None
+
+
+@pytest.mark.asyncio
+async def test_metadata_is_fetched_once_and_completed(app_config):
+    box = FakeBoxAccount()
+    cache, client = make_client(app_config, box, FakeClock())
+
+    responses = await asyncio.gather(*(get_metadata(client) for _ in range(10)))
+
+    assert len(box.requests) == 1
+    status, metadata = responses[0]
+    assert status == 200
+    assert metadata["registration_endpoint"] == "https://mcp.example.org/oauth/register"
+    assert metadata["scopes_supported"] == ["root_readwrite"]
+    assert all(response == responses[0] for response in responses)
+    # The rendered response is reused
+    assert await cache.get_response() is await cache.get_response()
+
+
+@pytest.mark.asyncio
+async def test_expired_metadata_is_served_while_revalidated(app_config):
+    box = FakeBoxAccount()
+    clock = FakeClock()
+    cache, client = make_client(app_config, box, clock)
+    await get_metadata(client)
+    first = await cache.get_response()
+
+    clock.now = 61
+    status, _ = await get_metadata(client)
+    await settle()
+
+    assert status == 200
+    assert len(box.requests) == 2
+    assert box.requests[1].headers["if-none-match"] == '"v1"'
+    assert cache.not_modified == 1
+    assert await cache.get_response() is first
+
+    # Revalidated for another TTL
+    clock.now = 100
+    await get_metadata(client)
+    assert len(box.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_upstream_max_age_wins_over_the_ttl(app_config):
+    box = FakeBoxAccount(cache_control="public, max-age=5")
+    clock = FakeClock()
+    _, client = make_client(app_config, box, clock)
+    await get_metadata(client)
+
+    clock.now = 6
+    await get_metadata(client)
+    await settle()
+
+    assert len(box.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_too_stale_metadata_waits_for_the_new_version(app_config):
+    box = FakeBoxAccount()
+    clock = FakeClock()
+    _, client = make_client(app_config, box, clock)
+    await get_metadata(client)
+
+    box.metadata["issuer"] = "https://account.box.com/new"
+    box.etag = '"v2"'
+    clock.now = 1000
+    _, metadata = await get_metadata(client)
+
+    assert metadata["issuer"] == "https://account.box.com/new"
+
+
+@pytest.mark.asyncio
+async def test_unreachable_box_is_retried(app_config):
+    box = FakeBoxAccount()
+    box.down = True
+    clock = FakeClock()
+    cache, client = make_client(app_config, box, clock)
+
+    status, body = await get_metadata(client)
+    assert status == 502
+    assert body["error"] == "temporarily_unavailable"
+
+    box.down = False
+    status, _ = await get_metadata(client)
+    assert status == 200
+
+    # Failed revalidations keep serving the last metadata
+    box.down = True
+    clock.now = 61
+    status, _ = await get_metadata(client)
+    await settle()
+    assert status == 200
+    assert cache.errors == 2
+
+
+def rewrite(path, metadata):
+    """Rewrite a config file, with a later modification time."""
+    stat = os.stat(path)
+    path.write_text(json.dumps(metadata))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.mark.asyncio
+async def test_protected_resource_routes_share_one_response(app_config):
+    app = Starlette()
+    add_oauth_endpoints(app, app_config)
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app), base_url="http://mcp"
+    )
+
+    with patch(
+        "oauth_endpoints.load_protected_resource_metadata",
+        wraps=oauth_endpoints.load_protected_resource_metadata,
+    ) as load:
+        responses = [
+            await client.get(f"/.well-known/oauth-protected-resource{path}")
+            for path in ["", "/mcp", "/sse"]
+        ]
+
+    assert all(response.status_code == 200 for response in responses)
+    assert all(
+        response.json()["resource"] == "https://mcp.example.org/mcp"
+        for response in responses
+    )
+    load.assert_called_once()
+    preflight = await client.options("/.well-known/oauth-protected-resource/mcp")
+    assert preflight.headers["access-control-allow-methods"] == "GET, OPTIONS"
+
+
+def test_protected_resource_is_reloaded_when_the_file_changes(app_config):
+    path = app_config.mcp_auth.oauth_protected_resources_config_file
+    metadata = ProtectedResourceMetadata(path)
+    first = metadata.get_response()
+
+    assert metadata.get_response() is first
+    assert metadata.loads == 1
+
+    rewrite(Path(path), {"resource": "https://other.example.org/mcp"})
+    second = metadata.get_response()
+
+    assert second is not first
+    assert json.loads(second.body)["resource"] == "https://other.example.org/mcp"
+    assert metadata.loads == 2
+
+    os.remove(path)
+    assert metadata.get_response() is None
+
+
+@pytest.mark.asyncio
+async def test_authorization_server_follows_the_protected_resource(
+    app_config, tmp_path
+):
+    box = FakeBoxAccount()
+    _, client = make_client(app_config, box, FakeClock())
+    _, metadata = await get_metadata(client)
+    assert metadata["scopes_supported"] == ["root_readwrite"]
+
+    rewrite(
+        tmp_path / "protected-resource.json",
+        {
+            "resource": "https://mcp.example.org/mcp",
+            "scopes_supported": ["root_readonly"],
+        },
+    )
+    _, metadata = await get_metadata(client)
+
+    assert metadata["scopes_supported"] == ["root_readonly"]
+    assert len(box.requests) == 1
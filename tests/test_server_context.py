@@ -0,0 +1,147 @@
+import asyncio
+import random
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from mcp.server.fastmcp import Context
+
+from config import CacheConfig, ExecutionConfig
+from server_context import BoxClientCache, BoxContext, box_lifespan_mcp_oauth
+from tool_executor import ToolExecutor
+from tools.box_tools_generic import get_box_client
+
+
+def make_ctx(box_context: BoxContext, token: str | None):
+    """Build a minimal MCP context carrying a request with the given token."""
+    scope = {"oauth_token": token} if token else {}
+    request = SimpleNamespace(scope=scope)
+    return SimpleNamespace(
+        request_context=SimpleNamespace(lifespan_context=box_context, request=request)
+    )
+
+
+def test_pre_created_client_is_used():
+    client = object()
+    box_context = BoxContext(client=client)
+    assert get_box_client(make_ctx(box_context, None)) is client
+
+
+def test_missing_token_raises():
+    box_context = BoxContext(client=None)
+    with pytest.raises(ValueError, match="No OAuth token"):
+        get_box_client(make_ctx(box_context, None))
+
+
+def test_lifespan_context_is_not_mutated():
+    box_context = BoxContext(client=None)
+    get_box_client(make_ctx(box_context, "token-a"))
+    assert box_context.client is None
+    assert not hasattr(box_context, "request")
+
+
+def test_client_resolved_once_per_request():
+    box_context = BoxContext(client=None)
+    ctx = make_ctx(box_context, "token-a")
+    first = get_box_client(ctx)
+    assert get_box_client(ctx) is first
+    assert first.auth.token == "token-a"
+
+
+def test_validated_user_id_is_on_the_request_context():
+    box_context = BoxContext(client=None)
+    ctx = make_ctx(box_context, "token-a")
+    ctx.request_context.request.scope["box_user_id"] = "42"
+    request_context = box_context.get_request_context(ctx.request_context.request)
+    assert request_context.user_id == "42"
+
+
+@pytest.mark.asyncio
+async def test_interleaved_tokens_on_event_loop():
+    box_context = BoxContext(client=None)
+
+    async def call(n: int) -> None:
+        token = f"token-{n % 7}"
+        ctx = make_ctx(box_context, token)
+        for _ in range(5):
+            client = get_box_client(ctx)
+            # Yield so other requests interleave between resolutions
+            await asyncio.sleep(0)
+            assert client.auth.token == token
+
+    await asyncio.gather(*(call(n) for n in range(200)))
+
+
+@pytest.mark.asyncio
+async def test_interleaved_tokens_on_tool_executor_threads():
+    box_context = BoxContext(client=None)
+    executor = ToolExecutor(ExecutionConfig(tool_workers=16, tool_queue_size=1000))
+    seen_threads = set()
+
+    async def box_token_tool(ctx: Context) -> list[str]:
+        tokens = []
+        for _ in range(3):
+            tokens.append(get_box_client(ctx).auth.token)
+            seen_threads.add(threading.current_thread().name)
+            time.sleep(random.uniform(0, 0.002))
+        return tokens
+
+    wrapped = executor.wrap_tool(box_token_tool)
+    try:
+        expected = [f"token-{n}" for n in range(300)]
+        results = await asyncio.gather(
+            *(wrapped(ctx=make_ctx(box_context, token)) for token in expected)
+        )
+    finally:
+        executor.shutdown()
+
+    for token, tokens in zip(expected, results):
+        assert tokens == [token] * 3
+    assert len(seen_threads) > 1
+
+
+def test_client_cache_reuses_clients_per_token():
+    client_cache = BoxClientCache(CacheConfig())
+    box_context = BoxContext(client=None, client_cache=client_cache)
+
+    first = get_box_client(make_ctx(box_context, "token-a"))
+    second = get_box_client(make_ctx(box_context, "token-a"))
+    other = get_box_client(make_ctx(box_context, "token-b"))
+
+    assert first is second
+    assert other is not first
+    assert other.auth.token == "token-b"
+    assert first.network_session.additional_headers == {
+        "x-box-ai-library": "mcp-server-box"
+    }
+    stats = client_cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_client_cache_does_not_store_raw_tokens():
+    client_cache = BoxClientCache(CacheConfig())
+    client_cache.get_or_create("secret-token")
+    assert "secret-token" not in client_cache._cache
+    assert BoxClientCache._key("secret-token") in client_cache._cache
+
+
+def test_client_cache_closes_evicted_sessions():
+    client_cache = BoxClientCache(CacheConfig(client_cache_max_entries=1))
+    first = client_cache.get_or_create("token-a")
+    session = first.network_session.network_client.requests_session
+
+    with patch.object(session, "close") as mock_close:
+        client_cache.get_or_create("token-b")
+        mock_close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_mcp_oauth_lifespan_clears_client_cache():
+    async with box_lifespan_mcp_oauth(None, cache_config=CacheConfig()) as box_context:
+        assert box_context.client_cache.rate_limiters is box_context.rate_limiters
+        box_context.client_cache.get_or_create("token-a")
+        assert box_context.client_cache.stats()["entries"] == 1
+    assert box_context.client_cache.stats()["entries"] == 0
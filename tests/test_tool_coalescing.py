@@ -0,0 +1,128 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from box_api import BoxAsyncTransport
+from config import CacheConfig
+from server_context import BoxClientCache, BoxContext
+from tool_coalescing import ToolCoalescer
+from tools.box_tools_file import box_file_info_tool
+from tools.box_tools_folder import box_folder_create_tool, box_folder_items_list_tool
+
+FILE = {"type": "file", "id": "123", "name": "report.pdf"}
+
+
+def make_ctx(box_context: BoxContext, token: str):
+    request = SimpleNamespace(scope={"oauth_token": token})
+    return SimpleNamespace(
+        request_context=SimpleNamespace(lifespan_context=box_context, request=request)
+    )
+
+
+@pytest.fixture
+def fake_box():
+    """A BoxContext whose async transport counts the requests sent to Box."""
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await asyncio.sleep(0.05)
+        if request.url.path.endswith("/items"):
+            return httpx.Response(200, json={"entries": [FILE], "limit": 1000})
+        if request.url.path.endswith("/missing"):
+            return httpx.Response(404, json={"message": "Not Found", "request_id": "x"})
+        return httpx.Response(200, json=FILE)
+
+    transport = BoxAsyncTransport(transport=httpx.MockTransport(handler))
+    box_context = BoxContext(
+        client_cache=BoxClientCache(CacheConfig()), transport=transport
+    )
+    return box_context, requests
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_make_one_upstream_request(fake_box):
+    box_context, requests = fake_box
+    coalescer = ToolCoalescer()
+    tool = coalescer.wrap_tool(box_folder_items_list_tool)
+
+    results = await asyncio.gather(
+        *(tool(ctx=make_ctx(box_context, "token-a"), folder_id="0") for _ in range(20))
+    )
+
+    assert len(requests) == 1
+    assert all(result == results[0] for result in results)
+    assert results[0]["folder_items"][0]["id"] == "123"
+    assert coalescer.stats() == {
+        "calls": 20,
+        "executions": 1,
+        "saved_calls": 19,
+        "in_flight": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_arguments_are_normalized(fake_box):
+    box_context, requests = fake_box
+    tool = ToolCoalescer().wrap_tool(box_folder_items_list_tool)
+    ctx = make_ctx(box_context, "token-a")
+
+    await asyncio.gather(
+        tool(ctx, "0"),
+        tool(ctx=ctx, folder_id="0", is_recursive=False),
+        tool(ctx, "0", False, 1000),
+    )
+
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_different_identities_and_arguments_are_not_shared(fake_box):
+    box_context, requests = fake_box
+    tool = ToolCoalescer().wrap_tool(box_file_info_tool)
+
+    await asyncio.gather(
+        tool(make_ctx(box_context, "token-a"), "123"),
+        tool(make_ctx(box_context, "token-b"), "123"),
+        tool(make_ctx(box_context, "token-a"), "456"),
+    )
+
+    assert len(requests) == 3
+    assert {r.headers["authorization"] for r in requests} == {
+        "Bearer token-a",
+        "Bearer token-b",
+    }
+
+
+@pytest.mark.asyncio
+async def test_completed_calls_are_not_cached(fake_box):
+    box_context, requests = fake_box
+    tool = ToolCoalescer().wrap_tool(box_file_info_tool)
+
+    await tool(make_ctx(box_context, "token-a"), "123")
+    await tool(make_ctx(box_context, "token-a"), "123")
+
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_call(fake_box):
+    box_context, requests = fake_box
+    tool = ToolCoalescer().wrap_tool(box_file_info_tool)
+
+    first = asyncio.create_task(tool(make_ctx(box_context, "token-a"), "123"))
+    second = asyncio.create_task(tool(make_ctx(box_context, "token-a"), "123"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    result = await second
+    assert result["file_info"]["id"] == "123"
+    assert len(requests) == 1
+
+
+def test_only_marked_tools_are_wrapped():
+    coalescer = ToolCoalescer()
+    assert coalescer.wrap_tool(box_folder_create_tool) is box_folder_create_tool
+    assert coalescer.wrap_tool(box_file_info_tool) is not box_file_info_tool
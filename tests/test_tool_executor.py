@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from mcp.server.fastmcp import Context, FastMCP
+
+from config import ExecutionConfig
+from tool_executor import (
+    AI_POOL,
+    DEFAULT_POOL,
+    ToolExecutor,
+    ToolExecutorBusyError,
+    ToolThreadPool,
+    native_async,
+)
+from tool_registry import register_all_tools
+
+
+@pytest.fixture
+def executor():
+    executor = ToolExecutor(
+        ExecutionConfig(tool_workers=2, ai_tool_workers=1, tool_queue_size=4)
+    )
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_wrapped_tool_does_not_block_event_loop(executor):
+    async def box_slow_tool(ctx: Context, file_id: str) -> dict:
+        time.sleep(0.2)
+        return {"file_id": file_id, "thread": threading.current_thread().name}
+
+    wrapped = executor.wrap_tool(box_slow_tool)
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    result = await wrapped(ctx=None, file_id="123")
+    ticker_task.cancel()
+
+    assert result["file_id"] == "123"
+    assert result["thread"].startswith("box-tools-default")
+    # The loop kept running while the tool was sleeping
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_pool_bounds_concurrency(executor):
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    async def box_counting_tool() -> None:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    wrapped = executor.wrap_tool(box_counting_tool)
+    await asyncio.gather(*(wrapped() for _ in range(6)))
+
+    assert peak == 2
+    stats = executor.stats()[DEFAULT_POOL]
+    assert stats["completed"] == 6
+    assert stats["active"] == 0
+    assert stats["queued"] == 0
+    assert stats["peak_queued"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_ai_tools_use_ai_pool(executor):
+    async def box_ai_fake_tool() -> str:
+        return threading.current_thread().name
+
+    result = await executor.wrap_tool(box_ai_fake_tool)()
+    assert result.startswith("box-tools-ai")
+    assert executor.stats()[AI_POOL]["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_native_async_tool_is_not_wrapped(executor):
+    @native_async
+    async def box_native_tool() -> str:
+        return "ok"
+
+    assert executor.wrap_tool(box_native_tool) is box_native_tool
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_calls():
+    pool = ToolThreadPool("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        first = asyncio.create_task(pool.run(release.wait))
+        second = asyncio.create_task(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(ToolExecutorBusyError):
+            await pool.run(release.wait)
+        assert pool.stats()["rejected"] == 1
+        assert pool.stats()["saturation"] == 1.0
+
+        release.set()
+        await asyncio.gather(first, second)
+        assert pool.stats()["queued"] == 0
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_register_all_tools_applies_wrappers(executor):
+    mcp = FastMCP(name="test")
+
+    async def box_thread_name_tool(ctx: Context, value: str) -> str:
+        """Return the executing thread name."""
+        return f"{value}:{threading.current_thread().name}"
+
+    def registrar(server):
+        server.tool()(box_thread_name_tool)
+
+    register_all_tools(mcp, [registrar], wrappers=[executor.wrap_tool])
+
+    tools = await mcp.list_tools()
+    tool = next(t for t in tools if t.name == "box_thread_name_tool")
+    assert tool.description == "Return the executing thread name."
+    assert list(tool.inputSchema["properties"]) == ["value"]
+
+    result = await mcp.call_tool("box_thread_name_tool", {"value": "x"})
+    assert "x:box-tools-default" in str(result)
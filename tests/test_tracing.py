@@ -0,0 +1,228 @@
+import json
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+import requests
+from box_sdk_gen import BoxClient, BoxDeveloperTokenAuth
+from mcp.server.fastmcp import Context
+from requests.structures import CaseInsensitiveDict
+
+import tracing
+from box_api import BoxAsyncApi, BoxAsyncTransport
+from box_api.observability import observe_client
+from config import ObservabilityConfig
+from tool_executor import ToolExecutor
+from tracing import (
+    SPAN_KIND_CLIENT,
+    SPAN_KIND_SERVER,
+    STATUS_ERROR,
+    JsonFileSpanExporter,
+    OtlpHttpSpanExporter,
+    SpanContext,
+    Tracer,
+    configure_tracing,
+    format_traceparent,
+    parse_traceparent,
+)
+
+TRACE_ID = "0af7651916cd43dd8448eb211c80319c"
+PARENT_ID = "b7ad6b7169203331"
+TRACEPARENT = f"00-{TRACE_ID}-{PARENT_ID}-01"
+FILE = {"type": "file", "id": "123", "name": "report.pdf"}
+
+
+@pytest.fixture
+def traces(tmp_path, monkeypatch):
+    """Install a tracer exporting to a file, returns a function reading the spans back."""
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(JsonFileSpanExporter(str(path), "test-service"))
+    monkeypatch.setattr(tracing, "_tracer", tracer)
+
+    def read_spans():
+        tracer.exporter.flush()
+        if not path.exists():
+            return []
+        spans = []
+        for line in path.read_text().splitlines():
+            document = json.loads(line)
+            for resource_spans in document["resourceSpans"]:
+                for scope_spans in resource_spans["scopeSpans"]:
+                    spans.extend(scope_spans["spans"])
+        return spans
+
+    yield read_spans
+    tracer.shutdown()
+
+
+def tool_context(traceparent=None):
+    headers = {"traceparent": traceparent} if traceparent else {}
+    return Context(request_context=MagicMock(request=MagicMock(headers=headers)))
+
+
+def sdk_response(status: int, body: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict({})
+    response._content = json.dumps(body).encode("utf-8")
+    response.url = "https://api.box.com/2.0/files/123"
+    return response
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (TRACEPARENT, SpanContext(TRACE_ID, PARENT_ID, True)),
+        (f"00-{TRACE_ID}-{PARENT_ID}-00", SpanContext(TRACE_ID, PARENT_ID, False)),
+        (
+            f"01-{TRACE_ID}-{PARENT_ID}-01-future",
+            SpanContext(TRACE_ID, PARENT_ID, True),
+        ),
+        (None, None),
+        ("garbage", None),
+        (f"00-{TRACE_ID}-{PARENT_ID}-01-extra", None),
+        (f"ff-{TRACE_ID}-{PARENT_ID}-01", None),
+        (f"00-{'0' * 32}-{PARENT_ID}-01", None),
+        (f"00-{TRACE_ID}-{'0' * 16}-01", None),
+        (f"00-{TRACE_ID.upper()}-{PARENT_ID}-01", None),
+    ],
+)
+def test_parse_traceparent(header, expected):
+    assert parse_traceparent(header) == expected
+
+
+def test_format_traceparent_round_trips():
+    assert format_traceparent(parse_traceparent(TRACEPARENT)) == TRACEPARENT
+
+
+@pytest.mark.asyncio
+async def test_tool_span_continues_the_request_trace(traces):
+    async def box_search_tool(ctx: Context, query: str) -> dict:
+        return {"error": "404 Not Found"}
+
+    tool = tracing.get_tracer().wrap_tool(box_search_tool)
+    await tool(tool_context(TRACEPARENT), query="report")
+
+    [span] = traces()
+    assert span["name"] == "tools/call box_search_tool"
+    assert span["kind"] == SPAN_KIND_SERVER
+    assert span["traceId"] == TRACE_ID
+    assert span["parentSpanId"] == PARENT_ID
+    assert span["status"] == {"code": STATUS_ERROR, "message": "404 Not Found"}
+
+
+@pytest.mark.asyncio
+async def test_unsampled_requests_are_not_exported(traces):
+    async def box_search_tool(ctx: Context) -> str:
+        return "ok"
+
+    tool = tracing.get_tracer().wrap_tool(box_search_tool)
+    await tool(tool_context(f"00-{TRACE_ID}-{PARENT_ID}-00"))
+
+    assert traces() == []
+
+
+@pytest.mark.asyncio
+async def test_sdk_requests_on_pool_threads_are_children_of_the_tool_span(traces):
+    client = observe_client(BoxClient(BoxDeveloperTokenAuth(token="token-a")))
+    session = client.network_session.network_client.requests_session = MagicMock()
+    session.request.return_value = sdk_response(200, FILE)
+
+    async def box_file_info_tool(ctx: Context, file_id: str) -> dict:
+        return {"name": client.files.get_file_by_id(file_id).name}
+
+    executor = ToolExecutor()
+    tool = tracing.get_tracer().wrap_tool(executor.wrap_tool(box_file_info_tool))
+    assert await tool(tool_context(), file_id="123") == {"name": "report.pdf"}
+    executor.shutdown()
+
+    spans = {span["name"]: span for span in traces()}
+    tool_span = spans["tools/call box_file_info_tool"]
+    queue_span = spans["tool pool queue"]
+    request_span = spans["GET /2.0/files/{id}"]
+    assert "parentSpanId" not in tool_span
+    assert queue_span["parentSpanId"] == tool_span["spanId"]
+    assert request_span["parentSpanId"] == tool_span["spanId"]
+    assert request_span["traceId"] == tool_span["traceId"]
+    assert request_span["kind"] == SPAN_KIND_CLIENT
+    attributes = {a["key"]: a["value"] for a in request_span["attributes"]}
+    assert attributes["http.response.status_code"] == {"intValue": "200"}
+    assert attributes["url.path"] == {"stringValue": "/2.0/files/123"}
+
+
+@pytest.mark.asyncio
+async def test_async_transport_requests_are_recorded(traces):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(404, json={"message": "Not Found"})
+
+    client = BoxClient(BoxDeveloperTokenAuth(token="token-a"))
+    api = BoxAsyncApi(BoxAsyncTransport(transport=httpx.MockTransport(handler)), client)
+    with tracing.get_tracer().start_span("parent") as parent:
+        result = await api.file_info("123")
+    assert "error" in result
+
+    spans = {span["name"]: span for span in traces()}
+    request_span = spans["GET /2.0/files/{id}"]
+    assert request_span["parentSpanId"] == parent.context.span_id
+    assert request_span["status"]["code"] == STATUS_ERROR
+
+
+def test_otlp_exporter_posts_batches_to_the_collector():
+    documents = []
+
+    def collector(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/v1/traces"
+        documents.append(json.loads(request.content))
+        return httpx.Response(200, json={})
+
+    exporter = OtlpHttpSpanExporter(
+        "http://collector:4318/",
+        "test-service",
+        transport=httpx.MockTransport(collector),
+    )
+    tracer = Tracer(exporter)
+    for i in range(3):
+        with tracer.start_span(f"span {i}"):
+            pass
+    tracer.shutdown()
+
+    [document] = documents
+    resource_spans = document["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "test-service"}}
+    ]
+    assert len(resource_spans["scopeSpans"][0]["spans"]) == 3
+    assert exporter.exported == 3
+
+
+def test_unreachable_collector_drops_the_spans():
+    def collector(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused", request=request)
+
+    exporter = OtlpHttpSpanExporter(
+        "http://collector:4318",
+        "test-service",
+        transport=httpx.MockTransport(collector),
+    )
+    tracer = Tracer(exporter)
+    with tracer.start_span("lost"):
+        pass
+    tracer.shutdown()
+
+    assert exporter.failed == 1
+
+
+def test_configure_tracing(tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr(tracing.atexit, "register", registered.append)
+    monkeypatch.setattr(tracing.atexit, "unregister", registered.remove)
+    assert configure_tracing(ObservabilityConfig()) is None
+
+    path = tmp_path / "traces.jsonl"
+    tracer = configure_tracing(
+        ObservabilityConfig(tracing_exporter="file", tracing_file=str(path))
+    )
+    assert isinstance(tracer.exporter, JsonFileSpanExporter)
+    assert registered == [tracer.shutdown]
+    assert configure_tracing(ObservabilityConfig(tracing_exporter="none")) is None
+    assert registered == []